@@ -0,0 +1,189 @@
+import asyncio
+import bisect
+import random
+import time
+from collections import Counter
+from datetime import datetime
+from config import WEBHOOK_LOGS_URL, WEBHOOK_ANALYTICS_URL, ANALYTICS_FLUSH_SECONDS, ANALYTICS_SAMPLE_RATE
+from webhook_dispatcher import webhook_dispatcher
+from metrics import metrics
+from loop_monitor import loop_monitor
+
+# -------- ANALYTICS AGGREGATION --------
+
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+IMMEDIATE_EVENTS = {"Bot Health"}  # Rare events that are still posted one by one
+
+# Cumulative counterparts of the windowed counters, for the /metrics endpoint
+search_latency_metric = metrics.histogram("player_search_seconds", "Player search latency by search type", ("search_type",))
+selection_metric = metrics.counter("selections_total", "Disambiguation selections by outcome", ("outcome",))
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds) with approximate percentiles"""
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)  # Last bucket: above the largest bound
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value_ms):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, value_ms)] += 1
+        self.count += 1
+        self.total += value_ms
+        self.max = max(self.max, value_ms)
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of observations"""
+        if not self.count:
+            return 0
+        target = fraction * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else self.max
+        return self.max
+
+    def summary(self):
+        if not self.count:
+            return "no samples"
+        return f"avg {self.total / self.count:.0f}ms, p50 ≤{self.percentile(0.5):.0f}ms, p95 ≤{self.percentile(0.95):.0f}ms, max {self.max:.0f}ms"
+
+def match_bucket(matches):
+    if matches <= 1:
+        return str(matches)
+    return "2-3" if matches <= 3 else "4+"
+
+class AnalyticsAggregator:
+    """
+    Counts analytics events in process and posts one summary embed per interval.
+
+    Player searches, question outcomes, block reasons, selections and timeouts
+    become counters and latency histograms instead of one webhook message per
+    event. A configurable fraction of raw events is still posted as samples.
+    """
+    def __init__(self, flush_interval=ANALYTICS_FLUSH_SECONDS, sample_rate=ANALYTICS_SAMPLE_RATE, clock=time.time, rand=random.random):
+        self.flush_interval = flush_interval
+        self.sample_rate = sample_rate
+        self.clock = clock
+        self.rand = rand
+        self.task = None
+        self.reset()
+
+    def reset(self):
+        self.window_start = self.clock()
+        self.events = Counter()             # event type: count
+        self.searches = Counter()           # search type: count
+        self.match_counts = Counter()       # matches found bucket: count
+        self.search_latency = {}            # search type: LatencyHistogram
+        self.questions = Counter()          # status: count
+        self.block_reasons = Counter()      # reason / status: count
+        self.disambiguations = Counter()    # disambiguation status: count
+        self.selections = Counter()         # "selection type: outcome": count
+        self.timeouts = LatencyHistogram()  # seconds a selection waited before timing out (in ms buckets)
+
+    def record(self, event_type, fields):
+        """Fold one event into the current window"""
+        self.events[event_type] += 1
+
+        if event_type == "Player Search":
+            search_type = fields.get("search_type", "unknown")
+            self.searches[search_type] += 1
+            self.match_counts[match_bucket(fields.get("matches_found", 0))] += 1
+            if "duration_ms" in fields:
+                self.search_latency.setdefault(search_type, LatencyHistogram()).observe(fields["duration_ms"])
+                search_latency_metric.observe(fields["duration_ms"] / 1000, search_type=search_type)
+
+        elif event_type == "Question Processed":
+            status = fields.get("status", "unknown")
+            self.questions[status] += 1
+            if status != "approved" and fields.get("reason"):
+                self.block_reasons[fields["reason"]] += 1
+
+        elif event_type == "Single Player Policy":
+            self.block_reasons[fields.get("status", event_type)] += 1
+
+        elif event_type == "Player Disambiguation":
+            self.disambiguations[fields.get("status", "unknown")] += 1
+
+        elif event_type == "User Selection":
+            outcome = fields.get("timeout", "completed")
+            self.selections[f"{fields.get('selection_type', 'unknown')}: {outcome}"] += 1
+            selection_metric.inc(outcome=outcome)
+            if outcome == "timed_out" and "timeout_duration" in fields:
+                self.timeouts.observe(fields["timeout_duration"] * 1000)
+
+    def should_post(self, event_type):
+        """Whether this raw event is also posted on its own (sampled, or important enough)"""
+        if event_type in IMMEDIATE_EVENTS:
+            return True
+        if self.sample_rate > 0 and self.rand() < self.sample_rate:
+            if loop_monitor.degraded:
+                loop_monitor.shed_load("analytics_sample")  # Still counted in the summary
+                return False
+            return True
+        return False
+
+    # -------- SUMMARY --------
+
+    def summary_embed(self):
+        """One compact embed for the current window, or None if nothing happened"""
+        if not self.events:
+            return None
+
+        minutes = max((self.clock() - self.window_start) / 60, 0.01)
+        fields = []
+
+        def add(name, counter, limit=8):
+            if counter:
+                lines = [f"{key}: {count}" for key, count in counter.most_common(limit)]
+                fields.append({"name": name, "value": "\n".join(lines)[:1024], "inline": True})
+
+        add("Events", self.events)
+        add("Questions", self.questions)
+        add("Block Reasons", self.block_reasons)
+        add("Disambiguations", self.disambiguations)
+        add("Selections", self.selections)
+        add("Search Types", self.searches)
+        add("Matches Found", self.match_counts)
+        if self.search_latency:
+            lines = [f"{search_type}: {histogram.summary()}" for search_type, histogram
+                     in sorted(self.search_latency.items(), key=lambda item: -item[1].count)[:8]]
+            fields.append({"name": "Search Latency", "value": "\n".join(lines)[:1024], "inline": False})
+        if self.timeouts.count:
+            fields.append({"name": "Selection Timeouts", "value": f"{self.timeouts.count} timed out, waited {self.timeouts.summary()}", "inline": False})
+
+        return {
+            "title": "ANALYTICS - Summary",
+            "description": f"{sum(self.events.values())} events in the last {minutes:.0f} min",
+            "color": 0x9932cc,
+            "timestamp": datetime.utcnow().isoformat(),
+            "fields": fields[:25]
+        }
+
+    def flush(self):
+        """Queue the summary for the analytics webhook and start a new window"""
+        embed = self.summary_embed()
+        self.reset()
+        webhook_url = WEBHOOK_ANALYTICS_URL or WEBHOOK_LOGS_URL
+        if embed is None or not webhook_url:
+            return False
+        return webhook_dispatcher.enqueue(webhook_url, "ANALYTICS", embed)
+
+    def start(self):
+        """Start the periodic summary (once per event loop)"""
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if loop_monitor.degraded:
+                loop_monitor.shed_load("analytics_flush")  # Keep counting; the next flush covers the longer window
+                continue
+            self.flush()
+
+# Global analytics aggregator instance
+analytics = AnalyticsAggregator()
@@ -8,64 +8,16 @@ import uuid
 import time
 import os
 from datetime import datetime, timedelta
-from collections import defaultdict
 from question_map_store import load_question_map, save_question_map, append_question
+from rate_limiter import AsyncRateLimiter, RateLimitExceeded
+from route_limiter import route_limiter
+from outbound_scheduler import outbound, send_notice, submit_delete, PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW
 
 # ========== EMERGENCY IP BAN PREVENTION ==========
 # CRITICAL: Universal rate limiting to prevent Discord IP bans
 
-class UniversalRateLimiter:
-    """
-    CRITICAL: Prevents Discord IP bans by rate limiting ALL Discord operations
-    """
-    def __init__(self):
-        self.calls = defaultdict(list)
-        self.max_calls_per_minute = 10  # Very conservative limit
-        self.max_calls_per_hour = 100   # Hourly limit
-        self.cooldown_duration = 60     # Seconds
-        self.emergency_mode = False
-        
-    def can_proceed(self, operation="general"):
-        """Check if operation can proceed without hitting rate limits"""
-        now = time.time()
-        
-        # Clean old calls
-        self.calls[operation] = [t for t in self.calls[operation] if now - t < 3600]  # Keep 1 hour
-        minute_calls = [t for t in self.calls[operation] if now - t < 60]  # Last minute
-        
-        # Check limits
-        if len(minute_calls) >= self.max_calls_per_minute:
-            print(f"🚨 RATE_LIMIT: {operation} blocked - {len(minute_calls)} calls in last minute")
-            return False
-            
-        if len(self.calls[operation]) >= self.max_calls_per_hour:
-            print(f"🚨 RATE_LIMIT: {operation} blocked - {len(self.calls[operation])} calls in last hour")
-            return False
-            
-        return True
-    
-    def record_call(self, operation="general"):
-        """Record an API call"""
-        self.calls[operation].append(time.time())
-    
-    def wait_if_needed(self, operation="general"):
-        """Wait if rate limit would be exceeded"""
-        if not self.can_proceed(operation):
-            print(f"🚨 EMERGENCY_WAIT: Waiting {self.cooldown_duration}s for {operation}")
-            time.sleep(self.cooldown_duration)
-        
-        self.record_call(operation)
-    
-    def enter_emergency_mode(self):
-        """Enter emergency mode with extreme rate limiting"""
-        self.emergency_mode = True
-        self.max_calls_per_minute = 3  # Extremely conservative
-        self.max_calls_per_hour = 30
-        self.cooldown_duration = 120   # 2 minute waits
-        print("🚨 ENTERING EMERGENCY MODE: Extreme rate limiting activated")
-
 # Global rate limiter instance
-rate_limiter = UniversalRateLimiter()
+rate_limiter = AsyncRateLimiter()
 
 # EMERGENCY: Disable features that cause API abuse
 EMERGENCY_MODE = True  # Start in emergency mode after IP ban
@@ -79,8 +31,8 @@ def safe_discord_operation(operation_name):
     def decorator(func):
         async def wrapper(*args, **kwargs):
             try:
-                # Rate limit check
-                rate_limiter.wait_if_needed(operation_name)
+                # Rate limit check (awaits, never blocks the event loop)
+                await rate_limiter.acquire(operation_name)
                 
                 # Execute operation
                 result = await func(*args, **kwargs)
@@ -96,6 +48,9 @@ def safe_discord_operation(operation_name):
                 else:
                     print(f"❌ DISCORD_ERROR: {operation_name} failed with status {e.status}")
                     raise
+            except RateLimitExceeded as e:
+                print(f"🚨 RATE_LIMIT: Skipping {operation_name}: {e}")
+                return None
             except Exception as e:
                 print(f"❌ OPERATION_ERROR: {operation_name} failed: {e}")
                 raise
@@ -105,28 +60,6 @@ def safe_discord_operation(operation_name):
 # Set up flow tracing logger
 logger = logging.getLogger(__name__)
 
-# -------- SIMPLE RESOURCE MONITORING --------
-def log_resource_usage(stage, request_id=None):
-    """Log resource usage checkpoint using built-in modules"""
-    try:
-        import gc
-        import sys
-        
-        # Get object count as a proxy for memory usage
-        obj_count = len(gc.get_objects())
-        # Get reference count for tracking potential memory leaks
-        ref_count = sys.gettotalrefcount() if hasattr(sys, 'gettotalrefcount') else 'N/A'
-        
-        if request_id:
-            logger.info(f"📊 RESOURCE_TRACE [{request_id}]: {stage} - Objects: {obj_count}, Refs: {ref_count}")
-        else:
-            logger.info(f"📊 RESOURCE_TRACE: {stage} - Objects: {obj_count}, Refs: {ref_count}")
-    except Exception as e:
-        if request_id:
-            logger.warning(f"📊 RESOURCE_TRACE [{request_id}]: Could not get resource usage for {stage}: {e}")
-        else:
-            logger.warning(f"📊 RESOURCE_TRACE: Could not get resource usage for {stage}: {e}")
-
 # -------- STAGE MONITORING UTILITY --------
 def log_stage_info(stage, request_id=None):
     """Log processing stage for debugging (no external dependencies)"""
@@ -139,15 +72,70 @@ def log_stage_info(stage, request_id=None):
 from config import (
     DISCORD_TOKEN, SUBMISSION_CHANNEL, ANSWERING_CHANNEL, FINAL_ANSWER_CHANNEL,
     FINAL_ANSWER_LINK, PRE_SELECTION_DELAY, REACTIONS, 
-    banned_categories, pending_selections, timeout_tasks, players_data
+    banned_categories, players_data, METRICS_PORT, METRICS_HOST, PROFILE_MAX_REQUESTS
 )
-from logging_system import log_info, log_error, log_success, log_analytics, start_batching, log_memory_usage
+from logging_system import log_info, log_error, log_success, log_debug, log_analytics, start_batching, log_memory_usage, log_resource_usage
 from utils import load_words_from_json, load_players_from_json, load_nicknames_from_json, is_likely_player_request, normalize_name
 from validation import validate_question
 from player_matching import check_player_mentioned, process_multi_player_query_fixed, has_multi_player_keywords, has_multi_player_keywords_enhanced, validate_suspicious_names_strict
-from recent_mentions import check_recent_player_mentions, check_fallback_recent_mentions
-from selection_handlers import start_selection_timeout, cancel_selection_timeout, handle_disambiguation_selection, handle_block_selection, cleanup_invalid_selection
-from bot_logic import process_approved_question, get_potential_player_words, handle_multi_player_question, handle_single_player_question, schedule_answered_message_cleanup
+from recent_mentions import check_recent_player_mentions, check_fallback_recent_mentions, recent_mention_flights
+from mention_index import recent_message_index, index_bot_message
+from history_backfill import start_backfill
+from mention_plans import build_mention_plans
+from selection_handlers import complete_selection, cleanup_invalid_selection, restore_pending_selections
+from selection_store import selection_store
+from bot_logic import process_approved_question, get_potential_player_words, handle_multi_player_question, handle_single_player_question, resolve_referenced_message, mark_question_answered
+from deletion_service import deletion_service
+from timer_scheduler import timers
+from discord_cache import channel_registry, member_cache
+from http_session import http_session
+from webhook_dispatcher import webhook_dispatcher
+from analytics import analytics
+from metrics import metrics, metrics_server
+from loop_monitor import loop_monitor
+from instrumentation import timed_stage
+from tracing import tracer, set_attribute
+from flight_recorder import flight_recorder
+from profiling import request_profiler
+
+# -------- METRICS --------
+ask_requests = metrics.counter("ask_requests_total", "!ask requests by outcome", ("outcome",))
+ask_duration = metrics.histogram("ask_request_seconds", "Time to handle one !ask request")
+
+# Read from existing state at scrape time
+metrics.callback("event_loop_lag_seconds", "Most recent event-loop lag sample", lambda: loop_monitor.lag)
+metrics.callback("event_loop_lag_max_seconds", "Worst event-loop lag in the recent window", lambda: loop_monitor.max_lag)
+metrics.callback("load_shedding_mode", "0 normal, 1 degraded, 2 overloaded", lambda: loop_monitor.mode)
+metrics.callback("load_shed_total", "Work skipped or refused while shedding load",
+                 lambda: [({"action": action}, count) for action, count in loop_monitor.shed.items()], kind="counter")
+metrics.callback("rate_limiter_tokens", "Tokens left per operation bucket",
+                 lambda: [({"operation": "global"}, rate_limiter.global_bucket.tokens)] +
+                         [({"operation": op}, bucket.tokens) for op, bucket in rate_limiter.buckets.items()])
+metrics.callback("rate_limiter_calls_total", "Calls admitted per operation",
+                 lambda: [({"operation": op}, count) for op, count in rate_limiter.calls.items()], kind="counter")
+metrics.callback("rate_limiter_waits_total", "Calls that had to wait per operation",
+                 lambda: [({"operation": op}, count) for op, count in rate_limiter.waits.items()], kind="counter")
+metrics.callback("rate_limiter_rejected_total", "Calls refused because their wait would exceed the cap",
+                 lambda: [({"operation": op}, count) for op, count in rate_limiter.rejected.items()], kind="counter")
+metrics.callback("route_limiter_events_total", "Discord REST route limiter events",
+                 lambda: [({"event": event}, count) for event, count in route_limiter.stats.items()], kind="counter")
+metrics.callback("webhook_queue_depth", "Embeds waiting in the webhook dispatcher", lambda: len(webhook_dispatcher))
+metrics.callback("webhook_events_total", "Webhook dispatcher events",
+                 lambda: [({"event": event}, count) for event, count in webhook_dispatcher.stats.items()], kind="counter")
+metrics.callback("recent_mention_index_size", "Messages in the recent mention index", lambda: len(recent_message_index))
+metrics.callback("cache_events_total", "Cache lookups by cache and result", lambda: [
+    ({"cache": "recent_mentions", "result": "hit"}, recent_mention_flights.stats["cache_hits"]),
+    ({"cache": "recent_mentions", "result": "coalesced"}, recent_mention_flights.stats["coalesced"]),
+    ({"cache": "recent_mentions", "result": "miss"}, recent_mention_flights.stats["lookups"]),
+    ({"cache": "channels", "result": "hit"}, channel_registry.stats["hits"]),
+    ({"cache": "channels", "result": "missing"}, channel_registry.stats["misses"]),
+    ({"cache": "channels", "result": "refresh"}, channel_registry.stats["refreshes"]),
+    ({"cache": "members", "result": "gateway_hit"}, member_cache.stats["gateway_hits"]),
+    ({"cache": "members", "result": "hit"}, member_cache.stats["hits"]),
+    ({"cache": "members", "result": "miss"}, member_cache.stats["fetches"]),
+], kind="counter")
+metrics.callback("pending_selections", "Disambiguation prompts awaiting a choice", lambda: len(selection_store))
+metrics.callback("outbound_backlog", "Queued outbound Discord operations", lambda: outbound.backlog)
 
 # -------- PERSISTENT QUESTION_ID STORAGE --------
 question_map = load_question_map()
@@ -161,7 +149,22 @@ intents.guilds = True
 intents.messages = True
 intents.message_content = True
 
-bot = commands.Bot(command_prefix="!", intents=intents)
+class AskBot(commands.Bot):
+    async def close(self):
+        await super().close()
+        await metrics_server.stop()
+        # Post the partial analytics window and anything still queued before the session goes
+        analytics.flush()
+        await webhook_dispatcher.flush()
+        await tracer.exporter.flush()
+        await flight_recorder.flush()
+        await timers.flush()
+        await selection_store.flush()
+        # Release pooled webhook connections once nothing else will log
+        await http_session.close()
+
+# Route-bucket limiter gates every REST call on the bot's HTTP session
+bot = AskBot(command_prefix="!", intents=intents, http_trace=route_limiter.trace_config())
 
 # -------- HELPER FUNCTIONS --------
 # (Old disambiguation logic removed - now handled inline with proper last name analysis)
@@ -178,6 +181,17 @@ async def on_ready():
         start_batching()
         log_info("STARTUP: Log batching started")
         
+        loop_monitor.start()
+        if tracer.enabled:
+            tracer.exporter.start()
+        flight_recorder.start()
+        if METRICS_PORT:
+            try:
+                if await metrics_server.start(METRICS_HOST, METRICS_PORT):
+                    log_info(f"STARTUP: Metrics endpoint at http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+            except OSError as e:
+                log_error(f"STARTUP: Metrics endpoint failed to start: {e}")
+        
         # CRITICAL: Load player data with comprehensive error handling
         log_info("STARTUP: Beginning player data loading...")
         
@@ -224,6 +238,9 @@ async def on_ready():
             load_nicknames_from_json("nicknames.json")
             log_info("STARTUP: Nicknames loaded successfully")
             
+            # Precompute recent-mention match plans for the roster
+            build_mention_plans(players_data)
+            
         except Exception as e:
             log_error(f"CRITICAL STARTUP ERROR in data loading: {e}")
             import traceback
@@ -250,9 +267,22 @@ async def on_ready():
             log_error("STARTUP WARNING: Bot started but no player data available")
             print("⚠️ STARTUP WARNING: No player data loaded")
         
+        # Index channel names once per guild
+        for guild in bot.guilds:
+            channel_registry.refresh(guild)
+        
         # Cleanup
-        log_info("STARTUP: Cleaning up orphaned disambiguation messages")
-        pending_selections.clear()
+        log_info("STARTUP: Restoring pending disambiguation selections")
+        restore_pending_selections(bot)
+        
+        # Resume delayed deletes and timeouts scheduled before the last restart
+        deletion_service.resolve_channel = bot.get_channel
+        timers.restore()
+        log_info(f"STARTUP: Scheduled jobs pending: {timers.counts()}")
+        
+        # Warm the recent mention index in the background (paged; route_limiter gates each history request)
+        for guild in bot.guilds:
+            start_backfill(guild)
         
         log_success("Bot startup sequence completed!")
         
@@ -265,6 +295,12 @@ async def on_ready():
 @bot.event  
 async def on_message(message):
     if message.author.bot:
+        # Keep the recent mention index current with our own posts
+        if message.author == bot.user:
+            index_bot_message(message)
+            # A new post can change a player's pending/answered status
+            if message.channel.name in (ANSWERING_CHANNEL, FINAL_ANSWER_CHANNEL):
+                recent_mention_flights.invalidate()
         return
     
     relevant_channels = [SUBMISSION_CHANNEL, ANSWERING_CHANNEL, FINAL_ANSWER_CHANNEL]
@@ -276,17 +312,13 @@ async def on_message(message):
         if message.content.startswith("!ask"):
             pass  # Let Discord.py process the command
         else:
-            try:
-                await message.delete()
-            except:
-                pass
-            error_msg = await message.channel.send(f"Only the `!ask` command is allowed in #{SUBMISSION_CHANNEL}.")
-            await error_msg.delete(delay=5)
+            submit_delete(message)
+            await send_notice(message.channel, f"Only the `!ask` command is allowed in #{SUBMISSION_CHANNEL}.", priority=PRIORITY_LOW)
             return
 
     # Handle expert answers
     elif message.channel.name == ANSWERING_CHANNEL and message.reference:
-        referenced = message.reference.resolved
+        referenced = await resolve_referenced_message(message)
         
         # Try to get from question_map first (for new messages)
         meta = None
@@ -337,7 +369,7 @@ async def on_message(message):
                 log_error(f"Failed to parse old message format: {e}")
         
         if meta:
-            final_channel = discord.utils.get(message.guild.text_channels, name=FINAL_ANSWER_CHANNEL)
+            final_channel = channel_registry.get(message.guild, FINAL_ANSWER_CHANNEL)
 
             if final_channel:
                 # Use asker_id if available (creates proper @ mention), otherwise use name
@@ -353,33 +385,58 @@ async def on_message(message):
                 print(f"asker_mention: {asker_mention}")
                 print(f"formatted_answer: {formatted_answer}")
 
-                await final_channel.send(formatted_answer)
+                await outbound.run("forward_answer", lambda: final_channel.send(formatted_answer), PRIORITY_HIGH)
 
             '''if referenced and referenced.id in question_map:
                 return'''
 
-            # Update status regardless of whether it was in question_map
+            # Update status regardless of whether it was in question_map (edit and cleanup are queued together)
             try:
-                fresh_message = await message.channel.fetch_message(referenced.id)
-                original_content = fresh_message.content
-                
-                if "❗ **Not Answered**\n\nReply to this message to answer." in original_content:
-                    updated_content = original_content.replace("❗ **Not Answered**\n\nReply to this message to answer.", "✅ **Answered**")
-                elif "❗ **Not Answered**" in original_content:
-                    updated_content = original_content.replace("❗ **Not Answered**", "✅ **Answered**")
-                    updated_content = updated_content.replace("\nReply to this message to answer.", "").replace("Reply to this message to answer.", "")
-                else:
-                    updated_content = original_content + "\n\n✅ **Answered**\n"
-                
-                if updated_content != original_content:
-                    await fresh_message.edit(content=updated_content)
-                    asyncio.create_task(schedule_answered_message_cleanup(fresh_message, message))
-
+                mark_question_answered(referenced, message)
             except Exception as e:
                 log_error(f"Failed to edit original message: {e}")
     
     await bot.process_commands(message)
 
+# -------- RECENT MENTION INDEX MAINTENANCE --------
+
+@bot.event
+async def on_resumed():
+    # Catch up on anything posted while the gateway was disconnected
+    log_info("RESUMED: Starting incremental mention index backfill")
+    for guild in bot.guilds:
+        start_backfill(guild, incremental=True)
+
+@bot.event
+async def on_raw_message_delete(payload):
+    recent_message_index.remove(payload.message_id)
+
+@bot.event
+async def on_raw_bulk_message_delete(payload):
+    for message_id in payload.message_ids:
+        recent_message_index.remove(message_id)
+
+@bot.event
+async def on_raw_message_edit(payload):
+    # Status updates and !correct edits change what the index should match
+    if payload.message_id in recent_message_index.messages and "content" in payload.data:
+        recent_message_index.update_content(payload.message_id, payload.data["content"])
+
+# -------- CHANNEL REGISTRY MAINTENANCE --------
+
+@bot.event
+async def on_guild_channel_create(channel):
+    channel_registry.refresh(channel.guild)
+
+@bot.event
+async def on_guild_channel_update(before, after):
+    if before.name != after.name:
+        channel_registry.refresh(after.guild)
+
+@bot.event
+async def on_guild_channel_delete(channel):
+    channel_registry.refresh(channel.guild)
+
 # -------- COMMAND: !ask --------
 
 def emergency_load_players():
@@ -395,6 +452,7 @@ def emergency_load_players():
             if len(players_data) == 0 and len(players_loaded) > 0:
                 # Direct extension as emergency measure
                 players_data.extend(players_loaded)
+                build_mention_plans(players_data)
                 print(f"🚨 EMERGENCY: Loaded {len(players_data)} players")
                 return True
             elif len(players_data) > 0:
@@ -416,52 +474,67 @@ async def ask_question(ctx, *, question: str = None):
     # 🆔 REQUEST TRACKING: Generate unique request ID and start timing
     request_id = str(uuid.uuid4())[:8]
     start_time = time.time()
-    logger.info(f"🆔 REQUEST_TRACE: Starting request {request_id}")
-    logger.info(f"🔵 FLOW_TRACE [{request_id}]: Starting message processing for: '{question[:50] if question else 'None'}...'")
-    logger.info(f"🔍 DEBUG_TRACE [{request_id}]: Full question received: '{question}'")
-    logger.info(f"🔍 DEBUG_TRACE [{request_id}]: Question length: {len(question) if question else 0}")
-    logger.info(f"🔍 DEBUG_TRACE [{request_id}]: Original message content: '{ctx.message.content}'")
+    logger.debug(f"🆔 REQUEST_TRACE: Starting request {request_id}")
+    logger.debug(f"🔵 FLOW_TRACE [{request_id}]: Starting message processing for: '{question[:50] if question else 'None'}...'")
+    logger.debug(f"🔍 DEBUG_TRACE [{request_id}]: Full question received: '{question}'")
+    logger.debug(f"🔍 DEBUG_TRACE [{request_id}]: Question length: {len(question) if question else 0}")
+    logger.debug(f"🔍 DEBUG_TRACE [{request_id}]: Original message content: '{ctx.message.content}'")
     log_memory_usage("Request Start", request_id)
     
     if ctx.channel.name != SUBMISSION_CHANNEL:
-        logger.info(f"🔴 FLOW_TRACE [{request_id}]: Wrong channel, exiting early")
-        error_msg = await ctx.send(f"Please use this command in #{SUBMISSION_CHANNEL}")
-        await error_msg.delete(delay=5)
+        logger.debug(f"🔴 FLOW_TRACE [{request_id}]: Wrong channel, exiting early")
+        ask_requests.inc(outcome="wrong_channel")
+        await send_notice(ctx.channel, f"Please use this command in #{SUBMISSION_CHANNEL}")
         return
 
     if question is None:
-        logger.info(f"🔴 FLOW_TRACE [{request_id}]: No question provided, exiting early")
-        error_msg = await ctx.send("Please provide a question. Usage: `!ask your question here`")
-        await error_msg.delete(delay=5)
+        logger.debug(f"🔴 FLOW_TRACE [{request_id}]: No question provided, exiting early")
+        ask_requests.inc(outcome="empty")
+        await send_notice(ctx.channel, "Please provide a question. Usage: `!ask your question here`")
+        return
+
+    # LOAD SHEDDING - Turn new questions away while the event loop is overloaded
+    if loop_monitor.overloaded:
+        log_info(f"LOAD SHEDDING: Refused !ask from {ctx.author.id} (loop lag {loop_monitor.lag * 1000:.0f}ms)")
+        loop_monitor.shed_load("ask")
+        ask_requests.inc(outcome="busy")
+        submit_delete(ctx.message)
+        await send_notice(ctx.channel, "The bot is busy right now, please try asking again in a minute.", delete_after=8)
         return
 
     # DUPLICATE PREVENTION - Check if user is already being processed
     if ctx.author.id in processing_users:
-        logger.info(f"🔴 FLOW_TRACE [{request_id}]: Duplicate prevention triggered, exiting early")
+        logger.debug(f"🔴 FLOW_TRACE [{request_id}]: Duplicate prevention triggered, exiting early")
         log_info(f"DUPLICATE PREVENTION: User {ctx.author.id} already being processed, ignoring duplicate")
+        ask_requests.inc(outcome="duplicate")
         return
     
     # Add user to processing set
     processing_users.add(ctx.author.id)
-    logger.info(f"🟡 FLOW_TRACE [{request_id}]: Added user to processing set, continuing with validation")
+    outcome = "error"  # Overwritten on every normal exit; counted in finally
+    trace = tracer.begin("ask", request_id, user_id=ctx.author.id, question=question)
+    recording = flight_recorder.begin(request_id, user_id=ctx.author.id, message_id=ctx.message.id, question=question)
+    profiled = request_profiler.start_request()
+    error = None
+    logger.debug(f"🟡 FLOW_TRACE [{request_id}]: Added user to processing set, continuing with validation")
     
     try:
         # Prevent duplicate processing - check if user already has pending selection
-        if ctx.author.id in pending_selections:
+        if selection_store.has_user(ctx.author.id):
             log_info(f"DUPLICATE PREVENTION: User {ctx.author.id} already has pending selection, ignoring")
+            outcome = "pending_selection"
             return
 
         # Validate question through all checks
-        logger.info(f"🟡 FLOW_TRACE [{request_id}]: Starting question validation")
-        is_valid, error_message, error_category = validate_question(question)
+        logger.debug(f"🟡 FLOW_TRACE [{request_id}]: Starting question validation")
+        with timed_stage("validation"):
+            is_valid, error_message, error_category = validate_question(question)
+            set_attribute("result", error_category if not is_valid else "valid")
         if not is_valid:
-            logger.info(f"🔴 FLOW_TRACE [{request_id}]: Question validation failed: {error_category}")
-            try:
-                await ctx.message.delete()
-            except:
-                pass
-            error_msg = await ctx.send(error_message)
-            await error_msg.delete(delay=5)
+            logger.debug(f"🔴 FLOW_TRACE [{request_id}]: Question validation failed: {error_category}")
+            outcome = "invalid"
+            submit_delete(ctx.message)
+            await send_notice(ctx.channel, error_message)
             return
 
         # Check for player names
@@ -474,38 +547,36 @@ async def ask_question(ctx, *, question: str = None):
                 logger.info(f"🚨 EMERGENCY [{request_id}]: Emergency load failed, showing error")
         
         if not players_data:
-            logger.info(f"🔴 FLOW_TRACE [{request_id}]: No player data available, exiting")
-            error_msg = await ctx.send("Player database is not available. Please try again later.")
-            await error_msg.delete(delay=5)
-            try:
-                await ctx.message.delete()
-            except:
-                pass
+            logger.debug(f"🔴 FLOW_TRACE [{request_id}]: No player data available, exiting")
+            outcome = "no_player_data"
+            await send_notice(ctx.channel, "Player database is not available. Please try again later.")
+            submit_delete(ctx.message)
             return
         
         # 🔧 UNIFIED PLAYER DETECTION: Single call handles both intent detection and player matching
-        logger.info(f"🟡 FLOW_TRACE [{request_id}]: Starting unified player detection")
+        logger.debug(f"🟡 FLOW_TRACE [{request_id}]: Starting unified player detection")
         log_resource_usage("Before Player Detection", request_id)
         
-        matched_players = check_player_mentioned(question)
+        with timed_stage("player_detection"):
+            matched_players = check_player_mentioned(question)
+            set_attribute("result", [p['name'] for p in matched_players] if isinstance(matched_players, list) else matched_players)
         
         # Handle blocking result
         if matched_players == "BLOCKED":
-            logger.info(f"🚫 FLOW_TRACE [{request_id}]: Multi-player query blocked by unified detection")
+            logger.debug(f"🚫 FLOW_TRACE [{request_id}]: Multi-player query blocked by unified detection")
+            outcome = "blocked"
             
-            try:
-                await ctx.message.delete()
-            except:
-                pass
+            submit_delete(ctx.message)
             
-            error_msg = await ctx.send(
+            await send_notice(
+                ctx.channel,
                 f"**Single Player Policy**: Your question appears to reference multiple players. "
-                f"Please ask about one player at a time. If this seems incorrect, please contact a mod."
+                f"Please ask about one player at a time. If this seems incorrect, please contact a mod.",
+                delete_after=8
             )
-            await error_msg.delete(delay=8)
             return
         
-        logger.info(f"🟡 FLOW_TRACE [{request_id}]: Player detection completed, moving to decision logic")
+        logger.debug(f"🟡 FLOW_TRACE [{request_id}]: Player detection completed, moving to decision logic")
         log_resource_usage("After Player Detection", request_id)
         
         # Fallback check for potential player words - but respect validation
@@ -516,7 +587,8 @@ async def ask_question(ctx, *, question: str = None):
                 # 🔧 FIX: Validate potential player words before bypassing
                 from player_matching_validator import validate_player_matches
                 mock_players = [{'name': word, 'team': 'Unknown'} for word in potential_player_words]
-                validated_words = validate_player_matches(question, mock_players)
+                with timed_stage("fallback_validation"):
+                    validated_words = validate_player_matches(question, mock_players)
                 
                 if validated_words:
                     log_info(f"FALLBACK VALIDATION: Approved fallback for validated words: {[p['name'] for p in validated_words]}")
@@ -526,12 +598,12 @@ async def ask_question(ctx, *, question: str = None):
                     fallback_recent_check = False
 
         if matched_players:
-            logger.info(f"🟠 FLOW_TRACE [{request_id}]: Entering decision routing with {len(matched_players)} detected players")
+            logger.debug(f"🟠 FLOW_TRACE [{request_id}]: Entering decision routing with {len(matched_players)} detected players")
             log_resource_usage("Before Decision Routing", request_id)
             
             # Handle multiple players
             if len(matched_players) > 1:
-                logger.info(f"🟠 FLOW_TRACE [{request_id}]: Multiple players detected, analyzing last names")
+                logger.debug(f"🟠 FLOW_TRACE [{request_id}]: Multiple players detected, analyzing last names")
                 
                 # 🔧 FIXED: Proper decision logic for disambiguation vs multi-player blocking
                 
@@ -547,51 +619,62 @@ async def ask_question(ctx, *, question: str = None):
                 
                 if len(last_names) == 1:
                     # All players share same last name = ambiguous single player = DISAMBIGUATE
-                    logger.info(f"🟢 FLOW_TRACE [{request_id}]: Same last name detected → DISAMBIGUATION")
+                    logger.debug(f"🟢 FLOW_TRACE [{request_id}]: Same last name detected → DISAMBIGUATION")
                     log_info(f"DECISION LOGIC: Same last name detected → DISAMBIGUATION")
+                    outcome = "disambiguation"
                     from selection_handlers import create_player_disambiguation_prompt
-                    await create_player_disambiguation_prompt(ctx, question, matched_players)
-                    logger.info(f"✅ FLOW_TRACE [{request_id}]: Disambiguation prompt created successfully")
+                    with timed_stage("disambiguation_prompt"):
+                        await create_player_disambiguation_prompt(ctx, question, matched_players)
+                    logger.debug(f"✅ FLOW_TRACE [{request_id}]: Disambiguation prompt created successfully")
                     return
                 else:
                     # Multiple distinct last names = true multi-player question = BLOCK
-                    logger.info(f"🟢 FLOW_TRACE [{request_id}]: Multiple distinct last names → MULTI-PLAYER BLOCK")
+                    logger.debug(f"🟢 FLOW_TRACE [{request_id}]: Multiple distinct last names → MULTI-PLAYER BLOCK")
                     log_info(f"DECISION LOGIC: Multiple distinct last names → MULTI-PLAYER BLOCK")
-                    await handle_multi_player_question(ctx, question, matched_players, question_map)
-                    logger.info(f"✅ FLOW_TRACE [{request_id}]: Multi-player block executed successfully")
+                    outcome = "multi_player"
+                    with timed_stage("multi_player"):
+                        await handle_multi_player_question(ctx, question, matched_players, question_map)
+                    logger.debug(f"✅ FLOW_TRACE [{request_id}]: Multi-player block executed successfully")
                     return
             
             # Handle single player
             else:
-                logger.info(f"🟢 FLOW_TRACE [{request_id}]: Single player detected, processing")
-                await handle_single_player_question(ctx, question, matched_players, question_map)
-                logger.info(f"✅ FLOW_TRACE [{request_id}]: Single player processing completed")
+                logger.debug(f"🟢 FLOW_TRACE [{request_id}]: Single player detected, processing")
+                outcome = "single_player"
+                with timed_stage("single_player"):
+                    await handle_single_player_question(ctx, question, matched_players, question_map)
+                logger.debug(f"✅ FLOW_TRACE [{request_id}]: Single player processing completed")
                 return
             
+        elif fallback_recent_check and loop_monitor.degraded:
+            # Optional scan skipped under load; the question is posted without it
+            log_info(f"LOAD SHEDDING: Skipped fallback recent mention scan (loop lag {loop_monitor.lag * 1000:.0f}ms)")
+            loop_monitor.shed_load("fallback_scan")
+            
         elif fallback_recent_check:
             # Fallback recent mentions check
             potential_player_words = get_potential_player_words(question)
-            found_recent_mention = await check_fallback_recent_mentions(ctx.guild, potential_player_words)
+            with timed_stage("fallback_recent_mentions"):
+                found_recent_mention = await check_fallback_recent_mentions(ctx.guild, potential_player_words)
             
             if found_recent_mention:
-                try:
-                    await ctx.message.delete()
-                except:
-                    pass
-                error_msg = await ctx.send("This topic has been asked about recently, please be patient and wait for an answer.")
-                await error_msg.delete(delay=8)
+                outcome = "recent_mention"
+                submit_delete(ctx.message)
+                await send_notice(ctx.channel, "This topic has been asked about recently, please be patient and wait for an answer.", delete_after=8)
                 return
 
         # All checks passed - post question
-        logger.info(f"🟢 FLOW_TRACE [{request_id}]: All checks passed, posting approved question")
+        logger.debug(f"🟢 FLOW_TRACE [{request_id}]: All checks passed, posting approved question")
         log_resource_usage("Before Question Posting", request_id)
-        await process_approved_question(ctx.channel, ctx.author, question, ctx.message, question_map)
-        logger.info(f"✅ FLOW_TRACE [{request_id}]: Question posted successfully")
+        with timed_stage("approve_and_post"):
+            await process_approved_question(ctx.channel, ctx.author, question, ctx.message, question_map)
+        outcome = "approved"
+        logger.debug(f"✅ FLOW_TRACE [{request_id}]: Question posted successfully")
         
         # Final completion logging
         duration = time.time() - start_time
         logger.info(f"🆔 REQUEST_TRACE: Completed request {request_id} in {duration:.2f}s")
-        logger.info(f"✅ FLOW_TRACE [{request_id}]: Message processing complete")
+        logger.debug(f"✅ FLOW_TRACE [{request_id}]: Message processing complete")
         log_resource_usage("After Processing Complete", request_id)
         
     except Exception as e:
@@ -600,6 +683,8 @@ async def ask_question(ctx, *, question: str = None):
         logger.error(f"❌ FLOW_TRACE [{request_id}]: Exception occurred in message processing: {str(e)}")
         logger.error(f"🆔 REQUEST_TRACE: Failed request {request_id} after {duration:.2f}s - {str(e)}")
         log_memory_usage("Exception Occurred", request_id)
+        error = f"{type(e).__name__}: {e}"
+        trace.attributes["error"] = error
         
         # Re-raise the exception to maintain existing error handling
         raise
@@ -607,10 +692,22 @@ async def ask_question(ctx, *, question: str = None):
     finally:
         # Always remove user from processing set when done
         processing_users.discard(ctx.author.id)
-        logger.info(f"🧹 FLOW_TRACE [{request_id}]: Cleaned up processing user from set")
+        ask_requests.inc(outcome=outcome)
+        ask_duration.observe(time.time() - start_time)
+        tracer.end(trace, outcome=outcome)
+        dump_path = flight_recorder.finish(recording, error, trace)
+        if dump_path:
+            log_info(f"FLIGHT RECORDER: {outcome} request dumping to {dump_path}")
+        profile_report = request_profiler.finish_request(profiled)
+        if profile_report:
+            post_profile_report(*profile_report)
+        log_debug(lambda: f"STAGE_TIMINGS: {outcome} in {trace.duration_ms():.1f}ms - {trace.summary()}")
+        logger.debug(f"🧹 FLOW_TRACE [{request_id}]: Cleaned up processing user from set")
 
 # -------- REACTION HANDLER --------
 # -------- ENHANCED REACTION HANDLER WITH SAFEGUARDS --------
+# New prompts use a select menu (selection_handlers.PlayerSelectView); reactions
+# are still honoured as a fallback for prompts posted before the switch
 
 # Configuration option
 ALLOW_HELPER_REACTIONS = False  # Set to True if you want to allow helpers
@@ -622,38 +719,24 @@ async def on_reaction_add(reaction, user):
     
     message_id = reaction.message.id
     
-    # Find the selection data
-    selection_data = None
-    original_user_id = None
-    storage_key = None
-    
-    if message_id in pending_selections:
-        selection_data = pending_selections[message_id]
-        original_user_id = selection_data.get("user_id")
-        storage_key = message_id
-    else:
-        # Fallback: check if stored by user ID
-        for user_key, data in pending_selections.items():
-            if isinstance(user_key, int) and data.get("message") and data["message"].id == message_id:
-                selection_data = data
-                original_user_id = user_key
-                storage_key = user_key
-                break
+    # Find the selection data (indexed by prompt message id)
+    selection_data = selection_store.get(message_id)
     
     # No pending selection found
     if not selection_data:
         return
+    original_user_id = selection_data["user_id"]
     
     # 🔧 SAFEGUARD 1: Check if original user is still in server
     guild = reaction.message.guild
     original_user = None
     if guild:
         try:
-            original_user = await guild.fetch_member(original_user_id)
-        except discord.NotFound:
-            log_info(f"ORPHANED SELECTION: Original user {original_user_id} no longer in server, allowing helper reactions")
-            # Allow anyone to react if original user left
-            original_user_id = user.id
+            original_user = await member_cache.get(guild, original_user_id)
+            if original_user is None:
+                log_info(f"ORPHANED SELECTION: Original user {original_user_id} no longer in server, allowing helper reactions")
+                # Allow anyone to react if original user left
+                original_user_id = user.id
         except Exception as e:
             log_error(f"ERROR checking if user {original_user_id} is in server: {e}")
     
@@ -691,89 +774,14 @@ async def on_reaction_add(reaction, user):
             log_info(f"HELPER REACTION: User {user.id} ({user.display_name}) helping with question from user {original_user_id}")
             # Continue processing but log it as helper assistance
     
-    # Verify message and lock status
-    message_obj = selection_data.get("message")
-    if not message_obj or reaction.message.id != message_obj.id or selection_data.get("locked"):
-        return
-    
-    # Lock the selection
-    selection_data["locked"] = True
-    log_info(f"REACTION PROCESSING: User {user.id} ({user.display_name}) processing selection")
-    
-    # 🔧 SAFEGUARD 3: Enhanced timeout cancellation
-    try:
-        cancel_selection_timeout(original_user_id)
-        # Also try to cancel by message_id if that's how timeouts are stored
-        cancel_selection_timeout(message_id)
-    except Exception as e:
-        log_error(f"ERROR canceling timeout: {e}")
-    
+    # complete_selection / cleanup_invalid_selection claim the selection, so only the first reaction counts
     if str(reaction.emoji) in REACTIONS:
         selected_index = REACTIONS.index(str(reaction.emoji))
-        
-        if selected_index < len(selection_data["players"]):
-            selected_player = selection_data["players"][selected_index]
-            
-            # 🔧 SAFEGUARD 4: Enhanced analytics with helper tracking
-            selection_type = selection_data.get("type", "unknown")
-            if user.id != original_user_id:
-                selection_type += "_helper_assisted"
-            
-            await log_analytics("User Selection",
-                user_id=original_user_id,  # Always log original user
-                helper_user_id=user.id if user.id != original_user_id else None,
-                user_name=getattr(user, 'display_name', 'Unknown'),
-                channel=reaction.message.channel.name,
-                question=selection_data.get("original_question", "Unknown"),
-                selected_player=f"{selected_player['name']} ({selected_player['team']})",
-                selection_type=selection_type,
-                timeout="completed"
-            )
-            
-            # Clean up messages
-            try:
-                await selection_data["message"].delete()
-                log_info(f"CLEANUP: Deleted disambiguation message after selection")
-            except Exception as e:
-                log_error(f"CLEANUP: Error deleting disambiguation message: {e}")
-            
-            # 🔧 SAFEGUARD 5: Robust cleanup
-            # Remove from all possible storage locations
-            keys_to_remove = []
-            if message_id in pending_selections:
-                keys_to_remove.append(message_id)
-            if original_user_id in pending_selections:
-                keys_to_remove.append(original_user_id)
-            if storage_key and storage_key not in keys_to_remove:
-                keys_to_remove.append(storage_key)
-            
-            for key in keys_to_remove:
-                try:
-                    del pending_selections[key]
-                    log_info(f"CLEANUP: Removed pending selection key {key}")
-                except KeyError:
-                    pass
-            
-            # Handle different selection types
-            if selection_data.get("type") == "block_selection":
-                await handle_block_selection(reaction, user, selected_player, selection_data)
-                return
-            
-            elif selection_data.get("type") == "disambiguation_selection":
-                blocked = await handle_disambiguation_selection(reaction, user, selected_player, selection_data)
-                if blocked:
-                    log_info(f"🔧 RACE CONDITION FIX: Question blocked for {selected_player['name']}, returning early")
-                    return
-                else:
-                    log_info(f"🔧 RACE CONDITION FIX: Question processed for {selected_player['name']}, returning early") 
-                    return
-            
-            log_error(f"🚨 RACE CONDITION BUG: Unexpected fallback execution for {selected_player['name']}")
-            return
+        await complete_selection(reaction.message.channel, user, message_id, selected_index, original_user_id)
     
     # Invalid reaction - clean up
     else:
-        cleanup_invalid_selection(original_user_id, selection_data)
+        cleanup_invalid_selection(message_id)
         log_info(f"CLEANUP: Invalid reaction from user {user.id}, cleaned up selection")
 
 # 🔧 SAFEGUARD 7: Admin command to force-clear stuck selections
@@ -783,25 +791,100 @@ async def clear_stuck_selections(ctx, user_id: int = None):
     """Admin command to clear stuck disambiguation selections"""
     if user_id:
         # Clear specific user
-        removed = 0
-        keys_to_remove = []
-        for key, data in pending_selections.items():
-            if data.get("user_id") == user_id:
-                keys_to_remove.append(key)
-        
-        for key in keys_to_remove:
-            del pending_selections[key]
-            removed += 1
+        removed = 1 if selection_store.claim_user(user_id) else 0
         
         await ctx.send(f"✅ Cleared {removed} stuck selections for user {user_id}")
     else:
         # Clear all
-        count = len(pending_selections)
-        pending_selections.clear()
+        count = selection_store.clear()
         await ctx.send(f"✅ Cleared all {count} pending selections")
     
     log_info(f"ADMIN CLEAR: {ctx.author.display_name} cleared stuck selections")
 
+# -------- PROFILING COMMAND --------
+@bot.command(name="profile")
+@commands.has_permissions(administrator=True)
+async def profile_requests(ctx, count: str = "5"):
+    """Admin command: cProfile the next N !ask requests and post the top functions (`!profile off` cancels)"""
+    if count.lower() == "off":
+        profile_report = request_profiler.stop(f"cancelled by {ctx.author.display_name}")
+        if profile_report:
+            post_profile_report(*profile_report)
+        else:
+            await ctx.send("No profile is running")
+        return
+    if not count.isdigit():
+        await ctx.send("Usage: `!profile [N]` or `!profile off`")
+        return
+    
+    count = max(1, min(int(count), PROFILE_MAX_REQUESTS))
+    run = request_profiler.arm(count, ctx.channel)
+    if not run:
+        await ctx.send(f"A profile is already running ({request_profiler.remaining} requests still to go, `!profile off` to stop it)")
+        return
+    
+    asyncio.get_running_loop().call_later(request_profiler.max_seconds, expire_profile, run)
+    await ctx.send(f"✅ Profiling the next {count} questions (for at most {request_profiler.max_seconds}s)")
+    log_info(f"PROFILE: {ctx.author.display_name} armed profiling for {count} requests")
+
+def expire_profile(run):
+    """Stop a profile run that is still waiting for requests at its time limit"""
+    profile_report = request_profiler.stop("time limit reached", run)
+    if profile_report:
+        post_profile_report(*profile_report)
+
+def post_profile_report(path, summary, channel):
+    """Post a finished (or stopped) profile's summary where `!profile` was run"""
+    log_info(f"PROFILE: Stats written to {path}", details=summary)
+    if channel is None:
+        return
+    content = f"📈 **Profile complete** (`{path or 'not saved'}`)\n```{summary[:1800]}```"
+    outbound.submit("profile_report", lambda: channel.send(content), PRIORITY_NORMAL)
+
+# -------- FLIGHT RECORDER COMMAND --------
+@bot.command(name="flight")
+@commands.has_permissions(manage_messages=True)
+async def flag_request(ctx, target: str = None):
+    """Moderator command: dump a recent request's debug events (`!flight <request id | !ask message id | message link>`) or a user's next one (`!flight @user`)"""
+    if target is None:
+        await ctx.send("Usage: `!flight <request id, !ask message id or link>` or `!flight @user`")
+        return
+    
+    if ctx.message.mentions:
+        member = ctx.message.mentions[0]
+        flight_recorder.flag_user(member.id)
+        await ctx.send(f"✅ The next question from {member.display_name} will be recorded")
+        log_info(f"FLIGHT RECORDER: {ctx.author.display_name} flagged next request from {member.id}")
+        return
+    
+    dump_path = flight_recorder.flag(target)
+    if dump_path:
+        await ctx.send(f"✅ Request `{target}` will be dumped to `{dump_path}` within {flight_recorder.flush_interval}s")
+        log_info(f"FLIGHT RECORDER: {ctx.author.display_name} flagged request {target}")
+    else:
+        await ctx.send(f"Request `{target}` is no longer in memory")
+
+# -------- ADMIN MENTION WINDOW COMMAND --------
+@bot.command(name="mention_window")
+@commands.has_permissions(administrator=True)
+async def set_mention_window(ctx, hours: int = None):
+    """Admin command to view or change the recent mention window without a restart"""
+    import config
+
+    if hours is None:
+        await ctx.send(f"Recent mention window is {config.RECENT_MENTION_HOURS}h (max {config.RECENT_MENTION_RETENTION_HOURS}h)")
+        return
+
+    if not 1 <= hours <= config.RECENT_MENTION_RETENTION_HOURS:
+        await ctx.send(f"❌ Window must be between 1 and {config.RECENT_MENTION_RETENTION_HOURS} hours")
+        return
+
+    # The mention index keeps full retention, so only queries change
+    config.RECENT_MENTION_HOURS = hours
+    recent_mention_flights.invalidate()
+    await ctx.send(f"✅ Recent mention window set to {hours}h")
+    log_info(f"ADMIN MENTION WINDOW: {ctx.author.display_name} set window to {hours}h")
+
 # -------- ADMIN CORRECTION COMMAND --------
 @bot.command(name="correct")
 @commands.check_any(
@@ -818,7 +901,7 @@ async def correct_answer(ctx, message_link: str, *, correction: str):
         message_id = int(message_link.split('/')[-1])
         
         # Try to find the message in final answer channel
-        final_channel = discord.utils.get(ctx.guild.text_channels, name=FINAL_ANSWER_CHANNEL)
+        final_channel = channel_registry.get(ctx.guild, FINAL_ANSWER_CHANNEL)
         if not final_channel:
             await ctx.send("❌ Could not find final answer channel")
             return
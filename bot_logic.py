@@ -1,10 +1,14 @@
 # Updated bot_logic.py for question_map change
 
 import discord
-import asyncio
 from config import ANSWERING_CHANNEL, FINAL_ANSWER_LINK
 from logging_system import log_error, log_analytics, log_info, log_success
 from question_map_store import load_question_map, save_question_map, append_question
+from outbound_scheduler import outbound, send_notice, submit_delete, submit_confirmation, PRIORITY_HIGH, PRIORITY_NORMAL
+from deletion_service import deletion_service
+from discord_cache import channel_registry
+from instrumentation import timed_stage
+from tracing import set_attribute
 
 # -------- MULTI-PLAYER QUESTION PROCESSING --------
 
@@ -49,7 +53,9 @@ async def handle_single_player_question(ctx, question, matched_players, question
         print(f"SINGLE PLAYER: About to check recent mentions")
         
         # Single player - check recent mentions
-        recent_mentions = await check_recent_player_mentions(ctx.guild, matched_players)
+        with timed_stage("recent_mention_check"):
+            recent_mentions = await check_recent_player_mentions(ctx.guild, matched_players)
+            set_attribute("found", [mention["status"] for mention in recent_mentions or []])
         
         print(f"SINGLE PLAYER: Recent mentions result: {len(recent_mentions) if recent_mentions else 0}")
         
@@ -60,25 +66,22 @@ async def handle_single_player_question(ctx, question, matched_players, question
             
             print(f"BLOCKING: Due to recent mention - {player['name']} ({status})")
             
-            try:
-                await ctx.message.delete()
-                print("SINGLE PLAYER: Deleted original message")
-            except Exception as e:
-                print(f"SINGLE PLAYER: Failed to delete message: {e}")
+            submit_delete(ctx.message)
+            print("SINGLE PLAYER: Queued delete of original message")
             
             if status == "answered":
                 # 🔧 NEW: Use specific answer URL if available
                 answer_url = mention.get("answer_url")
                 if answer_url:
-                    error_msg = await ctx.send(f"**{player['name']}** was answered recently: {answer_url}")
+                    notice = f"**{player['name']}** was answered recently: {answer_url}"
                     print(f"SINGLE PLAYER: Used specific answer URL for {player['name']}")
                 else:
-                    error_msg = await ctx.send(f"This player has been asked about recently. There is an answer here: {FINAL_ANSWER_LINK}")
+                    notice = f"This player has been asked about recently. There is an answer here: {FINAL_ANSWER_LINK}"
                     print(f"SINGLE PLAYER: Used generic answer link for {player['name']}")
             else:
-                error_msg = await ctx.send("This player has been asked about recently, please be patient and wait for an answer.")
+                notice = "This player has been asked about recently, please be patient and wait for an answer."
             
-            await error_msg.delete(delay=8)
+            await send_notice(ctx.channel, notice, delete_after=8)
             print("SINGLE PLAYER: Sent blocking message")
             return True  # Blocked
         else:
@@ -101,13 +104,10 @@ async def process_approved_question(channel, user, question, original_message=No
     """Process a question that has passed all checks"""
     # Delete the original message if provided
     if original_message:
-        try:
-            await original_message.delete()
-            print("Deleted original user message in process_approved_question")
-        except Exception as e:
-            print(f"Failed to delete original message in process_approved_question: {e}")
+        submit_delete(original_message)
+        print("Queued delete of original user message in process_approved_question")
     
-    answering_channel = discord.utils.get(channel.guild.text_channels, name=ANSWERING_CHANNEL)
+    answering_channel = channel_registry.get(channel.guild, ANSWERING_CHANNEL)
     
     if answering_channel:
         # Format the question for the answering channel
@@ -116,7 +116,8 @@ async def process_approved_question(channel, user, question, original_message=No
         
         try:
             # Post to answering channel
-            posted_message = await answering_channel.send(formatted_message)
+            with timed_stage("discord_post"):
+                posted_message = await outbound.run("post_question", lambda: answering_channel.send(formatted_message), PRIORITY_HIGH)
             print(f"Posted question to #{ANSWERING_CHANNEL}")
             
             # Store the question mapping for later reference
@@ -137,50 +138,69 @@ async def process_approved_question(channel, user, question, original_message=No
             )
             
             # Send confirmation message
-            confirmation_msg = await channel.send(f"✅ Your question has been posted for experts to answer.")
-            await confirmation_msg.delete(delay=5)
-            print("Confirmation message sent and will be deleted in 5 seconds")
+            submit_confirmation(channel, "✅ Your question has been posted for experts to answer.", delete_after=5)
+            print("Confirmation message queued and will be deleted 5 seconds after sending")
             
         except Exception as e:
             log_error(f"Failed to post question to answering channel: {e}")
-            error_msg = await channel.send("❌ Failed to post your question. Please try again.")
-            await error_msg.delete(delay=5)
+            await send_notice(channel, "❌ Failed to post your question. Please try again.")
     else:
         log_error(f"Could not find #{ANSWERING_CHANNEL}")
-        error_msg = await channel.send(f"❌ Could not find #{ANSWERING_CHANNEL}")
-        await error_msg.delete(delay=5)
+        await send_notice(channel, f"❌ Could not find #{ANSWERING_CHANNEL}")
 
-async def schedule_answered_message_cleanup(original_message, reply_message, delay_seconds=15):
-    """Schedule deletion of answered question and expert reply after specified delay"""
+# -------- ANSWERED QUESTIONS --------
+
+NOT_ANSWERED_STATUS = "❗ **Not Answered**"
+REPLY_PROMPT = "Reply to this message to answer."
+ANSWERED_STATUS = "✅ **Answered**"
+ANSWERED_CLEANUP_SECONDS = 15  # Answered question and its replies are removed after this delay
+
+async def resolve_referenced_message(message):
+    """The message `message` replies to; the gateway usually delivered it already, so REST is the last resort"""
+    reference = message.reference
+    if isinstance(reference.resolved, discord.Message):
+        return reference.resolved
+    if reference.cached_message is not None:
+        return reference.cached_message
+    if isinstance(reference.resolved, discord.DeletedReferencedMessage):
+        return None
     try:
-        log_info(f"AUTO-DELETE: Scheduled cleanup for question {original_message.id} and reply {reply_message.id} in {delay_seconds}s")
-        
-        await asyncio.sleep(delay_seconds)
-        
-        # Delete both messages
-        deleted_count = 0
-        try:
-            await original_message.delete()
-            deleted_count += 1
-            log_info(f"AUTO-DELETE: Deleted question {original_message.id}")
-        except discord.NotFound:
-            log_info(f"AUTO-DELETE: Question {original_message.id} already deleted")
-        except Exception as e:
-            log_error(f"AUTO-DELETE: Failed to delete question {original_message.id}: {e}")
-        
-        try:
-            await reply_message.delete()  
-            deleted_count += 1
-            log_info(f"AUTO-DELETE: Deleted reply {reply_message.id}")
-        except discord.NotFound:
-            log_info(f"AUTO-DELETE: Reply {reply_message.id} already deleted")
-        except Exception as e:
-            log_error(f"AUTO-DELETE: Failed to delete reply {reply_message.id}: {e}")
-            
-        log_success(f"AUTO-DELETE: Cleanup completed - {deleted_count}/2 messages deleted")
-        
-    except Exception as e:
-        log_error(f"AUTO-DELETE: Unexpected error: {e}")
+        return await outbound.run("fetch_reference", lambda: message.channel.fetch_message(reference.message_id))
+    except discord.NotFound:
+        return None
+
+def answered_content(content):
+    """Question post content with its status switched to answered (unchanged if it already is)"""
+    if f"{NOT_ANSWERED_STATUS}\n\n{REPLY_PROMPT}" in content:
+        return content.replace(f"{NOT_ANSWERED_STATUS}\n\n{REPLY_PROMPT}", ANSWERED_STATUS)
+    if NOT_ANSWERED_STATUS in content:
+        updated = content.replace(NOT_ANSWERED_STATUS, ANSWERED_STATUS)
+        return updated.replace(f"\n{REPLY_PROMPT}", "").replace(REPLY_PROMPT, "")
+    if ANSWERED_STATUS in content:
+        return content
+    return content + f"\n\n{ANSWERED_STATUS}\n"
+
+def mark_question_answered(question_message, reply_message):
+    """Queue the status edit and the cleanup of an answered question; returns False if it was already answered"""
+    updated_content = answered_content(question_message.content)
+    if updated_content == question_message.content:
+        # Already answered: no edit, but this reply still goes (the question's own cleanup is already scheduled)
+        deletion_service.schedule(reply_message, ANSWERED_CLEANUP_SECONDS)
+        log_info(f"AUTO-DELETE: Question {question_message.id} already answered, scheduled cleanup of reply {reply_message.id}")
+        return False
+    
+    # One queued job per question: a second answer arriving meanwhile coalesces into it
+    outbound.submit("mark_answered", lambda: question_message.edit(content=updated_content),
+                    PRIORITY_NORMAL, key=("mark_answered", question_message.id))
+    schedule_answered_message_cleanup(question_message, reply_message)
+    return True
+
+def schedule_answered_message_cleanup(original_message, reply_message, delay_seconds=ANSWERED_CLEANUP_SECONDS):
+    """Schedule deletion of answered question and expert reply after specified delay"""
+    # Both land in the same bulk delete, and survive a restart via the timer journal
+    deletion_service.schedule(original_message, delay_seconds)
+    deletion_service.schedule(reply_message, delay_seconds)
+    log_info(f"AUTO-DELETE: Scheduled cleanup for question {original_message.id} and reply {reply_message.id} in {delay_seconds}s")
 
 # -------- QUESTION FALLBACK CHECK --------
 
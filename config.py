@@ -8,6 +8,38 @@ LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
 
 # -------- LOG LEVELS --------
 LOG_LEVELS = {"DEBUG": 0, "INFO": 1, "WARNING": 2, "ERROR": 3}
+WEBHOOK_QUEUE_SIZE = 500  # Embeds queued for webhooks before the drop policy kicks in
+WEBHOOK_DROP_ORDER = ["DEBUG", "INFO", "SUCCESS", "ANALYTICS", "WARNING", "ERROR"]  # Dropped first → last when the queue is full
+ANALYTICS_FLUSH_SECONDS = 300  # How often the aggregated analytics summary is posted
+ANALYTICS_SAMPLE_RATE = 0.0  # Fraction of raw analytics events also posted individually (0 = summaries only)
+
+# -------- HTTP SESSION --------
+HTTP_POOL_SIZE = 10  # Max pooled connections on the shared webhook session
+HTTP_TIMEOUT_SECONDS = 10  # Total timeout per webhook request
+HTTP_KEEPALIVE_SECONDS = 30  # How long idle webhook connections stay open
+
+# -------- METRICS --------
+METRICS_PORT = int(os.environ.get("METRICS_PORT", "0"))  # Local /metrics endpoint port (0 = disabled)
+METRICS_HOST = os.environ.get("METRICS_HOST", "127.0.0.1")  # Bind address for the /metrics endpoint
+LOOP_LAG_INTERVAL = 1.0  # Seconds between event-loop lag samples
+LOOP_LAG_DEGRADED = 0.25  # Lag (seconds) that switches off optional work (fallback scans, analytics posts)
+LOOP_LAG_OVERLOADED = 1.0  # Lag (seconds) at which new !ask requests get a "busy" reply
+LOOP_LAG_ESCALATE_SAMPLES = 3  # Consecutive samples over a threshold before switching into that load-shedding mode
+LOOP_LAG_RECOVERY_SAMPLES = 10  # Calm samples before stepping back down one load-shedding mode
+ALLOCATION_SAMPLING = os.environ.get("ALLOCATION_SAMPLING", "0") == "1"  # Log allocation counters at request checkpoints
+TRACING_ENABLED = os.environ.get("TRACING_ENABLED", "0") == "1"  # Export finished request traces to a local JSONL file
+TRACE_FLUSH_SECONDS = 5  # How often queued traces are written (off the event loop)
+TRACE_QUEUE_SIZE = 1000  # Finished traces held for the writer before the oldest are dropped
+TRACE_MAX_BYTES = 5 * 1024 * 1024  # Trace file size before it is rotated
+TRACE_BACKUPS = 3  # Rotated trace files kept (traces.jsonl.1 ... .3)
+FLIGHT_RECORDER_EVENTS = 500  # Debug events kept per request (ring buffer)
+FLIGHT_RECORDER_BUDGET_MS = 3000  # Requests slower than this are dumped
+FLIGHT_RECORDER_KEEP = 50  # Recent requests kept in memory so moderators can flag them
+FLIGHT_RECORDER_MAX_DUMPS = 100  # Dump files kept on disk (oldest removed first)
+FLIGHT_RECORDER_FLUSH_SECONDS = 2  # How often queued dumps are written (off the event loop)
+PROFILE_MAX_REQUESTS = 50  # Upper bound for `!profile N`
+PROFILE_TOP_FUNCTIONS = 12  # Functions listed in the posted profile summary
+PROFILE_MAX_SECONDS = 300  # A `!profile` run stops (with a partial report) after this long
 
 # -------- CHANNEL NAMES --------
 SUBMISSION_CHANNEL = "ask-the-experts"
@@ -19,9 +51,20 @@ FAQ_LINK = "https://discord.com/channels/849784755388940290/1374490028549603408"
 FINAL_ANSWER_LINK = "https://discord.com/channels/849784755388940290/1377375716286533823"
 
 # -------- TIMING CONFIG --------
-RECENT_MENTION_HOURS = 24
+RECENT_MENTION_HOURS = 24  # Adjustable at runtime with !mention_window (up to the retention below)
+RECENT_MENTION_RETENTION_HOURS = 72  # How much history the mention index keeps
 RECENT_MENTION_LIMIT = 250
+BACKFILL_PAGE_SIZE = 100  # Messages per history call when warming the mention index
+BACKFILL_PAGE_DELAY = 1.0  # Seconds to yield between backfill pages
+RECENT_MENTION_CACHE_SECONDS = 5  # Short-lived cache of recent mention lookups during bursts
+OUTBOUND_WORKERS = 3  # Concurrent outbound Discord operations
+OUTBOUND_LOW_BACKLOG = 20  # Queued low-priority operations before new ones are dropped
+OUTBOUND_LOW_MAX_AGE = 30  # Seconds before a queued low-priority operation is considered stale
+DELETION_TICK_SECONDS = 1.0  # How often queued message deletions are flushed in bulk
 SELECTION_TIMEOUT = 30
+SELECTION_SWEEP_SECONDS = 2  # How often expired pending selections are swept
+SELECTION_SAVE_SECONDS = 1  # Changes to pending selections are saved at most this often (off the event loop)
+MEMBER_CACHE_TTL = 300  # Seconds a REST-fetched member (or "not a member") is reused
 PRE_SELECTION_DELAY = 0.5
 
 # -------- BANNED WORD CATEGORIES --------
@@ -37,8 +80,6 @@ banned_categories = {
 }
 
 # -------- GLOBAL DATA STRUCTURES --------
-pending_selections = {}  # user_id: {"message": Message, "players": [...], "original_question": str, "locked": bool}
-timeout_tasks = {}  # user_id: asyncio.Task (for proper cleanup)
 players_data = []  # Will hold the MLB API data
 player_nicknames = {}  # Global variable to store loaded nicknames
 
@@ -0,0 +1,132 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+import discord
+from config import DELETION_TICK_SECONDS
+from logging_system import log_error, log_info
+from outbound_scheduler import outbound, PRIORITY_LOW
+from timer_scheduler import timers
+
+# -------- BULK DELETION OF EPHEMERAL MESSAGES --------
+
+BULK_DELETE_MAX = 100  # Discord's per-call limit for bulk deletes
+BULK_DELETE_MAX_AGE = timedelta(days=14) - timedelta(minutes=5)  # Bulk delete rejects messages older than 14 days
+
+def is_bulk_deletable(message_id, now=None):
+    now = now or datetime.now(timezone.utc)
+    return now - discord.utils.snowflake_time(message_id) < BULK_DELETE_MAX_AGE
+
+class DeletionService:
+    """
+    Collects messages to delete per channel and removes them on a short tick.
+
+    Everything due in a channel goes out as one `channel.delete_messages` call
+    (chunks of 100), so cleanup costs one REST call per channel per tick.
+    Messages too old for bulk delete fall back to single deletes.
+
+    Delayed deletes wait in the persistent timer scheduler, so notices that
+    were due to disappear are still cleaned up after a restart.
+    """
+    def __init__(self, tick=DELETION_TICK_SECONDS, scheduler=timers):
+        self.tick = tick
+        self.scheduler = scheduler
+        self.pending = {}   # channel_id: {message_id, ...} due now
+        self.channels = {}  # channel_id: channel
+        self.resolve_channel = None  # channel_id -> channel, for deletes restored after a restart
+        self.task = None
+        self.stats = {"scheduled": 0, "deleted": 0, "bulk_calls": 0, "single_calls": 0, "failed": 0}
+
+    def __len__(self):
+        return sum(len(messages) for messages in self.pending.values())
+
+    def schedule(self, message, delay=0):
+        """Delete `message` on the first tick at least `delay` seconds from now"""
+        channel = message.channel
+        self.channels[channel.id] = channel
+        self.stats["scheduled"] += 1
+        if delay > 0:
+            self.scheduler.schedule("delete_message", delay, {"channel_id": channel.id, "message_id": message.id},
+                                    key=f"delete:{message.id}")
+        else:
+            self._enqueue(channel, message.id)
+
+    def _enqueue(self, channel, message_id):
+        self.channels[channel.id] = channel
+        self.pending.setdefault(channel.id, set()).add(message_id)
+        self._ensure_running()
+
+    async def handle_timer(self, payload, context=None):
+        """Timer handler: a delayed delete is due, add it to the next bulk delete"""
+        channel_id = payload["channel_id"]
+        channel = self.channels.get(channel_id)
+        if channel is None and self.resolve_channel:
+            channel = self.resolve_channel(channel_id)
+        if channel is None:
+            log_info(f"DELETION: Channel {channel_id} unavailable, skipping delete of {payload['message_id']}")
+            return
+        self._enqueue(channel, payload["message_id"])
+
+    def cancel(self, message_id):
+        if self.scheduler.cancel(f"delete:{message_id}"):
+            return True
+        for channel_id, messages in list(self.pending.items()):
+            if message_id in messages:
+                messages.discard(message_id)
+                if not messages:
+                    del self.pending[channel_id]
+                return True
+        return False
+
+    def _ensure_running(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while self.pending:
+            await asyncio.sleep(self.tick)
+            try:
+                await self.flush()
+            except Exception as e:
+                log_error(f"DELETION: Tick failed: {e}")
+
+    async def flush(self):
+        """Delete everything that is due; returns the number of messages removed"""
+        deleted = 0
+        for channel_id in list(self.pending):
+            due = sorted(self.pending.pop(channel_id))
+            deleted += await self._delete(self.channels[channel_id], due)
+        return deleted
+
+    async def _delete(self, channel, message_ids):
+        wall_now = datetime.now(timezone.utc)
+        bulk = [discord.Object(id=message_id) for message_id in message_ids if is_bulk_deletable(message_id, wall_now)]
+        single = [message_id for message_id in message_ids if not is_bulk_deletable(message_id, wall_now)]
+
+        deleted = 0
+        for start in range(0, len(bulk), BULK_DELETE_MAX):
+            chunk = bulk[start:start + BULK_DELETE_MAX]
+            try:
+                await outbound.run("bulk_delete", lambda chunk=chunk: channel.delete_messages(chunk), PRIORITY_LOW)
+                self.stats["bulk_calls"] += 1
+                deleted += len(chunk)
+            except discord.HTTPException as e:
+                # One bad id (e.g. already deleted) fails the whole chunk; retry those one by one
+                log_info(f"DELETION: Bulk delete in #{channel.name} failed ({e}), falling back to single deletes")
+                single.extend(message.id for message in chunk)
+
+        for message_id in single:
+            try:
+                await outbound.run("delete_message", lambda message_id=message_id: channel.get_partial_message(message_id).delete(), PRIORITY_LOW)
+                self.stats["single_calls"] += 1
+                deleted += 1
+            except discord.NotFound:
+                pass
+            except Exception as e:
+                self.stats["failed"] += 1
+                log_error(f"DELETION: Failed to delete {message_id} in #{channel.name}: {e}")
+
+        self.stats["deleted"] += deleted
+        return deleted
+
+# Global deletion service instance
+deletion_service = DeletionService()
+timers.register("delete_message", deletion_service.handle_timer)
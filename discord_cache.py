@@ -0,0 +1,97 @@
+import time
+import discord
+from config import MEMBER_CACHE_TTL
+
+# -------- CHANNEL REGISTRY --------
+
+class ChannelRegistry:
+    """
+    Text channel ids by (guild id, channel name).
+
+    Filled with one scan per guild at on_ready and rescanned when channels are
+    created, renamed or deleted, so a lookup by name is a dict hit plus
+    guild.get_channel() instead of a linear scan of guild.text_channels.
+    Names that are still missing after a rescan are remembered until the next
+    channel event, so looking up a channel that does not exist stays O(1).
+    """
+    def __init__(self):
+        self.ids = {}          # (guild_id, channel name): channel_id
+        self.missing = set()   # (guild_id, channel name) not found by the last rescan
+        self.stats = {"hits": 0, "misses": 0, "refreshes": 0}
+
+    def refresh(self, guild):
+        """Re-index every text channel of a guild"""
+        for key in [key for key in self.ids if key[0] == guild.id]:
+            del self.ids[key]
+        self.missing = {key for key in self.missing if key[0] != guild.id}
+        for channel in guild.text_channels:
+            self.ids.setdefault((guild.id, channel.name), channel.id)  # First match wins, like discord.utils.get
+        self.stats["refreshes"] += 1
+
+    def get(self, guild, name):
+        """The guild's text channel called `name`, or None"""
+        key = (guild.id, name)
+        channel_id = self.ids.get(key)
+        if channel_id is not None:
+            channel = guild.get_channel(channel_id)
+            if channel is not None and channel.name == name:
+                self.stats["hits"] += 1
+                return channel
+        elif key in self.missing:
+            self.stats["misses"] += 1
+            return None
+
+        # Unknown or stale entry (e.g. a missed update event): rescan this guild once
+        self.refresh(guild)
+        channel_id = self.ids.get(key)
+        if channel_id is None:
+            self.missing.add(key)
+            return None
+        return guild.get_channel(channel_id)
+
+# Global channel registry instance
+channel_registry = ChannelRegistry()
+
+# -------- MEMBER CACHE --------
+
+MEMBER_CACHE_MAX = 1000  # Entries kept before expired ones are pruned
+
+class MemberCache:
+    """
+    Guild members for checks like "is the asker still in the server".
+
+    The gateway member cache is used first; otherwise a short-lived local cache
+    (including "not a member" answers) so REST fetch_member only runs on a miss.
+    """
+    def __init__(self, ttl=MEMBER_CACHE_TTL, clock=time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self.members = {}  # (guild_id, user_id): (member or None, expires_at)
+        self.stats = {"gateway_hits": 0, "hits": 0, "fetches": 0}
+
+    async def get(self, guild, user_id):
+        """The member, or None if the user is not in the guild; other REST errors propagate"""
+        member = guild.get_member(user_id)
+        if member is not None:
+            self.stats["gateway_hits"] += 1
+            return member
+
+        key = (guild.id, user_id)
+        now = self.clock()
+        cached = self.members.get(key)
+        if cached is not None and cached[1] > now:
+            self.stats["hits"] += 1
+            return cached[0]
+
+        self.stats["fetches"] += 1
+        try:
+            member = await guild.fetch_member(user_id)
+        except discord.NotFound:
+            member = None
+        self.members[key] = (member, now + self.ttl)
+        if len(self.members) > MEMBER_CACHE_MAX:
+            self.members = {key: entry for key, entry in self.members.items() if entry[1] > now}
+        return member
+
+# Global member cache instance
+member_cache = MemberCache()
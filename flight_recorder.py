@@ -0,0 +1,186 @@
+import asyncio
+import contextvars
+import json
+import os
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from config import FLIGHT_RECORDER_EVENTS, FLIGHT_RECORDER_BUDGET_MS, FLIGHT_RECORDER_KEEP, FLIGHT_RECORDER_MAX_DUMPS, FLIGHT_RECORDER_FLUSH_SECONDS
+
+# -------- FLIGHT RECORDER --------
+
+DUMP_DIR = "/persistence/flight_recorder"
+
+# The recording of the request being served by the current task
+_current_recording = contextvars.ContextVar("current_recording", default=None)
+
+class Recording:
+    """Fixed-size ring buffer of one request's debug events (oldest dropped first)"""
+    __slots__ = ("request_id", "attributes", "events", "recorded", "start_ns", "started_at", "token")
+
+    def __init__(self, request_id, attributes, capacity):
+        self.request_id = request_id
+        self.attributes = attributes
+        self.events = deque(maxlen=capacity)  # (ns since start, event, fields)
+        self.recorded = 0
+        self.start_ns = time.perf_counter_ns()
+        self.started_at = datetime.utcnow()
+        self.token = None
+
+    def to_record(self, reason, duration_ms, error=None, trace=None):
+        return {
+            "request_id": self.request_id,
+            "reason": reason,
+            "start": self.started_at.isoformat(),
+            "duration_ms": round(duration_ms, 3),
+            "error": error,
+            "attributes": self.attributes,
+            "dropped_events": self.recorded - len(self.events),
+            "events": [{"at_ms": round(offset / 1e6, 3), "event": event, **fields} for offset, event, fields in self.events],
+            "trace": trace.to_record() if trace is not None else None
+        }
+
+def flight_record(event, **fields):
+    """
+    Note a debug event (candidate, score, threshold, verdict) for the current
+    request. Kept in memory only; written out if the request turns out bad.
+    Outside a request this is a single contextvar read.
+    """
+    recording = _current_recording.get()
+    if recording is not None:
+        recording.events.append((time.perf_counter_ns() - recording.start_ns, event, fields))
+        recording.recorded += 1
+
+class FlightRecorder:
+    """
+    Per-request debug detail without debug logging.
+
+    Every !ask gets a ring buffer of events; it is dumped to DUMP_DIR only if
+    the request errors, runs past the latency budget, or a moderator flags it
+    (by request id - shown in webhook log footers - or by the !ask message id
+    or link, while it is among the last FLIGHT_RECORDER_KEEP requests; or
+    ahead of time for a user's next request).
+
+    Dumps are only queued on the request path - slow requests are most common
+    when the loop is already lagging - and a background task serializes and
+    writes them in an executor thread, like the trace exporter.
+    """
+    def __init__(self, capacity=FLIGHT_RECORDER_EVENTS, budget_ms=FLIGHT_RECORDER_BUDGET_MS,
+                 keep=FLIGHT_RECORDER_KEEP, max_dumps=FLIGHT_RECORDER_MAX_DUMPS, dump_dir=DUMP_DIR,
+                 flush_interval=FLIGHT_RECORDER_FLUSH_SECONDS):
+        self.capacity = capacity
+        self.budget_ms = budget_ms
+        self.keep = keep
+        self.max_dumps = max_dumps
+        self.dump_dir = dump_dir
+        self.flush_interval = flush_interval
+        self.pending = deque(maxlen=max_dumps)  # (path, recording, reason, duration_ms, error, trace) awaiting the writer
+        self.task = None
+        self.recent = OrderedDict()   # request_id: (Recording, duration_ms, error, trace)
+        self.by_message = {}          # !ask message id: request_id, for the requests in `recent`
+        self.flagged_users = set()    # user ids whose next request is dumped
+        self.stats = {"recordings": 0, "queued": 0, "dumps": 0, "failed": 0}
+
+    def begin(self, request_id, **attributes):
+        """Start recording for this task; pair with finish() in a finally"""
+        recording = Recording(request_id, attributes, self.capacity)
+        recording.token = _current_recording.set(recording)
+        self.stats["recordings"] += 1
+        return recording
+
+    def finish(self, recording, error=None, trace=None):
+        """Stop recording; dump if the request errored, was slow or its user was flagged. Returns the dump path or None"""
+        duration_ms = (time.perf_counter_ns() - recording.start_ns) / 1e6
+        try:
+            _current_recording.reset(recording.token)
+        except ValueError:
+            _current_recording.set(None)
+
+        self.recent[recording.request_id] = (recording, duration_ms, error, trace)
+        message_id = recording.attributes.get("message_id")
+        if message_id is not None:
+            self.by_message[message_id] = recording.request_id
+        while len(self.recent) > self.keep:
+            _, (evicted, _, _, _) = self.recent.popitem(last=False)
+            self.by_message.pop(evicted.attributes.get("message_id"), None)
+
+        if error is not None:
+            reason = "error"
+        elif duration_ms > self.budget_ms:
+            reason = "slow"
+        elif recording.attributes.get("user_id") in self.flagged_users:
+            self.flagged_users.discard(recording.attributes.get("user_id"))
+            reason = "flagged"
+        else:
+            return None
+        return self.dump(recording, reason, duration_ms, error, trace)
+
+    def resolve(self, target):
+        """Request id from a request id, the !ask message id, or a link to that message"""
+        target = target.strip("<>").rstrip("/").rsplit("/", 1)[-1]
+        if target in self.recent:
+            return target
+        if target.isdigit():
+            return self.by_message.get(int(target))
+        return None
+
+    def flag(self, target):
+        """Dump a recent request on a moderator's request; None if it is no longer kept"""
+        entry = self.recent.get(self.resolve(target))
+        if entry is None:
+            return None
+        recording, duration_ms, error, trace = entry
+        return self.dump(recording, "flagged", duration_ms, error, trace)
+
+    def flag_user(self, user_id):
+        """Dump this user's next request"""
+        self.flagged_users.add(user_id)
+
+    def dump(self, recording, reason, duration_ms, error=None, trace=None):
+        """Queue a dump for the background writer; returns the path it will be written to"""
+        path = os.path.join(self.dump_dir, f"{recording.started_at:%Y%m%dT%H%M%S}_{recording.request_id}_{reason}.json")
+        self.pending.append((path, recording, reason, duration_ms, error, trace))
+        self.stats["queued"] += 1
+        return path
+
+    def start(self):
+        """Start the background dump writer (once per event loop)"""
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self):
+        """Write every queued dump in an executor thread; returns the number written"""
+        if not self.pending:
+            return 0
+        batch = list(self.pending)
+        self.pending.clear()
+        return await asyncio.get_running_loop().run_in_executor(None, self.write, batch)
+
+    def write(self, batch):
+        """Serialize and write queued dumps, then prune old ones (blocking; runs in the executor)"""
+        written = 0
+        try:
+            os.makedirs(self.dump_dir, exist_ok=True)
+            for path, recording, reason, duration_ms, error, trace in batch:
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(recording.to_record(reason, duration_ms, error, trace), f, indent=1, default=str)
+                written += 1
+            self._prune()
+        except OSError as e:
+            self.stats["failed"] += len(batch) - written
+            print(f"⚠️ Flight recorder dump failed: {e}")
+        self.stats["dumps"] += written
+        return written
+
+    def _prune(self):
+        dumps = sorted(name for name in os.listdir(self.dump_dir) if name.endswith(".json"))
+        for name in dumps[:-self.max_dumps]:
+            os.remove(os.path.join(self.dump_dir, name))
+
+# Global flight recorder instance
+flight_recorder = FlightRecorder()
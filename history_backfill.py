@@ -0,0 +1,100 @@
+import asyncio
+import discord
+from datetime import datetime, timedelta, timezone
+from config import ANSWERING_CHANNEL, FINAL_ANSWER_CHANNEL, RECENT_MENTION_RETENTION_HOURS, BACKFILL_PAGE_SIZE, BACKFILL_PAGE_DELAY
+from logging_system import log_error, log_info, log_success
+from mention_index import recent_message_index, IndexedMessage, INDEX_WARMING, INDEX_READY
+from discord_cache import channel_registry
+
+# -------- BACKGROUND HISTORY BACKFILL --------
+
+backfill_tasks = {}  # guild_id: asyncio.Task
+backfill_checkpoints = {}  # channel_id: id of the oldest message paged so far (next `before=`)
+
+async def backfill_channel(guild, channel, throttle=None, stop_at=None):
+    """
+    Page a channel newest-first with explicit `before=` checkpoints, indexing bot messages.
+    Stops at the retention cutoff, or at `stop_at` (POSIX seconds) for incremental catch-up.
+    Returns the number of pages fetched.
+    """
+    cutoff = (datetime.now(timezone.utc) - timedelta(hours=RECENT_MENTION_RETENTION_HOURS)).timestamp()
+    if stop_at is not None:
+        cutoff = max(cutoff, stop_at)
+
+    before = None
+    pages = 0
+    indexed = 0
+    while True:
+        if throttle:
+            await throttle("history_backfill")
+
+        page = [message async for message in channel.history(limit=BACKFILL_PAGE_SIZE, before=before)]
+        pages += 1
+        if not page:
+            break
+
+        reached_cutoff = False
+        for message in page:
+            if message.created_at.timestamp() < cutoff:
+                reached_cutoff = True
+                break
+            if message.author == guild.me:
+                recent_message_index.add_entry(IndexedMessage.from_message(message))
+                indexed += 1
+
+        # Checkpoint: the next page starts just before the oldest message we saw
+        before = discord.Object(id=page[-1].id)
+        backfill_checkpoints[channel.id] = page[-1].id
+
+        if reached_cutoff or len(page) < BACKFILL_PAGE_SIZE:
+            break
+
+        # Yield between pages so live requests are never starved
+        await asyncio.sleep(BACKFILL_PAGE_DELAY)
+
+    log_info(f"BACKFILL: #{channel.name} indexed {indexed} bot messages in {pages} pages")
+    return pages
+
+async def backfill_recent_message_index(guild, throttle=None, incremental=False):
+    """
+    Warm the recent message index for a guild; recent-mention checks use direct scans until it is ready.
+    An incremental pass only tops up an index a full pass has completed; otherwise it runs as a full pass.
+    """
+    if incremental and not recent_message_index.is_ready:
+        # High-water marks from a failed pass or live posts do not mean the history behind them is indexed
+        incremental = False
+
+    channels = [channel_registry.get(guild, name) for name in (ANSWERING_CHANNEL, FINAL_ANSWER_CHANNEL)]
+    channels = [channel for channel in channels if channel]
+
+    if not incremental:
+        recent_message_index.state = INDEX_WARMING
+    log_info(f"BACKFILL: Starting {'incremental' if incremental else 'full'} backfill for {guild.name}")
+
+    try:
+        total_pages = 0
+        for channel in channels:
+            stop_at = recent_message_index.newest_seen.get(channel.id) if incremental else None
+            total_pages += await backfill_channel(guild, channel, throttle=throttle, stop_at=stop_at)
+
+        recent_message_index.expire()
+        recent_message_index.state = INDEX_READY
+        log_success(f"BACKFILL: Mention index ready with {len(recent_message_index)} messages ({total_pages} history pages)")
+    except asyncio.CancelledError:
+        log_info("BACKFILL: Cancelled")
+        raise
+    except Exception as e:
+        # Leave the index warming so checks keep using bounded direct scans
+        log_error(f"BACKFILL: Failed for {guild.name}: {e}")
+
+def start_backfill(guild, throttle=None, incremental=False):
+    """Start (or restart) the backfill task for a guild"""
+    existing = backfill_tasks.get(guild.id)
+    if existing and not existing.done():
+        if incremental:
+            return existing  # A full backfill already covers the gap
+        existing.cancel()
+
+    task = asyncio.create_task(backfill_recent_message_index(guild, throttle=throttle, incremental=incremental))
+    backfill_tasks[guild.id] = task
+    return task
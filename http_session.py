@@ -0,0 +1,41 @@
+import asyncio
+import aiohttp
+from config import HTTP_POOL_SIZE, HTTP_TIMEOUT_SECONDS, HTTP_KEEPALIVE_SECONDS
+
+# -------- SHARED HTTP SESSION --------
+
+class SharedHTTPSession:
+    """
+    One aiohttp session per process for webhook calls.
+
+    Connections are pooled (bounded by HTTP_POOL_SIZE) and kept alive between
+    calls, so a log batch or analytics event reuses an open TLS connection
+    instead of paying DNS, TCP and TLS setup every time. Closed on bot shutdown.
+    """
+    def __init__(self, pool_size=HTTP_POOL_SIZE, timeout=HTTP_TIMEOUT_SECONDS, keepalive=HTTP_KEEPALIVE_SECONDS):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.keepalive = keepalive
+        self.session = None
+        self.loop = None
+
+    def get(self):
+        """The shared session, created on first use in the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self.session is None or self.session.closed or self.loop is not loop:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=self.keepalive, ttl_dns_cache=300)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout, connect=self.timeout / 2)
+            )
+            self.loop = loop
+        return self.session
+
+    async def close(self):
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        self.loop = None
+
+# Global shared session instance
+http_session = SharedHTTPSession()
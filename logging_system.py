@@ -1,65 +1,39 @@
-import asyncio
-import aiohttp
 from datetime import datetime
 from config import WEBHOOK_LOGS_URL, WEBHOOK_ANALYTICS_URL, LOG_LEVEL, LOG_LEVELS
+from webhook_dispatcher import webhook_dispatcher
+from analytics import analytics
+from instrumentation import allocation_sampler
+from tracing import current_request_id
 
-log_batch = []
-batch_lock = asyncio.Lock()
-BATCH_INTERVAL = 10  # seconds
-MAX_BATCH_SIZE = 5   # send immediately if this many logs are queued
-
-async def batch_sender():
-    while True:
-        await asyncio.sleep(BATCH_INTERVAL)
-        await send_batch()
-
-async def send_batch():
-    async with batch_lock:
-        if not log_batch:
-            return
-        # Combine all embeds into one payload (or send multiple if needed)
-        payload = {"embeds": log_batch[:10]}  # Discord allows up to 10 embeds per message
-        await send_webhook(WEBHOOK_LOGS_URL, payload)
-        del log_batch[:10]  # Remove sent logs
+# Webhook delivery (queueing, packing, 429 handling, drop policy) lives in webhook_dispatcher
 
 def start_batching():
-    asyncio.create_task(batch_sender())
+    """Start the webhook sender and analytics summary (once per event loop; on_ready can run again after reconnects)"""
+    webhook_dispatcher.start()
+    analytics.start()
 
-async def log_to_discord_batched(level, title, message, details=None, fields=None, color=None):
+def _log_embed(level, title, message, details, timestamp, request_id=None):
     embed = {
         "title": f"{level} - {title}",
         "description": f"```{message}```" if len(message) <= 2000 else f"```{message[:1900]}...\n[TRUNCATED]```",
-        "color": color or 0x0099ff,
-        "timestamp": datetime.utcnow().isoformat(),
-        "footer": {"text": f"Level: {level}"}
+        "color": LOG_COLORS.get(level, 0x0099ff),
+        "timestamp": timestamp.isoformat(),
+        "footer": {"text": f"Level: {level} | Request: {request_id}" if request_id else f"Level: {level}"}
     }
     if details:
         embed["fields"] = [{"name": "Details", "value": f"```{details[:1000]}```", "inline": False}]
-    if fields:
-        embed.setdefault("fields", []).extend(fields)
-    async with batch_lock:
-        log_batch.append(embed)
-        if len(log_batch) >= MAX_BATCH_SIZE:
-            await send_batch()
+    return embed
 
 # -------- ENHANCED WEBHOOK LOGGING SYSTEM --------
 
-async def send_webhook(webhook_url, payload):
-    """Send payload to Discord webhook with error handling"""
-    if not webhook_url:
-        return False
-    
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(webhook_url, json=payload) as response:
-                if response.status == 204:
-                    return True
-                else:
-                    print(f"❌ Webhook failed: {response.status}")
-                    return False
-    except Exception as e:
-        print(f"❌ Webhook error: {e}")
-        return False
+LOG_COLORS = {
+    "DEBUG": 0x808080,    # Gray
+    "INFO": 0x0099ff,     # Blue  
+    "WARNING": 0xff9900,  # Orange
+    "ERROR": 0xff0000,    # Red
+    "SUCCESS": 0x00ff00,  # Green
+    "ANALYTICS": 0x9932cc # Purple
+}
 
 async def log_to_discord(level, title, message, details=None, fields=None, color=None):
     """Enhanced Discord webhook logging with rich embeds"""
@@ -72,19 +46,10 @@ async def log_to_discord(level, title, message, details=None, fields=None, color
     if msg_level < current_level:
         return
     
-    colors = {
-        "DEBUG": 0x808080,    # Gray
-        "INFO": 0x0099ff,     # Blue  
-        "WARNING": 0xff9900,  # Orange
-        "ERROR": 0xff0000,    # Red
-        "SUCCESS": 0x00ff00,  # Green
-        "ANALYTICS": 0x9932cc # Purple
-    }
-    
     embed = {
         "title": f"{level} - {title}",
         "description": f"```{message}```" if len(message) <= 2000 else f"```{message[:1900]}...\n[TRUNCATED]```",
-        "color": color or colors.get(level, 0x0099ff),
+        "color": color or LOG_COLORS.get(level, 0x0099ff),
         "timestamp": datetime.utcnow().isoformat(),
         "footer": {"text": f"Level: {level}"}
     }
@@ -95,15 +60,21 @@ async def log_to_discord(level, title, message, details=None, fields=None, color
     if fields:
         embed.setdefault("fields", []).extend(fields)
     
-    payload = {"embeds": [embed]}
-    await send_webhook(WEBHOOK_LOGS_URL, payload)
+    webhook_dispatcher.enqueue(WEBHOOK_LOGS_URL, level, embed)
 
-async def log_analytics(event_type, **kwargs):
-    """Log detailed analytics events to Discord webhook"""
+def record_analytics(event_type, **kwargs):
+    """Count an analytics event; only sampled (or immediate) events are posted on their own"""
+    analytics.record(event_type, kwargs)
     webhook_url = WEBHOOK_ANALYTICS_URL or WEBHOOK_LOGS_URL
-    if not webhook_url:
-        return
-    
+    if webhook_url and analytics.should_post(event_type):
+        webhook_dispatcher.enqueue(webhook_url, "ANALYTICS", lambda: analytics_embed(event_type, **kwargs))
+
+async def log_analytics(event_type, **kwargs):
+    """Log an analytics event (aggregated into the periodic summary)"""
+    record_analytics(event_type, **kwargs)
+
+def analytics_embed(event_type, **kwargs):
+    """Embed for a single raw analytics event"""
     embed = {
         "title": f"ANALYTICS - {event_type}",
         "color": 0x9932cc,
@@ -189,8 +160,7 @@ async def log_analytics(event_type, **kwargs):
             "inline": True
         })
     
-    payload = {"embeds": [embed]}
-    await send_webhook(webhook_url, payload)
+    return embed
 
 # -------- SIMPLIFIED LOGGING FUNCTIONS --------
 
@@ -208,45 +178,55 @@ logging.basicConfig(
 
 # Get logger for this module
 render_logger = logging.getLogger('discord_bot')
+render_logger.setLevel(getattr(logging, str(LOG_LEVEL).upper(), logging.INFO))
+
+# Resolved once: the level check is the only work a filtered-out log call does
+_level_threshold = LOG_LEVELS.get(LOG_LEVEL, 1)
 
-def _safe_discord_log(level, title, message, details=None):
-    """Safely attempt to log to Discord without warnings"""
-    try:
-        # Check if we have a running event loop
-        loop = asyncio.get_running_loop()
-        if loop and not loop.is_closed():
-            asyncio.create_task(log_to_discord_batched(level, title, message, details))
-    except RuntimeError:
-        # No event loop running - this is fine for testing
-        pass
-    except Exception:
-        # Any other error - silently ignore to avoid spam
-        pass
+def log_enabled(level):
+    """True if `level` passes LOG_LEVEL (SUCCESS counts as INFO); use it to guard expensive log-only work"""
+    return LOG_LEVELS.get(level, 1) >= _level_threshold
+
+def _log(level, title, python_level, message, details, prefix=""):
+    if not log_enabled(level):
+        return
+    # Messages and details may be zero-argument callables, formatted only once the level passed
+    if callable(message):
+        message = message()
+    if callable(details):
+        details = details()
+    # Lines logged while serving a request carry its id, whichever module logs them
+    request_id = current_request_id()
+    if request_id:
+        prefix = f"{prefix}[{request_id}] "
+    render_logger.log(python_level, f"{prefix}{message}")
+    if WEBHOOK_LOGS_URL:
+        _buffer_for_webhook(level, title, message, details, request_id)
+
+def _buffer_for_webhook(level, title, message, details, request_id=None):
+    """Hand a log line to the webhook dispatcher: a queue append, the embed is built when it is sent"""
+    timestamp = datetime.utcnow()
+    webhook_dispatcher.enqueue(WEBHOOK_LOGS_URL, level, lambda: _log_embed(level, title, message, details, timestamp, request_id))
 
 def log_debug(message, details=None):
     """Log debug message"""
-    render_logger.debug(message)
-    _safe_discord_log("DEBUG", "Debug", message, details)
+    _log("DEBUG", "Debug", logging.DEBUG, message, details)
 
 def log_info(message, details=None):
     """Log info message"""
-    render_logger.info(message)
-    _safe_discord_log("INFO", "Info", message, details)
+    _log("INFO", "Info", logging.INFO, message, details)
 
 def log_warning(message, details=None):
     """Log warning message"""
-    render_logger.warning(message)
-    _safe_discord_log("WARNING", "Warning", message, details)
+    _log("WARNING", "Warning", logging.WARNING, message, details)
 
 def log_error(message, details=None):
     """Log error message"""
-    render_logger.error(message)
-    _safe_discord_log("ERROR", "Error", message, details)
+    _log("ERROR", "Error", logging.ERROR, message, details)
 
 def log_success(message, details=None):
     """Log success message"""
-    render_logger.info(f"SUCCESS: {message}")
-    _safe_discord_log("SUCCESS", "Success", message, details)
+    _log("SUCCESS", "Success", logging.INFO, message, details, prefix="SUCCESS: ")
 
 def log_memory_usage(stage, request_id=None):
     """Log memory usage checkpoint for debugging purposes"""
@@ -259,26 +239,13 @@ def log_memory_usage(stage, request_id=None):
     log_debug(message)
 
 def log_resource_usage(stage, request_id=None):
-    """Log resource usage checkpoint using built-in modules for debugging purposes"""
-    try:
-        import gc
-        import sys
-        
-        # Get object count as a proxy for memory usage
-        obj_count = len(gc.get_objects())
-        # Get reference count for tracking potential memory leaks
-        ref_count = sys.gettotalrefcount() if hasattr(sys, 'gettotalrefcount') else 'N/A'
-        
-        if request_id:
-            message = f"📊 RESOURCE_TRACE [{request_id}]: {stage} - Objects: {obj_count}, Refs: {ref_count}"
-        else:
-            message = f"📊 RESOURCE_TRACE: {stage} - Objects: {obj_count}, Refs: {ref_count}"
-        
-        log_info(message)
-    except Exception as e:
-        if request_id:
-            message = f"📊 RESOURCE_TRACE [{request_id}]: {stage} - Could not get resource usage: {e}"
-        else:
-            message = f"📊 RESOURCE_TRACE: {stage} - Could not get resource usage: {e}"
-        
-        log_debug(message)
+    """Log allocation counters at a checkpoint (no-op unless ALLOCATION_SAMPLING)"""
+    sample = allocation_sampler.sample()
+    if sample is None:
+        return
+    
+    counters = f"Blocks: {sample['blocks']} ({sample['delta']:+d}), GC counts: {sample['gc_counts']}"
+    if request_id:
+        log_debug(f"📊 RESOURCE_TRACE [{request_id}]: {stage} - {counters}")
+    else:
+        log_debug(f"📊 RESOURCE_TRACE: {stage} - {counters}")
@@ -0,0 +1,105 @@
+import asyncio
+import time
+from collections import Counter, deque
+from config import LOOP_LAG_INTERVAL, LOOP_LAG_DEGRADED, LOOP_LAG_OVERLOADED, LOOP_LAG_ESCALATE_SAMPLES, LOOP_LAG_RECOVERY_SAMPLES
+
+# -------- EVENT LOOP LAG MONITOR --------
+
+MODE_NORMAL = 0
+MODE_DEGRADED = 1     # Optional work is skipped: fallback recent-mention scans, analytics posts
+MODE_OVERLOADED = 2   # New !ask requests are also turned away with a "busy" notice
+MODE_NAMES = ("normal", "degraded", "overloaded")
+
+class LoopMonitor:
+    """
+    Measures event-loop lag: how late a `sleep(interval)` wakes up.
+
+    Lag means something is blocking the loop (or it is saturated), which
+    delays gateway heartbeats and every user's command. After
+    `escalate_samples` consecutive samples above a threshold the monitor
+    switches into that load-shedding mode, so a single GC pause or slow
+    callback does not turn users away; it steps back down one mode at a time
+    after `recovery_samples` calm samples.
+    """
+    def __init__(self, interval=LOOP_LAG_INTERVAL, window=60, clock=time.perf_counter,
+                 degraded_lag=LOOP_LAG_DEGRADED, overloaded_lag=LOOP_LAG_OVERLOADED,
+                 escalate_samples=LOOP_LAG_ESCALATE_SAMPLES, recovery_samples=LOOP_LAG_RECOVERY_SAMPLES):
+        self.interval = interval
+        self.clock = clock
+        self.degraded_lag = degraded_lag
+        self.overloaded_lag = overloaded_lag
+        self.escalate_samples = escalate_samples
+        self.recovery_samples = recovery_samples
+        self.samples = deque(maxlen=window)  # Recent lag samples (seconds)
+        self.lag = 0.0
+        self.mode = MODE_NORMAL
+        self.hot = [0, 0, 0]   # Per mode: consecutive samples at or above its threshold
+        self.calm = 0          # Consecutive samples below the current mode's threshold
+        self.shed = Counter()  # action: times work was skipped or refused
+        self.task = None
+
+    @property
+    def max_lag(self):
+        return max(self.samples, default=0.0)
+
+    @property
+    def degraded(self):
+        return self.mode >= MODE_DEGRADED
+
+    @property
+    def overloaded(self):
+        return self.mode >= MODE_OVERLOADED
+
+    def record(self, lag):
+        self.lag = max(lag, 0.0)
+        self.samples.append(self.lag)
+
+        if self.lag >= self.overloaded_lag:
+            level = MODE_OVERLOADED
+        elif self.lag >= self.degraded_lag:
+            level = MODE_DEGRADED
+        else:
+            level = MODE_NORMAL
+        for mode in (MODE_DEGRADED, MODE_OVERLOADED):
+            self.hot[mode] = self.hot[mode] + 1 if level >= mode else 0
+
+        # Escalate to the highest mode whose threshold held for the whole window
+        target = level
+        while target > MODE_NORMAL and self.hot[target] < self.escalate_samples:
+            target -= 1
+
+        if target > self.mode:
+            self._set_mode(target)
+        elif level < self.mode:
+            self.calm += 1
+            if self.calm >= self.recovery_samples:
+                self._set_mode(self.mode - 1)
+        else:
+            self.calm = 0
+
+    def _set_mode(self, mode):
+        # Import here to avoid circular imports
+        from logging_system import log_info, log_warning
+
+        message = f"LOOP_MONITOR: {MODE_NAMES[self.mode]} → {MODE_NAMES[mode]} (lag {self.lag * 1000:.0f}ms)"
+        (log_warning if mode > self.mode else log_info)(message)
+        self.mode = mode
+        self.calm = 0
+
+    def shed_load(self, action):
+        """Count one skipped / refused piece of work"""
+        self.shed[action] += 1
+
+    def start(self):
+        """Start sampling (once per event loop)"""
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            started = self.clock()
+            await asyncio.sleep(self.interval)
+            self.record(self.clock() - started - self.interval)
+
+# Global loop monitor instance
+loop_monitor = LoopMonitor()
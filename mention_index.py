@@ -0,0 +1,210 @@
+import re
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+import config
+from config import FINAL_ANSWER_CHANNEL, ANSWERING_CHANNEL, RECENT_MENTION_LIMIT, RECENT_MENTION_RETENTION_HOURS
+from utils import normalize_name
+from logging_system import log_error, log_info
+from time_window import TimeBucketWindow
+
+# -------- INVERTED INDEX OVER RECENT BOT MESSAGES --------
+
+INDEXED_CHANNELS = (ANSWERING_CHANNEL, FINAL_ANSWER_CHANNEL)
+
+# Index lifecycle: "cold" until a backfill starts, "warming" while it pages history, then "ready"
+INDEX_COLD = "cold"
+INDEX_WARMING = "warming"
+INDEX_READY = "ready"
+BUCKET_SECONDS = 3600  # One bucket per hour of message history
+TOKEN_PATTERN = re.compile(r"\w+")
+
+def tokenize(text_normalized):
+    """Split normalized text into the same word units that \\b regex boundaries see"""
+    return set(TOKEN_PATTERN.findall(text_normalized))
+
+class IndexedMessage:
+    """Lightweight copy of a bot message kept in the recent message index"""
+    __slots__ = ("id", "channel_id", "channel_name", "content", "normalized",
+                 "tokens", "author_name", "jump_url", "created_at")
+
+    def __init__(self, message_id, channel_id, channel_name, content, created_at, author_name=None, jump_url=None):
+        self.id = message_id
+        self.channel_id = channel_id
+        self.channel_name = channel_name
+        self.author_name = author_name
+        self.jump_url = jump_url
+        self.created_at = created_at  # POSIX timestamp (seconds)
+        self.set_content(content)
+
+    @classmethod
+    def from_message(cls, message):
+        return cls(
+            message.id, message.channel.id, message.channel.name, message.content,
+            message.created_at.timestamp(), message.author.display_name, message.jump_url
+        )
+
+    def set_content(self, content):
+        self.content = content
+        self.normalized = normalize_name(content)
+        self.tokens = tokenize(self.normalized)
+
+class RecentMessageIndex:
+    """
+    Maps normalized tokens to the bot messages that contain them.
+    Message ages are tracked in a TimeBucketWindow so expiry drops whole
+    hourly buckets instead of rescanning every message, and the mention
+    window can change at runtime without rebuilding the index.
+    """
+    def __init__(self, retention_hours=RECENT_MENTION_RETENTION_HOURS, bucket_seconds=BUCKET_SECONDS):
+        self.window = TimeBucketWindow(retention_hours=retention_hours, bucket_seconds=bucket_seconds)
+        self.messages = {}                  # message_id: IndexedMessage
+        self.postings = defaultdict(set)    # token: {message_id, ...}
+        self.newest_seen = {}               # channel_id: newest indexed timestamp (backfill high-water mark)
+        self.state = INDEX_COLD
+
+    def __len__(self):
+        return len(self.messages)
+
+    @property
+    def is_ready(self):
+        return self.state == INDEX_READY
+
+    def clear(self):
+        self.messages.clear()
+        self.postings.clear()
+        self.window = TimeBucketWindow(retention_hours=self.window.retention_hours, bucket_seconds=self.window.bucket_seconds)
+        self.newest_seen.clear()
+        self.state = INDEX_COLD
+
+    def add(self, message_id, channel_id, channel_name, content, created_at, author_name=None, jump_url=None):
+        """Index a message; re-adding an existing id replaces its content"""
+        entry = IndexedMessage(message_id, channel_id, channel_name, content, created_at, author_name, jump_url)
+        return self.add_entry(entry)
+
+    def add_entry(self, entry):
+        if entry.id in self.messages:
+            self.remove(entry.id)
+        if not self.window.record(entry.id, entry.created_at):
+            return None
+
+        self.messages[entry.id] = entry
+        for token in entry.tokens:
+            self.postings[token].add(entry.id)
+        if entry.created_at > self.newest_seen.get(entry.channel_id, 0):
+            self.newest_seen[entry.channel_id] = entry.created_at
+        return entry
+
+    def add_message(self, message):
+        """Index a discord.Message"""
+        return self.add_entry(IndexedMessage.from_message(message))
+
+    def update_content(self, message_id, content):
+        """Re-tokenize an edited message, keeping its original timestamp"""
+        entry = self.messages.get(message_id)
+        if not entry or entry.content == content:
+            return
+        for token in entry.tokens:
+            self._discard_posting(token, message_id)
+        entry.set_content(content)
+        for token in entry.tokens:
+            self.postings[token].add(message_id)
+
+    def remove(self, message_id):
+        entry = self.messages.pop(message_id, None)
+        if not entry:
+            return
+        for token in entry.tokens:
+            self._discard_posting(token, message_id)
+        self.window.discard(message_id)
+
+    def _discard_posting(self, token, message_id):
+        ids = self.postings.get(token)
+        if ids is not None:
+            ids.discard(message_id)
+            if not ids:
+                del self.postings[token]
+
+    def expire(self, now=None):
+        """Drop every bucket that lies entirely outside the retention window"""
+        expired = self.window.expire(now)
+        for message_id in expired:
+            self.remove(message_id)
+        if expired:
+            log_info(f"MENTION INDEX: Expired {len(expired)} messages")
+        return len(expired)
+
+    def lookup(self, word, channel_ids=None, hours=None, now=None):
+        """Return messages from the last `hours` (default RECENT_MENTION_HOURS) containing every token of `word`, newest first"""
+        tokens = tokenize(normalize_name(word))
+        if not tokens:
+            return []
+
+        # Intersect posting lists starting from the rarest token
+        posting_lists = sorted((self.postings.get(token, set()) for token in tokens), key=len)
+        candidate_ids = set(posting_lists[0])
+        for ids in posting_lists[1:]:
+            candidate_ids &= ids
+            if not candidate_ids:
+                return []
+
+        hours = config.RECENT_MENTION_HOURS if hours is None else hours
+        hits = []
+        for message_id in candidate_ids:
+            if not self.window.seen_within(message_id, hours, now):
+                continue
+            entry = self.messages[message_id]
+            if channel_ids is not None and entry.channel_id not in channel_ids:
+                continue
+            hits.append(entry)
+        hits.sort(key=lambda entry: entry.created_at, reverse=True)
+        return hits
+
+    def recent_messages(self, channel_id, since, limit=None):
+        """Messages in `channel_id` created at or after `since` (POSIX seconds), newest first"""
+        entries = [entry for entry in self.messages.values()
+                   if entry.channel_id == channel_id and entry.created_at >= since]
+        entries.sort(key=lambda entry: entry.created_at, reverse=True)
+        return entries[:limit] if limit else entries
+
+# Global index instance
+recent_message_index = RecentMessageIndex()
+
+# -------- INDEX MAINTENANCE --------
+
+def index_bot_message(message):
+    """Record a message the bot just posted in one of the indexed channels"""
+    channel_name = getattr(message.channel, "name", None)
+    if channel_name not in INDEXED_CHANNELS:
+        return
+    try:
+        recent_message_index.add_message(message)
+    except Exception as e:
+        log_error(f"MENTION INDEX: Failed to index message {message.id}: {e}")
+
+async def iter_recent_bot_messages(guild, channel, time_threshold):
+    """
+    Yield the bot's messages in `channel` since `time_threshold` as IndexedMessage objects.
+    Served from the index once it is ready; while warming, falls back to a
+    bounded direct history scan.
+    """
+    if recent_message_index.is_ready:
+        recent_message_index.expire()
+        for entry in recent_message_index.recent_messages(channel.id, time_threshold.timestamp(), RECENT_MENTION_LIMIT):
+            yield entry
+        return
+
+    async for message in channel.history(after=time_threshold, limit=RECENT_MENTION_LIMIT):
+        if message.author == guild.me:
+            yield IndexedMessage.from_message(message)
+
+async def build_scan_index(guild, channels):
+    """Bounded direct scan of each channel into a throwaway index (used while the shared index warms up)"""
+    index = RecentMessageIndex(retention_hours=config.RECENT_MENTION_HOURS)
+    time_threshold = datetime.now(timezone.utc) - timedelta(hours=config.RECENT_MENTION_HOURS)
+    for channel in channels:
+        try:
+            async for entry in iter_recent_bot_messages(guild, channel, time_threshold):
+                index.add_entry(entry)
+        except Exception as e:
+            log_error(f"MENTION INDEX: Error scanning #{channel.name}: {e}")
+    return index
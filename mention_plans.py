@@ -0,0 +1,102 @@
+import re
+from collections import defaultdict
+from config import players_data
+from utils import normalize_name
+from logging_system import log_info
+
+# -------- PRECOMPUTED PER-PLAYER MATCH PLANS --------
+
+TOKEN_PATTERN = re.compile(r"\w+")
+DISTINCTIVE_FIRST_NAME_LENGTH = 5  # Shorter first names ("mike", "john") are too common to match alone
+
+def message_tokens(text_normalized):
+    """Word units as seen by \\b regex boundaries"""
+    return frozenset(TOKEN_PATTERN.findall(text_normalized))
+
+def _is_single_token(word):
+    return bool(TOKEN_PATTERN.fullmatch(word))
+
+class MentionPlan:
+    """
+    Everything check_player_mention_hierarchical needs to know about one player,
+    computed once when the roster is indexed instead of on every message.
+    """
+    __slots__ = ("name", "first_name", "last_name", "name_tokens", "full_pattern",
+                 "first_pattern", "last_pattern", "first_is_token", "last_is_token",
+                 "distinctive_first_name", "last_name_shared", "conflicting_first_names")
+
+    def __init__(self, player_name_normalized, first_names_by_last=None):
+        self.name = player_name_normalized
+        parts = player_name_normalized.split()
+        self.first_name = parts[0] if len(parts) > 1 else None
+        self.last_name = parts[-1] if len(parts) > 1 else None
+        self.name_tokens = message_tokens(player_name_normalized)
+        self.full_pattern = re.compile(f"\\b{re.escape(player_name_normalized)}\\b")
+
+        # Single-token names are matched by set membership; anything else keeps its regex
+        self.first_is_token = bool(self.first_name) and _is_single_token(self.first_name)
+        self.last_is_token = bool(self.last_name) and _is_single_token(self.last_name)
+        self.first_pattern = re.compile(f"\\b{re.escape(self.first_name)}\\b(?![a-z])", re.IGNORECASE) if self.first_name else None
+        self.last_pattern = re.compile(f"\\b{re.escape(self.last_name)}\\b(?![a-z])", re.IGNORECASE) if self.last_name else None
+
+        self.distinctive_first_name = bool(self.first_name) and len(self.first_name) >= DISTINCTIVE_FIRST_NAME_LENGTH
+
+        # Other rostered players with the same last name, e.g. Wilyer vs Brayan Abreu
+        others = set((first_names_by_last or {}).get(self.last_name, ())) - {self.first_name}
+        self.last_name_shared = bool(others)
+        self.conflicting_first_names = frozenset(others)
+
+    def has_first_name(self, tokens, text):
+        if self.first_is_token:
+            return self.first_name in tokens
+        return bool(self.first_pattern.search(text))
+
+    def has_last_name(self, tokens, text):
+        if self.last_is_token:
+            return self.last_name in tokens
+        return bool(self.last_pattern.search(text))
+
+    def has_full_name(self, tokens, text):
+        # Every name token must be present before the phrase regex is worth running
+        return self.name_tokens <= tokens and bool(self.full_pattern.search(text))
+
+mention_plans = {}  # normalized player name: MentionPlan (rostered players)
+adhoc_plans = {}  # normalized name: MentionPlan for names outside the roster
+first_names_by_last = defaultdict(set)  # last name: {first names on the roster}
+
+def build_mention_plans(players):
+    """Precompute plans for every rostered player (call after players are loaded)"""
+    first_names_by_last.clear()
+    names = set()
+    for player in players:
+        name = normalize_name(player.get('name', ''))
+        parts = name.split()
+        if len(parts) > 1:
+            first_names_by_last[parts[-1]].add(parts[0])
+        if name:
+            names.add(name)
+
+    mention_plans.clear()
+    adhoc_plans.clear()
+    for name in names:
+        mention_plans[name] = MentionPlan(name, first_names_by_last)
+
+    shared = sum(1 for plan in mention_plans.values() if plan.last_name_shared)
+    log_info(f"MENTION PLANS: Built {len(mention_plans)} plans ({shared} with shared last names)")
+    return mention_plans
+
+def get_mention_plan(player_name_normalized):
+    """Plan for a player name; names outside the roster get a plan built and cached on first use"""
+    plan = mention_plans.get(player_name_normalized)
+    if plan is not None:
+        return plan
+    if not mention_plans and players_data:
+        build_mention_plans(players_data)
+        plan = mention_plans.get(player_name_normalized)
+        if plan is not None:
+            return plan
+    plan = adhoc_plans.get(player_name_normalized)
+    if plan is None:
+        plan = MentionPlan(player_name_normalized, first_names_by_last)
+        adhoc_plans[player_name_normalized] = plan
+    return plan
@@ -0,0 +1,210 @@
+import bisect
+import math
+import time
+from aiohttp import web
+
+# -------- PROMETHEUS-STYLE METRICS --------
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # seconds
+
+def _label_key(label_names, labels):
+    if set(labels) != set(label_names):
+        raise ValueError(f"expected labels {label_names}, got {tuple(labels)}")
+    return tuple(str(labels[name]) for name in label_names)
+
+def _format_labels(label_names, key, extra=None):
+    pairs = list(zip(label_names, key)) + list(extra or [])
+    if not pairs:
+        return ""
+    escaped = (f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34)).replace(chr(10), chr(92) + "n")}"'
+               for name, value in pairs)
+    return "{" + ",".join(escaped) + "}"
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """Monotonic count, optionally split by labels"""
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self.values = {}  # label values tuple: count
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(self.label_names, labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self.values.get(_label_key(self.label_names, labels), 0)
+
+    def samples(self):
+        for key, value in sorted(self.values.items()):
+            yield self.name, _format_labels(self.label_names, key), value
+
+class Gauge(Counter):
+    """Value that goes up and down"""
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        self.values[_label_key(self.label_names, labels)] = value
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+class CallbackMetric:
+    """
+    Counter or gauge read from existing state at scrape time, so hot paths
+    (rate limiter, caches, queues) need no extra bookkeeping.
+    `collect()` returns a number, or a list of (labels dict, value).
+    """
+    def __init__(self, name, help_text, collect, kind="gauge"):
+        self.name = name
+        self.help = help_text
+        self.collect = collect
+        self.kind = kind
+
+    def samples(self):
+        result = self.collect()
+        if isinstance(result, (int, float)):
+            yield self.name, "", result
+            return
+        for labels, value in result:
+            yield self.name, _format_labels(tuple(labels), tuple(labels.values())), value
+
+class Histogram:
+    """Cumulative-bucket histogram (seconds by default)"""
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self.series = {}  # label values tuple: [bucket counts..., +Inf count], sum
+
+    def observe(self, value, **labels):
+        key = _label_key(self.label_names, labels)
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def time(self, **labels):
+        return _HistogramTimer(self, labels)
+
+    def count(self, **labels):
+        series = self.series.get(_label_key(self.label_names, labels))
+        return sum(series[0]) if series else 0
+
+    def samples(self):
+        for key, (counts, total) in sorted(self.series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket", _format_labels(self.label_names, key, [("le", _format_value(bound))]), cumulative
+            yield f"{self.name}_sum", _format_labels(self.label_names, key), total
+            yield f"{self.name}_count", _format_labels(self.label_names, key), cumulative
+
+class _HistogramTimer:
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+
+class MetricsRegistry:
+    """Named metrics rendered in the Prometheus text exposition format"""
+    def __init__(self):
+        self.metrics = {}  # name: metric
+
+    def _register(self, metric):
+        existing = self.metrics.get(metric.name)
+        if existing is not None:
+            return existing  # Same name: share the metric (module reloads, repeated setup)
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help_text, labels=()):
+        return self._register(Counter(name, help_text, labels))
+
+    def gauge(self, name, help_text, labels=()):
+        return self._register(Gauge(name, help_text, labels))
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, help_text, labels, buckets))
+
+    def callback(self, name, help_text, collect, kind="gauge"):
+        """(Re)bind a metric read at scrape time"""
+        metric = CallbackMetric(name, help_text, collect, kind)
+        self.metrics[name] = metric
+        return metric
+
+    def render(self):
+        lines = []
+        for name in sorted(self.metrics):
+            metric = self.metrics[name]
+            try:
+                samples = list(metric.samples())
+            except Exception as e:
+                lines.append(f"# {name} collection failed: {e}")
+                continue
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for sample_name, labels, value in samples:
+                lines.append(f"{sample_name}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+# Global metrics registry
+metrics = MetricsRegistry()
+
+# -------- /metrics HTTP SERVER --------
+
+class MetricsServer:
+    """Optional local aiohttp server exposing GET /metrics"""
+    def __init__(self, registry=metrics):
+        self.registry = registry
+        self.runner = None
+
+    def app(self):
+        async def handle_metrics(request):
+            return web.Response(text=self.registry.render(), content_type="text/plain", charset="utf-8",
+                                headers={"X-Content-Type-Options": "nosniff"})
+
+        app = web.Application()
+        app.router.add_get("/metrics", handle_metrics)
+        return app
+
+    async def start(self, host, port):
+        """Start serving (once); returns False if already running. A failed bind (OSError) leaves it stopped, so start() can be retried"""
+        if self.runner is not None:
+            return False
+        runner = web.AppRunner(self.app(), access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, host, port).start()
+        except BaseException:
+            await runner.cleanup()
+            raise
+        self.runner = runner
+        return True
+
+    async def stop(self):
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+
+# Global metrics server instance (started from on_ready when METRICS_PORT is set)
+metrics_server = MetricsServer()
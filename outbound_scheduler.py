@@ -0,0 +1,170 @@
+import asyncio
+import itertools
+import time
+import discord
+from config import OUTBOUND_WORKERS, OUTBOUND_LOW_BACKLOG, OUTBOUND_LOW_MAX_AGE
+from logging_system import log_error, log_info
+
+# -------- PRIORITIZED OUTBOUND DISCORD OPERATIONS --------
+
+# Priority classes (lower drains first)
+PRIORITY_HIGH = 0    # Posting approved questions, forwarding answers
+PRIORITY_NORMAL = 1  # User-facing notices, disambiguation prompts, status edits
+PRIORITY_LOW = 2     # Confirmations and cosmetic deletes
+
+class OutboundJob:
+    __slots__ = ("priority", "operation", "factory", "future", "key", "submitted_at", "droppable")
+
+    def __init__(self, priority, operation, factory, future=None, key=None, droppable=False):
+        self.priority = priority
+        self.operation = operation
+        self.factory = factory          # Zero-argument callable returning the coroutine to run
+        self.future = future            # Set for awaited jobs; None for fire-and-forget
+        self.key = key                  # Coalescing key for fire-and-forget jobs
+        self.submitted_at = time.monotonic()
+        self.droppable = droppable
+
+class OutboundScheduler:
+    """
+    Priority queue in front of every user-triggered Discord REST call.
+
+    Workers always take the highest-priority job next, and the HTTP-level route
+    limiter paces the actual requests, so a burst of confirmations and deletes
+    never sits in front of an approved question or a forwarded answer.
+
+    - run(): awaited by the caller; always executed
+    - submit(): fire-and-forget; low-priority jobs are coalesced by key and
+      dropped when the low backlog is full or the job has gone stale
+
+    Deletes are not queued one by one here; they are batched per channel by
+    deletion_service and issued as bulk deletes.
+    """
+    def __init__(self, workers=OUTBOUND_WORKERS, low_backlog=OUTBOUND_LOW_BACKLOG, low_max_age=OUTBOUND_LOW_MAX_AGE):
+        self.worker_count = workers
+        self.low_backlog = low_backlog
+        self.low_max_age = low_max_age
+        self.queue = None
+        self.workers = []
+        self.loop = None
+        self.pending_keys = {}  # coalescing key: queued OutboundJob
+        self.low_pending = 0
+        self.sequence = itertools.count()
+        self.stats = {"run": 0, "submitted": 0, "coalesced": 0, "dropped": 0, "stale": 0, "failed": 0}
+
+    def _ensure_workers(self):
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            # First use, or a new event loop (e.g. after a restart): start fresh
+            self.loop = loop
+            self.queue = asyncio.PriorityQueue()
+            self.pending_keys.clear()
+            self.low_pending = 0
+            self.workers = []
+        self.workers = [worker for worker in self.workers if not worker.done()]
+        while len(self.workers) < self.worker_count:
+            self.workers.append(loop.create_task(self._worker()))
+
+    def _enqueue(self, job):
+        if job.droppable:
+            self.low_pending += 1
+        self.queue.put_nowait((job.priority, next(self.sequence), job))
+
+    async def run(self, operation, factory, priority=PRIORITY_NORMAL):
+        """Queue `factory()` at `priority` and wait for its result"""
+        self._ensure_workers()
+        future = self.loop.create_future()
+        self.stats["run"] += 1
+        self._enqueue(OutboundJob(priority, operation, factory, future=future))
+        return await future
+
+    def submit(self, operation, factory, priority=PRIORITY_LOW, key=None):
+        """Queue `factory()` without waiting; returns False if it was dropped"""
+        self._ensure_workers()
+        self.stats["submitted"] += 1
+
+        if key is not None and key in self.pending_keys:
+            # Same work already queued: keep one job, with the latest factory
+            self.pending_keys[key].factory = factory
+            self.stats["coalesced"] += 1
+            return True
+
+        droppable = priority >= PRIORITY_LOW
+        if droppable and self.low_pending >= self.low_backlog:
+            self.stats["dropped"] += 1
+            log_info(f"OUTBOUND: Dropped {operation} (low-priority backlog full)")
+            return False
+
+        job = OutboundJob(priority, operation, factory, key=key, droppable=droppable)
+        if key is not None:
+            self.pending_keys[key] = job
+        self._enqueue(job)
+        return True
+
+    @property
+    def backlog(self):
+        return self.queue.qsize() if self.queue else 0
+
+    async def _worker(self):
+        while True:
+            _, _, job = await self.queue.get()
+            try:
+                await self._execute(job)
+            finally:
+                self.queue.task_done()
+
+    async def _execute(self, job):
+        if job.key is not None and self.pending_keys.get(job.key) is job:
+            del self.pending_keys[job.key]
+        if job.droppable:
+            self.low_pending -= 1
+            if time.monotonic() - job.submitted_at > self.low_max_age:
+                self.stats["stale"] += 1
+                return
+        if job.future is not None and job.future.done():
+            return  # Caller gave up
+
+        try:
+            result = await job.factory()
+        except Exception as e:
+            self.stats["failed"] += 1
+            if job.future is not None:
+                if not job.future.done():
+                    job.future.set_exception(e)
+            elif not isinstance(e, discord.NotFound):
+                log_error(f"OUTBOUND: {job.operation} failed: {e}")
+            return
+
+        if job.future is not None and not job.future.done():
+            job.future.set_result(result)
+
+    async def join(self):
+        """Wait until everything queued so far has been handled"""
+        if self.queue is not None:
+            await self.queue.join()
+
+# Global scheduler instance
+outbound = OutboundScheduler()
+
+# -------- COMMON OPERATIONS --------
+
+async def send_notice(channel, content, delete_after=5, priority=PRIORITY_NORMAL):
+    """Send a short-lived notice to a user; it is removed by the next bulk delete after `delete_after` seconds"""
+    # Import here to avoid circular imports
+    from deletion_service import deletion_service
+    message = await outbound.run("send_notice", lambda: channel.send(content), priority)
+    deletion_service.schedule(message, delete_after)
+    return message
+
+def submit_delete(message):
+    """Queue a message for the next bulk delete in its channel"""
+    from deletion_service import deletion_service
+    deletion_service.schedule(message)
+
+def submit_confirmation(channel, content, delete_after=5):
+    """Low-priority confirmation; concurrent confirmations in one channel collapse into one"""
+    from deletion_service import deletion_service
+
+    async def send():
+        message = await channel.send(content)
+        deletion_service.schedule(message, delete_after)
+    return outbound.submit("send_confirmation", send, PRIORITY_LOW, key=("confirmation", channel.id))
@@ -1,5 +1,4 @@
 import re
-import asyncio
 import logging
 import time
 from datetime import datetime
@@ -7,8 +6,10 @@ from difflib import SequenceMatcher
 from functools import wraps
 from config import players_data
 from utils import normalize_name, expand_nicknames, is_likely_player_request
-from logging_system import log_analytics, log_info
+from logging_system import record_analytics, log_info, log_debug, log_enabled
 from player_matching_validator import validate_player_matches
+from instrumentation import timed_stage
+from flight_recorder import flight_record
 
 # Set up detection tracing logger
 logger = logging.getLogger(__name__)
@@ -139,7 +140,7 @@ def find_exact_player_matches(text):
         player_name_normalized = normalize_name(player['name'])
         if player_name_normalized == text_normalized:
             exact_matches.append(player)
-            log_info(f"EXACT MATCH FOUND: '{text}' → {player['name']} ({player['team']})")
+            log_debug(lambda: f"EXACT MATCH FOUND: '{text}' → {player['name']} ({player['team']})")
     
     return exact_matches
 
@@ -148,13 +149,13 @@ def extract_potential_names(text):
     # First expand nicknames
     expanded_text = expand_nicknames(text)
     if expanded_text != text:
-        log_info(f"NAME EXTRACTION: Expanded '{text}' to '{expanded_text}'")
+        log_debug(lambda: f"NAME EXTRACTION: Expanded '{text}' to '{expanded_text}'")
         text = expanded_text
     
     # 🔧 SURGICAL FIX #1: Try exact matches FIRST to prevent splitting
     exact_matches = find_exact_player_matches(text)
     if exact_matches:
-        log_info(f"EXACT MATCH PRIORITY: Found {len(exact_matches)} exact matches, stopping name extraction")
+        log_debug(lambda: f"EXACT MATCH PRIORITY: Found {len(exact_matches)} exact matches, stopping name extraction")
         return [normalize_name(text)]  # Return only the exact match, don't split
     
     # 🔧 CRITICAL FIX: Word-boundary aware splitting to prevent "Corey" → "C" + "ey"
@@ -165,7 +166,7 @@ def extract_potential_names(text):
     
     # Now normalize each segment individually
     if len(segments) > 1:
-        log_info(f"MULTI-PLAYER: Split '{text}' into {len(segments)} segments: {segments}")
+        log_debug(lambda: f"MULTI-PLAYER: Split '{text}' into {len(segments)} segments: {segments}")
         
         # Process each segment individually and normalize
         for i, segment in enumerate(segments):
@@ -174,7 +175,7 @@ def extract_potential_names(text):
             segment_normalized = normalize_name(segment_cleaned)
             if len(segment_normalized) >= 3:  # Reasonable minimum length
                 potential_names.append(segment_normalized)
-                log_info(f"MULTI-PLAYER: Segment {i+1}: '{segment}' → '{segment_cleaned}' → '{segment_normalized}'")
+                log_debug(lambda: f"MULTI-PLAYER: Segment {i+1}: '{segment}' → '{segment_cleaned}' → '{segment_normalized}'")
     
     # For single segment (no separators found), use the original logic
     text_normalized = normalize_name(text)
@@ -259,7 +260,7 @@ def extract_potential_names(text):
         name_combo = f"{word1} {word2}"
         if len(name_combo) >= 7 and name_combo not in potential_names:  # Avoid duplicates
             potential_names.append(name_combo)
-            log_info(f"NAME EXTRACTION: Added 2-word combo from original: '{name_combo}'")
+            log_debug(lambda: f"NAME EXTRACTION: Added 2-word combo from original: '{name_combo}'")
     
     # Look for 3-word combinations (like "Juan Soto Jr")
     for i in range(len(filtered_words) - 2):
@@ -319,7 +320,7 @@ def extract_potential_names(text):
             filtered_original = ' '.join(filtered_original_words)
             if len(filtered_original.replace(' ', '')) >= 3 and filtered_original not in potential_names:
                 potential_names.append(filtered_original)
-                log_info(f"NAME EXTRACTION: Added filtered original text: '{filtered_original}'")
+                log_debug(lambda: f"NAME EXTRACTION: Added filtered original text: '{filtered_original}'")
     
     # Remove duplicates while preserving order
     unique_names = []
@@ -351,18 +352,18 @@ def extract_potential_names(text):
     for name in unique_names:
         # Filter out separator-containing names
         if any(sep in name for sep in separator_chars):
-            log_info(f"NAME EXTRACTION: Filtered out separator-containing name: '{name}'")
+            log_debug(lambda: f"NAME EXTRACTION: Filtered out separator-containing name: '{name}'")
             continue
         
         # Filter out team names
         if name.lower() in team_names:
-            log_info(f"NAME EXTRACTION: Filtered out team name: '{name}'")
+            log_debug(lambda: f"NAME EXTRACTION: Filtered out team name: '{name}'")
             continue
         
         # Keep the name if it passes all filters
         cleaned_names.append(name)
     
-    log_info(f"NAME EXTRACTION: Found {len(cleaned_names)} potential names from '{text}': {cleaned_names}")
+    log_debug(lambda: f"NAME EXTRACTION: Found {len(cleaned_names)} potential names from '{text}': {cleaned_names}")
     return cleaned_names
 
 # -------- LAST NAME MATCHING --------
@@ -387,7 +388,7 @@ def check_last_name_match(potential_name, player_name):
     
     # Special case: if it's a very close match to a last name, be more lenient
     if similarity >= 0.75:  # Lower threshold for last name only
-        log_info(f"LAST NAME MATCH: '{potential_name}' vs last name '{player_last_name}' = {similarity:.3f}")
+        log_debug(lambda: f"LAST NAME MATCH: '{potential_name}' vs last name '{player_last_name}' = {similarity:.3f}")
         return similarity, True
     
     return None, False
@@ -418,33 +419,33 @@ def fuzzy_match_players(text, max_results=8):
         log_info(f"BLOCKING nonsensical combination: '{text}'")
         return []
     
-    print(f"🚨 PROCEEDING with fuzzy matching: '{text}' ({word_count} words)")
-    log_info(f"PROCEEDING with fuzzy matching: '{text}' ({word_count} words)")
+    log_debug(lambda: f"PROCEEDING with fuzzy matching: '{text}' ({word_count} words)")
     
     # 🔍 DEBUG: Show call trace to monitor all fuzzy matching attempts
-    import traceback
-    print(f"🔍 FUZZY CALL TRACE: '{text}' from:")
-    for line in traceback.format_stack()[-3:-1]:
-        print(f"   {line.strip()}")
+    if log_enabled("DEBUG"):
+        import traceback
+        print(f"🔍 FUZZY CALL TRACE: '{text}' from:")
+        for line in traceback.format_stack()[-3:-1]:
+            print(f"   {line.strip()}")
     
-    log_info(f"FUZZY MATCH: Starting for '{text}'")
-    log_info(f"FUZZY MATCH Starting", f"Query: '{text}'")
+    log_debug(lambda: f"FUZZY MATCH: Starting for '{text}'")
+    log_debug(lambda: f"FUZZY MATCH Starting", lambda: f"Query: '{text}'")
     
     if not players_data:
-        log_info(f"FUZZY MATCH: No players data available")
+        log_debug(lambda: f"FUZZY MATCH: No players data available")
         return []
     
     # Extract potential player names from the text
     potential_names = extract_potential_names(text)
     matches = []
     
-    log_info(f"FUZZY MATCH: Testing {len(potential_names)} potential names: {potential_names}")
-    log_info(f"FUZZY MATCH Potential Names", f"Found {len(potential_names)} names: {potential_names}")
+    log_debug(lambda: f"FUZZY MATCH: Testing {len(potential_names)} potential names: {potential_names}")
+    log_debug(lambda: f"FUZZY MATCH Potential Names", lambda: f"Found {len(potential_names)} names: {potential_names}")
     
     # Try fuzzy matching with each potential name
     for potential_name in potential_names:
-        log_info(f"FUZZY MATCH: Testing potential name: '{potential_name}'")
-        log_info(f"FUZZY MATCH Testing", f"Name: '{potential_name}'")
+        log_debug(lambda: f"FUZZY MATCH: Testing potential name: '{potential_name}'")
+        log_debug(lambda: f"FUZZY MATCH Testing", lambda: f"Name: '{potential_name}'")
         
         for i, player in enumerate(players_data):
             player_name = normalize_name(player['name'])
@@ -453,7 +454,7 @@ def fuzzy_match_players(text, max_results=8):
             lastname_sim, is_lastname_match = check_last_name_match(potential_name, player_name)
             
             if is_lastname_match and lastname_sim >= 0.75:
-                log_info(f"LAST NAME MATCH: '{potential_name}' → {player['name']} ({player['team']}) = {lastname_sim:.3f}")
+                log_debug(lambda: f"LAST NAME MATCH: '{potential_name}' → {player['name']} ({player['team']}) = {lastname_sim:.3f}")
                 matches.append((player, lastname_sim))
                 # Don't continue - still check fuzzy matching for other players
             
@@ -471,7 +472,7 @@ def fuzzy_match_players(text, max_results=8):
                 part_similarity = SequenceMatcher(None, potential_name, name_part).ratio()
                 name_part_similarities.append(part_similarity)
                 if part_similarity == 1.0:  # Exact match with any name part
-                    log_info(f"EXACT NAME PART MATCH: '{potential_name}' = '{name_part}' (1.000)")
+                    log_debug(lambda: f"EXACT NAME PART MATCH: '{potential_name}' = '{name_part}' (1.000)")
             
             # Get the best similarity from all comparisons
             best_name_part_similarity = max(name_part_similarities) if name_part_similarities else 0.0
@@ -486,7 +487,7 @@ def fuzzy_match_players(text, max_results=8):
             
             # Log the comparison details for debugging
             if best_name_part_similarity > similarity:
-                log_info(f"NAME PART MATCH BETTER: '{potential_name}' vs '{player_name}' - full: {similarity:.3f}, best part: {best_name_part_similarity:.3f}")
+                log_debug(lambda: f"NAME PART MATCH BETTER: '{potential_name}' vs '{player_name}' - full: {similarity:.3f}, best part: {best_name_part_similarity:.3f}")
             
             # 🔧 CRITICAL FIX: Enhanced substring detection for BOTH first and last names
             # Check if potential_name is a substring of ANY part of the player's name
@@ -504,19 +505,19 @@ def fuzzy_match_players(text, max_results=8):
                     # Check against first name
                     if word in player_first_name.lower():
                         is_substring_match = True
-                        log_info(f"SUBSTRING DETECTED: Word '{word}' found in first name '{player_first_name}'")
+                        log_debug(lambda: f"SUBSTRING DETECTED: Word '{word}' found in first name '{player_first_name}'")
                         break
                     # Check against last name  
                     elif word in normalize_name(player_last_name):
                         is_substring_match = True
-                        log_info(f"SUBSTRING DETECTED: Word '{word}' found in last name '{player_last_name}'")
+                        log_debug(lambda: f"SUBSTRING DETECTED: Word '{word}' found in last name '{player_last_name}'")
                         break
                     # Check against any other name parts (middle names, etc.)
                     else:
                         for name_part in player_name_parts:
                             if word in name_part.lower():
                                 is_substring_match = True
-                                log_info(f"SUBSTRING DETECTED: Word '{word}' found in name part '{name_part}'")
+                                log_debug(lambda: f"SUBSTRING DETECTED: Word '{word}' found in name part '{name_part}'")
                                 break
                         if is_substring_match:
                             break
@@ -526,7 +527,7 @@ def fuzzy_match_players(text, max_results=8):
                 for name_part in player_name_parts:
                     if potential_name.lower() in name_part.lower():
                         is_substring_match = True
-                        log_info(f"FULL SUBSTRING DETECTED: '{potential_name}' found in name part '{name_part}'")
+                        log_debug(lambda: f"FULL SUBSTRING DETECTED: '{potential_name}' found in name part '{name_part}'")
                         break
             
             # Dynamic threshold with substring detection
@@ -535,12 +536,12 @@ def fuzzy_match_players(text, max_results=8):
             elif is_substring_match and len(potential_name) >= 4:
                 # 🔧 FIX: Lower threshold for substring matches (like "greene" matching "Riley Greene")
                 threshold = 0.6  # Allow Riley Greene (0.667) and Isaiah Greene (0.643) to pass
-                log_info(f"SUBSTRING THRESHOLD: Lowered to {threshold} for '{potential_name}' in '{player_last_name}'")
+                log_debug(lambda: f"SUBSTRING THRESHOLD: Lowered to {threshold} for '{potential_name}' in '{player_last_name}'")
             elif ' ' in potential_name:
                 # 🔧 NEW: Much stricter threshold for multi-word queries like "juan soto"
                 # This prevents "juan soto" from matching "juan brito" (0.737)
                 threshold = 0.95  # Only very close matches for full names
-                log_info(f"MULTI-WORD THRESHOLD: Raised to {threshold} for full name '{potential_name}'")
+                log_debug(lambda: f"MULTI-WORD THRESHOLD: Raised to {threshold} for full name '{potential_name}'")
             elif ' ' in player_name and ' ' not in potential_name:
                 # Calculate last_name_similarity for threshold logic
                 last_name_similarity = SequenceMatcher(None, potential_name, player_last_name).ratio()
@@ -549,17 +550,19 @@ def fuzzy_match_players(text, max_results=8):
                 threshold = 0.7
             
             if best_similarity >= threshold:
-                log_info(f"FUZZY MATCH: '{potential_name}' → {player['name']} ({player['team']}) = {best_similarity:.3f} (threshold: {threshold})")
-                log_info(f"FUZZY MATCH Found", f"'{potential_name}' → {player['name']} ({player['team']}) = {best_similarity:.3f}")
+                log_debug(lambda: f"FUZZY MATCH: '{potential_name}' → {player['name']} ({player['team']}) = {best_similarity:.3f} (threshold: {threshold})")
+                log_debug(lambda: f"FUZZY MATCH Found", lambda: f"'{potential_name}' → {player['name']} ({player['team']}) = {best_similarity:.3f}")
+                flight_record("fuzzy_match", phrase=potential_name, player=player['name'], team=player['team'], score=round(best_similarity, 3), threshold=threshold)
                 matches.append((player, best_similarity))
             elif best_similarity >= 0.5:  # Log near misses for debugging
-                log_info(f"NEAR MISS: '{potential_name}' → {player['name']} ({player['team']}) = {best_similarity:.3f} (needed: {threshold})")
+                flight_record("near_miss", phrase=potential_name, player=player['name'], team=player['team'], score=round(best_similarity, 3), threshold=threshold)
+                log_debug(lambda: f"NEAR MISS: '{potential_name}' → {player['name']} ({player['team']}) = {best_similarity:.3f} (needed: {threshold})")
                 # Only log Acuña near misses to avoid spam
-                if 'acuna' in normalize_name(player['name']).lower():
-                    log_info(f"ACUÑA NEAR MISS", f"'{potential_name}' → {player['name']} ({player['team']}) = {best_similarity:.3f} (needed: {threshold})")
+                if log_enabled("DEBUG") and 'acuna' in normalize_name(player['name']).lower():
+                    log_debug(lambda: f"ACUÑA NEAR MISS", lambda: f"'{potential_name}' → {player['name']} ({player['team']}) = {best_similarity:.3f} (needed: {threshold})")
     
-    log_info(f"FUZZY MATCH: Found {len(matches)} total matches before deduplication")
-    log_info(f"FUZZY MATCH Total", f"Found {len(matches)} matches before deduplication")
+    log_debug(lambda: f"FUZZY MATCH: Found {len(matches)} total matches before deduplication")
+    log_debug(lambda: f"FUZZY MATCH Total", lambda: f"Found {len(matches)} matches before deduplication")
     
     # Sort by score and remove duplicates
     matches.sort(key=lambda x: x[1], reverse=True)
@@ -569,18 +572,18 @@ def fuzzy_match_players(text, max_results=8):
     for player, score in matches:
         player_key = f"{normalize_name(player['name'])}|{normalize_name(player['team'])}"
         if player_key not in seen_players and len(unique_matches) < max_results:
-            log_info(f"ADDING MATCH: {player['name']} ({player['team']}) = {score:.3f}")
-            log_info(f"FUZZY MATCH Adding", f"{player['name']} ({player['team']}) = {score:.3f}")
+            log_debug(lambda: f"ADDING MATCH: {player['name']} ({player['team']}) = {score:.3f}")
+            log_debug(lambda: f"FUZZY MATCH Adding", lambda: f"{player['name']} ({player['team']}) = {score:.3f}")
             unique_matches.append(player)
             seen_players.add(player_key)
         else:
             if player_key in seen_players:
-                log_info(f"DUPLICATE SKIPPED: {player['name']} ({player['team']})")
+                log_debug(lambda: f"DUPLICATE SKIPPED: {player['name']} ({player['team']})")
             else:
-                log_info(f"MAX RESULTS REACHED: Skipping {player['name']} ({player['team']})")
+                log_debug(lambda: f"MAX RESULTS REACHED: Skipping {player['name']} ({player['team']})")
     
     log_info(f"FUZZY MATCH: Returning {len(unique_matches)} unique matches")
-    log_info(f"FUZZY MATCH Final", f"Returning {len(unique_matches)} unique matches: {[p['name'] for p in unique_matches]}")
+    log_debug(lambda: f"FUZZY MATCH Final", lambda: f"Returning {len(unique_matches)} unique matches: {[p['name'] for p in unique_matches]}")
     return unique_matches
 
 # -------- RAW PLAYER DETECTION (NEW) --------
@@ -593,7 +596,7 @@ def capture_all_raw_player_detections(text):
     """
     start_time = datetime.now()
     
-    log_info(f"RAW DETECTION: Capturing all detections for '{text}'")
+    log_debug(lambda: f"RAW DETECTION: Capturing all detections for '{text}'")
     
     if not players_data or not is_likely_player_request(text):
         return []
@@ -601,7 +604,7 @@ def capture_all_raw_player_detections(text):
     # First, expand any nicknames
     expanded_text = expand_nicknames(text)
     if expanded_text != text:
-        log_info(f"RAW DETECTION: Using expanded text: '{expanded_text}'")
+        log_debug(lambda: f"RAW DETECTION: Using expanded text: '{expanded_text}'")
         text = expanded_text
     
     text_normalized = normalize_name(text)
@@ -617,7 +620,7 @@ def capture_all_raw_player_detections(text):
     words = text_normalized.split()
     filtered_words = [word for word in words if word not in basic_stop_words and len(word) >= 3]
     
-    log_info(f"RAW DETECTION: Filtered words: {filtered_words}")
+    log_debug(lambda: f"RAW DETECTION: Filtered words: {filtered_words}")
     
     # Test ALL combinations and individual words (no validation filtering)
     
@@ -636,7 +639,7 @@ def capture_all_raw_player_detections(text):
                 detected_name = player['name']
                 if detected_name not in all_detected_names:
                     all_detected_names.append(detected_name)
-                    log_info(f"RAW DETECTION: Found combo match '{combo}' → {detected_name}")
+                    log_debug(lambda: f"RAW DETECTION: Found combo match '{combo}' → {detected_name}")
     
     # Test 3-word combinations
     for i in range(len(filtered_words) - 2):
@@ -653,7 +656,7 @@ def capture_all_raw_player_detections(text):
                 detected_name = player['name']
                 if detected_name not in all_detected_names:
                     all_detected_names.append(detected_name)
-                    log_info(f"RAW DETECTION: Found 3-word combo match '{combo}' → {detected_name}")
+                    log_debug(lambda: f"RAW DETECTION: Found 3-word combo match '{combo}' → {detected_name}")
     
     # Test individual words
     for word in filtered_words:
@@ -675,7 +678,7 @@ def capture_all_raw_player_detections(text):
                     detected_name = player['name']
                     if detected_name not in all_detected_names:
                         all_detected_names.append(detected_name)
-                        log_info(f"RAW DETECTION: Found individual word match '{word}' → {detected_name}")
+                        log_debug(lambda: f"RAW DETECTION: Found individual word match '{word}' → {detected_name}")
                     break
     
     # Test full text matches
@@ -688,7 +691,7 @@ def capture_all_raw_player_detections(text):
             detected_name = player['name']
             if detected_name not in all_detected_names:
                 all_detected_names.append(detected_name)
-                log_info(f"RAW DETECTION: Found full text match '{text_normalized}' → {detected_name}")
+                log_debug(lambda: f"RAW DETECTION: Found full text match '{text_normalized}' → {detected_name}")
         
         # Lastname matching for single-word queries
         query_words = text_normalized.split()
@@ -700,7 +703,7 @@ def capture_all_raw_player_detections(text):
                     detected_name = player['name']
                     if detected_name not in all_detected_names:
                         all_detected_names.append(detected_name)
-                        log_info(f"RAW DETECTION: Found lastname match '{lastname}' → {detected_name}")
+                        log_debug(lambda: f"RAW DETECTION: Found lastname match '{lastname}' → {detected_name}")
     
     # 🔧 FIX: Route through simplified detection instead of old complex system
     simplified_matches = simplified_player_detection(text)
@@ -709,15 +712,15 @@ def capture_all_raw_player_detections(text):
             detected_name = player['name']
             if detected_name not in all_detected_names:
                 all_detected_names.append(detected_name)
-                log_info(f"RAW DETECTION: Found simplified match → {detected_name}")
+                log_debug(lambda: f"RAW DETECTION: Found simplified match → {detected_name}")
     elif simplified_matches:
         # Single player returned
         detected_name = simplified_matches['name']
         if detected_name not in all_detected_names:
             all_detected_names.append(detected_name)
-            log_info(f"RAW DETECTION: Found simplified match → {detected_name}")
+            log_debug(lambda: f"RAW DETECTION: Found simplified match → {detected_name}")
     
-    log_info(f"RAW DETECTION: Total detected names: {len(all_detected_names)} - {all_detected_names}")
+    log_debug(lambda: f"RAW DETECTION: Total detected names: {len(all_detected_names)} - {all_detected_names}")
     return all_detected_names
 
 # -------- DIRECT PLAYER LOOKUP (RECURSION-SAFE) --------
@@ -967,7 +970,7 @@ def detect_players_unified(text, is_recursive_call=False):
     # 🛡️ RECURSION PREVENTION: Block recursive calls
     if is_recursive_call:
         logger.debug("🛡️ RECURSION_PREVENTION: Skipping recursive unified detection call")
-        log_info("🛡️ RECURSION_PREVENTION: Skipping recursive unified detection call")
+        log_debug("🛡️ RECURSION_PREVENTION: Skipping recursive unified detection call")
         return direct_player_lookup(text)
     
     # 🚨 UNIVERSAL PROTECTION: Block long sentences FIRST
@@ -977,20 +980,18 @@ def detect_players_unified(text, is_recursive_call=False):
         log_info(f"BLOCKING detection for long text ({word_count} words): '{text}'")
         return []
     
-    print(f"🚨 PROCEEDING with unified detection for: '{text}'")
-    log_info(f"PROCEEDING with unified detection for: '{text}'")
+    log_debug(lambda: f"PROCEEDING with unified detection for: '{text}'")
     
     # Use existing detection logic in priority order
     # Step 1: Try exact matches first (fastest)
     try:
         exact_matches = find_exact_player_matches(text)
         if exact_matches:
-            print(f"🚨 Found via exact match: {len(exact_matches)} players")
-            log_info(f"Found via exact match: {len(exact_matches)} players")
+            log_debug(lambda: f"Found via exact match: {len(exact_matches)} players")
             return exact_matches
     except Exception as e:
         print(f"🚨 Error in exact matching: {e}")
-        log_info(f"Error in exact matching: {e}")
+        log_debug(lambda: f"Error in exact matching: {e}")
     
     # Step 2: Try the existing player detection logic with recursion flag
     try:
@@ -998,7 +999,7 @@ def detect_players_unified(text, is_recursive_call=False):
         return check_player_mentioned_original(text, is_recursive_call=True)
     except Exception as e:
         print(f"🚨 Error in existing detection: {e}")
-        log_info(f"Error in existing detection: {e}")
+        log_debug(lambda: f"Error in existing detection: {e}")
         return []
 
 def check_player_mentioned_original(text, is_recursive_call=False):
@@ -1006,8 +1007,7 @@ def check_player_mentioned_original(text, is_recursive_call=False):
     start_time = datetime.now()
     
     # 🚨 EMERGENCY DEBUG: Add immediate debug logging
-    print(f"🚨 DEBUG: check_player_mentioned_original() called with: '{text}'")
-    log_info(f"🚨 DEBUG: check_player_mentioned_original() called with: '{text}'")
+    log_debug(lambda: f"🚨 DEBUG: check_player_mentioned_original() called with: '{text}'")
     
     log_info(f"CHECK PLAYER: Looking for players in '{text}'")
     
@@ -1017,7 +1017,7 @@ def check_player_mentioned_original(text, is_recursive_call=False):
     # First, expand any nicknames
     expanded_text = expand_nicknames(text)
     if expanded_text != text:
-        log_info(f"NICKNAME: Using expanded text: '{expanded_text}'")
+        log_debug(lambda: f"NICKNAME: Using expanded text: '{expanded_text}'")
         text = expanded_text
     
     # 🔧 SURGICAL FIX #4: Add early exit for exact matches
@@ -1025,25 +1025,21 @@ def check_player_mentioned_original(text, is_recursive_call=False):
     if exact_matches:
         log_info(f"EARLY EXIT: Found {len(exact_matches)} exact matches, stopping all processing")
         duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
-        try:
-            asyncio.create_task(log_analytics("Player Search",
-                question=text, duration_ms=duration_ms, players_checked=len(players_data),
-                matches_found=len(exact_matches), players_found=exact_matches, search_type="exact_match_early_exit"
-            ))
-        except RuntimeError:
-            # No event loop running (test environment) - skip analytics
-            pass
+        record_analytics("Player Search",
+            question=text, duration_ms=duration_ms, players_checked=len(players_data),
+            matches_found=len(exact_matches), players_found=exact_matches, search_type="exact_match_early_exit"
+        )
         return exact_matches
     
     # 🔧 NEW: Use existing multi-player detection logic
     potential_names = extract_potential_names(text)
     all_detected_players = []
     
-    log_info(f"MULTI-PLAYER INTEGRATION: Found {len(potential_names)} potential names: {potential_names}")
+    log_debug(lambda: f"MULTI-PLAYER INTEGRATION: Found {len(potential_names)} potential names: {potential_names}")
     
     # Process each potential name to find matching players
     for potential_name in potential_names:
-        log_info(f"PROCESSING POTENTIAL NAME: '{potential_name}'")
+        log_debug(lambda: f"PROCESSING POTENTIAL NAME: '{potential_name}'")
         
         # 🔧 FIX: Route through unified detection instead of direct fuzzy matching
         name_matches = detect_players_unified(potential_name)
@@ -1054,10 +1050,10 @@ def check_player_mentioned_original(text, is_recursive_call=False):
             name_matches = []
         
         if name_matches:
-            log_info(f"FOUND MATCHES for '{potential_name}': {[p['name'] for p in name_matches]}")
+            log_debug(lambda: f"FOUND MATCHES for '{potential_name}': {[p['name'] for p in name_matches]}")
             all_detected_players.extend(name_matches)
         else:
-            log_info(f"NO MATCHES for '{potential_name}'")
+            log_debug(lambda: f"NO MATCHES for '{potential_name}'")
     
     # Remove duplicates while preserving order
     seen_players = set()
@@ -1067,24 +1063,24 @@ def check_player_mentioned_original(text, is_recursive_call=False):
         if player_key not in seen_players:
             unique_detected_players.append(player)
             seen_players.add(player_key)
-            log_info(f"UNIQUE PLAYER DETECTED: {player['name']} ({player['team']})")
+            log_debug(lambda: f"UNIQUE PLAYER DETECTED: {player['name']} ({player['team']})")
     
     if unique_detected_players:
         log_info(f"MULTI-PLAYER DETECTION: Found {len(unique_detected_players)} unique players")
         
         # 🔧 SURGICAL FIX #3: ALWAYS validate, even for multi-player
         validated_players = validate_player_matches(text, unique_detected_players)
-        log_info(f"MULTI-PLAYER VALIDATION: {len(unique_detected_players)} → {len(validated_players)}")
+        log_debug(lambda: f"MULTI-PLAYER VALIDATION: {len(unique_detected_players)} → {len(validated_players)}")
         
         # 🔧 CRITICAL FIX: Return immediately if we found ANY validated players
         # This prevents the fallback logic from overriding correct results
         if validated_players:
             log_info(f"EARLY RETURN: Multi-player detection found {len(validated_players)} validated players, stopping all fallback processing")
             duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
-            asyncio.create_task(log_analytics("Player Search",
+            record_analytics("Player Search",
                 question=text, duration_ms=duration_ms, players_checked=len(players_data),
                 matches_found=len(validated_players), players_found=validated_players, search_type="multi_player_integrated"
-            ))
+            )
             return validated_players
         else:
             log_info(f"MULTI-PLAYER VALIDATION FAILED: All {len(unique_detected_players)} players were rejected by validation, continuing to fallback")
@@ -1142,15 +1138,15 @@ def check_player_mentioned_original(text, is_recursive_call=False):
         
         # Only remove "max" if it doesn't seem to be part of a name
         if not has_potential_lastname:
-            log_info(f"CONTEXT FILTER: Removing 'max' due to stats context (no lastname detected) in: {words}")
+            log_debug(lambda: f"CONTEXT FILTER: Removing 'max' due to stats context (no lastname detected) in: {words}")
             words = [w for w in words if w != 'max']
         else:
-            log_info(f"CONTEXT FILTER: Keeping 'max' as it appears to be part of a name: {words}")
+            log_debug(lambda: f"CONTEXT FILTER: Keeping 'max' as it appears to be part of a name: {words}")
     
     filtered_words = [word for word in words if word not in stop_words and len(word) >= 3]
     
-    log_info(f"WORD EXTRACTION: Original text: '{text_normalized}'")
-    log_info(f"WORD EXTRACTION: Filtered words: {filtered_words}")
+    log_debug(lambda: f"WORD EXTRACTION: Original text: '{text_normalized}'")
+    log_debug(lambda: f"WORD EXTRACTION: Filtered words: {filtered_words}")
     
     # 🔧 STEP 1: Test COMBINATIONS first (2-word and 3-word phrases)
     combination_matches = []
@@ -1158,7 +1154,7 @@ def check_player_mentioned_original(text, is_recursive_call=False):
     # Test 2-word combinations
     for i in range(len(filtered_words) - 1):
         combo = f"{filtered_words[i]} {filtered_words[i+1]}"
-        log_info(f"TESTING 2-WORD COMBO: '{combo}'")
+        log_debug(lambda: f"TESTING 2-WORD COMBO: '{combo}'")
         
         # Look for exact matches on this combination
         for player in players_data:
@@ -1166,19 +1162,19 @@ def check_player_mentioned_original(text, is_recursive_call=False):
             
             # Check if combo exactly matches full name
             if player_name_normalized == combo:
-                log_info(f"EXACT COMBO MATCH: '{combo}' → {player['name']} ({player['team']})")
+                log_debug(lambda: f"EXACT COMBO MATCH: '{combo}' → {player['name']} ({player['team']})")
                 combination_matches.append(player)
                 continue
             
             # Check if combo is contained in player name
             if combo in player_name_normalized:
-                log_info(f"CONTAINED COMBO MATCH: '{combo}' → {player['name']} ({player['team']})")
+                log_debug(lambda: f"CONTAINED COMBO MATCH: '{combo}' → {player['name']} ({player['team']})")
                 combination_matches.append(player)
     
     # Test 3-word combinations
     for i in range(len(filtered_words) - 2):
         combo = f"{filtered_words[i]} {filtered_words[i+1]} {filtered_words[i+2]}"
-        log_info(f"TESTING 3-WORD COMBO: '{combo}'")
+        log_debug(lambda: f"TESTING 3-WORD COMBO: '{combo}'")
         
         # Look for exact matches on this combination
         for player in players_data:
@@ -1186,18 +1182,18 @@ def check_player_mentioned_original(text, is_recursive_call=False):
             
             # Check if combo exactly matches full name
             if player_name_normalized == combo:
-                log_info(f"EXACT 3-WORD COMBO MATCH: '{combo}' → {player['name']} ({player['team']})")
+                log_debug(lambda: f"EXACT 3-WORD COMBO MATCH: '{combo}' → {player['name']} ({player['team']})")
                 combination_matches.append(player)
                 continue
             
             # Check if combo is contained in player name
             if combo in player_name_normalized:
-                log_info(f"CONTAINED 3-WORD COMBO MATCH: '{combo}' → {player['name']} ({player['team']})")
+                log_debug(lambda: f"CONTAINED 3-WORD COMBO MATCH: '{combo}' → {player['name']} ({player['team']})")
                 combination_matches.append(player)
     
     # If we found combination matches, prioritize those
     if combination_matches:
-        log_info(f"COMBINATION MATCHES: Found {len(combination_matches)} matches from combinations")
+        log_debug(lambda: f"COMBINATION MATCHES: Found {len(combination_matches)} matches from combinations")
         
         # Deduplicate combination matches
         seen_players = set()
@@ -1207,25 +1203,25 @@ def check_player_mentioned_original(text, is_recursive_call=False):
             if player_key not in seen_players:
                 unique_combo_matches.append(player)
                 seen_players.add(player_key)
-                log_info(f"UNIQUE COMBO MATCH: Added {player['name']} ({player['team']})")
+                log_debug(lambda: f"UNIQUE COMBO MATCH: Added {player['name']} ({player['team']})")
         
         # Apply validation to combination matches
         validated_combo_matches = validate_player_matches(text, unique_combo_matches)
         
         duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
-        asyncio.create_task(log_analytics("Player Search",
+        record_analytics("Player Search",
             question=text, duration_ms=duration_ms, players_checked=len(players_data),
             matches_found=len(validated_combo_matches), players_found=validated_combo_matches, search_type="combination_match_validated"
-        ))
+        )
         return validated_combo_matches
     
     # 🔧 STEP 2: Only test individual words if NO combinations matched
-    log_info(f"COMBINATION MATCHING: No combination matches found, testing individual words")
+    log_debug(lambda: f"COMBINATION MATCHING: No combination matches found, testing individual words")
     
     individual_matches = []
     
     for word in filtered_words:
-        log_info(f"TESTING INDIVIDUAL WORD: '{word}'")
+        log_debug(lambda: f"TESTING INDIVIDUAL WORD: '{word}'")
         
         # Create variations for possessive/plural forms
         word_variations = [word]
@@ -1243,7 +1239,7 @@ def check_player_mentioned_original(text, is_recursive_call=False):
             # Test all word variations
             for word_variant in word_variations:
                 if word_variant in name_parts:
-                    log_info(f"EXACT PART MATCH: '{word}' (variant: '{word_variant}') → {player['name']} ({player['team']})")
+                    log_debug(lambda: f"EXACT PART MATCH: '{word}' (variant: '{word_variant}') → {player['name']} ({player['team']})")
                     word_matches.append(player)
                     break  # Found a match, no need to test other variants for this player
         
@@ -1251,7 +1247,7 @@ def check_player_mentioned_original(text, is_recursive_call=False):
         if word_matches:
             # For single-word matches, require additional validation
             if len(word_matches) > 10:  # Too many matches = probably a common word
-                log_info(f"INDIVIDUAL WORD REJECTED: '{word}' matched {len(word_matches)} players (too many)")
+                log_debug(lambda: f"INDIVIDUAL WORD REJECTED: '{word}' matched {len(word_matches)} players (too many)")
                 continue
             
             # Add validated word matches
@@ -1266,21 +1262,21 @@ def check_player_mentioned_original(text, is_recursive_call=False):
             if player_key not in seen_players:
                 unique_individual_matches.append(player)
                 seen_players.add(player_key)
-                log_info(f"UNIQUE INDIVIDUAL MATCH: Added {player['name']} ({player['team']})")
+                log_debug(lambda: f"UNIQUE INDIVIDUAL MATCH: Added {player['name']} ({player['team']})")
         
-        log_info(f"INDIVIDUAL MATCHING: Found {len(unique_individual_matches)} total matches from individual words")
+        log_debug(lambda: f"INDIVIDUAL MATCHING: Found {len(unique_individual_matches)} total matches from individual words")
         
         # Apply validation to individual matches
         validated_individual_matches = validate_player_matches(text, unique_individual_matches)
 
         duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
-        asyncio.create_task(log_analytics("Player Search",
+        record_analytics("Player Search",
             question=text, duration_ms=duration_ms, players_checked=len(players_data),
             matches_found=len(validated_individual_matches), players_found=validated_individual_matches, search_type="individual_word_match_validated"
-        ))
+        )
         return validated_individual_matches
     
-    log_info(f"INDIVIDUAL WORDS: No matches found from individual words, testing full text as fallback")
+    log_debug(lambda: f"INDIVIDUAL WORDS: No matches found from individual words, testing full text as fallback")
     
     # 🔧 STEP 3: FALLBACK - Full text matching (your original logic)
     
@@ -1289,12 +1285,12 @@ def check_player_mentioned_original(text, is_recursive_call=False):
     for player in players_data:
         player_name_normalized = normalize_name(player['name'])
         if player_name_normalized == text_normalized:
-            log_info(f"EXACT FULL TEXT MATCH: '{text_normalized}' → {player['name']} ({player['team']})")
+            log_debug(lambda: f"EXACT FULL TEXT MATCH: '{text_normalized}' → {player['name']} ({player['team']})")
             exact_matches.append(player)
     
     # If we found exact matches, return ONLY those
     if exact_matches:
-        log_info(f"EXACT FULL TEXT MATCHES: Found {len(exact_matches)} exact matches")
+        log_debug(lambda: f"EXACT FULL TEXT MATCHES: Found {len(exact_matches)} exact matches")
         
         # Deduplicate exact matches
         seen_players = set()
@@ -1304,13 +1300,13 @@ def check_player_mentioned_original(text, is_recursive_call=False):
             if player_key not in seen_players:
                 unique_exact.append(player)
                 seen_players.add(player_key)
-                log_info(f"EXACT UNIQUE: Added {player['name']} ({player['team']})")
+                log_debug(lambda: f"EXACT UNIQUE: Added {player['name']} ({player['team']})")
         
         duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
-        asyncio.create_task(log_analytics("Player Search",
+        record_analytics("Player Search",
             question=text, duration_ms=duration_ms, players_checked=len(players_data),
             matches_found=len(unique_exact), players_found=unique_exact, search_type="exact_full_text"
-        ))
+        )
         return unique_exact
     
     # STEP 3B: Other direct matches on full text
@@ -1335,7 +1331,7 @@ def check_player_mentioned_original(text, is_recursive_call=False):
                 is_meaningful_substring = True
         
         if is_meaningful_substring:
-            log_info(f"SUBSTRING MATCH: '{text_normalized}' → {player['name']} ({player['team']})")
+            log_debug(lambda: f"SUBSTRING MATCH: '{text_normalized}' → {player['name']} ({player['team']})")
             other_matches.append(player)
             continue
         
@@ -1349,12 +1345,12 @@ def check_player_mentioned_original(text, is_recursive_call=False):
                 lastname_match = bool(re.search(lastname_pattern, text_normalized))
                 
                 if lastname_match:
-                    log_info(f"LASTNAME MATCH: '{text_normalized}' → {player['name']} ({player['team']})")
+                    log_debug(lambda: f"LASTNAME MATCH: '{text_normalized}' → {player['name']} ({player['team']})")
                     other_matches.append(player)
     
     # If we found other direct matches, return those
     if other_matches:
-        log_info(f"OTHER FULL TEXT MATCHES: Found {len(other_matches)} non-exact direct matches")
+        log_debug(lambda: f"OTHER FULL TEXT MATCHES: Found {len(other_matches)} non-exact direct matches")
         
         # Deduplicate other matches
         seen_players = set()
@@ -1364,16 +1360,16 @@ def check_player_mentioned_original(text, is_recursive_call=False):
             if player_key not in seen_players:
                 unique_other.append(player)
                 seen_players.add(player_key)
-                log_info(f"OTHER UNIQUE: Added {player['name']} ({player['team']})")
+                log_debug(lambda: f"OTHER UNIQUE: Added {player['name']} ({player['team']})")
         
         duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
-        asyncio.create_task(log_analytics("Player Search",
+        record_analytics("Player Search",
             question=text, duration_ms=duration_ms, players_checked=len(players_data),
             matches_found=len(unique_other), players_found=unique_other, search_type="full_text_substring"
-        ))
+        )
         return unique_other
     
-    log_info(f"FULL TEXT MATCHING: No direct matches found, falling back to fuzzy matching")
+    log_debug(lambda: f"FULL TEXT MATCHING: No direct matches found, falling back to fuzzy matching")
     
     # STEP 4: Fuzzy matching as final fallback
     matches = fuzzy_match_players(text, max_results=5)
@@ -1384,25 +1380,25 @@ def check_player_mentioned_original(text, is_recursive_call=False):
         duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
         
         if validated_matches:
-            asyncio.create_task(log_analytics("Player Search",
+            record_analytics("Player Search",
                 question=text, duration_ms=duration_ms, players_checked=len(players_data),
                 matches_found=len(validated_matches), players_found=validated_matches, search_type="fuzzy_match_validated"
-            ))
+            )
             return validated_matches
         else:
             # All fuzzy matches were rejected by validation
-            asyncio.create_task(log_analytics("Player Search",
+            record_analytics("Player Search",
                 question=text, duration_ms=duration_ms, players_checked=len(players_data),
                 matches_found=0, search_type="fuzzy_match_all_rejected"
-            ))
+            )
     else:
         duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
     
     # Log failed search
-    asyncio.create_task(log_analytics("Player Search",
+    record_analytics("Player Search",
         question=text, duration_ms=duration_ms, players_checked=len(players_data),
         matches_found=0, search_type="no_match"
-    ))
+    )
     return None
 
 def check_player_mentioned(text):
@@ -1417,14 +1413,18 @@ def check_player_mentioned(text):
     
     # STEP 1: Intent-first multi-player detection
     logger.info(f"🔍 INTENT_CHECK: Checking for multi-player intent in: '{text}'")
-    has_suspicious_pattern, suspicious_segments = has_multi_player_keywords_enhanced(text)
+    with timed_stage("intent_check"):
+        has_suspicious_pattern, suspicious_segments = has_multi_player_keywords_enhanced(text)
+    flight_record("intent_check", multi_player_intent=has_suspicious_pattern, segments=suspicious_segments)
     
     if has_suspicious_pattern:
         logger.info(f"🔍 INTENT_DETECTED: Multi-player intent found, segments: {suspicious_segments}")
         
         # STEP 2: Strict validation to confirm players
-        confirmed_players = validate_suspicious_names_strict(text, suspicious_segments)
+        with timed_stage("strict_validation"):
+            confirmed_players = validate_suspicious_names_strict(text, suspicious_segments)
         logger.info(f"🔍 VALIDATION_RESULT: {len(confirmed_players)} confirmed players")
+        flight_record("strict_validation", confirmed=[p['name'] for p in confirmed_players])
         
         if len(confirmed_players) >= 2:
             # Check for different last names
@@ -1455,7 +1455,8 @@ def check_player_mentioned(text):
     
     # STEP 3: Normal single-player detection
     logger.info(f"🎯 NORMAL_DETECTION: Running normal player detection")
-    result = simplified_player_detection(text)
+    with timed_stage("name_matching"):
+        result = simplified_player_detection(text)
     
     # Log the result
     if result:
@@ -1568,6 +1569,7 @@ def simplified_fuzzy_match(text, max_results=8):
         
         if best_similarity >= threshold:
             logger.info(f"🎯 SIMPLIFIED_FUZZY: '{text}' → {player['name']} ({player['team']}) = {best_similarity:.3f} (strategy: {match_strategy})")
+            flight_record("simplified_fuzzy_match", text=text, player=player['name'], team=player['team'], score=round(best_similarity, 3), threshold=threshold, strategy=match_strategy)
             matches.append((player, best_similarity))
     
     # Sort by score and remove duplicates
@@ -1600,7 +1602,7 @@ def has_multi_player_keywords_enhanced(query):
         if f' {keyword} ' in f' {query_lower} ':
             segments = [seg.strip() for seg in re.split(f'\\s+{re.escape(keyword)}\\s+', query, flags=re.IGNORECASE)]
             if len(segments) >= 2:
-                log_info(f"SIMPLIFIED INTENT: Found comparison keyword '{keyword}', segments: {segments}")
+                log_debug(lambda: f"SIMPLIFIED INTENT: Found comparison keyword '{keyword}', segments: {segments}")
                 return True, segments
     
     # 🔧 PERMISSIVE: Remove "or" detection entirely - too many false positives
@@ -1613,13 +1615,13 @@ def has_multi_player_keywords_enhanced(query):
             name_like_segments = sum(1 for seg in semicolon_segments 
                                    if seg and any(word.isalpha() and len(word) >= 3 for word in seg.split()))
             if name_like_segments >= 4:  # Require 4+ name-like segments
-                log_info(f"SIMPLIFIED INTENT: Found obvious semicolon list with {name_like_segments} name-like segments")
+                log_debug(lambda: f"SIMPLIFIED INTENT: Found obvious semicolon list with {name_like_segments} name-like segments")
                 return True, semicolon_segments
     
     # 🔧 REMOVED: Complex comma detection, slash detection, bracket detection
     # These were causing too many false positives
     
-    log_info(f"SIMPLIFIED INTENT: No clear multi-player intent detected for: '{query}'")
+    log_debug(lambda: f"SIMPLIFIED INTENT: No clear multi-player intent detected for: '{query}'")
     return False, []
 
 def validate_suspicious_names_strict(query, suspicious_segments):
@@ -1629,7 +1631,7 @@ def validate_suspicious_names_strict(query, suspicious_segments):
     """
     from player_matching_validator import validate_player_mention_in_text
     
-    log_info(f"STRICT VALIDATION: Checking {len(suspicious_segments)} segments for '{query}'")
+    log_debug(lambda: f"STRICT VALIDATION: Checking {len(suspicious_segments)} segments for '{query}'")
     
     confirmed_players = []
     
@@ -1654,7 +1656,7 @@ def validate_suspicious_names_strict(query, suspicious_segments):
         elif len(words) == 1:
             cleaning_approaches.append(words[0])  # Single word
         
-        log_info(f"STRICT VALIDATION: Processing segment '{segment}' with {len(cleaning_approaches)} approaches")
+        log_debug(lambda: f"STRICT VALIDATION: Processing segment '{segment}' with {len(cleaning_approaches)} approaches")
         
         segment_players = []
         
@@ -1662,38 +1664,38 @@ def validate_suspicious_names_strict(query, suspicious_segments):
             if not cleaned or len(cleaned.strip()) < 2:
                 continue
                 
-            log_info(f"STRICT VALIDATION: Trying approach: '{segment}' → '{cleaned}'")
+            log_debug(lambda: f"STRICT VALIDATION: Trying approach: '{segment}' → '{cleaned}'")
             
             # Skip obviously non-name segments
             if not looks_like_player_name(cleaned):
-                log_info(f"STRICT VALIDATION: Skipping non-name approach: '{cleaned}'")
+                log_debug(lambda: f"STRICT VALIDATION: Skipping non-name approach: '{cleaned}'")
                 continue
                 
             # Use existing exact matching first
             exact_matches = find_exact_player_matches(cleaned)
             
             if exact_matches:
-                log_info(f"STRICT VALIDATION: Found {len(exact_matches)} exact matches for '{cleaned}'")
+                log_debug(lambda: f"STRICT VALIDATION: Found {len(exact_matches)} exact matches for '{cleaned}'")
                 for player in exact_matches:
                     # Use existing validation system
                     if validate_player_mention_in_text(query, player['name'], context="user_question"):
                         segment_players.append(player)
-                        log_info(f"STRICT VALIDATION: Confirmed player: {player['name']}")
+                        log_debug(lambda: f"STRICT VALIDATION: Confirmed player: {player['name']}")
                     else:
-                        log_info(f"STRICT VALIDATION: Rejected player: {player['name']} (failed validation)")
+                        log_debug(lambda: f"STRICT VALIDATION: Rejected player: {player['name']} (failed validation)")
                 break  # Found exact matches, stop trying other approaches
             else:
                 # Try simplified fuzzy matching with very strict threshold
                 fuzzy_matches = simplified_fuzzy_match(cleaned, max_results=3)
                 if fuzzy_matches:
-                    log_info(f"STRICT VALIDATION: Found {len(fuzzy_matches)} fuzzy matches for '{cleaned}'")
+                    log_debug(lambda: f"STRICT VALIDATION: Found {len(fuzzy_matches)} fuzzy matches for '{cleaned}'")
                     for player in fuzzy_matches:
                         # Use existing validation system
                         if validate_player_mention_in_text(query, player['name'], context="user_question"):
                             segment_players.append(player)
-                            log_info(f"STRICT VALIDATION: Confirmed fuzzy player: {player['name']}")
+                            log_debug(lambda: f"STRICT VALIDATION: Confirmed fuzzy player: {player['name']}")
                         else:
-                            log_info(f"STRICT VALIDATION: Rejected fuzzy player: {player['name']} (failed validation)")
+                            log_debug(lambda: f"STRICT VALIDATION: Rejected fuzzy player: {player['name']} (failed validation)")
                     if segment_players:  # Found some players, stop trying other approaches
                         break
         
@@ -1708,7 +1710,7 @@ def validate_suspicious_names_strict(query, suspicious_segments):
             unique_confirmed.append(player)
             seen_players.add(player_key)
     
-    log_info(f"STRICT VALIDATION: Confirmed {len(unique_confirmed)} unique players: {[p['name'] for p in unique_confirmed]}")
+    log_debug(lambda: f"STRICT VALIDATION: Confirmed {len(unique_confirmed)} unique players: {[p['name'] for p in unique_confirmed]}")
     return unique_confirmed
 
 def looks_like_player_name(segment):
@@ -1874,10 +1876,10 @@ def simplified_player_detection(text):
     if exact_matches:
         logger.info(f"🎯 SIMPLIFIED_DETECTION: Found {len(exact_matches)} exact matches, returning immediately")
         duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
-        asyncio.create_task(log_analytics("Player Search",
+        record_analytics("Player Search",
             question=text, duration_ms=duration_ms, players_checked=len(players_data),
             matches_found=len(exact_matches), players_found=exact_matches, search_type="exact_match"
-        ))
+        )
         return exact_matches
     
     # PRIORITY 2: Filtered name extraction and matching
@@ -1912,28 +1914,19 @@ def simplified_player_detection(text):
         
         if validated_matches:
             duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
-            try:
-                asyncio.create_task(log_analytics("Player Search",
-                    question=text, duration_ms=duration_ms, players_checked=len(players_data),
-                    matches_found=len(validated_matches), players_found=validated_matches, search_type="filtered_detection"
-                ))
-            except RuntimeError:
-                # No event loop running (test environment) - skip analytics
-                pass
+            record_analytics("Player Search",
+                question=text, duration_ms=duration_ms, players_checked=len(players_data),
+                matches_found=len(validated_matches), players_found=validated_matches, search_type="filtered_detection"
+            )
             return validated_matches
     
     # No matches found
     logger.info(f"🎯 SIMPLIFIED_DETECTION: No matches found for '{text}'")
     duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
     
-    # 🔧 FIX: Handle asyncio gracefully in test environments
-    try:
-        asyncio.create_task(log_analytics("Player Search",
-            question=text, duration_ms=duration_ms, players_checked=len(players_data),
-            matches_found=0, search_type="no_match"
-        ))
-    except RuntimeError:
-        # No event loop running (test environment) - skip analytics
-        pass
+    record_analytics("Player Search",
+        question=text, duration_ms=duration_ms, players_checked=len(players_data),
+        matches_found=0, search_type="no_match"
+    )
     
     return None
@@ -2,7 +2,8 @@ import re
 from difflib import SequenceMatcher
 from config import players_data
 from utils import normalize_name
-from logging_system import log_info
+from logging_system import log_debug
+from flight_recorder import flight_record
 
 # Context types for validation
 CONTEXT_USER_QUESTION = "user_question"
@@ -74,9 +75,9 @@ def is_valid_player_name_phrase(phrase, matched_player_name, context=CONTEXT_UNK
     phrase_words = phrase_normalized.split()
     player_words = player_normalized.split()
     
-    log_info(f"VALIDATING: '{phrase}' → '{matched_player_name}' (context: {context})")
-    log_info(f"PHRASE WORDS: {phrase_words}")
-    log_info(f"PLAYER WORDS: {player_words}")
+    log_debug(lambda: f"VALIDATING: '{phrase}' → '{matched_player_name}' (context: {context})")
+    log_debug(lambda: f"PHRASE WORDS: {phrase_words}")
+    log_debug(lambda: f"PLAYER WORDS: {player_words}")
     
     # Apply context-specific validation rules
     if context == CONTEXT_METADATA:
@@ -95,10 +96,10 @@ def validate_metadata_context(phrase_words, player_words, phrase, matched_player
     if len(phrase_words) >= 1:
         # At least one word should be reasonable length
         if any(len(word) >= 2 for word in phrase_words):
-            log_info(f"METADATA VALIDATION PASSED: '{phrase}' → '{matched_player_name}'")
+            log_debug(lambda: f"METADATA VALIDATION PASSED: '{phrase}' → '{matched_player_name}'")
             return True
     
-    log_info(f"METADATA VALIDATION FAILED: '{phrase}' → '{matched_player_name}' - insufficient structure")
+    log_debug(lambda: f"METADATA VALIDATION FAILED: '{phrase}' → '{matched_player_name}' - insufficient structure")
     return False
 
 def validate_expert_reply_context(phrase_words, player_words, phrase, matched_player_name, phrase_normalized, player_normalized):
@@ -114,14 +115,14 @@ def validate_expert_reply_context(phrase_words, player_words, phrase, matched_pl
     
     for pattern in critical_non_name_patterns:
         if re.search(pattern, phrase_normalized):
-            log_info(f"EXPERT REPLY VALIDATION FAILED: Phrase '{phrase}' matches critical non-name pattern: {pattern}")
+            log_debug(lambda: f"EXPERT REPLY VALIDATION FAILED: Phrase '{phrase}' matches critical non-name pattern: {pattern}")
             return False
     
     # Rule 2: More lenient word length requirements
     if len(phrase_words) == 2:
         word1, word2 = phrase_words
         if len(word1) < 2 or len(word2) < 2:
-            log_info(f"EXPERT REPLY VALIDATION FAILED: Words too short: {word1}, {word2}")
+            log_debug(lambda: f"EXPERT REPLY VALIDATION FAILED: Words too short: {word1}, {word2}")
             return False
     
     # Rule 3: Use same permissive logic as user questions for consistency
@@ -138,26 +139,26 @@ def validate_expert_reply_context(phrase_words, player_words, phrase, matched_pl
         if player_name_in_phrase:
             # If we found actual name parts, be very permissive with similarity (same as user questions)
             min_similarity = 0.2
-            log_info(f"Found player name part in phrase - using permissive threshold: {min_similarity}")
+            log_debug(lambda: f"Found player name part in phrase - using permissive threshold: {min_similarity}")
         else:
             # If no name parts found, use moderate threshold for expert replies (more lenient than user questions)
             min_similarity = 0.3
-            log_info(f"No player name parts found - using moderate threshold: {min_similarity}")
+            log_debug(lambda: f"No player name parts found - using moderate threshold: {min_similarity}")
         
         if similarity < min_similarity:
-            log_info(f"EXPERT REPLY VALIDATION FAILED: Low similarity {similarity:.3f} for multi-word phrase (required: {min_similarity})")
+            log_debug(lambda: f"EXPERT REPLY VALIDATION FAILED: Low similarity {similarity:.3f} for multi-word phrase (required: {min_similarity})")
             return False
         else:
-            log_info(f"Similarity check passed: {similarity:.3f} >= {min_similarity}")
+            log_debug(lambda: f"Similarity check passed: {similarity:.3f} >= {min_similarity}")
     
     # Rule 4: More lenient word matching (same as user questions)
     if len(phrase_words) >= 2:
         phrase_words_in_player = sum(1 for word in phrase_words if word in player_words)
         if phrase_words_in_player == 0:
-            log_info(f"EXPERT REPLY VALIDATION FAILED: No phrase words found in player name")
+            log_debug(lambda: f"EXPERT REPLY VALIDATION FAILED: No phrase words found in player name")
             return False
     
-    log_info(f"EXPERT REPLY VALIDATION PASSED: '{phrase}' → '{matched_player_name}'")
+    log_debug(lambda: f"EXPERT REPLY VALIDATION PASSED: '{phrase}' → '{matched_player_name}'")
     return True
 
 def validate_user_question_context(phrase_words, player_words, phrase, matched_player_name, phrase_normalized, player_normalized):
@@ -173,14 +174,14 @@ def validate_user_question_context(phrase_words, player_words, phrase, matched_p
     
     for pattern in critical_non_name_patterns:
         if re.search(pattern, phrase_normalized):
-            log_info(f"PERMISSIVE VALIDATION FAILED: Phrase '{phrase}' matches critical non-name pattern: {pattern}")
+            log_debug(lambda: f"PERMISSIVE VALIDATION FAILED: Phrase '{phrase}' matches critical non-name pattern: {pattern}")
             return False
     
     # 🔧 PERMISSIVE: Much more lenient word length requirements
     if len(phrase_words) == 2:
         word1, word2 = phrase_words
         if len(word1) < 2 or len(word2) < 2:
-            log_info(f"PERMISSIVE VALIDATION FAILED: Words too short: {word1}, {word2}")
+            log_debug(lambda: f"PERMISSIVE VALIDATION FAILED: Words too short: {word1}, {word2}")
             return False
         
         # 🔧 PERMISSIVE: Only reject the most obvious non-name combos
@@ -191,7 +192,7 @@ def validate_user_question_context(phrase_words, player_words, phrase, matched_p
         }
         
         if (word1, word2) in critical_non_name_combos:
-            log_info(f"PERMISSIVE VALIDATION FAILED: Critical non-name combo detected: {word1}, {word2}")
+            log_debug(lambda: f"PERMISSIVE VALIDATION FAILED: Critical non-name combo detected: {word1}, {word2}")
             return False
     
     # 🔧 PERMISSIVE: Much lower similarity thresholds
@@ -208,17 +209,17 @@ def validate_user_question_context(phrase_words, player_words, phrase, matched_p
         if player_name_in_phrase:
             # If we found actual name parts, be very permissive with similarity
             min_similarity = 0.1  # Very low threshold
-            log_info(f"Found player name part in phrase - using very permissive threshold: {min_similarity}")
+            log_debug(lambda: f"Found player name part in phrase - using very permissive threshold: {min_similarity}")
         else:
             # If no name parts found, still be more permissive than before
             min_similarity = 0.3  # Lowered from 0.6
-            log_info(f"No player name parts found - using moderate threshold: {min_similarity}")
+            log_debug(lambda: f"No player name parts found - using moderate threshold: {min_similarity}")
         
         if similarity < min_similarity:
-            log_info(f"PERMISSIVE VALIDATION FAILED: Low similarity {similarity:.3f} for multi-word phrase (required: {min_similarity})")
+            log_debug(lambda: f"PERMISSIVE VALIDATION FAILED: Low similarity {similarity:.3f} for multi-word phrase (required: {min_similarity})")
             return False
         else:
-            log_info(f"Similarity check passed: {similarity:.3f} >= {min_similarity}")
+            log_debug(lambda: f"Similarity check passed: {similarity:.3f} >= {min_similarity}")
     
     # 🔧 PERMISSIVE: Remove the phrase words check - too restrictive
     # This was rejecting legitimate matches where the phrase didn't contain exact player name parts
@@ -226,7 +227,7 @@ def validate_user_question_context(phrase_words, player_words, phrase, matched_p
     # 🔧 PERMISSIVE: Remove the common non-name words check - too restrictive
     # This was rejecting legitimate matches that happened to contain common words
     
-    log_info(f"PERMISSIVE VALIDATION PASSED: '{phrase}' → '{matched_player_name}'")
+    log_debug(lambda: f"PERMISSIVE VALIDATION PASSED: '{phrase}' → '{matched_player_name}'")
     return True
 
 def validate_player_mention_in_text(text, player_name, context=None):
@@ -242,7 +243,7 @@ def validate_player_mention_in_text(text, player_name, context=None):
     if context is None:
         context = detect_validation_context(text)
     
-    log_info(f"MENTION VALIDATION: Checking if '{text}' mentions '{player_name}' (context: {context})")
+    log_debug(lambda: f"MENTION VALIDATION: Checking if '{text}' mentions '{player_name}' (context: {context})")
     
     # 🔧 CRITICAL BUG FIX: Prevent common English words from being validated as player names
     # This was causing words like "should", "bail", "early" to be treated as player names
@@ -325,13 +326,13 @@ def validate_player_mention_in_text(text, player_name, context=None):
     
     # If the player name is a common English word, reject it immediately
     if player_normalized in common_english_words:
-        log_info(f"MENTION VALIDATION FAILED: '{player_name}' is a common English word, not a player name")
+        log_debug(lambda: f"MENTION VALIDATION FAILED: '{player_name}' is a common English word, not a player name")
         return False
     
     # Also check if it's a single common word (for cases like "should" vs "Should Martinez")
     player_words = player_normalized.split()
     if len(player_words) == 1 and player_words[0] in common_english_words:
-        log_info(f"MENTION VALIDATION FAILED: '{player_name}' is a single common English word, not a player name")
+        log_debug(lambda: f"MENTION VALIDATION FAILED: '{player_name}' is a single common English word, not a player name")
         return False
     
     # 🔧 CRITICAL FIX: Split text on separators, not just spaces
@@ -347,12 +348,12 @@ def validate_player_mention_in_text(text, player_name, context=None):
         
         # 🔧 ADDITIONAL SAFETY: Don't validate if the "lastname" is a common word
         if actual_last_name in common_english_words:
-            log_info(f"MENTION VALIDATION FAILED: Last name '{actual_last_name}' is a common English word")
+            log_debug(lambda: f"MENTION VALIDATION FAILED: Last name '{actual_last_name}' is a common English word")
             return False
         
         # Check if the actual last name appears in the text
         if actual_last_name in text_words:
-            log_info(f"MENTION VALIDATION PASSED: '{player_name}' found via last name '{actual_last_name}' in '{text}' (context: {context})")
+            log_debug(lambda: f"MENTION VALIDATION PASSED: '{player_name}' found via last name '{actual_last_name}' in '{text}' (context: {context})")
             return True
         
         # For compound last names like "De La Cruz", also check if any significant part matches
@@ -365,7 +366,7 @@ def validate_player_mention_in_text(text, player_name, context=None):
                 if i + 1 < len(player_words):
                     next_part = player_words[i + 1]
                     if next_part in text_words:
-                        log_info(f"MENTION VALIDATION PASSED: '{player_name}' found via compound name parts '{compound_part} {next_part}' in '{text}' (context: {context})")
+                        log_debug(lambda: f"MENTION VALIDATION PASSED: '{player_name}' found via compound name parts '{compound_part} {next_part}' in '{text}' (context: {context})")
                         return True
     
     # Count how many player name parts appear in the text
@@ -383,9 +384,9 @@ def validate_player_mention_in_text(text, player_name, context=None):
         is_valid = matching_parts >= len(player_words) // 2
     
     if is_valid:
-        log_info(f"MENTION VALIDATION PASSED: '{player_name}' found in '{text}' (context: {context})")
+        log_debug(lambda: f"MENTION VALIDATION PASSED: '{player_name}' found in '{text}' (context: {context})")
     else:
-        log_info(f"MENTION VALIDATION FAILED: '{player_name}' not clearly mentioned in '{text}' (context: {context})")
+        log_debug(lambda: f"MENTION VALIDATION FAILED: '{player_name}' not clearly mentioned in '{text}' (context: {context})")
     
     return is_valid
 
@@ -418,17 +419,19 @@ def validate_player_matches(text, matches, context=None):
     if context is None:
         context = detect_validation_context(text)
     
-    log_info(f"VALIDATION: Processing {len(matches)} matches with context: {context}")
+    log_debug(lambda: f"VALIDATION: Processing {len(matches)} matches with context: {context}")
     
     validated_matches = []
     
     for player in matches:
         # Use mention validation (more permissive) for full text validation
-        if validate_player_mention_in_text(text, player['name'], context):
+        accepted = validate_player_mention_in_text(text, player['name'], context)
+        flight_record("validator_verdict", player=player['name'], team=player['team'], context=context, accepted=accepted)
+        if accepted:
             validated_matches.append(player)
-            log_info(f"MATCH VALIDATED: {player['name']} ({player['team']}) in {context} context")
+            log_debug(lambda: f"MATCH VALIDATED: {player['name']} ({player['team']}) in {context} context")
         else:
-            log_info(f"MATCH REJECTED: {player['name']} ({player['team']}) - failed {context} validation")
+            log_debug(lambda: f"MATCH REJECTED: {player['name']} ({player['team']}) - failed {context} validation")
     
-    log_info(f"VALIDATION SUMMARY: {len(matches)} → {len(validated_matches)} matches (context: {context})")
+    log_debug(lambda: f"VALIDATION SUMMARY: {len(matches)} → {len(validated_matches)} matches (context: {context})")
     return validated_matches
@@ -0,0 +1,151 @@
+import cProfile
+import os
+import pstats
+import threading
+import time
+from datetime import datetime
+from config import PROFILE_TOP_FUNCTIONS, PROFILE_MAX_SECONDS
+
+# -------- ON-DEMAND REQUEST PROFILER --------
+
+PROFILE_DIR = "/persistence/profiles"
+
+class RequestProfiler:
+    """
+    cProfile around the next N !ask requests, armed at runtime by `!profile N`.
+
+    The event-loop thread is profiled from the first armed request's start to
+    the last one's end, so concurrent Discord I/O and other handlers show up as
+    well. Work handed to an executor through tracing.run_in_executor is
+    profiled per call in its worker thread and merged into the same stats.
+
+    A run that has not seen its N requests within `max_seconds` (or is
+    cancelled with `!profile off`) is stopped by stop(), which reports what
+    was collected so far.
+    """
+    def __init__(self, output_dir=PROFILE_DIR, top=PROFILE_TOP_FUNCTIONS,
+                 max_seconds=PROFILE_MAX_SECONDS, clock=time.monotonic):
+        self.output_dir = output_dir
+        self.top = top
+        self.max_seconds = max_seconds
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.run = 0                # Id of the current run; stale requests from a stopped run are ignored
+        self.reset()
+
+    def reset(self):
+        self.remaining = 0          # Requests still to be profiled
+        self.active = 0             # Profiled requests in flight
+        self.completed = 0
+        self.profile = None
+        self.thread_profiles = []   # Executor-thread profiles merged on completion
+        self.report_to = None       # Whatever the caller wants back with the report (e.g. a channel)
+        self.deadline = None
+
+    @property
+    def armed(self):
+        return self.remaining > 0 or self.active > 0
+
+    @property
+    def expired(self):
+        return self.armed and self.deadline is not None and self.clock() >= self.deadline
+
+    def arm(self, count, report_to=None):
+        """Profile the next `count` requests; returns the run id, or False if a run is already in progress"""
+        if self.armed:
+            return False
+        self.reset()
+        self.run += 1
+        self.remaining = count
+        self.report_to = report_to
+        self.deadline = self.clock() + self.max_seconds
+        return self.run
+
+    def start_request(self):
+        """Called as a request starts; the run id if this request is being profiled, else False"""
+        if self.remaining <= 0 or self.expired:
+            return False
+        self.remaining -= 1
+        self.active += 1
+        if self.profile is None:
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        return self.run
+
+    def finish_request(self, profiled):
+        """
+        Called as a request ends. When the last profiled request finishes (or
+        the run is past its time limit), stops profiling, writes the stats and
+        returns (path, summary, report_to); otherwise None.
+        """
+        if not profiled or profiled != self.run or not self.armed:
+            return None  # Not profiled, or its run was already stopped
+        self.active -= 1
+        self.completed += 1
+        if self.expired:
+            return self.stop("time limit reached")
+        if self.remaining > 0 or self.active > 0:
+            return None
+        return self._finish()
+
+    def stop(self, reason, run=None):
+        """
+        End the current run early (time limit or `!profile off`) and report the
+        requests completed so far; None if nothing is running (or `run` is not
+        the current one).
+        """
+        if not self.armed or (run is not None and run != self.run):
+            return None
+        return self._finish(f"Stopped early ({reason}) with {self.remaining + self.active} requests to go")
+
+    def _finish(self, note=None):
+        if self.profile is None:
+            result = (None, f"{note}\nNo requests were profiled", self.report_to)
+        else:
+            self.profile.disable()
+            stats = pstats.Stats(self.profile)
+            with self.lock:
+                for thread_profile in self.thread_profiles:
+                    stats.add(thread_profile)
+            summary = self.summary(stats)
+            result = (self._write(stats), f"{note}\n{summary}" if note else summary, self.report_to)
+        self.reset()
+        return result
+
+    def profile_call(self, func, *args):
+        """Run `func` (in an executor thread), profiling it if a run is in progress"""
+        if self.profile is None:
+            return func(*args)
+        thread_profile = cProfile.Profile()
+        try:
+            thread_profile.enable()
+        except ValueError:
+            return func(*args)  # A process-wide profiler already covers this thread
+        try:
+            return func(*args)
+        finally:
+            thread_profile.disable()
+            with self.lock:
+                self.thread_profiles.append(thread_profile)
+
+    def _write(self, stats):
+        path = os.path.join(self.output_dir, f"ask_{datetime.utcnow():%Y%m%dT%H%M%S}_{self.completed}req.prof")
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            stats.dump_stats(path)
+        except OSError as e:
+            print(f"⚠️ Profile write failed: {e}")
+            return None
+        return path
+
+    def summary(self, stats):
+        """Top functions by cumulative time, one short line each"""
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+        lines = [f"{self.completed} requests, {stats.total_tt * 1000:.0f}ms profiled"]
+        for (filename, line, function), (_, calls, self_time, cumulative, _) in rows[:self.top]:
+            location = f"{os.path.basename(filename)}:{line}" if line else filename
+            lines.append(f"{cumulative * 1000:7.0f}ms cum {self_time * 1000:6.0f}ms self {calls:6d}x  {function} ({location})")
+        return "\n".join(lines)
+
+# Global request profiler instance
+request_profiler = RequestProfiler()
@@ -0,0 +1,146 @@
+import asyncio
+import time
+
+# -------- ASYNC TOKEN-BUCKET RATE LIMITER --------
+
+# Normal limits: sustained calls per hour with a per-minute burst allowance
+OPERATION_CALLS_PER_HOUR = 100
+OPERATION_BURST = 10
+EMERGENCY_CALLS_PER_HOUR = 30
+EMERGENCY_BURST = 3
+
+# Shared ceiling across every operation (Discord's own global limit is 50 requests/second)
+GLOBAL_CALLS_PER_SECOND = 40
+GLOBAL_BURST = 40
+EMERGENCY_GLOBAL_CALLS_PER_SECOND = 5
+EMERGENCY_GLOBAL_BURST = 5
+
+# Longest a caller may be queued (the old limiter's emergency cooldown); beyond that acquire() fails fast
+MAX_WAIT_SECONDS = 120
+
+class RateLimitExceeded(Exception):
+    """Raised by AsyncRateLimiter.acquire when the wait for a token would exceed its cap"""
+    def __init__(self, operation, delay):
+        super().__init__(f"{operation} would wait {delay:.0f}s for a rate limit token")
+        self.operation = operation
+        self.delay = delay
+
+class TokenBucket:
+    """
+    Token bucket with reservation: a call always takes a token, and if the bucket
+    is empty the balance goes negative and the caller is told how long to wait.
+    Each waiter sleeps exactly once, in arrival order, and accounting is O(1).
+    """
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = rate            # tokens added per second
+        self.capacity = capacity    # maximum burst
+        self.tokens = capacity
+        self.updated = clock()
+
+    def _refill(self, now):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def reserve(self, now):
+        """Take one token; returns the seconds to wait before using it (0 if available now)"""
+        self._refill(now)
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def refund(self):
+        """Give back a reserved token that will not be used"""
+        self.tokens = min(self.capacity, self.tokens + 1)
+
+    def peek(self, now):
+        """Seconds until a token would be available, without taking one"""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def reconfigure(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = min(self.tokens, capacity)
+
+class AsyncRateLimiter:
+    """
+    CRITICAL: Prevents Discord IP bans by rate limiting ALL Discord operations.
+
+    Every operation has its own bucket and all operations share a global bucket.
+    A caller waits in its operation's bucket first and only then draws from the
+    global one, so a flood of one operation queues behind itself instead of
+    spending everyone else's allowance. Waiting is always `await asyncio.sleep`,
+    never a blocking sleep, so heartbeats and other users keep running.
+
+    A caller that would be queued longer than `max_wait` gets RateLimitExceeded
+    straight away, and a cancelled waiter hands its token back, so a backlog
+    of waiters cannot push everyone's wait out without bound.
+    """
+    def __init__(self, clock=time.monotonic, sleep=asyncio.sleep, max_wait=MAX_WAIT_SECONDS):
+        self.clock = clock
+        self.sleep = sleep
+        self.max_wait = max_wait
+        self.emergency_mode = False
+        self.operation_rate = OPERATION_CALLS_PER_HOUR / 3600
+        self.operation_burst = OPERATION_BURST
+        self.buckets = {}  # operation: TokenBucket
+        self.global_bucket = TokenBucket(GLOBAL_CALLS_PER_SECOND, GLOBAL_BURST, clock)
+        self.calls = {}    # operation: calls admitted
+        self.waits = {}    # operation: calls that had to wait
+        self.rejected = {} # operation: calls refused because the wait exceeded max_wait
+
+    def _bucket(self, operation):
+        bucket = self.buckets.get(operation)
+        if bucket is None:
+            bucket = TokenBucket(self.operation_rate, self.operation_burst, self.clock)
+            self.buckets[operation] = bucket
+        return bucket
+
+    async def acquire(self, operation="general"):
+        """
+        Wait (without blocking the event loop) until `operation` may make one call.
+        Raises RateLimitExceeded instead if that would take longer than max_wait.
+        """
+        bucket = self._bucket(operation)
+        delay = bucket.reserve(self.clock())
+        if delay > self.max_wait:
+            bucket.refund()
+            self.rejected[operation] = self.rejected.get(operation, 0) + 1
+            print(f"🚨 RATE_LIMIT: {operation} refused, wait would be {delay:.1f}s")
+            raise RateLimitExceeded(operation, delay)
+        if delay > 0:
+            self.waits[operation] = self.waits.get(operation, 0) + 1
+            print(f"🚨 RATE_LIMIT: {operation} waiting {delay:.1f}s")
+            await self._wait(delay, bucket)
+
+        await self._wait(self.global_bucket.reserve(self.clock()), self.global_bucket)
+
+        self.calls[operation] = self.calls.get(operation, 0) + 1
+
+    async def _wait(self, delay, bucket):
+        """Sleep out a reservation; a cancelled caller refunds its token so later waiters are not pushed back"""
+        if delay <= 0:
+            return
+        try:
+            await self.sleep(delay)
+        except asyncio.CancelledError:
+            bucket.refund()
+            raise
+
+    def can_proceed(self, operation="general"):
+        """Check if operation could proceed right now without waiting"""
+        now = self.clock()
+        return self._bucket(operation).peek(now) == 0 and self.global_bucket.peek(now) == 0
+
+    def enter_emergency_mode(self):
+        """Enter emergency mode with extreme rate limiting"""
+        self.emergency_mode = True
+        self.operation_rate = EMERGENCY_CALLS_PER_HOUR / 3600
+        self.operation_burst = EMERGENCY_BURST
+        for bucket in self.buckets.values():
+            bucket.reconfigure(self.operation_rate, self.operation_burst)
+        self.global_bucket.reconfigure(EMERGENCY_GLOBAL_CALLS_PER_SECOND, EMERGENCY_GLOBAL_BURST)
+        print("🚨 ENTERING EMERGENCY MODE: Extreme rate limiting activated")
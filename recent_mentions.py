@@ -1,10 +1,16 @@
 import re
 import discord
+from functools import lru_cache
 from datetime import datetime, timedelta, timezone
-from config import FINAL_ANSWER_CHANNEL, ANSWERING_CHANNEL, RECENT_MENTION_HOURS, RECENT_MENTION_LIMIT
+import config
+from config import FINAL_ANSWER_CHANNEL, ANSWERING_CHANNEL, RECENT_MENTION_CACHE_SECONDS
 from utils import normalize_name
 from logging_system import log_error, log_info
 from player_matching_validator import validate_player_matches, validate_extracted_player_name
+from mention_index import recent_message_index, iter_recent_bot_messages, build_scan_index
+from single_flight import SingleFlight
+from mention_plans import get_mention_plan, message_tokens
+from discord_cache import channel_registry
 
 # -------- ENHANCED MESSAGE PARSING FUNCTIONS --------
 
@@ -149,6 +155,29 @@ def check_player_in_message_sections(player_name_normalized, player_uuid, sectio
 
 # -------- HIERARCHICAL MATCHING FUNCTIONS --------
 
+@lru_cache(maxsize=64)
+def _username_patterns(author_normalized):
+    """Compiled username-removal patterns; the author is almost always the bot, so these are built once"""
+    # Common bot message patterns that include usernames
+    username_patterns = [
+        f"\\*\\*{re.escape(author_normalized)}\\*\\* asked:",
+        f"\\*\\*{re.escape(author_normalized)}\\*\\*:",
+        f"{re.escape(author_normalized)} asked:",
+        f"{re.escape(author_normalized)}:",
+        # Handle potential variations
+        f"\\*\\*{re.escape(author_normalized.replace(' ', ''))}\\*\\* asked:",
+        f"\\*\\*{re.escape(author_normalized.replace(' ', ''))}\\*\\*:",
+        # Also remove just the raw username if it appears
+        f"\\b{re.escape(author_normalized)}\\b",
+    ]
+    compiled = []
+    for pattern in username_patterns:
+        try:
+            compiled.append(re.compile(pattern, re.IGNORECASE))
+        except re.error as e:
+            log_error(f"REGEX ERROR in username pattern: {e} - Pattern: {pattern}")
+    return tuple(compiled)
+
 def clean_message_content_for_scanning(message_content, message_author_name):
     """
     Remove username from message content to prevent false positives
@@ -163,32 +192,10 @@ def clean_message_content_for_scanning(message_content, message_author_name):
         return content_normalized
     
     try:
-        # Common bot message patterns that include usernames
-        username_patterns = [
-            f"\\*\\*{re.escape(author_normalized)}\\*\\* asked:",
-            f"\\*\\*{re.escape(author_normalized)}\\*\\*:",
-            f"{re.escape(author_normalized)} asked:",
-            f"{re.escape(author_normalized)}:",
-            # Handle potential variations
-            f"\\*\\*{re.escape(author_normalized.replace(' ', ''))}\\*\\* asked:",
-            f"\\*\\*{re.escape(author_normalized.replace(' ', ''))}\\*\\*:",
-]
-        
         # Remove username patterns from the content
         cleaned_content = content_normalized
-        for pattern in username_patterns:
-            try:
-                cleaned_content = re.sub(pattern, "", cleaned_content, flags=re.IGNORECASE)
-            except re.error as e:
-                log_error(f"REGEX ERROR in username pattern: {e} - Pattern: {pattern}")
-                continue
-        
-        # Also remove just the raw username if it appears
-        if len(author_normalized) > 0:
-            try:
-                cleaned_content = re.sub(f"\\b{re.escape(author_normalized)}\\b", "", cleaned_content, flags=re.IGNORECASE)
-            except re.error as e:
-                log_error(f"REGEX ERROR in raw username removal: {e} - Username: {author_normalized}")
+        for pattern in _username_patterns(author_normalized):
+            cleaned_content = pattern.sub("", cleaned_content)
         
         # Clean up extra whitespace
         cleaned_content = re.sub(r'\s+', ' ', cleaned_content).strip()
@@ -199,9 +206,29 @@ def clean_message_content_for_scanning(message_content, message_author_name):
         log_error(f"ERROR in clean_message_content_for_scanning: {e}")
         return content_normalized  # Return original if cleaning fails
 
+# Words that never count as "another player's first name" in lastname-only matches
+COMMON_WORDS = frozenset({
+    'the', 'and', 'or', 'but', 'for', 'with', 'have', 'has', 'had', 'been', 'being', 'was', 'were', 'are', 'is',
+    'i', 'as', 'a', 'an', 'he', 'she', 'it', 'they', 'them', 'their', 'his', 'her', 'him', 'my', 'me', 'we', 'us', 'our',
+    'you', 'your', 'this', 'that', 'these', 'those', 'what', 'when', 'where', 'why', 'who', 'how', 'which', 'whose', 'whom',
+    'will', 'would', 'could', 'should', 'can', 'may', 'might', 'must', 'shall', 'do', 'does', 'did', 'done',
+    'get', 'got', 'getting', 'go', 'going', 'went', 'gone', 'come', 'coming', 'came', 'see', 'seeing', 'saw', 'seen',
+    'look', 'looking', 'looked', 'find', 'finding', 'found', 'take', 'taking', 'took', 'taken', 'give', 'giving', 'gave', 'given',
+    'make', 'making', 'made', 'put', 'putting', 'say', 'saying', 'said', 'tell', 'telling', 'told', 'know', 'knowing', 'knew', 'known',
+    'think', 'thinking', 'thought', 'feel', 'feeling', 'felt', 'want', 'wanting', 'wanted', 'need', 'needing', 'needed',
+    'like', 'liking', 'liked', 'love', 'loving', 'loved', 'help', 'helping', 'helped', 'try', 'trying', 'tried',
+    'work', 'working', 'worked', 'play', 'playing', 'played', 'run', 'running', 'ran', 'walk', 'walking', 'walked',
+    'talk', 'talking', 'talked', 'ask', 'asking', 'asked', 'answer', 'answering', 'answered', 'call', 'calling', 'called',
+    'move', 'moving', 'moved', 'turn', 'turning', 'turned', 'start', 'starting', 'started', 'stop', 'stopping', 'stopped',
+    'solid', 'pickup', 'category', 'steals', 'performing', 'well', 'lately'
+})
+
+PLAYERS_SECTION_PATTERN = re.compile(r'\[players:(.*?)\]', re.IGNORECASE)
+
 def check_player_mention_hierarchical(player_name_normalized, player_uuid, message_normalized, message_content, message_author_name=None):
     """
     Enhanced hierarchical matching with phrase validation
+    Uses the player's precomputed MentionPlan, so most levels are token-set checks
     Returns: (is_match, match_type, confidence_score)
     """
     if 'rodon' in player_name_normalized.lower():
@@ -222,9 +249,11 @@ def check_player_mention_hierarchical(player_name_normalized, player_uuid, messa
         scanning_normalized = message_normalized
     
     try:
+        plan = get_mention_plan(player_name_normalized)
+        tokens = message_tokens(scanning_normalized)
+        
         # LEVEL 1: EXACT full name match (highest confidence = 1.0)
-        exact_pattern = f"\\b{re.escape(player_name_normalized)}\\b"
-        if re.search(exact_pattern, scanning_normalized):
+        if plan.has_full_name(tokens, scanning_normalized):
             if 'rodon' in player_name_normalized.lower():
                log_info(f"🔍 LEVEL 1 DEBUG: Found exact match for '{player_name_normalized}' in '{scanning_normalized[:50]}...'")
             # Apply phrase validation even to exact matches to catch false positives
@@ -237,12 +266,10 @@ def check_player_mention_hierarchical(player_name_normalized, player_uuid, messa
                 return False, "exact_full_name_rejected", 0.0
         
         # LEVEL 2: Full name in [Players: ...] list (high confidence = 0.9)
-        players_section_pattern = r'\[players:(.*?)\]'
-        players_match = re.search(players_section_pattern, scanning_normalized, re.IGNORECASE)
+        players_match = PLAYERS_SECTION_PATTERN.search(scanning_normalized) if '[players:' in scanning_normalized else None
         if players_match:
             players_text = players_match.group(1)
-            player_in_list_pattern = f"\\b{re.escape(player_name_normalized)}\\b"
-            if re.search(player_in_list_pattern, players_text):
+            if plan.has_full_name(message_tokens(players_text), players_text):
                 # Players list matches are generally safe, but still validate
                 mock_player = {'name': player_name_normalized, 'team': 'Unknown'}
                 validated_matches = validate_player_matches(players_text, [mock_player], context="metadata")
@@ -253,124 +280,86 @@ def check_player_mention_hierarchical(player_name_normalized, player_uuid, messa
                     return False, "players_list_rejected", 0.0
         
         # LEVEL 3: Last name with enhanced validation (medium confidence = 0.7)
-        if ' ' in player_name_normalized:
-            lastname = player_name_normalized.split()[-1]
-            firstname = player_name_normalized.split()[0]
-            
-            # 🔧 FIXED: Prevent partial word matches like "last" matching "lasts"
-            # Use stricter word boundary pattern that requires exact word match
-            lastname_pattern = f"\\b{re.escape(lastname)}\\b(?![a-z])"
-            lastname_matches = re.findall(lastname_pattern, scanning_normalized, re.IGNORECASE)
+        if plan.last_name:
+            lastname = plan.last_name
+            firstname = plan.first_name
             
-            if lastname_matches:
-                # Additional check: ensure the found word is exactly the lastname (not a partial match)
-                exact_lastname_found = any(match.lower() == lastname.lower() for match in lastname_matches)
+            # 🔧 FIXED: Prevent partial word matches like "last" matching "lasts" (whole-token check)
+            if plan.has_last_name(tokens, scanning_normalized):
+                if 'rodon' in player_name_normalized.lower():
+                    log_info(f"🔍 LEVEL 3 DEBUG: Found exact lastname '{lastname}' in '{scanning_normalized[:50]}...'")
+                    log_info(f"🔍 LEVEL 3 DEBUG: Baseball context check result: {validate_baseball_context(scanning_normalized, lastname)}")
                 
-                if exact_lastname_found:
-                    if 'rodon' in player_name_normalized.lower():
-                        log_info(f"🔍 LEVEL 3 DEBUG: Found exact lastname '{lastname}' in '{scanning_normalized[:50]}...'")
-                        log_info(f"🔍 LEVEL 3 DEBUG: Baseball context check result: {validate_baseball_context(scanning_normalized, lastname)}")
+                # 🔧 CRITICAL FIX: For lastname matches, also check if the first name is present
+                # This prevents "Brayan Abreu" from matching messages about "Wilyer Abreu"
+                if plan.has_first_name(tokens, scanning_normalized):
+                    # Both first and last name found - this is a strong match
+                    log_info(f"RECENT MENTION VALIDATION: Found both '{firstname}' and '{lastname}' in message - strong match")
+                    
+                    # Enhanced validation: baseball context + phrase validation
+                    if validate_baseball_context(scanning_normalized, lastname):
+                        # Additional phrase validation for lastname matches
+                        mock_player = {'name': player_name_normalized, 'team': 'Unknown'}
+                        validated_matches = validate_player_matches(scanning_normalized, [mock_player], context="expert_reply")
+                        if validated_matches:
+                            return True, "full_name_with_context_validated", 0.9  # Higher confidence for full name
+                        else:
+                            log_info(f"RECENT MENTION VALIDATION: Full name match for '{firstname} {lastname}' rejected by phrase validation")
+                            return False, "full_name_context_rejected", 0.0
+                else:
+                    # Only lastname found - check if this could be a different player with same lastname
+                    log_info(f"RECENT MENTION VALIDATION: Found lastname '{lastname}' but not firstname '{firstname}' - checking for disambiguation")
                     
-                    # 🔧 CRITICAL FIX: For lastname matches, also check if the first name is present
-                    # This prevents "Brayan Abreu" from matching messages about "Wilyer Abreu"
-                    firstname_pattern = f"\\b{re.escape(firstname)}\\b(?![a-z])"
-                    firstname_in_message = bool(re.search(firstname_pattern, scanning_normalized, re.IGNORECASE))
+                    # Fast path: a rostered teammate-by-surname is named in the message
+                    conflicting = plan.conflicting_first_names & tokens
+                    if conflicting:
+                        log_info(f"RECENT MENTION VALIDATION: Found conflicting first names for '{lastname}': {sorted(conflicting)}")
+                        return False, "lastname_different_player", 0.0
                     
-                    if firstname_in_message:
-                        # Both first and last name found - this is a strong match
-                        log_info(f"RECENT MENTION VALIDATION: Found both '{firstname}' and '{lastname}' in message - strong match")
-                        
-                        # Enhanced validation: baseball context + phrase validation
+                    # Look for any other first name in the message that might indicate a different player
+                    potential_other_firstnames = [
+                        word for word in scanning_normalized.split()
+                        # Skip common words and the lastname we already found
+                        if len(word) >= 3 and word != lastname and word not in COMMON_WORDS and word.isalpha()
+                    ]
+                    
+                    if potential_other_firstnames:
+                        log_info(f"RECENT MENTION VALIDATION: Found potential other first names: {potential_other_firstnames}")
+                        log_info(f"RECENT MENTION VALIDATION: Lastname '{lastname}' likely refers to different player, not '{firstname} {lastname}'")
+                        return False, "lastname_different_player", 0.0
+                    else:
+                        # No other first names found, could still be the same player referenced by lastname only
+                        # But be more conservative - require baseball context
                         if validate_baseball_context(scanning_normalized, lastname):
                             # Additional phrase validation for lastname matches
                             mock_player = {'name': player_name_normalized, 'team': 'Unknown'}
                             validated_matches = validate_player_matches(scanning_normalized, [mock_player], context="expert_reply")
                             if validated_matches:
-                                return True, "full_name_with_context_validated", 0.9  # Higher confidence for full name
+                                return True, "lastname_only_with_context_validated", 0.6  # Lower confidence for lastname only
                             else:
-                                log_info(f"RECENT MENTION VALIDATION: Full name match for '{firstname} {lastname}' rejected by phrase validation")
-                                return False, "full_name_context_rejected", 0.0
-                    else:
-                        # Only lastname found - check if this could be a different player with same lastname
-                        log_info(f"RECENT MENTION VALIDATION: Found lastname '{lastname}' but not firstname '{firstname}' - checking for disambiguation")
-                        
-                        # Look for any other first name in the message that might indicate a different player
-                        message_words = scanning_normalized.split()
-                        potential_other_firstnames = []
-                        
-                        # Define common words to skip when looking for potential first names
-                        common_words = {
-                            'the', 'and', 'or', 'but', 'for', 'with', 'have', 'has', 'had', 'been', 'being', 'was', 'were', 'are', 'is',
-                            'i', 'as', 'a', 'an', 'he', 'she', 'it', 'they', 'them', 'their', 'his', 'her', 'him', 'my', 'me', 'we', 'us', 'our',
-                            'you', 'your', 'this', 'that', 'these', 'those', 'what', 'when', 'where', 'why', 'who', 'how', 'which', 'whose', 'whom',
-                            'will', 'would', 'could', 'should', 'can', 'may', 'might', 'must', 'shall', 'do', 'does', 'did', 'done',
-                            'get', 'got', 'getting', 'go', 'going', 'went', 'gone', 'come', 'coming', 'came', 'see', 'seeing', 'saw', 'seen',
-                            'look', 'looking', 'looked', 'find', 'finding', 'found', 'take', 'taking', 'took', 'taken', 'give', 'giving', 'gave', 'given',
-                            'make', 'making', 'made', 'put', 'putting', 'say', 'saying', 'said', 'tell', 'telling', 'told', 'know', 'knowing', 'knew', 'known',
-                            'think', 'thinking', 'thought', 'feel', 'feeling', 'felt', 'want', 'wanting', 'wanted', 'need', 'needing', 'needed',
-                            'like', 'liking', 'liked', 'love', 'loving', 'loved', 'help', 'helping', 'helped', 'try', 'trying', 'tried',
-                            'work', 'working', 'worked', 'play', 'playing', 'played', 'run', 'running', 'ran', 'walk', 'walking', 'walked',
-                            'talk', 'talking', 'talked', 'ask', 'asking', 'asked', 'answer', 'answering', 'answered', 'call', 'calling', 'called',
-                            'move', 'moving', 'moved', 'turn', 'turning', 'turned', 'start', 'starting', 'started', 'stop', 'stopping', 'stopped',
-                            'solid', 'pickup', 'category', 'steals', 'performing', 'well', 'lately'
-                        }
-                        
-                        for word in message_words:
-                            # Skip common words and the lastname we already found
-                            if (len(word) >= 3 and 
-                                word.lower() != lastname.lower() and 
-                                word.lower() not in common_words and
-                                word.isalpha()):
-                                potential_other_firstnames.append(word)
-                        
-                        if potential_other_firstnames:
-                            log_info(f"RECENT MENTION VALIDATION: Found potential other first names: {potential_other_firstnames}")
-                            log_info(f"RECENT MENTION VALIDATION: Lastname '{lastname}' likely refers to different player, not '{firstname} {lastname}'")
-                            return False, "lastname_different_player", 0.0
+                                log_info(f"RECENT MENTION VALIDATION: Lastname-only match for '{lastname}' rejected by phrase validation")
+                                return False, "lastname_only_context_rejected", 0.0
                         else:
-                            # No other first names found, could still be the same player referenced by lastname only
-                            # But be more conservative - require baseball context
-                            if validate_baseball_context(scanning_normalized, lastname):
-                                # Additional phrase validation for lastname matches
-                                mock_player = {'name': player_name_normalized, 'team': 'Unknown'}
-                                validated_matches = validate_player_matches(scanning_normalized, [mock_player], context="expert_reply")
-                                if validated_matches:
-                                    return True, "lastname_only_with_context_validated", 0.6  # Lower confidence for lastname only
-                                else:
-                                    log_info(f"RECENT MENTION VALIDATION: Lastname-only match for '{lastname}' rejected by phrase validation")
-                                    return False, "lastname_only_context_rejected", 0.0
-                            else:
-                                log_info(f"RECENT MENTION VALIDATION: Lastname-only match for '{lastname}' rejected - insufficient baseball context")
-                                return False, "lastname_only_no_context", 0.0
-                else:
-                    log_info(f"RECENT MENTION VALIDATION: Lastname '{lastname}' found but only as partial match - rejecting")
-                    return False, "lastname_partial_match_rejected", 0.0
+                            log_info(f"RECENT MENTION VALIDATION: Lastname-only match for '{lastname}' rejected - insufficient baseball context")
+                            return False, "lastname_only_no_context", 0.0
         
         # LEVEL 4: First name with enhanced validation (lower confidence = 0.6)
-        if ' ' in player_name_normalized:
-            firstname = player_name_normalized.split()[0]
-            # Only for distinctive first names (length >= 5 to avoid common names like "mike", "john")
-            if len(firstname) >= 5:
-                # 🔧 FIXED: Use same stricter pattern as lastname to prevent partial matches
-                firstname_pattern = f"\\b{re.escape(firstname)}\\b(?![a-z])"
-                firstname_matches = re.findall(firstname_pattern, scanning_normalized, re.IGNORECASE)
-                
-                if firstname_matches:
-                    # Additional check: ensure the found word is exactly the firstname (not a partial match)
-                    exact_firstname_found = any(match.lower() == firstname.lower() for match in firstname_matches)
-                    
-                    if exact_firstname_found and validate_baseball_context(scanning_normalized, firstname):
-                        # Additional phrase validation for firstname matches
-                        mock_player = {'name': player_name_normalized, 'team': 'Unknown'}
-                        validated_matches = validate_player_matches(scanning_normalized, [mock_player], context="expert_reply")
-                        if validated_matches:
-                            return True, "firstname_with_context_validated", 0.6
-                        else:
-                            log_info(f"RECENT MENTION VALIDATION: Firstname match for '{firstname}' rejected by phrase validation")
-                            return False, "firstname_context_rejected", 0.0
+        # Only for distinctive first names (length >= 5 to avoid common names like "mike", "john")
+        if plan.distinctive_first_name:
+            firstname = plan.first_name
+            if plan.has_first_name(tokens, scanning_normalized):
+                if validate_baseball_context(scanning_normalized, firstname):
+                    # Additional phrase validation for firstname matches
+                    mock_player = {'name': player_name_normalized, 'team': 'Unknown'}
+                    validated_matches = validate_player_matches(scanning_normalized, [mock_player], context="expert_reply")
+                    if validated_matches:
+                        return True, "firstname_with_context_validated", 0.6
                     else:
-                        log_info(f"RECENT MENTION VALIDATION: Firstname '{firstname}' found but only as partial match or failed baseball context - rejecting")
-                        return False, "firstname_partial_match_rejected", 0.0
+                        log_info(f"RECENT MENTION VALIDATION: Firstname match for '{firstname}' rejected by phrase validation")
+                        return False, "firstname_context_rejected", 0.0
+                else:
+                    log_info(f"RECENT MENTION VALIDATION: Firstname '{firstname}' found but only as partial match or failed baseball context - rejecting")
+                    return False, "firstname_partial_match_rejected", 0.0
         
         # LEVEL 5: No match
         if 'rodon' in player_name_normalized.lower():
@@ -438,139 +427,151 @@ def validate_baseball_context(message_normalized, name_part):
 
 # -------- RECENT MENTIONS CHECKING --------
 
+# Coalesces concurrent lookups per (guild, player, window); cleared whenever the bot posts
+recent_mention_flights = SingleFlight(cache_ttl=RECENT_MENTION_CACHE_SECONDS)
+
+async def _lookup_player_recent_status(guild, player, answering_channel, final_channel, time_threshold):
+    """
+    Walk both channels for a single player
+    Returns: (status, answering_message_url, answer_message_url) - status is None when nothing blocks
+    """
+    player_name_normalized = normalize_name(player['name'])
+    player_uuid = player['uuid'].lower()
+    
+    log_info(f"RECENT MENTION CHECK: Checking player '{player['name']}' (normalized: '{player_name_normalized}', uuid: {player_uuid[:8]}...)")
+    
+    # TIER 1: Check question-reposting channel (pending status)
+    log_info(f"TIER 1: Checking answering channel for pending questions...")
+    found_in_answering = False
+    answering_message_url = None
+    if answering_channel:
+        try:
+            message_count = 0
+            # Only bot messages are yielded, from the index or a bounded scan while it warms up
+            async for message in iter_recent_bot_messages(guild, answering_channel, time_threshold):
+                message_count += 1
+                message_normalized = message.normalized
+                
+                # 🔧 ENHANCED DEBUG: Log each message content for Francisco Lindor
+                if 'francisco' in player_name_normalized.lower() or 'lindor' in player_name_normalized.lower():
+                    log_info(f"🔧 LINDOR DEBUG: Checking bot message: '{message.content[:200]}...'")
+                    log_info(f"🔧 LINDOR DEBUG: Normalized: '{message_normalized[:200]}...'")
+                    log_info(f"🔧 LINDOR DEBUG: Looking for: '{player_name_normalized}' or '{player_uuid[:8]}'")
+                
+                # 🔧 FIXED: Add error handling for hierarchical matching
+                try:
+                    is_match, match_type, confidence = check_player_mention_hierarchical(
+                        player_name_normalized, player_uuid, message_normalized, message.content, 
+                        message_author_name=message.author_name
+                    )
+                    
+                    if is_match:
+                        log_info(f"RECENT MENTION CHECK: Found {player['name']} in bot message in answering channel ({match_type}, confidence: {confidence})")
+                        log_info(f"RECENT MENTION CHECK: Match details - player_normalized: '{player_name_normalized}', message_snippet: '{message_normalized[:100]}...'")
+                        found_in_answering = True
+                        answering_message_url = message.jump_url  # 🔧 CAPTURE THE MESSAGE URL
+                        break
+                except Exception as e:
+                    log_error(f"ERROR in hierarchical matching for message in answering channel: {e}")
+                    continue
+                        
+            log_info(f"RECENT MENTION CHECK: Checked {message_count} messages in answering channel")
+        except Exception as e:
+            log_error(f"RECENT MENTION CHECK: Error checking answering channel: {e}")
+    
+    # TIER 2 & 3: Check final answer channel (answered vs mentioned)
+    log_info(f"TIER 2 & 3: Checking final channel for answered/mentioned players...")
+    found_in_final = False
+    answer_message_url = None
+    if final_channel:
+        try:
+            message_count = 0
+            async for message in iter_recent_bot_messages(guild, final_channel, time_threshold):
+                message_count += 1
+                log_info(f"CHECKING MESSAGE: '{message.content[:100]}...' (ID: {message.id})")
+                
+                # Parse message into sections for tiered checking
+                try:
+                    # Parse message into sections
+                    sections = parse_final_answer_sections(message.content)
+                    
+                    # Use enhanced section-based matching
+                    is_match, match_type, confidence, section_found = check_player_in_message_sections(
+                        player_name_normalized, player_uuid, sections, message.author_name
+                    )
+                    
+                    if is_match:
+                        # TIER 2: Check if found in expert reply (strong block - answered)
+                        if section_found == "expert_reply" and confidence >= 0.7:
+                            log_info(f"TIER 2: Found {player['name']} in EXPERT REPLY - status: answered")
+                            found_in_final = True
+                            answer_message_url = message.jump_url
+                            break
+                        else:
+                            # TIER 3: Player not in expert reply, check if mentioned anywhere in full message
+                            is_full_match, full_match_type, full_confidence = check_player_mention_hierarchical(
+                                player_name_normalized, player_uuid, message.normalized, message.content, 
+                                message.author_name
+                            )
+                            
+                            if is_full_match and full_confidence >= 0.7:
+                                # Player was mentioned but NOT answered by expert - DON'T BLOCK
+                                log_info(f"TIER 3: {player['name']} mentioned in question but NOT in expert reply - allowing future questions")
+                                # Continue checking other messages, don't set found_in_final = True
+                            # If not found anywhere in this message, continue to next message
+                            
+                except Exception as e:
+                    log_error(f"ERROR in hierarchical matching for message in final channel: {e}")
+                    continue
+                        
+            log_info(f"RECENT MENTION CHECK: Checked {message_count} messages in final channel")
+        except Exception as e:
+            log_error(f"RECENT MENTION CHECK: Error checking final channel: {e}")
+    
+    # STEP 3: Determine status with tiered logic
+    status = None
+    if found_in_final:
+        # Only set to "answered" if found in expert reply section
+        status = "answered"
+        log_info(f"RECENT MENTION CHECK: {player['name']} found in expert reply - status: answered")
+        log_info(f"RECENT MENTION CHECK: Answer URL captured: {answer_message_url}")
+    elif found_in_answering:
+        # If found only in answering channel = pending
+        status = "pending"
+        log_info(f"RECENT MENTION CHECK: {player['name']} found only in answering channel - status: pending")
+    else:
+        # 🔧 NEW: No blocking status means question gets through
+        # This includes cases where player was mentioned in questions but not in expert replies
+        log_info(f"RECENT MENTION CHECK: {player['name']} NOT FOUND in expert replies or pending questions - allowing through")
+        # status remains None - no recent mention that should block
+    
+    return status, answering_message_url, answer_message_url
+
 async def check_recent_player_mentions(guild, players_to_check):
     """Check if any of the players were mentioned in the last X hours in bot messages only"""
     log_info(f"RECENT MENTION CHECK: Checking {len(players_to_check)} players")
     for p in players_to_check:
         log_info(f"RECENT MENTION CHECK: Looking for '{p['name']}' ({p['team']})")
     
-    time_threshold = datetime.now(timezone.utc) - timedelta(hours=RECENT_MENTION_HOURS)
+    time_threshold = datetime.now(timezone.utc) - timedelta(hours=config.RECENT_MENTION_HOURS)
     log_info(f"RECENT MENTION CHECK: Time threshold: {time_threshold}")
     recent_mentions = []
     
     # Get both channels
-    final_channel = discord.utils.get(guild.text_channels, name=FINAL_ANSWER_CHANNEL)
-    answering_channel = discord.utils.get(guild.text_channels, name=ANSWERING_CHANNEL)
+    final_channel = channel_registry.get(guild, FINAL_ANSWER_CHANNEL)
+    answering_channel = channel_registry.get(guild, ANSWERING_CHANNEL)
     
     log_info(f"RECENT MENTION CHECK: Answering channel: {ANSWERING_CHANNEL}")
     log_info(f"RECENT MENTION CHECK: Final channel: {FINAL_ANSWER_CHANNEL}")
     
     for player in players_to_check:
-        player_name_normalized = normalize_name(player['name'])
-        player_uuid = player['uuid'].lower()
-        
-        log_info(f"RECENT MENTION CHECK: Checking player '{player['name']}' (normalized: '{player_name_normalized}', uuid: {player_uuid[:8]}...)")
-        
-        # TIER 1: Check question-reposting channel (pending status)
-        log_info(f"TIER 1: Checking answering channel for pending questions...")
-        found_in_answering = False
-        answering_message_url = None
-        if answering_channel:
-            try:
-                message_count = 0
-                async for message in answering_channel.history(after=time_threshold, limit=RECENT_MENTION_LIMIT):
-                    message_count += 1
-                    # Only check messages from the bot itself
-                    if message.author == guild.me:  # guild.me is the bot
-                        message_normalized = normalize_name(message.content)
-                        
-                        # 🔧 ENHANCED DEBUG: Log each message content for Francisco Lindor
-                        if 'francisco' in player_name_normalized.lower() or 'lindor' in player_name_normalized.lower():
-                            log_info(f"🔧 LINDOR DEBUG: Checking bot message: '{message.content[:200]}...'")
-                            log_info(f"🔧 LINDOR DEBUG: Normalized: '{message_normalized[:200]}...'")
-                            log_info(f"🔧 LINDOR DEBUG: Looking for: '{player_name_normalized}' or '{player_uuid[:8]}'")
-                        
-                        # 🔧 FIXED: Add error handling for hierarchical matching
-                        try:
-                            is_match, match_type, confidence = check_player_mention_hierarchical(
-                                player_name_normalized, player_uuid, message_normalized, message.content, 
-                                message_author_name=message.author.display_name
-                            )
-                            
-                            if is_match:
-                                log_info(f"RECENT MENTION CHECK: Found {player['name']} in bot message in answering channel ({match_type}, confidence: {confidence})")
-                                log_info(f"RECENT MENTION CHECK: Match details - player_normalized: '{player_name_normalized}', message_snippet: '{message_normalized[:100]}...'")
-                                found_in_answering = True
-                                answering_message_url = message.jump_url  # 🔧 CAPTURE THE MESSAGE URL
-                                break
-                        except Exception as e:
-                            log_error(f"ERROR in hierarchical matching for message in answering channel: {e}")
-                            continue
-                            
-                log_info(f"RECENT MENTION CHECK: Checked {message_count} messages in answering channel")
-            except Exception as e:
-                log_error(f"RECENT MENTION CHECK: Error checking answering channel: {e}")
-        
-        # TIER 2 & 3: Check final answer channel (answered vs mentioned)
-        log_info(f"TIER 2 & 3: Checking final channel for answered/mentioned players...")
-        found_in_final = False
-        answer_message_url = None
-        if final_channel:
-            try:
-                message_count = 0
-                async for message in final_channel.history(after=time_threshold, limit=RECENT_MENTION_LIMIT):
-                    message_count += 1
-                    # Only check messages from the bot itself
-                    log_info(f"CHECKING MESSAGE: '{message.content[:100]}...' (ID: {message.id})")
-                    if message.author == guild.me:  # guild.me is the bot
-                        message_normalized = normalize_name(message.content)
-                        
-                        # Parse message into sections for tiered checking
-                        try:
-                            # Parse message into sections
-                            sections = parse_final_answer_sections(message.content)
-                            
-                            # Use enhanced section-based matching
-                            is_match, match_type, confidence, section_found = check_player_in_message_sections(
-                                player_name_normalized, player_uuid, sections, message.author.display_name
-                            )
-                            
-                            if is_match:
-                                # TIER 2: Check if found in expert reply (strong block - answered)
-                                if section_found == "expert_reply" and confidence >= 0.7:
-                                    log_info(f"TIER 2: Found {player['name']} in EXPERT REPLY - status: answered")
-                                    found_in_final = True
-                                    answer_message_url = message.jump_url
-                                    break
-                                else:
-                                    # TIER 3: Player not in expert reply, check if mentioned anywhere in full message
-                                    full_message_normalized = normalize_name(message.content)
-                                    is_full_match, full_match_type, full_confidence = check_player_mention_hierarchical(
-                                        player_name_normalized, player_uuid, full_message_normalized, message.content, 
-                                        message.author.display_name
-                                    )
-                                    
-                                    if is_full_match and full_confidence >= 0.7:
-                                        # Player was mentioned but NOT answered by expert - DON'T BLOCK
-                                        log_info(f"TIER 3: {player['name']} mentioned in question but NOT in expert reply - allowing future questions")
-                                        # Continue checking other messages, don't set found_in_final = True
-                                    # If not found anywhere in this message, continue to next message
-                                    
-                        except Exception as e:
-                            log_error(f"ERROR in hierarchical matching for message in final channel: {e}")
-                            continue
-                            
-                log_info(f"RECENT MENTION CHECK: Checked {message_count} messages in final channel")
-            except Exception as e:
-                log_error(f"RECENT MENTION CHECK: Error checking final channel: {e}")
+        # Concurrent requests for the same player share one history walk
+        flight_key = (guild.id, player['uuid'].lower(), config.RECENT_MENTION_HOURS)
+        status, answering_message_url, answer_message_url = await recent_mention_flights.do(
+            flight_key,
+            lambda player=player: _lookup_player_recent_status(guild, player, answering_channel, final_channel, time_threshold)
+        )
         
-        # STEP 3: Determine status with tiered logic
-        status = None
-        if found_in_final:
-            # Only set to "answered" if found in expert reply section
-            status = "answered"
-            log_info(f"RECENT MENTION CHECK: {player['name']} found in expert reply - status: answered")
-            log_info(f"RECENT MENTION CHECK: Answer URL captured: {answer_message_url}")
-        elif found_in_answering:
-            # If found only in answering channel = pending
-            status = "pending"
-            log_info(f"RECENT MENTION CHECK: {player['name']} found only in answering channel - status: pending")
-        else:
-            # 🔧 NEW: No blocking status means question gets through
-            # This includes cases where player was mentioned in questions but not in expert replies
-            log_info(f"RECENT MENTION CHECK: {player['name']} NOT FOUND in expert replies or pending questions - allowing through")
-            # status remains None - no recent mention that should block
-
         # Add to results only if there's a blocking status
         if status:
             # Check for duplicates
@@ -604,73 +605,48 @@ async def check_recent_player_mentions(guild, players_to_check):
 
 async def check_fallback_recent_mentions(guild, potential_player_words):
     """Enhanced fallback check for recent mentions using potential player words with validation"""
-    time_threshold = datetime.now(timezone.utc) - timedelta(hours=RECENT_MENTION_HOURS)
+    answering_channel = channel_registry.get(guild, ANSWERING_CHANNEL)
+    final_channel = channel_registry.get(guild, FINAL_ANSWER_CHANNEL)
+    channels = [channel for channel in (answering_channel, final_channel) if channel]
     
-    answering_channel = discord.utils.get(guild.text_channels, name=ANSWERING_CHANNEL)
-    final_channel = discord.utils.get(guild.text_channels, name=FINAL_ANSWER_CHANNEL)
+    # Each word becomes a dictionary lookup; while the shared index warms up,
+    # one bounded scan per channel builds a throwaway index for this request
+    if recent_message_index.is_ready:
+        index = recent_message_index
+        index.expire()
+    else:
+        index = await build_scan_index(guild, channels)
+    channel_ids = {channel.id for channel in channels}
     
     for word in potential_player_words:
         # 🔧 FIXED: Skip very short words that are likely to cause false positives
         if len(word) < 4:
             log_info(f"FALLBACK: Skipping short word '{word}' (length < 4)")
             continue
-            
-        # Check answering channel
-        if answering_channel:
-            try:
-                async for message in answering_channel.history(after=time_threshold, limit=RECENT_MENTION_LIMIT):
-                    if message.author == guild.me:
-                        message_normalized = normalize_name(message.content)
-                        
-                        # 🔧 FIXED: Use word boundary detection instead of simple substring matching
-                        word_pattern = f"\\b{re.escape(word)}\\b(?![a-z])"
-                        word_matches = re.findall(word_pattern, message_normalized, re.IGNORECASE)
-                        
-                        if word_matches:
-                            # Additional check: ensure exact word match (not partial)
-                            exact_word_found = any(match.lower() == word.lower() for match in word_matches)
-                            
-                            if exact_word_found:
-                                # Apply phrase validation to fallback matches
-                                mock_player = {'name': word, 'team': 'Unknown'}
-                                validated_matches = validate_player_matches(message_normalized, [mock_player], context="expert_reply")
-                                if validated_matches:
-                                    log_info(f"FALLBACK: Found exact word '{word}' in recent bot message in answering channel (validated)")
-                                    return True
-                                else:
-                                    log_info(f"FALLBACK VALIDATION: Exact word '{word}' found but rejected by phrase validation")
-                            else:
-                                log_info(f"FALLBACK: Word '{word}' found but only as partial match in answering channel - rejecting")
-            except Exception as e:
-                log_error(f"FALLBACK: Error checking answering channel: {e}")
         
-        # Check final channel
-        if final_channel:
+        hits = index.lookup(word, channel_ids=channel_ids)
+        if not hits:
+            continue
+        
+        # 🔧 FIXED: Use word boundary detection instead of simple substring matching
+        word_pattern = re.compile(f"\\b{re.escape(word)}\\b(?![a-z])", re.IGNORECASE)
+        
+        for entry in hits:
             try:
-                async for message in final_channel.history(after=time_threshold, limit=RECENT_MENTION_LIMIT):
-                    if message.author == guild.me:
-                        message_normalized = normalize_name(message.content)
-                        
-                        # 🔧 FIXED: Use word boundary detection instead of simple substring matching
-                        word_pattern = f"\\b{re.escape(word)}\\b(?![a-z])"
-                        word_matches = re.findall(word_pattern, message_normalized, re.IGNORECASE)
-                        
-                        if word_matches:
-                            # Additional check: ensure exact word match (not partial)
-                            exact_word_found = any(match.lower() == word.lower() for match in word_matches)
-                            
-                            if exact_word_found:
-                                # Apply phrase validation to fallback matches
-                                mock_player = {'name': word, 'team': 'Unknown'}
-                                validated_matches = validate_player_matches(message_normalized, [mock_player], context="expert_reply")
-                                if validated_matches:
-                                    log_info(f"FALLBACK: Found exact word '{word}' in recent bot message in final channel (validated)")
-                                    return True
-                                else:
-                                    log_info(f"FALLBACK VALIDATION: Exact word '{word}' found but rejected by phrase validation")
-                            else:
-                                log_info(f"FALLBACK: Word '{word}' found but only as partial match in final channel - rejecting")
+                # Token hits can still miss the exact phrase (multi-token or punctuated words)
+                if not word_pattern.search(entry.normalized):
+                    log_info(f"FALLBACK: Word '{word}' found but only as partial match in {entry.channel_name} - rejecting")
+                    continue
+                
+                # Apply phrase validation to fallback matches
+                mock_player = {'name': word, 'team': 'Unknown'}
+                validated_matches = validate_player_matches(entry.normalized, [mock_player], context="expert_reply")
+                if validated_matches:
+                    log_info(f"FALLBACK: Found exact word '{word}' in recent bot message in {entry.channel_name} (validated)")
+                    return True
+                else:
+                    log_info(f"FALLBACK VALIDATION: Exact word '{word}' found but rejected by phrase validation")
             except Exception as e:
-                log_error(f"FALLBACK: Error checking final channel: {e}")
+                log_error(f"FALLBACK: Error checking indexed message {entry.id}: {e}")
     
     return False
@@ -0,0 +1,221 @@
+import asyncio
+import time
+import aiohttp
+from rate_limiter import TokenBucket
+
+# -------- DISCORD ROUTE-BUCKET RATE LIMITER --------
+
+GLOBAL_REQUESTS_PER_SECOND = 50  # Discord's documented global limit per bot token
+MAJOR_PARAMETER_SEGMENTS = ("channels", "guilds", "webhooks")
+API_PATH_PREFIX = "/api/"
+TOKEN_SEGMENTS = ("webhooks", "interactions")   # Followed by an id and a per-hook / per-interaction token
+UNLIMITED = 1 << 30                             # Limit recorded for routes that report none
+PRUNE_INTERVAL = 60.0                           # Seconds between sweeps for idle buckets
+
+def route_key(method, path):
+    """
+    Reduce a request path to (route template, major parameter) the way Discord buckets them,
+    e.g. DELETE /api/v10/channels/123/messages/456 -> ("DELETE channels/{channels}/messages/{id}", "123")
+    """
+    parts = [part for part in path.split("/") if part]
+    if parts[:1] == ["api"]:
+        parts = parts[1:]
+    if parts and parts[0].startswith("v") and parts[0][1:].isdigit():
+        parts = parts[1:]
+
+    template = []
+    major = []
+    for i, part in enumerate(parts):
+        previous = parts[i - 1] if i else ""
+        if part.isdigit():
+            if not major and previous in MAJOR_PARAMETER_SEGMENTS:
+                major.append(part)
+                template.append("{" + previous + "}")
+            else:
+                template.append("{id}")
+        elif previous == "reactions":
+            template.append("{emoji}")
+        elif i >= 2 and parts[i - 2] in TOKEN_SEGMENTS and previous.isdigit():
+            if parts[i - 2] == "webhooks":
+                major.append(part)  # Webhook token is part of the major parameter
+            template.append("{token}")
+        else:
+            template.append(part)
+    return f"{method.upper()} " + "/".join(template), "/".join(major)
+
+class RouteBucket:
+    """What we currently know about one Discord rate-limit bucket"""
+    __slots__ = ("limit", "remaining", "reset_at", "in_flight", "changed")
+
+    def __init__(self):
+        self.limit = None               # Unknown until the first response
+        self.remaining = 1              # One discovery request may go out before limits are known
+        self.reset_at = 0.0             # Monotonic time the current window ends (inf: open, end not reported yet)
+        self.in_flight = 0
+        self.changed = asyncio.Event()  # Set (and replaced) whenever a response updates the bucket
+
+    def notify(self):
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+class RouteBucketLimiter:
+    """
+    Schedules requests against the real per-route buckets Discord reports.
+
+    - Route -> bucket hash mapping is learned from X-RateLimit-Bucket, so routes
+      that share a bucket share its budget
+    - Remaining / Reset-After decide when the next request in a bucket may go;
+      a new window only opens once every request from the old one has answered
+    - 429s with X-RateLimit-Global (or global scope) pause every route
+    - A token bucket keeps total traffic under the global per-second limit
+
+    Requests wait before they are sent instead of being retried after a 429.
+    """
+    def __init__(self, global_rate=GLOBAL_REQUESTS_PER_SECOND, clock=time.monotonic, sleep=asyncio.sleep):
+        self.clock = clock
+        self.sleep = sleep
+        self.bucket_hashes = {}     # route template: Discord bucket hash
+        self.buckets = {}           # (bucket hash or route template, major parameter): RouteBucket
+        self.global_bucket = TokenBucket(global_rate, global_rate, clock)
+        self.global_reset_at = 0.0
+        self.next_prune = clock() + PRUNE_INTERVAL
+        self.stats = {"requests": 0, "waits": 0, "rate_limited": 0, "global_rate_limited": 0}
+
+    def _bucket(self, route, major):
+        key = (self.bucket_hashes.get(route, route), major)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = RouteBucket()
+            self.buckets[key] = bucket
+        return bucket
+
+    def _prune(self, now):
+        """Forget buckets with nothing in flight whose window has ended; their limits are relearned on next use"""
+        self.next_prune = now + PRUNE_INTERVAL
+        idle = [key for key, bucket in self.buckets.items()
+                if not bucket.in_flight and (bucket.reset_at <= now or bucket.limit == UNLIMITED)]
+        for key in idle:
+            self.buckets.pop(key).notify()
+
+    async def acquire(self, method, path):
+        """Wait until a request to `path` fits in its bucket and the global limit"""
+        route, major = route_key(method, path)
+        if self.clock() >= self.next_prune:
+            self._prune(self.clock())
+
+        while True:
+            bucket = self._bucket(route, major)
+            now = self.clock()
+
+            if now < self.global_reset_at:
+                self.stats["waits"] += 1
+                await self.sleep(self.global_reset_at - now)
+                continue
+
+            if bucket.limit is None and bucket.in_flight:
+                # Another request is discovering this bucket's limits; wait for its response
+                await bucket.changed.wait()
+                continue
+
+            if now >= bucket.reset_at and not bucket.in_flight:
+                if bucket.limit is None:
+                    bucket.remaining = max(bucket.remaining, 1)  # Rediscover after a 429 without limit headers
+                else:
+                    # Window over and every response from it is in: open a new one
+                    bucket.remaining = bucket.limit
+                    bucket.reset_at = float("inf")
+
+            if bucket.remaining <= 0:
+                self.stats["waits"] += 1
+                if now < bucket.reset_at < float("inf"):
+                    await self.sleep(bucket.reset_at - now)
+                else:
+                    await bucket.changed.wait()
+                continue
+
+            bucket.remaining -= 1
+            bucket.in_flight += 1
+            break
+
+        delay = self.global_bucket.reserve(self.clock())
+        if delay > 0:
+            try:
+                await self.sleep(delay)
+            except BaseException:
+                # Cancelled before the request went out: aiohttp will not report it, so hand the slot back here
+                bucket.in_flight = max(bucket.in_flight - 1, 0)
+                bucket.remaining += 1
+                bucket.notify()
+                raise
+        self.stats["requests"] += 1
+
+    def update(self, method, path, status, headers):
+        """Learn bucket state from a response's rate-limit headers"""
+        route, major = route_key(method, path)
+        now = self.clock()
+
+        bucket_hash = headers.get("X-RateLimit-Bucket")
+        if bucket_hash and self.bucket_hashes.get(route) != bucket_hash:
+            # Move what we learned under the route template over to the shared bucket
+            old = self.buckets.pop((self.bucket_hashes.get(route, route), major), None)
+            self.bucket_hashes[route] = bucket_hash
+            if old is not None:
+                self.buckets.setdefault((bucket_hash, major), old)
+        bucket = self._bucket(route, major)
+        bucket.in_flight = max(bucket.in_flight - 1, 0)
+
+        if "X-RateLimit-Limit" in headers:
+            remaining = int(headers.get("X-RateLimit-Remaining", 0))
+            reset_at = now + float(headers.get("X-RateLimit-Reset-After", 0))
+            if bucket.reset_at == float("inf") or bucket.limit is None:
+                bucket.reset_at = reset_at
+            # Other requests may be in flight in this window, so never raise our own count
+            bucket.remaining = remaining if bucket.limit is None else min(bucket.remaining, remaining)
+            bucket.limit = int(headers["X-RateLimit-Limit"])
+        elif bucket.limit is None and status != 429:
+            bucket.limit = bucket.remaining = UNLIMITED  # Route reports no limits
+
+        if status == 429:
+            retry_after = float(headers.get("Retry-After", 1))
+            if headers.get("X-RateLimit-Global", "").lower() == "true" or headers.get("X-RateLimit-Scope") == "global":
+                self.stats["global_rate_limited"] += 1
+                self.global_reset_at = max(self.global_reset_at, now + retry_after)
+            else:
+                self.stats["rate_limited"] += 1
+                bucket.remaining = 0
+                bucket.reset_at = now + retry_after
+
+        bucket.notify()
+
+    def release(self, method, path):
+        """A request failed without a response; give its slot back"""
+        route, major = route_key(method, path)
+        bucket = self._bucket(route, major)
+        bucket.in_flight = max(bucket.in_flight - 1, 0)
+        if bucket.limit is None:
+            bucket.remaining = max(bucket.remaining, 1)  # Let the next request rediscover the limits
+        bucket.notify()
+
+    def trace_config(self):
+        """aiohttp TraceConfig that gates and observes every Discord API request on a session"""
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, context, params):
+            if API_PATH_PREFIX in params.url.path:
+                await self.acquire(params.method, params.url.path)
+
+        async def on_request_end(session, context, params):
+            if API_PATH_PREFIX in params.url.path:
+                self.update(params.method, params.url.path, params.response.status, params.response.headers)
+
+        async def on_request_exception(session, context, params):
+            if API_PATH_PREFIX in params.url.path:
+                self.release(params.method, params.url.path)
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_request_end.append(on_request_end)
+        trace.on_request_exception.append(on_request_exception)
+        return trace
+
+# Global route limiter instance (attached to the bot's HTTP session via http_trace)
+route_limiter = RouteBucketLimiter()
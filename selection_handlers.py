@@ -1,118 +1,63 @@
-import asyncio
-from datetime import datetime
-from config import SELECTION_TIMEOUT, pending_selections, timeout_tasks, FINAL_ANSWER_LINK
+import time
+import discord
+from config import FINAL_ANSWER_LINK, ALLOW_HELPER_REACTIONS, REACTIONS
 from logging_system import log_warning, log_error, log_debug, log_success, log_analytics, log_info
 from utils import normalize_name
+from outbound_scheduler import outbound, send_notice, submit_delete
+from selection_store import selection_store, PERSISTED_FIELDS
 
 # -------- ENHANCED TIMEOUT HANDLER --------
 
-async def handle_selection_timeout(user_id, ctx):
-    """ENHANCED: Timeout handler with better cleanup and logging"""
-    start_time = datetime.now()
-    
+async def handle_selection_timeout(selection_data):
+    """ENHANCED: Timeout handler with better cleanup and logging (called by the selection store sweeper)"""
+    user_id = selection_data["user_id"]
     try:
-        await asyncio.sleep(SELECTION_TIMEOUT)
-        
-        # Check if user still has pending selection
-        if user_id not in pending_selections:
-            log_debug(f"TIMEOUT: User {user_id} no longer has pending selection")
-            return
-        
-        selection_data = pending_selections[user_id]
-        
-        # Check if already locked (user made selection)
-        if selection_data.get("locked", False):
-            log_debug(f"TIMEOUT: User {user_id} selection already locked")
-            return
-        
-        # Lock to prevent race conditions
-        selection_data["locked"] = True
-        
-        timeout_duration = (datetime.now() - start_time).total_seconds()
+        timeout_duration = time.time() - selection_data["created_at"]
+        channel = selection_data["message"].channel
         
         log_warning(f"TIMEOUT: User {user_id} selection timed out after {timeout_duration}s")
         
         # Log analytics
         await log_analytics("User Selection", 
             user_id=user_id,
-            user_name=getattr(ctx.author, 'display_name', 'Unknown'),
-            channel=ctx.channel.name,
+            user_name=selection_data.get("user_name", "Unknown"),
+            channel=channel.name,
             question=selection_data.get("original_question", "Unknown"),
             timeout="timed_out",
             timeout_duration=int(timeout_duration),
             selection_type=selection_data.get("type", "unknown")
         )
         
-        # Clean up messages
+        # Clean up messages (batched into one bulk delete)
         messages_deleted = 0
-        try:
-            if "message" in selection_data:
-                await selection_data["message"].delete()
-                messages_deleted += 1
-                log_debug("TIMEOUT: Deleted selection message")
-        except Exception as e:
-            log_error(f"TIMEOUT: Failed to delete selection message: {e}")
+        if "message" in selection_data:
+            submit_delete(selection_data["message"])
+            messages_deleted += 1
+            log_debug("TIMEOUT: Queued delete of selection message")
         
-        try:
-            if "original_user_message" in selection_data:
-                await selection_data["original_user_message"].delete()
-                messages_deleted += 1
-                log_debug("TIMEOUT: Deleted original user message")
-        except Exception as e:
-            log_error(f"TIMEOUT: Failed to delete original message: {e}")
+        if "original_user_message" in selection_data:
+            submit_delete(selection_data["original_user_message"])
+            messages_deleted += 1
+            log_debug("TIMEOUT: Queued delete of original user message")
         
         # Send timeout notification
         try:
-            timeout_msg = await ctx.send("⏰ Selection timed out. Please try your question again.")
-            await timeout_msg.delete(delay=5)
+            await send_notice(channel, "⏰ Selection timed out. Please try your question again.")
             log_debug("TIMEOUT: Sent timeout notification")
         except Exception as e:
             log_error(f"TIMEOUT: Failed to send timeout message: {e}")
         
-        # Remove from pending selections
-        del pending_selections[user_id]
-        
-        # Clean up timeout task reference
-        if user_id in timeout_tasks:
-            del timeout_tasks[user_id]
-        
         log_success(f"TIMEOUT: Cleaned up user {user_id} selection (deleted {messages_deleted} messages)")
         
-    except asyncio.CancelledError:
-        log_debug(f"TIMEOUT: Task cancelled for user {user_id} (user made selection)")
-        # Clean up timeout task reference
-        if user_id in timeout_tasks:
-            del timeout_tasks[user_id]
     except Exception as e:
         log_error(f"TIMEOUT: Unexpected error for user {user_id}: {e}")
-        # Emergency cleanup
-        if user_id in pending_selections:
-            del pending_selections[user_id]
-        if user_id in timeout_tasks:
-            del timeout_tasks[user_id]
 
-# -------- SELECTION MANAGEMENT --------
+# The store's sweeper claims expired selections, so a timeout can never race a selection
+selection_store.on_expire = handle_selection_timeout
 
-def start_selection_timeout(user_id, ctx):
-    """Start a timeout task for a user selection"""
-    # Cancel existing timeout if any
-    if user_id in timeout_tasks:
-        timeout_tasks[user_id].cancel()
-    
-    # Start new timeout task
-    timeout_tasks[user_id] = asyncio.create_task(handle_selection_timeout(user_id, ctx))
-    log_debug(f"TIMEOUT: Started timeout task for user {user_id}")
+# -------- SELECTION PROCESSING --------
 
-def cancel_selection_timeout(user_id):
-    """Cancel timeout task for a user"""
-    if user_id in timeout_tasks:
-        timeout_tasks[user_id].cancel()
-        del timeout_tasks[user_id]
-        log_debug(f"TIMEOUT: Cancelled timeout task for user {user_id}")
-
-# -------- REACTION PROCESSING --------
-
-async def handle_disambiguation_selection(reaction, user, selected_player, selection_data):
+async def handle_disambiguation_selection(channel, user, selected_player, selection_data):
     """Handle disambiguation selection (user picking which player they meant)"""
     from recent_mentions import check_recent_player_mentions
     from bot_logic import process_approved_question
@@ -158,25 +103,21 @@ async def handle_disambiguation_selection(reaction, user, selected_player, selec
                     blocker_message = f"You may only ask about one player. Your question has been blocked as you asked about: {validated_names_str}"
                 
                 try:
-                    error_msg = await reaction.message.channel.send(blocker_message)
-                    await error_msg.delete(delay=10)
+                    await send_notice(channel, blocker_message, delete_after=10)
                     log_info(f"✅ Sent single player policy blocker message")
                 except Exception as e:
                     log_error(f"❌ Failed to send single player policy message: {e}")
                 
                 # Delete the original user message
-                try:
-                    await selection_data["original_user_message"].delete()
-                    log_info("✅ Deleted original user message after single player policy block")
-                except Exception as e:
-                    log_error(f"❌ Failed to delete original user message: {e}")
+                submit_delete(selection_data["original_user_message"])
+                log_info("✅ Queued delete of original user message after single player policy block")
                 
                 # Log the single player policy violation
                 try:
                     await log_analytics("Single Player Policy",
                         user_id=user.id,
                         user_name=user.display_name,
-                        channel=reaction.message.channel.name,
+                        channel=channel.name,
                         question=original_question,
                         validated_players=len(all_matched_players),
                         raw_detections=len(all_raw_detections) if all_raw_detections else 0,
@@ -190,7 +131,7 @@ async def handle_disambiguation_selection(reaction, user, selected_player, selec
                 return True  # Blocked by single player policy
     
     # 🔧 EXISTING: Check recent mentions for this specific player
-    recent_mentions = await check_recent_player_mentions(reaction.message.guild, [selected_player])
+    recent_mentions = await check_recent_player_mentions(channel.guild, [selected_player])
     
     # DEBUG LOGGING - This will show us what's happening
     log_info(f"🔧 DEBUG: recent_mentions returned: {recent_mentions}")
@@ -212,32 +153,23 @@ async def handle_disambiguation_selection(reaction, user, selected_player, selec
                 # 🔧 NEW: Use the specific answer URL if available
                 answer_url = mention.get("answer_url")
                 if answer_url:
-                    error_msg = await reaction.message.channel.send(
-                        f"**{player_name}** was answered recently: {answer_url}"
-                    )
+                    notice = f"**{player_name}** was answered recently: {answer_url}"
                     log_info(f"🔧 SPECIFIC URL: Used specific answer URL for {player_name}")
                 else:
                     # Fallback to generic channel link
-                    error_msg = await reaction.message.channel.send(
-                        f"This player has been asked about recently. There is an answer here: {FINAL_ANSWER_LINK}"
-                    )
+                    notice = f"This player has been asked about recently. There is an answer here: {FINAL_ANSWER_LINK}"
                     log_info(f"🔧 FALLBACK URL: Used generic channel link for {player_name}")
             else:  # pending
-                error_msg = await reaction.message.channel.send(
-                    "This player has been asked about recently, please be patient and wait for an answer."
-                )
+                notice = "This player has been asked about recently, please be patient and wait for an answer."
             
-            await error_msg.delete(delay=8)
+            await send_notice(channel, notice, delete_after=8)
             log_info(f"✅ Sent and scheduled deletion of blocking message")
         except Exception as e:
             log_error(f"❌ Failed to send blocking message: {e}")
         
-        # Delete the original user message - but don't let exceptions stop the blocking
-        try:
-            await selection_data["original_user_message"].delete()
-            log_info("✅ Deleted original user message after blocking disambiguation")
-        except Exception as e:
-            log_error(f"❌ Failed to delete original user message: {e}")
+        # Delete the original user message - queued, so it can't stop the blocking
+        submit_delete(selection_data["original_user_message"])
+        log_info("✅ Queued delete of original user message after blocking disambiguation")
         
         # ALWAYS return True when blocking, regardless of any exceptions above
         log_info(f"🔧 DEBUG: Returning True (blocked) for {selected_player['name']}")
@@ -252,7 +184,7 @@ async def handle_disambiguation_selection(reaction, user, selected_player, selec
         log_info(f"🔧 Modified question: {modified_question}")
         
         await process_approved_question(
-            reaction.message.channel,
+            channel,
             user,
             modified_question,
             selection_data["original_user_message"],
@@ -262,7 +194,7 @@ async def handle_disambiguation_selection(reaction, user, selected_player, selec
         log_info(f"🔧 DEBUG: Returning False (not blocked) for {selected_player['name']}")
         return False  # Not blocked, processed
 
-async def handle_block_selection(reaction, user, selected_player, selection_data):
+async def handle_block_selection(channel, user, selected_player, selection_data):
     """Handle block selection (user picking from recently mentioned players)"""
     # Find the selected player's status
     selected_mention = None
@@ -274,44 +206,117 @@ async def handle_block_selection(reaction, user, selected_player, selection_data
     if selected_mention:
         status = selected_mention["status"]
         if status == "answered":
-            error_msg = await reaction.message.channel.send(
-                f"This player has been asked about recently. There is an answer here: {FINAL_ANSWER_LINK}"
-            )
+            notice = f"This player has been asked about recently. There is an answer here: {FINAL_ANSWER_LINK}"
         else:  # pending
-            error_msg = await reaction.message.channel.send(
-                "This player has been asked about recently, please be patient and wait for an answer."
-            )
+            notice = "This player has been asked about recently, please be patient and wait for an answer."
         
-        await error_msg.delete(delay=8)
+        await send_notice(channel, notice, delete_after=8)
         # Delete the original user message as well
-        try:
-            await selection_data["original_user_message"].delete()
-            log_info("✅ Deleted original user message after blocking")
-        except Exception as e:
-            log_error(f"❌ Failed to delete original user message: {e}")
+        submit_delete(selection_data["original_user_message"])
+        log_info("✅ Queued delete of original user message after blocking")
         return True  # Blocked
     
     return False  # Not blocked (shouldn't happen)
 
-def cleanup_invalid_selection(user_id, selection_data):
-    """Clean up when user makes invalid reaction"""
+async def complete_selection(channel, user, message_id, selected_index, original_user_id=None):
+    """Finish a selection made from a prompt's select menu (or a reaction on an older prompt)"""
+    # Claiming is atomic: only the first select/reaction gets the selection, and never after it expired
+    pending = selection_store.get(message_id)
+    if pending is None or selected_index >= len(pending["players"]):
+        return False
+    selection_data = selection_store.claim(message_id)
+    if selection_data is None:
+        return False
+    if original_user_id is None:
+        original_user_id = selection_data["user_id"]
+    log_info(f"SELECTION PROCESSING: User {user.id} ({user.display_name}) processing selection")
+    
+    selected_player = selection_data["players"][selected_index]
+    
+    # Analytics with helper tracking
+    selection_type = selection_data.get("type", "unknown")
+    if user.id != original_user_id:
+        selection_type += "_helper_assisted"
+    
+    await log_analytics("User Selection",
+        user_id=original_user_id,  # Always log original user
+        helper_user_id=user.id if user.id != original_user_id else None,
+        user_name=getattr(user, 'display_name', 'Unknown'),
+        channel=channel.name,
+        question=selection_data.get("original_question", "Unknown"),
+        selected_player=f"{selected_player['name']} ({selected_player['team']})",
+        selection_type=selection_type,
+        timeout="completed"
+    )
+    
+    # Clean up messages
+    submit_delete(selection_data["message"])
+    log_info(f"CLEANUP: Queued delete of disambiguation message after selection")
+    
+    # Handle different selection types
+    if selection_data.get("type") == "block_selection":
+        return await handle_block_selection(channel, user, selected_player, selection_data)
+    
+    elif selection_data.get("type") == "disambiguation_selection":
+        blocked = await handle_disambiguation_selection(channel, user, selected_player, selection_data)
+        log_info(f"🔧 RACE CONDITION FIX: Question {'blocked' if blocked else 'processed'} for {selected_player['name']}")
+        return blocked
+    
+    log_error(f"🚨 RACE CONDITION BUG: Unexpected selection type for {selected_player['name']}")
+    return False
+
+class PlayerSelectView(discord.ui.View):
+    """Select menu attached to the disambiguation prompt; one interaction per selection"""
+    def __init__(self, user_id, players):
+        # Timeouts are handled by the selection store's sweeper, not a per-view timer
+        super().__init__(timeout=None)
+        self.user_id = user_id
+        self.select = discord.ui.Select(
+            placeholder="Choose a player",
+            custom_id=f"player_select:{user_id}",
+            options=[
+                discord.SelectOption(label=f"{player['name']} ({player['team']})"[:100], value=str(i), emoji=REACTIONS[i])
+                for i, player in enumerate(players)
+            ]
+        )
+        self.select.callback = self.on_select
+        self.add_item(self.select)
+    
+    async def interaction_check(self, interaction):
+        if interaction.user.id == self.user_id or ALLOW_HELPER_REACTIONS:
+            return True
+        log_info(f"SELECTION BLOCKED: User {interaction.user.id} tried to select for question from user {self.user_id}")
+        await interaction.response.send_message(
+            f"Only <@{self.user_id}> can select from these options. "
+            f"If you'd like to help, you can ask them to make a selection!",
+            ephemeral=True
+        )
+        return False
+    
+    async def on_select(self, interaction):
+        if selection_store.get(interaction.message.id) is None:
+            await interaction.response.send_message("This selection has expired. Please ask your question again.", ephemeral=True)
+            return
+        
+        await interaction.response.defer()
+        self.stop()
+        await complete_selection(interaction.channel, interaction.user, interaction.message.id, int(self.select.values[0]))
+
+def cleanup_invalid_selection(message_id):
+    """Clean up when user makes an invalid selection"""
+    selection_data = selection_store.claim(message_id)
+    if selection_data is None:
+        return
     try:
-        asyncio.create_task(selection_data["message"].delete())
-        asyncio.create_task(selection_data["original_user_message"].delete())
+        submit_delete(selection_data["message"])
+        submit_delete(selection_data["original_user_message"])
     except:
         pass
-    
-    if user_id in pending_selections:
-        del pending_selections[user_id]
-    
-    cancel_selection_timeout(user_id)
 
 # Add this function to selection_handlers.py
 
 async def create_player_disambiguation_prompt(ctx, question, matched_players):
     """Create a disambiguation prompt when multiple players match an ambiguous search"""
-    from config import REACTIONS, pending_selections
-    
     log_info(f"DISAMBIGUATION: Creating prompt for {len(matched_players)} players")
     
     # Log the disambiguation event
@@ -332,30 +337,23 @@ async def create_player_disambiguation_prompt(ctx, question, matched_players):
         prompt_lines.append(f"{emoji} {player['name']} ({player['team']})")
     
     prompt_text = "\n".join(prompt_lines)
-    prompt_text += "\n\n*Click a reaction to select the player.*"
+    prompt_text += "\n\n*Choose the player from the menu below.*"
     
     try:
-        # Send the disambiguation prompt
-        prompt_message = await ctx.send(prompt_text)
+        # One message carries the choices; no per-candidate reactions
+        view = PlayerSelectView(ctx.author.id, matched_players[:len(REACTIONS)])
+        prompt_message = await outbound.run("disambiguation_prompt", lambda: ctx.send(prompt_text, view=view))
         log_info(f"DISAMBIGUATION: Sent prompt message with ID {prompt_message.id}")
         
-        # Add reaction emojis
-        for i in range(len(matched_players[:len(REACTIONS)])):
-            await prompt_message.add_reaction(REACTIONS[i])
-            log_info(f"DISAMBIGUATION: Added reaction {REACTIONS[i]}")
-        
-        # Store in pending selections
-        pending_selections[ctx.author.id] = {
+        # Store in pending selections (expires after SELECTION_TIMEOUT)
+        selection_store.add(ctx.author.id, prompt_message.id, {
             "message": prompt_message,
             "players": matched_players,
             "original_question": question,
             "original_user_message": ctx.message,
-            "type": "disambiguation_selection",
-            "locked": False
-        }
-        
-        # Start timeout task
-        start_selection_timeout(ctx.author.id, ctx)
+            "user_name": ctx.author.display_name,
+            "type": "disambiguation_selection"
+        })
         
         log_info(f"DISAMBIGUATION: Set up selection for user {ctx.author.id}")
         
@@ -364,3 +362,46 @@ async def create_player_disambiguation_prompt(ctx, question, matched_players):
     except Exception as e:
         log_error(f"DISAMBIGUATION: Failed to create prompt: {e}")
         return False
+
+# -------- RESTORE AFTER RESTART --------
+
+def restore_pending_selections(bot):
+    """Re-attach select menus to prompts that were pending at the last shutdown; clean up the ones that expired meanwhile"""
+    restored = expired = 0
+    now = selection_store.clock()
+    
+    for record in selection_store.load():
+        message_id = record["message_id"]
+        if message_id in selection_store:
+            continue  # Already live in this process (e.g. on_ready after a reconnect)
+        
+        channel = bot.get_channel(record.get("channel_id"))
+        if channel is None:
+            log_info(f"RESTORE: Channel for selection {message_id} unavailable, dropping it")
+            continue
+        
+        prompt_message = channel.get_partial_message(message_id)
+        original_user_message = None
+        if record.get("original_user_message_id"):
+            original_user_message = channel.get_partial_message(record["original_user_message_id"])
+        
+        if record["expires_at"] <= now:
+            # Queued together, so the whole backlog goes out as bulk deletes
+            submit_delete(prompt_message)
+            if original_user_message is not None:
+                submit_delete(original_user_message)
+            expired += 1
+            continue
+        
+        selection = {field: record[field] for field in PERSISTED_FIELDS if field in record}
+        selection["message"] = prompt_message
+        if original_user_message is not None:
+            selection["original_user_message"] = original_user_message
+        selection_store.restore(record["user_id"], message_id, selection, record["created_at"], record["expires_at"])
+        bot.add_view(PlayerSelectView(record["user_id"], selection["players"][:len(REACTIONS)]), message_id=message_id)
+        restored += 1
+    
+    # Drop the records that were not restored from the snapshot
+    selection_store.save()
+    log_info(f"RESTORE: Restored {restored} pending selections, cleaned up {expired} expired")
+    return restored, expired
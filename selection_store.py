@@ -0,0 +1,226 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from config import SELECTION_TIMEOUT, SELECTION_SWEEP_SECONDS, SELECTION_SAVE_SECONDS
+from logging_system import log_error, log_info
+
+# -------- PENDING SELECTION STORE --------
+
+STORE_FILE = "/persistence/pending_selections.json"
+PERSISTED_FIELDS = ("players", "original_question", "type", "user_name", "mentions")  # JSON-safe selection data kept across restarts
+
+class SelectionStore:
+    """
+    Pending disambiguation selections, keyed by prompt message id.
+
+    - get(message_id) / for_user(user_id): O(1) via the primary key and a user index
+    - claim(): atomically takes a selection out of the store, so exactly one of
+      a select, a reaction or the expiry sweeper ever gets to act on it
+    - one sweeper task expires entries past their TTL and hands them to on_expire;
+      it stops when the store is empty and restarts on the next add
+    - changes are saved to a JSON snapshot, so prompts pending at shutdown can
+      be re-attached (or cleaned up) after a restart; saves are debounced to
+      one per `save_delay` and written in an executor thread
+    """
+    def __init__(self, ttl=SELECTION_TIMEOUT, sweep_interval=SELECTION_SWEEP_SECONDS, clock=time.time, path=STORE_FILE,
+                 save_delay=SELECTION_SAVE_SECONDS):
+        self.ttl = ttl
+        self.path = path
+        self.sweep_interval = sweep_interval
+        self.save_delay = save_delay
+        self.clock = clock
+        self.by_message = {}    # message_id: selection dict
+        self.by_user = {}       # user_id: message_id
+        self.on_expire = None   # async callback(selection) for selections nobody completed
+        self.sweeper = None
+        self.expiring = set()   # on_expire tasks for replaced selections
+        self.dirty = False
+        self.saver = None
+        self.version = 0              # Bumped per snapshot taken, so an older snapshot never overwrites a newer one
+        self.written_version = 0
+        self.write_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.by_message)
+
+    def __contains__(self, message_id):
+        return message_id in self.by_message
+
+    def add(self, user_id, message_id, selection, ttl=None):
+        """
+        Store a selection. A user's previous pending selection is replaced and
+        handed to on_expire, so its prompt is cleaned up exactly as on a timeout.
+        """
+        previous = self.by_user.get(user_id)
+        if previous is not None and previous != message_id:
+            replaced = self.claim(previous)
+            if replaced is not None and self.on_expire is not None:
+                task = asyncio.create_task(self._expire(replaced))
+                self.expiring.add(task)
+                task.add_done_callback(self.expiring.discard)
+
+        now = self.clock()
+        return self.restore(user_id, message_id, selection, now, now + (self.ttl if ttl is None else ttl))
+
+    def restore(self, user_id, message_id, selection, created_at, expires_at):
+        """Store a selection with known timestamps (e.g. reloaded from the snapshot)"""
+        selection["user_id"] = user_id
+        selection["message_id"] = message_id
+        selection["created_at"] = created_at
+        selection["expires_at"] = expires_at
+        self.by_message[message_id] = selection
+        self.by_user[user_id] = message_id
+        self._ensure_sweeper()
+        self.save()
+        return selection
+
+    def get(self, message_id):
+        selection = self.by_message.get(message_id)
+        if selection is None or selection["expires_at"] <= self.clock():
+            return None
+        return selection
+
+    def for_user(self, user_id):
+        message_id = self.by_user.get(user_id)
+        return self.get(message_id) if message_id is not None else None
+
+    def has_user(self, user_id):
+        return self.for_user(user_id) is not None
+
+    def claim(self, message_id):
+        """Take the selection out of the store; returns None if someone else already did"""
+        selection = self.by_message.pop(message_id, None)
+        if selection is not None:
+            if self.by_user.get(selection["user_id"]) == message_id:
+                del self.by_user[selection["user_id"]]
+            self.save()
+        return selection
+
+    def claim_user(self, user_id):
+        message_id = self.by_user.get(user_id)
+        return self.claim(message_id) if message_id is not None else None
+
+    def clear(self):
+        count = len(self.by_message)
+        self.by_message.clear()
+        self.by_user.clear()
+        self.save()
+        return count
+
+    def expired(self, now=None):
+        now = self.clock() if now is None else now
+        return [message_id for message_id, selection in self.by_message.items() if selection["expires_at"] <= now]
+
+    async def sweep(self, now=None):
+        """Claim every expired selection and pass it to on_expire; returns how many expired"""
+        expired = [self.claim(message_id) for message_id in self.expired(now)]
+        for selection in expired:
+            await self._expire(selection)
+        if expired:
+            log_info(f"SELECTION STORE: Expired {len(expired)} selections, {len(self)} pending")
+        return len(expired)
+
+    async def _expire(self, selection):
+        if self.on_expire is None:
+            return
+        try:
+            await self.on_expire(selection)
+        except Exception as e:
+            log_error(f"SELECTION STORE: Expiry handler failed for message {selection['message_id']}: {e}")
+
+    def _ensure_sweeper(self):
+        if self.sweeper is None or self.sweeper.done():
+            self.sweeper = asyncio.create_task(self._sweep_loop())
+
+    async def _sweep_loop(self):
+        while self.by_message:
+            await asyncio.sleep(self.sweep_interval)
+            await self.sweep()
+
+    # -------- PERSISTENCE --------
+
+    def snapshot(self):
+        """JSON-safe records for every pending selection"""
+        records = []
+        for message_id, selection in self.by_message.items():
+            record = {
+                "message_id": message_id,
+                "user_id": selection["user_id"],
+                "created_at": selection["created_at"],
+                "expires_at": selection["expires_at"],
+            }
+            if selection.get("message") is not None:
+                record["channel_id"] = selection["message"].channel.id
+            if selection.get("original_user_message") is not None:
+                record["original_user_message_id"] = selection["original_user_message"].id
+            for field in PERSISTED_FIELDS:
+                if field in selection:
+                    record[field] = selection[field]
+            records.append(record)
+        return records
+
+    def save(self):
+        """Mark the snapshot stale; it is written within `save_delay` seconds"""
+        if not self.path:
+            return
+        self.dirty = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._save_now()  # No loop to defer to
+            return
+        if self.saver is None or self.saver.done():
+            self.saver = loop.create_task(self._save_later())
+
+    async def _save_later(self):
+        while self.dirty:
+            await asyncio.sleep(self.save_delay)
+            await self.flush()
+
+    async def flush(self):
+        """Write the snapshot now if anything changed (e.g. at shutdown)"""
+        if not self.dirty or not self.path:
+            return
+        self.dirty = False
+        self.version += 1
+        error = await asyncio.get_running_loop().run_in_executor(None, self.write, self.snapshot(), self.version)
+        if error:
+            log_error(error)
+
+    def _save_now(self):
+        self.dirty = False
+        self.version += 1
+        error = self.write(self.snapshot(), self.version)
+        if error:
+            log_error(error)
+
+    def write(self, records, version):
+        """Serialize and replace the snapshot file (blocking; runs in the executor). Returns an error message or None"""
+        temp_path = self.path + ".tmp"
+        with self.write_lock:
+            if version < self.written_version:
+                return None
+            try:
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(records, f)
+                os.replace(temp_path, self.path)
+            except (OSError, TypeError, ValueError) as e:
+                return f"SELECTION STORE: Failed to save pending selections: {e}"
+            self.written_version = version
+        return None
+
+    def load(self):
+        """Records saved before the last shutdown"""
+        if not self.path or not os.path.exists(self.path):
+            return []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            log_error(f"SELECTION STORE: Failed to load pending selections: {e}")
+            return []
+
+# Global selection store instance
+selection_store = SelectionStore()
@@ -0,0 +1,59 @@
+import asyncio
+import time
+from logging_system import log_info
+
+# -------- SINGLE-FLIGHT REQUEST COALESCING --------
+
+class SingleFlight:
+    """
+    Runs at most one lookup per key at a time. Callers arriving while a lookup
+    is in flight await the same result, and finished results are reused for
+    `cache_ttl` seconds unless invalidate() is called first.
+    """
+    def __init__(self, cache_ttl=5.0):
+        self.cache_ttl = cache_ttl
+        self.in_flight = {}     # key: asyncio.Task
+        self.cache = {}         # key: (expires_at, result)
+        self.generation = 0     # bumped by invalidate() so stale lookups are not cached
+        self.stats = {"calls": 0, "cache_hits": 0, "coalesced": 0, "lookups": 0}
+
+    async def do(self, key, factory):
+        """Return the result for `key`, calling `factory()` only if no shared result exists"""
+        self.stats["calls"] += 1
+
+        cached = self.cache.get(key)
+        if cached:
+            expires_at, result = cached
+            if expires_at > time.monotonic():
+                self.stats["cache_hits"] += 1
+                return result
+            del self.cache[key]
+
+        task = self.in_flight.get(key)
+        if task is None:
+            self.stats["lookups"] += 1
+            task = asyncio.ensure_future(self._run(key, factory, self.generation))
+            self.in_flight[key] = task
+        else:
+            self.stats["coalesced"] += 1
+            log_info(f"SINGLE FLIGHT: Joined in-flight lookup for {key}")
+
+        # Shield so one cancelled caller does not cancel the lookup for everyone else
+        return await asyncio.shield(task)
+
+    async def _run(self, key, factory, generation):
+        try:
+            result = await factory()
+        finally:
+            if self.in_flight.get(key) is asyncio.current_task():
+                del self.in_flight[key]
+
+        if generation == self.generation and self.cache_ttl > 0:
+            self.cache[key] = (time.monotonic() + self.cache_ttl, result)
+        return result
+
+    def invalidate(self):
+        """Forget cached results; lookups already running finish but are not cached or joined"""
+        self.generation += 1
+        self.cache.clear()
+        self.in_flight.clear()
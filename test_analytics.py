@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test the analytics aggregator
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import analytics as analytics_module
+from analytics import AnalyticsAggregator, LatencyHistogram
+from webhook_dispatcher import WebhookDispatcher
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def test_events_fold_into_counters_and_histograms():
+    """Searches, outcomes, block reasons, selections and timeouts are counted, not posted"""
+    aggregator = AnalyticsAggregator(flush_interval=300, sample_rate=0.0, clock=FakeClock())
+    for duration in (3, 8, 40, 400):
+        aggregator.record("Player Search", {"search_type": "exact_match", "matches_found": 1, "duration_ms": duration})
+    aggregator.record("Player Search", {"search_type": "no_match", "matches_found": 0, "duration_ms": 20})
+    aggregator.record("Question Processed", {"status": "approved", "reason": "passed_all_checks"})
+    aggregator.record("Question Processed", {"status": "blocked", "reason": "recent_mention"})
+    aggregator.record("User Selection", {"selection_type": "disambiguation_selection", "timeout": "timed_out", "timeout_duration": 30})
+    aggregator.record("User Selection", {"selection_type": "disambiguation_selection", "timeout": "completed"})
+    aggregator.record("Player Disambiguation", {"status": "disambiguation_shown"})
+    aggregator.record("Single Player Policy", {"status": "blocked_multi_player"})
+
+    assert aggregator.events["Player Search"] == 5
+    assert aggregator.searches == {"exact_match": 4, "no_match": 1}
+    assert aggregator.match_counts == {"1": 4, "0": 1}
+    assert aggregator.search_latency["exact_match"].count == 4
+    assert aggregator.block_reasons == {"recent_mention": 1, "blocked_multi_player": 1}
+    assert aggregator.disambiguations == {"disambiguation_shown": 1}
+    assert aggregator.selections["disambiguation_selection: timed_out"] == 1
+    assert aggregator.timeouts.count == 1
+    assert not aggregator.should_post("Player Search")
+    assert aggregator.should_post("Bot Health")
+
+def test_histogram_percentiles():
+    """Percentiles report the bucket bound holding that share of samples"""
+    histogram = LatencyHistogram()
+    for value in [4] * 90 + [200] * 10:
+        histogram.observe(value)
+    assert histogram.percentile(0.5) == 5
+    assert histogram.percentile(0.95) == 250
+    assert histogram.max == 200
+
+def test_flush_posts_one_summary_and_resets():
+    """A whole window becomes one embed on the analytics webhook"""
+    clock = FakeClock()
+    aggregator = AnalyticsAggregator(flush_interval=300, sample_rate=0.0, clock=clock)
+    dispatcher = WebhookDispatcher(max_queue=10)
+    original = (analytics_module.webhook_dispatcher, analytics_module.WEBHOOK_ANALYTICS_URL)
+    analytics_module.webhook_dispatcher = dispatcher
+    analytics_module.WEBHOOK_ANALYTICS_URL = "https://example.invalid/analytics"
+    try:
+        for i in range(50):
+            aggregator.record("Player Search", {"search_type": "fuzzy_match_validated", "matches_found": 2, "duration_ms": 30})
+        clock.now += 300
+        assert aggregator.flush()
+        assert not aggregator.flush()  # Empty window: nothing to post
+    finally:
+        analytics_module.webhook_dispatcher, analytics_module.WEBHOOK_ANALYTICS_URL = original
+
+    assert len(dispatcher) == 1
+    level, embed = dispatcher.queues["https://example.invalid/analytics"][0]
+    assert level == "ANALYTICS"
+    assert embed["description"] == "50 events in the last 5 min"
+    assert any(field["name"] == "Search Latency" for field in embed["fields"])
+    assert not aggregator.events
+
+def test_sampling():
+    """With a sample rate, a share of raw events is still posted individually"""
+    draws = iter([0.05, 0.5])
+    aggregator = AnalyticsAggregator(flush_interval=300, sample_rate=0.1, clock=FakeClock(), rand=lambda: next(draws))
+    assert aggregator.should_post("Player Search")
+    assert not aggregator.should_post("Player Search")
+
+if __name__ == "__main__":
+    print("🧪 Testing analytics aggregator...")
+    test_events_fold_into_counters_and_histograms()
+    test_histogram_percentiles()
+    test_flush_posts_one_summary_and_resets()
+    test_sampling()
+    print("✅ All analytics aggregator tests passed")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test marking answered questions without refetching them
+"""
+
+import sys
+import os
+import asyncio
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import discord
+import bot_logic
+from bot_logic import answered_content, mark_question_answered, resolve_referenced_message
+from outbound_scheduler import OutboundScheduler
+
+QUESTION = "<@42> asked:\n> How is Soto?\n\n❗ **Not Answered**\n\nReply to this message to answer."
+
+class FakeChannel:
+    def __init__(self):
+        self.id = 1
+        self.fetches = 0
+
+    async def fetch_message(self, message_id):
+        self.fetches += 1
+        return FakeMessage(message_id, self, QUESTION)
+
+class FakeMessage:
+    def __init__(self, message_id, channel, content):
+        self.id = message_id
+        self.channel = channel
+        self.content = content
+        self.edits = []
+
+    async def edit(self, content):
+        self.edits.append(content)
+        self.content = content
+
+class FakeReference:
+    def __init__(self, message_id, resolved=None, cached_message=None):
+        self.message_id = message_id
+        self.resolved = resolved
+        self.cached_message = cached_message
+
+class FakeReply:
+    def __init__(self, channel, reference, message_id=900):
+        self.id = message_id
+        self.channel = channel
+        self.reference = reference
+
+class FakeDeletionService:
+    def __init__(self):
+        self.scheduled = []
+
+    def schedule(self, message, delay=0):
+        self.scheduled.append((message.id, delay))
+
+def test_answered_content():
+    """Status line flips once; already-answered posts are left alone"""
+    updated = answered_content(QUESTION)
+    assert updated == "<@42> asked:\n> How is Soto?\n\n✅ **Answered**"
+    assert answered_content(updated) == updated
+    assert answered_content("<@42> asked:\n> Soto?").endswith("✅ **Answered**\n")
+
+def test_cached_reference_skips_fetch():
+    """A reference the gateway already resolved or cached never costs a REST call"""
+    channel = FakeChannel()
+    cached = FakeMessage(5, channel, QUESTION)
+
+    async def run():
+        from_cache = await resolve_referenced_message(FakeReply(channel, FakeReference(5, cached_message=cached)))
+        fetched = await resolve_referenced_message(FakeReply(channel, FakeReference(6)))
+        return from_cache, fetched
+
+    from_cache, fetched = asyncio.run(run())
+    assert from_cache is cached
+    assert fetched.id == 6 and channel.fetches == 1
+
+def test_mark_answered_queues_one_edit_and_cleanup():
+    """Answers to one question coalesce into one edit; every reply is cleaned up, even after the status flipped"""
+    channel = FakeChannel()
+    question = FakeMessage(5, channel, QUESTION)
+    deletions = FakeDeletionService()
+    original_outbound, original_deletions = bot_logic.outbound, bot_logic.deletion_service
+    bot_logic.outbound = OutboundScheduler(workers=1, low_backlog=20, low_max_age=30)
+    bot_logic.deletion_service = deletions
+
+    async def run():
+        first = mark_question_answered(question, FakeReply(channel, None, 901))
+        second = mark_question_answered(question, FakeReply(channel, None, 902))
+        await bot_logic.outbound.join()
+        third = mark_question_answered(question, FakeReply(channel, None, 903))
+        return first, second, third
+
+    try:
+        first, second, third = asyncio.run(run())
+    finally:
+        bot_logic.outbound, bot_logic.deletion_service = original_outbound, original_deletions
+
+    assert (first, second, third) == (True, True, False)
+    assert question.edits == ["<@42> asked:\n> How is Soto?\n\n✅ **Answered**"]
+    assert (5, 15) in deletions.scheduled
+    assert {(901, 15), (902, 15), (903, 15)} <= set(deletions.scheduled)
+
+if __name__ == "__main__":
+    print("🧪 Testing answer forwarding...")
+    test_answered_content()
+    test_cached_reference_skips_fetch()
+    test_mark_answered_queues_one_edit_and_cleanup()
+    print("✅ All answer forwarding tests passed")
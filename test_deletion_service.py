@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test bulk deletion of ephemeral bot notices
+"""
+
+import sys
+import os
+import asyncio
+import itertools
+from datetime import datetime, timedelta, timezone
+import discord
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from deletion_service import DeletionService, is_bulk_deletable
+from timer_scheduler import TimerScheduler
+
+class FakePartialMessage:
+    def __init__(self, channel, message_id):
+        self.channel = channel
+        self.id = message_id
+
+    async def delete(self):
+        self.channel.single_deletes.append(self.id)
+
+class FakeChannel:
+    def __init__(self, channel_id, name="ask-questions"):
+        self.id = channel_id
+        self.name = name
+        self.bulk_calls = []
+        self.single_deletes = []
+
+    async def delete_messages(self, messages):
+        self.bulk_calls.append([message.id for message in messages])
+
+    def get_partial_message(self, message_id):
+        return FakePartialMessage(self, message_id)
+
+message_counter = itertools.count()
+
+class FakeMessage:
+    def __init__(self, channel, age=timedelta(seconds=10)):
+        self.channel = channel
+        self.id = discord.utils.time_snowflake(datetime.now(timezone.utc) - age) + next(message_counter)
+
+def test_due_messages_are_bulk_deleted_per_channel():
+    """Everything due in a channel goes out as one bulk call; delayed deletes wait in the timer scheduler"""
+    now = [1000.0]
+    scheduler = TimerScheduler(journal_path=None, clock=lambda: now[0])
+    service = DeletionService(tick=1.0, scheduler=scheduler)
+    scheduler.register("delete_message", service.handle_timer)
+    submissions, answers = FakeChannel(1), FakeChannel(2, "answering-channel")
+    notices = [FakeMessage(submissions) for _ in range(5)]
+    later = FakeMessage(submissions)
+    answer_notice = FakeMessage(answers)
+
+    async def run():
+        for message in notices:
+            service.schedule(message)
+        service.schedule(later, delay=30)
+        service.schedule(answer_notice)
+        service.task.cancel()
+        return await service.flush()
+
+    assert asyncio.run(run()) == 6
+    assert submissions.bulk_calls == [sorted(message.id for message in notices)]
+    assert answers.bulk_calls == [[answer_notice.id]]
+    assert len(service) == 0
+    assert scheduler.counts() == {"delete_message": 1}
+
+def test_timer_fired_delete_joins_next_bulk_call():
+    """A delayed delete that comes due is batched like any other"""
+    scheduler = TimerScheduler(journal_path=None)
+    service = DeletionService(tick=0.01, scheduler=scheduler)
+    scheduler.register("delete_message", service.handle_timer)
+    channel = FakeChannel(1)
+    first, second = FakeMessage(channel), FakeMessage(channel)
+
+    async def run():
+        service.schedule(first, delay=0.02)
+        service.schedule(second, delay=0.02)
+        await asyncio.sleep(0.1)
+
+    asyncio.run(run())
+    assert channel.bulk_calls == [sorted([first.id, second.id])]
+    assert len(scheduler) == 0
+
+def test_chunks_of_one_hundred():
+    """Large batches are split into 100-message bulk deletes"""
+    service = DeletionService(tick=1.0, scheduler=TimerScheduler(journal_path=None))
+    channel = FakeChannel(1)
+    messages = [FakeMessage(channel) for _ in range(150)]
+
+    async def run():
+        for message in messages:
+            service.schedule(message)
+        service.task.cancel()
+        await service.flush()
+
+    asyncio.run(run())
+    assert [len(call) for call in channel.bulk_calls] == [100, 50]
+    assert service.stats["bulk_calls"] == 2
+
+def test_old_messages_use_single_deletes():
+    """Messages older than 14 days cannot be bulk deleted"""
+    service = DeletionService(tick=1.0, scheduler=TimerScheduler(journal_path=None))
+    channel = FakeChannel(1)
+    old = FakeMessage(channel, age=timedelta(days=15))
+    fresh = FakeMessage(channel)
+    assert not is_bulk_deletable(old.id)
+
+    async def run():
+        service.schedule(old)
+        service.schedule(fresh)
+        service.task.cancel()
+        await service.flush()
+
+    asyncio.run(run())
+    assert channel.bulk_calls == [[fresh.id]]
+    assert channel.single_deletes == [old.id]
+
+def test_tick_task_drains_and_stops():
+    """The background tick flushes due work and exits when nothing is pending"""
+    service = DeletionService(tick=0.01, scheduler=TimerScheduler(journal_path=None))
+    channel = FakeChannel(1)
+    message = FakeMessage(channel)
+
+    async def run():
+        service.schedule(message)
+        await asyncio.wait_for(service.task, timeout=1)
+
+    asyncio.run(run())
+    assert channel.bulk_calls == [[message.id]]
+    assert len(service) == 0
+
+if __name__ == "__main__":
+    print("🧪 Testing deletion service...")
+    test_due_messages_are_bulk_deleted_per_channel()
+    test_timer_fired_delete_joins_next_bulk_call()
+    test_chunks_of_one_hundred()
+    test_old_messages_use_single_deletes()
+    test_tick_task_drains_and_stops()
+    print("✅ All deletion service tests passed")
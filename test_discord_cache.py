@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test the channel registry and member cache
+"""
+
+import sys
+import os
+import asyncio
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import discord
+from discord_cache import ChannelRegistry, MemberCache
+
+class FakeChannel:
+    def __init__(self, channel_id, name):
+        self.id = channel_id
+        self.name = name
+
+class FakeGuild:
+    def __init__(self, channels, members=None):
+        self.id = 1
+        self.text_channels = channels
+        self.members = members or {}
+        self.rest_members = {}
+        self.fetches = 0
+
+    def get_channel(self, channel_id):
+        return next((channel for channel in self.text_channels if channel.id == channel_id), None)
+
+    def get_member(self, user_id):
+        return self.members.get(user_id)
+
+    async def fetch_member(self, user_id):
+        self.fetches += 1
+        if user_id not in self.rest_members:
+            raise discord.NotFound(FakeHTTPResponse(), "Unknown Member")
+        return self.rest_members[user_id]
+
+class FakeHTTPResponse:
+    status = 404
+    reason = "Not Found"
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_channel_lookup_scans_once():
+    """Name lookups hit the registry after one scan of the guild"""
+    answering = FakeChannel(10, "question-reposting")
+    guild = FakeGuild([FakeChannel(9, "general"), answering])
+    registry = ChannelRegistry()
+    registry.refresh(guild)
+
+    assert registry.get(guild, "question-reposting") is answering
+    assert registry.get(guild, "question-reposting") is answering
+    assert registry.stats == {"hits": 2, "misses": 0, "refreshes": 1}
+    assert registry.get(guild, "missing") is None
+
+def test_missing_channel_rescanned_only_after_channel_event():
+    """A name that is not there costs one rescan; later lookups miss in O(1) until channels change"""
+    guild = FakeGuild([FakeChannel(9, "general")])
+    registry = ChannelRegistry()
+    registry.refresh(guild)
+
+    for _ in range(5):
+        assert registry.get(guild, "final-answers") is None
+    assert registry.stats["refreshes"] == 2
+    assert registry.stats["misses"] == 4
+
+    created = FakeChannel(12, "final-answers")
+    guild.text_channels.append(created)
+    registry.refresh(guild)  # on_guild_channel_create
+    assert registry.get(guild, "final-answers") is created
+
+def test_renamed_channel_is_rescanned():
+    """A stale entry (renamed channel) triggers one rescan instead of a wrong answer"""
+    answering = FakeChannel(10, "question-reposting")
+    guild = FakeGuild([answering])
+    registry = ChannelRegistry()
+    registry.refresh(guild)
+
+    answering.name = "old-questions"
+    replacement = FakeChannel(11, "question-reposting")
+    guild.text_channels.append(replacement)
+    assert registry.get(guild, "question-reposting") is replacement
+
+def test_member_cache_prefers_gateway_then_ttl():
+    """Gateway members never hit REST; REST answers (including "gone") are reused until the TTL passes"""
+    clock = FakeClock()
+    present = object()
+    fetched = object()
+    guild = FakeGuild([], members={1: present})
+    guild.rest_members[2] = fetched
+    cache = MemberCache(ttl=60, clock=clock)
+
+    async def run():
+        results = [await cache.get(guild, 1)]
+        results += [await cache.get(guild, 2), await cache.get(guild, 2)]
+        results += [await cache.get(guild, 3), await cache.get(guild, 3)]
+        clock.now += 61
+        results.append(await cache.get(guild, 2))
+        return results
+
+    results = asyncio.run(run())
+    assert results == [present, fetched, fetched, None, None, fetched]
+    assert guild.fetches == 3
+
+if __name__ == "__main__":
+    print("🧪 Testing discord caches...")
+    test_channel_lookup_scans_once()
+    test_missing_channel_rescanned_only_after_channel_event()
+    test_renamed_channel_is_rescanned()
+    test_member_cache_prefers_gateway_then_ttl()
+    print("✅ All discord cache tests passed")
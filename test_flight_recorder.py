@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Test the per-request flight recorder
+"""
+
+import sys
+import os
+import json
+import time
+import asyncio
+import tempfile
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flight_recorder import FlightRecorder, flight_record
+
+def make_recorder(dump_dir, **overrides):
+    options = dict(capacity=5, budget_ms=1000, keep=3, max_dumps=10, dump_dir=dump_dir)
+    options.update(overrides)
+    return FlightRecorder(**options)
+
+def read_dump(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def flush(recorder):
+    """Run the background writer once"""
+    return asyncio.run(recorder.flush())
+
+def test_fast_clean_request_not_dumped():
+    """Normal requests never touch the disk"""
+    with tempfile.TemporaryDirectory() as tmp:
+        recorder = make_recorder(os.path.join(tmp, "dumps"))
+        recording = recorder.begin("req1", user_id=1)
+        flight_record("fuzzy_match", player="Aaron Judge", score=0.91, threshold=0.7)
+        assert recorder.finish(recording) is None
+        assert not os.path.exists(os.path.join(tmp, "dumps"))
+
+def test_error_request_dumped_with_events():
+    """An errored request is written out with its events"""
+    with tempfile.TemporaryDirectory() as tmp:
+        recorder = make_recorder(tmp)
+        recording = recorder.begin("req2", user_id=1)
+        flight_record("near_miss", player="Will Smith", score=0.62, threshold=0.7)
+        flight_record("validator_verdict", player="Will Smith", accepted=False)
+        path = recorder.finish(recording, error="ValueError: boom")
+        assert not os.path.exists(path)  # Only queued on the request path
+        assert flush(recorder) == 1
+
+        dump = read_dump(path)
+        assert dump["reason"] == "error" and dump["error"] == "ValueError: boom"
+        assert [event["event"] for event in dump["events"]] == ["near_miss", "validator_verdict"]
+        assert dump["events"][0]["score"] == 0.62
+
+def test_slow_request_dumped():
+    """Requests over the latency budget are dumped"""
+    with tempfile.TemporaryDirectory() as tmp:
+        recorder = make_recorder(tmp, budget_ms=10)
+        recording = recorder.begin("req3")
+        time.sleep(0.02)
+        path = recorder.finish(recording)
+        flush(recorder)
+        assert read_dump(path)["reason"] == "slow"
+
+def test_ring_buffer_keeps_latest_events():
+    """Only the newest `capacity` events are kept; the rest are counted"""
+    with tempfile.TemporaryDirectory() as tmp:
+        recorder = make_recorder(tmp)
+        recording = recorder.begin("req4")
+        for i in range(12):
+            flight_record("candidate", index=i)
+        path = recorder.finish(recording, error="x")
+        flush(recorder)
+        dump = read_dump(path)
+        assert [event["index"] for event in dump["events"]] == [7, 8, 9, 10, 11]
+        assert dump["dropped_events"] == 7
+
+def test_moderator_flags_recent_request_and_next_user_request():
+    """Flag by request id while still kept, or flag a user's next request"""
+    with tempfile.TemporaryDirectory() as tmp:
+        recorder = make_recorder(tmp, keep=2)
+        for request_id in ("a", "b", "c"):
+            recorder.finish(recorder.begin(request_id, user_id=5))
+        assert recorder.flag("a") is None  # Evicted
+        path = recorder.flag("c")
+        flush(recorder)
+        assert read_dump(path)["reason"] == "flagged"
+
+        recorder.flag_user(5)
+        path = recorder.finish(recorder.begin("d", user_id=5))
+        flush(recorder)
+        assert read_dump(path)["reason"] == "flagged"
+        assert recorder.finish(recorder.begin("e", user_id=5)) is None  # One-shot
+
+def test_flag_by_message_id_or_link():
+    """Moderators can flag with the !ask message id or a link to it instead of the request id"""
+    with tempfile.TemporaryDirectory() as tmp:
+        recorder = make_recorder(tmp, keep=2)
+        for request_id, message_id in (("a", 101), ("b", 102), ("c", 103)):
+            recorder.finish(recorder.begin(request_id, message_id=message_id))
+
+        by_id = recorder.flag("102")
+        by_link = recorder.flag("https://discord.com/channels/1/2/103")
+        flush(recorder)
+        assert read_dump(by_id)["request_id"] == "b"
+        assert read_dump(by_link)["request_id"] == "c"
+        assert recorder.flag("101") is None  # Evicted along with its request
+        assert 101 not in recorder.by_message
+
+def test_events_stay_with_their_request():
+    """Concurrent requests record into their own buffers; outside a request nothing is kept"""
+    with tempfile.TemporaryDirectory() as tmp:
+        recorder = make_recorder(tmp)
+        flight_record("orphan")
+
+        async def handle(request_id, delay):
+            recording = recorder.begin(request_id)
+            flight_record("start", request=request_id)
+            await asyncio.sleep(delay)
+            flight_record("end", request=request_id)
+            return recorder.finish(recording, error="x")
+
+        async def run():
+            paths = await asyncio.gather(handle("x", 0.02), handle("y", 0.01))
+            await recorder.flush()
+            return paths
+
+        for dump in map(read_dump, asyncio.run(run())):
+            assert {event["request"] for event in dump["events"]} == {dump["request_id"]}
+
+def test_old_dumps_pruned():
+    """At most max_dumps files are kept"""
+    with tempfile.TemporaryDirectory() as tmp:
+        recorder = make_recorder(tmp, max_dumps=2)
+        for i in range(4):
+            recorder.finish(recorder.begin(f"req{i}"), error="x")
+        assert flush(recorder) == 2  # The queue never holds more than would survive pruning
+        assert len(os.listdir(tmp)) == 2
+
+def test_failed_dump_is_counted():
+    """A dump the writer cannot save is counted, not raised into the event loop"""
+    with tempfile.TemporaryDirectory() as tmp:
+        blocker = os.path.join(tmp, "file")
+        open(blocker, "w").close()
+        recorder = make_recorder(os.path.join(blocker, "dumps"))
+        recorder.finish(recorder.begin("req"), error="x")
+        assert flush(recorder) == 0
+        assert recorder.stats["failed"] == 1 and recorder.stats["dumps"] == 0
+
+if __name__ == "__main__":
+    print("🧪 Testing flight recorder...")
+    test_fast_clean_request_not_dumped()
+    test_error_request_dumped_with_events()
+    test_slow_request_dumped()
+    test_ring_buffer_keeps_latest_events()
+    test_moderator_flags_recent_request_and_next_user_request()
+    test_flag_by_message_id_or_link()
+    test_events_stay_with_their_request()
+    test_old_dumps_pruned()
+    test_failed_dump_is_counted()
+    print("✅ All flight recorder tests passed")
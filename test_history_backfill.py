@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test the paged background backfill that warms the recent mention index
+"""
+
+import sys
+import os
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import history_backfill
+from mention_index import recent_message_index, INDEX_READY, INDEX_COLD
+
+# Keep the test fast and independent of deployment settings
+history_backfill.BACKFILL_PAGE_SIZE = 10
+history_backfill.BACKFILL_PAGE_DELAY = 0
+history_backfill.RECENT_MENTION_RETENTION_HOURS = 72
+
+class FakeAuthor:
+    def __init__(self, name):
+        self.display_name = name
+
+class FakeMessage:
+    def __init__(self, message_id, channel, content, author, created_at):
+        self.id = message_id
+        self.channel = channel
+        self.content = content
+        self.author = author
+        self.created_at = created_at
+        self.jump_url = f"https://discord.com/channels/1/{channel.id}/{message_id}"
+
+class FakeChannel:
+    """Serves history newest-first and records every page request"""
+    def __init__(self, channel_id, name):
+        self.id = channel_id
+        self.name = name
+        self.messages = []  # oldest first
+        self.page_requests = []
+
+    async def history(self, limit=100, before=None, after=None):
+        self.page_requests.append(before.id if before else None)
+        newest_first = sorted(self.messages, key=lambda message: message.id, reverse=True)
+        if before is not None:
+            newest_first = [message for message in newest_first if message.id < before.id]
+        for message in newest_first[:limit]:
+            yield message
+
+class FakeGuild:
+    def __init__(self, channels, me):
+        self.id = 1
+        self.name = "Test Guild"
+        self.text_channels = channels
+        self.me = me
+
+    def get_channel(self, channel_id):
+        return next((channel for channel in self.text_channels if channel.id == channel_id), None)
+
+def reset_index():
+    recent_message_index.clear()
+    recent_message_index.window.retention_hours = 72
+
+def make_guild(message_count, hours_apart):
+    bot_user = FakeAuthor("Ask Bot")
+    expert = FakeAuthor("Expert")
+    answering = FakeChannel(100, history_backfill.ANSWERING_CHANNEL)
+    final = FakeChannel(101, history_backfill.FINAL_ANSWER_CHANNEL)
+    now = datetime.now(timezone.utc)
+    for i in range(message_count):
+        created_at = now - timedelta(hours=(message_count - i) * hours_apart)
+        author = bot_user if i % 2 == 0 else expert
+        answering.messages.append(FakeMessage(1000 + i, answering, f"<@1> asked:\n> question {i}", author, created_at))
+    return FakeGuild([answering, final], bot_user), answering, final
+
+def test_full_backfill_pages_with_checkpoints():
+    """History is paged newest-first with before= checkpoints until the retention cutoff"""
+    reset_index()
+    guild, answering, final = make_guild(message_count=35, hours_apart=1)
+    throttled = []
+
+    async def throttle(operation):
+        throttled.append(operation)
+
+    asyncio.run(history_backfill.backfill_recent_message_index(guild, throttle=throttle))
+
+    assert recent_message_index.state == INDEX_READY
+    assert answering.page_requests == [None, 1025, 1015, 1005]
+    assert len(throttled) == len(answering.page_requests) + len(final.page_requests)
+    assert len(recent_message_index) == 18  # Bot-authored half of 35 messages
+    assert history_backfill.backfill_checkpoints[answering.id] == 1000
+
+def test_backfill_stops_at_retention_cutoff():
+    """Messages older than retention are never requested past the first old page"""
+    reset_index()
+    guild, answering, final = make_guild(message_count=40, hours_apart=4)
+
+    asyncio.run(history_backfill.backfill_recent_message_index(guild))
+
+    assert len(answering.page_requests) == 2  # 17 messages are inside 72h
+    assert all(entry.created_at >= (datetime.now(timezone.utc) - timedelta(hours=72)).timestamp()
+               for entry in recent_message_index.messages.values())
+
+def test_incremental_backfill_stops_at_high_water_mark():
+    """After a resume only pages newer than what is already indexed are fetched"""
+    reset_index()
+    guild, answering, final = make_guild(message_count=35, hours_apart=1)
+    asyncio.run(history_backfill.backfill_recent_message_index(guild))
+
+    answering.page_requests.clear()
+    newest = answering.messages[-1]
+    answering.messages.append(FakeMessage(2000, answering, "<@2> asked:\n> new question", guild.me, newest.created_at + timedelta(minutes=5)))
+    asyncio.run(history_backfill.backfill_recent_message_index(guild, incremental=True))
+
+    assert answering.page_requests == [None]
+    assert 2000 in recent_message_index.messages
+    recent_message_index.clear()
+    assert recent_message_index.state == INDEX_COLD
+
+def test_incremental_after_failed_full_pass_runs_full():
+    """A resume after a failed full pass pages the whole window instead of trusting the high-water mark"""
+    reset_index()
+    guild, answering, final = make_guild(message_count=35, hours_apart=1)
+    working_history = answering.history
+
+    def failing_history(limit=100, before=None, after=None):
+        if before is not None:
+            raise RuntimeError("HTTP 503")
+        return working_history(limit=limit, before=before, after=after)
+
+    answering.history = failing_history
+    asyncio.run(history_backfill.backfill_recent_message_index(guild))
+    assert recent_message_index.state != INDEX_READY
+    assert recent_message_index.newest_seen  # The first page already moved the high-water mark
+
+    answering.history = working_history
+    answering.page_requests.clear()
+    asyncio.run(history_backfill.backfill_recent_message_index(guild, incremental=True))
+
+    assert answering.page_requests == [None, 1025, 1015, 1005]
+    assert recent_message_index.state == INDEX_READY
+    assert len(recent_message_index) == 18
+
+if __name__ == "__main__":
+    test_full_backfill_pages_with_checkpoints()
+    test_backfill_stops_at_retention_cutoff()
+    test_incremental_backfill_stops_at_high_water_mark()
+    test_incremental_after_failed_full_pass_runs_full()
+    print("✅ History backfill tests passed")
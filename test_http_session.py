@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test that webhook calls share one pooled HTTP session
+"""
+
+import sys
+import os
+import asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from http_session import SharedHTTPSession
+from webhook_dispatcher import WebhookDispatcher
+
+def make_server(connections):
+    """Fake webhook endpoint that records which connection each request arrived on"""
+    async def webhook(request):
+        connections.append(id(request.transport))
+        return web.Response(status=204)
+
+    app = web.Application()
+    app.router.add_post("/webhook", webhook)
+    return TestServer(app)
+
+def test_webhooks_reuse_one_connection():
+    """Sequential webhook posts go over the same kept-alive connection"""
+    connections = []
+    shared = SharedHTTPSession(pool_size=4, timeout=5, keepalive=30)
+    dispatcher = WebhookDispatcher(http=shared)
+
+    async def run():
+        server = make_server(connections)
+        await server.start_server()
+        try:
+            url = str(server.make_url("/webhook"))
+            results = []
+            for i in range(3):
+                dispatcher.enqueue(url, "INFO", {"title": f"line {i}"})
+                results.append(await dispatcher.flush())
+            same_session = shared.get() is shared.get()
+        finally:
+            await shared.close()
+            await server.close()
+        return results, same_session
+
+    results, same_session = asyncio.run(run())
+
+    assert results == [1, 1, 1]
+    assert same_session
+    assert len(connections) == 3 and len(set(connections)) == 1
+    assert shared.session is None
+
+def test_close_allows_fresh_session():
+    """After close() (bot shutdown) the next use opens a new session instead of failing"""
+    shared = SharedHTTPSession(pool_size=4, timeout=5, keepalive=30)
+
+    async def run():
+        first = shared.get()
+        await shared.close()
+        second = shared.get()
+        closed = first.closed
+        await shared.close()
+        return first, second, closed
+
+    first, second, closed = asyncio.run(run())
+    assert closed and first is not second
+
+if __name__ == "__main__":
+    print("🧪 Testing shared HTTP session...")
+    test_webhooks_reuse_one_connection()
+    test_close_allows_fresh_session()
+    print("✅ All shared HTTP session tests passed")
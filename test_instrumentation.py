@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test per-stage timing and the allocation sampler
+"""
+
+import sys
+import os
+import asyncio
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from instrumentation import timed_stage, AllocationSampler, stage_seconds
+from tracing import Tracer, TraceExporter
+
+def make_tracer():
+    return Tracer(exporter=TraceExporter(path=None), enabled=False)
+
+def test_timed_stage_records_histogram():
+    """A timed block lands in the stage histogram, with or without a trace"""
+    before = stage_seconds.count(stage="test_stage")
+    with timed_stage("test_stage"):
+        sum(range(1000))
+    assert stage_seconds.count(stage="test_stage") == before + 1
+
+def test_timed_stage_records_span_in_current_trace():
+    """Inside a trace, stages become (nested) spans"""
+    tracer = make_tracer()
+    trace = tracer.begin("ask", "req1")
+    with timed_stage("player_detection"):
+        with timed_stage("name_matching", strategy="exact"):
+            pass
+    tracer.end(trace)
+
+    outer, inner = trace.spans
+    assert (outer.name, outer.parent_id) == ("player_detection", None)
+    assert (inner.name, inner.parent_id) == ("name_matching", outer.span_id)
+    assert inner.attributes == {"strategy": "exact"}
+    assert trace.summary().startswith("player_detection=")
+
+def test_timed_stage_spans_awaits():
+    """Stages that await are timed end to end"""
+    tracer = make_tracer()
+
+    async def run():
+        trace = tracer.begin("ask", "req2")
+        with timed_stage("test_await"):
+            await asyncio.sleep(0.02)
+        return tracer.end(trace)
+
+    trace = asyncio.run(run())
+    assert trace.spans[0].duration_ms() >= 15
+
+def test_timed_stage_records_on_exception():
+    """A stage that raises is still recorded, with the error"""
+    tracer = make_tracer()
+    trace = tracer.begin("ask", "req3")
+    try:
+        with timed_stage("test_raises"):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    tracer.end(trace)
+    assert trace.spans[0].error == "ValueError: boom"
+
+def test_allocation_sampler_off_by_default():
+    """Disabled sampler does no work"""
+    assert AllocationSampler(enabled=False).sample() is None
+
+def test_allocation_sampler_reports_delta():
+    """Enabled sampler reports allocated blocks and the change since the last sample"""
+    sampler = AllocationSampler(enabled=True)
+    first = sampler.sample()
+    keep = [[i] for i in range(10000)]
+    second = sampler.sample()
+    assert first["delta"] == 0
+    assert second["delta"] > 5000
+    assert len(second["gc_counts"]) == 3
+    del keep
+
+if __name__ == "__main__":
+    print("🧪 Testing instrumentation...")
+    test_timed_stage_records_histogram()
+    test_timed_stage_records_span_in_current_trace()
+    test_timed_stage_spans_awaits()
+    test_timed_stage_records_on_exception()
+    test_allocation_sampler_off_by_default()
+    test_allocation_sampler_reports_delta()
+    print("✅ All instrumentation tests passed")
@@ -9,6 +9,8 @@ import os
 # Add the current directory to Python path so we can import our modules
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+import logging_system
+from webhook_dispatcher import WebhookDispatcher
 from logging_system import log_info, log_error, log_success, log_warning, log_debug
 
 def test_logging():
@@ -23,5 +25,26 @@ def test_logging():
     
     print("🧪 Logging test complete. You should see 5 log messages above.")
 
+def test_filtered_levels_do_no_work():
+    """Below LOG_LEVEL nothing is formatted or queued; lazy messages are only built when needed"""
+    built = []
+    dispatcher = WebhookDispatcher(max_queue=10)
+    original = (logging_system._level_threshold, logging_system.WEBHOOK_LOGS_URL, logging_system.webhook_dispatcher)
+    logging_system._level_threshold = 1  # INFO
+    logging_system.WEBHOOK_LOGS_URL = "https://example.invalid/webhook"
+    logging_system.webhook_dispatcher = dispatcher
+    try:
+        log_debug(lambda: built.append("debug") or "debug line")
+        log_info(lambda: built.append("info") or "info line")
+    finally:
+        logging_system._level_threshold, logging_system.WEBHOOK_LOGS_URL, logging_system.webhook_dispatcher = original
+
+    assert built == ["info"]
+    queued = list(dispatcher.queues["https://example.invalid/webhook"])
+    assert [level for level, _ in queued] == ["INFO"]
+    assert queued[0][1]()["description"] == "```info line```"
+
 if __name__ == "__main__":
     test_logging()
+    test_filtered_levels_do_no_work()
+    print("✅ Logging level tests passed")
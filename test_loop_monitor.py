@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test the event-loop lag monitor and its load-shedding modes
+"""
+
+import sys
+import os
+import asyncio
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import loop_monitor as loop_monitor_module
+from loop_monitor import LoopMonitor, MODE_NORMAL, MODE_DEGRADED, MODE_OVERLOADED
+from analytics import AnalyticsAggregator
+
+def make_monitor(escalate_samples=3):
+    return LoopMonitor(interval=0.01, degraded_lag=0.1, overloaded_lag=0.5,
+                       escalate_samples=escalate_samples, recovery_samples=3)
+
+def test_single_spike_does_not_escalate():
+    """One slow sample (a GC pause) is not enough to start shedding load"""
+    monitor = make_monitor()
+    monitor.record(0.01)
+    monitor.record(0.8)
+    monitor.record(0.01)
+    monitor.record(0.8)
+    assert monitor.mode == MODE_NORMAL
+
+def test_escalates_after_consecutive_slow_samples():
+    """A sustained run of slow samples switches mode; the highest threshold that held wins"""
+    monitor = make_monitor()
+    monitor.record(0.2)
+    monitor.record(0.8)
+    assert monitor.mode == MODE_NORMAL
+    monitor.record(0.8)
+    assert monitor.degraded and not monitor.overloaded  # Three over the degraded threshold, two over overload
+    monitor.record(0.8)
+    assert monitor.overloaded
+
+def test_recovers_one_mode_at_a_time_after_calm_samples():
+    """Modes step back down only after a run of calm samples"""
+    monitor = make_monitor(escalate_samples=1)
+    monitor.record(0.8)
+    for _ in range(2):
+        monitor.record(0.0)
+    assert monitor.mode == MODE_OVERLOADED
+    monitor.record(0.0)
+    assert monitor.mode == MODE_DEGRADED
+    monitor.record(0.3)  # Still degraded-level lag: the calm run starts over
+    for _ in range(2):
+        monitor.record(0.0)
+    assert monitor.mode == MODE_DEGRADED
+    monitor.record(0.0)
+    assert monitor.mode == MODE_NORMAL
+
+def test_sampler_detects_blocked_loop():
+    """A loop kept blocked over several samples switches the monitor into overload"""
+    monitor = make_monitor(escalate_samples=2)
+
+    async def run():
+        monitor.start()
+        await asyncio.sleep(0.02)
+        import time
+        for _ in range(2):
+            time.sleep(0.7)  # Block the loop on purpose (well past overloaded_lag, even on a busy machine)
+            await asyncio.sleep(0.001)  # Let the sampler record the late wake-up
+        await asyncio.sleep(0.03)
+        monitor.task.cancel()
+
+    asyncio.run(run())
+    assert monitor.overloaded
+    assert monitor.max_lag >= 0.5
+
+def test_analytics_deferred_while_degraded():
+    """Sampled analytics posts are skipped under load but still counted"""
+    monitor = make_monitor(escalate_samples=1)
+    original = loop_monitor_module.loop_monitor
+    import analytics as analytics_module
+    analytics_module.loop_monitor = monitor
+    try:
+        aggregator = AnalyticsAggregator(flush_interval=60, sample_rate=1.0, rand=lambda: 0.0)
+        assert aggregator.should_post("Player Search")
+        monitor.record(0.2)
+        assert not aggregator.should_post("Player Search")
+        assert aggregator.should_post("Bot Health")  # Immediate events still go out
+        assert monitor.shed["analytics_sample"] == 1
+    finally:
+        analytics_module.loop_monitor = original
+
+if __name__ == "__main__":
+    print("🧪 Testing loop monitor...")
+    test_single_spike_does_not_escalate()
+    test_escalates_after_consecutive_slow_samples()
+    test_recovers_one_mode_at_a_time_after_calm_samples()
+    test_sampler_detects_blocked_loop()
+    test_analytics_deferred_while_degraded()
+    print("✅ All loop monitor tests passed")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test the inverted word index used by the fallback recent mention check
+"""
+
+import sys
+import os
+import asyncio
+import time
+from datetime import datetime, timezone
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import config
+from mention_index import RecentMessageIndex, recent_message_index, INDEX_READY
+import recent_mentions
+
+# Pin the mention window so these tests do not depend on runtime changes
+config.RECENT_MENTION_HOURS = 24
+
+class FakeAuthor:
+    def __init__(self, name):
+        self.display_name = name
+
+class FakeMessage:
+    def __init__(self, message_id, channel, content, author, created_at):
+        self.id = message_id
+        self.channel = channel
+        self.content = content
+        self.author = author
+        self.created_at = created_at
+        self.jump_url = f"https://discord.com/channels/1/{channel.id}/{message_id}"
+
+class FakeChannel:
+    def __init__(self, channel_id, name):
+        self.id = channel_id
+        self.name = name
+        self.messages = []
+        self.history_calls = 0
+
+    async def history(self, after=None, limit=None):
+        self.history_calls += 1
+        for message in self.messages:
+            yield message
+
+class FakeGuild:
+    def __init__(self, channels, me):
+        self.id = 1
+        self.text_channels = channels
+        self.me = me
+
+    def get_channel(self, channel_id):
+        return next((channel for channel in self.text_channels if channel.id == channel_id), None)
+
+def test_lookup_and_expiry():
+    """Tokens map to messages and whole buckets expire"""
+    index = RecentMessageIndex(retention_hours=24)
+    now = time.time()
+    index.add(1, 10, "question-reposting", "<@1> asked: Is Juan Soto hitting?", now - 60)
+    index.add(2, 11, "answered-by-expert", "**Expert** replied: Soto looks good", now - 2 * 3600)
+    index.add(3, 11, "answered-by-expert", "Ronald Acuña update", now - 30 * 3600)
+
+    assert [entry.id for entry in index.lookup("soto")] == [1, 2]
+    assert index.lookup("juan soto")[0].id == 1
+    assert index.lookup("acuna") == []  # Outside retention, never indexed
+    assert index.lookup("soto", hours=1)[0].id == 1  # Narrower window, same state
+    assert index.lookup("soto", channel_ids={11})[0].id == 2
+
+    removed = index.expire(now=now + 23 * 3600)
+    assert removed == 1
+    assert [entry.id for entry in index.lookup("soto")] == [1]
+    assert "looks" not in index.postings
+
+def test_edit_and_remove():
+    """Edits re-tokenize and removals clear posting lists"""
+    index = RecentMessageIndex(retention_hours=24)
+    index.add(1, 10, "question-reposting", "Juan Soto question", time.time())
+    index.update_content(1, "Aaron Judge question")
+    assert index.lookup("soto") == []
+    assert index.lookup("judge")[0].id == 1
+    index.remove(1)
+    assert len(index) == 0
+    assert not index.postings and not index.window.buckets
+
+def test_fallback_check_uses_index():
+    """The fallback check scans once per channel while warming and not at all once ready"""
+    recent_message_index.clear()
+    recent_message_index.window.retention_hours = 72
+
+    bot_user = FakeAuthor("Ask Bot")
+    answering = FakeChannel(100, recent_mentions.ANSWERING_CHANNEL)
+    final = FakeChannel(101, recent_mentions.FINAL_ANSWER_CHANNEL)
+    now = datetime.now(timezone.utc)
+    answering.messages.append(FakeMessage(500, answering, "<@1> asked:\n> How is Jazz Chisholm doing?", bot_user, now))
+    guild = FakeGuild([answering, final], bot_user)
+
+    found = asyncio.run(recent_mentions.check_fallback_recent_mentions(guild, ["chisholm", "doing", "lately"]))
+    assert found is True
+
+    assert answering.history_calls == 1
+    assert final.history_calls == 1
+
+    # Once the backfill has marked the shared index ready, lookups never touch history
+    for message in answering.messages:
+        recent_message_index.add_message(message)
+    recent_message_index.state = INDEX_READY
+    found = asyncio.run(recent_mentions.check_fallback_recent_mentions(guild, ["wacha", "chisholm"]))
+    assert found is True
+    found = asyncio.run(recent_mentions.check_fallback_recent_mentions(guild, ["wacha", "stats"]))
+    assert found is False
+    assert answering.history_calls == 1
+    assert final.history_calls == 1
+    recent_message_index.clear()
+
+if __name__ == "__main__":
+    test_lookup_and_expiry()
+    test_edit_and_remove()
+    test_fallback_check_uses_index()
+    print("✅ Mention index tests passed")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test precomputed per-player mention plans and the hierarchical matcher that uses them
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mention_plans import MentionPlan, build_mention_plans, get_mention_plan, message_tokens, mention_plans
+from recent_mentions import check_player_mention_hierarchical
+
+ROSTER = [
+    {'name': 'Brayan Abreu', 'team': 'Astros'},
+    {'name': 'Wilyer Abreu', 'team': 'Red Sox'},
+    {'name': 'Francisco Lindor', 'team': 'Mets'},
+    {'name': 'Victor Scott II', 'team': 'Cardinals'},
+    {'name': 'Max Muncy', 'team': 'Dodgers'},
+]
+
+def test_plan_fields():
+    """Plans capture distinctive first names and last-name conflicts"""
+    build_mention_plans(ROSTER)
+    brayan = get_mention_plan('brayan abreu')
+    assert brayan.distinctive_first_name
+    assert brayan.last_name_shared
+    assert brayan.conflicting_first_names == frozenset({'wilyer'})
+
+    max_muncy = get_mention_plan('max muncy')
+    assert not max_muncy.distinctive_first_name
+    assert not max_muncy.last_name_shared
+
+    scott = get_mention_plan('victor scott ii')
+    assert scott.last_name == 'ii' and scott.first_name == 'victor'
+    assert scott.name_tokens == frozenset({'victor', 'scott', 'ii'})
+
+def test_token_checks_match_word_boundaries():
+    """Token membership behaves like the old \\b regexes"""
+    plan = MentionPlan('max muncy')
+    text = 'is muncys stat line real or is muncy hitting'
+    tokens = message_tokens(text)
+    assert plan.has_last_name(tokens, text)
+    assert not plan.has_first_name(tokens, text)
+    assert not plan.has_full_name(tokens, 'max is muncy')
+    assert plan.has_full_name(message_tokens('max muncy hr'), 'max muncy hr')
+
+def test_hierarchical_levels():
+    """The matcher still walks full name, players list, last name and first name levels"""
+    build_mention_plans(ROSTER)
+    exact = check_player_mention_hierarchical('francisco lindor', 'uuid', 'francisco lindor projection update', 'francisco lindor projection update')
+    assert exact == (True, "exact_full_name_validated", 1.0)
+
+    conflict = check_player_mention_hierarchical('brayan abreu', 'uuid', 'wilyer abreu', 'wilyer abreu')
+    assert conflict[:2] == (False, "lastname_different_player")
+
+    none = check_player_mention_hierarchical('francisco lindor', 'uuid', 'how is juan soto doing', 'how is juan soto doing')
+    assert none == (False, "no_match", 0.0)
+
+def test_unrostered_names_get_cached_plans():
+    """Names outside the roster are planned once and reused"""
+    build_mention_plans(ROSTER)
+    first = get_mention_plan('mystery prospect')
+    assert get_mention_plan('mystery prospect') is first
+    assert 'mystery prospect' not in mention_plans
+
+if __name__ == "__main__":
+    test_plan_fields()
+    test_token_checks_match_word_boundaries()
+    test_hierarchical_levels()
+    test_unrostered_names_get_cached_plans()
+    print("✅ Mention plan tests passed")
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test the Prometheus-style metrics registry and local /metrics endpoint
+"""
+
+import sys
+import os
+import asyncio
+import aiohttp
+from aiohttp.test_utils import TestServer
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from metrics import MetricsRegistry, MetricsServer
+from loop_monitor import LoopMonitor
+
+def test_counter_and_gauge_render():
+    """Labelled counters and gauges render in the text exposition format"""
+    registry = MetricsRegistry()
+    requests = registry.counter("ask_requests_total", "Requests by outcome", ("outcome",))
+    requests.inc(outcome="approved")
+    requests.inc(outcome="approved")
+    requests.inc(outcome="blocked")
+    registry.gauge("pending_selections", "Pending").set(3)
+
+    text = registry.render()
+    assert "# TYPE ask_requests_total counter" in text
+    assert 'ask_requests_total{outcome="approved"} 2' in text
+    assert 'ask_requests_total{outcome="blocked"} 1' in text
+    assert "# TYPE pending_selections gauge" in text
+    assert "pending_selections 3" in text
+
+def test_same_name_returns_same_metric():
+    """Registering a name twice shares one metric"""
+    registry = MetricsRegistry()
+    first = registry.counter("events_total", "Events")
+    assert registry.counter("events_total", "Events") is first
+
+def test_wrong_labels_rejected():
+    """Label names must match the metric's declaration"""
+    registry = MetricsRegistry()
+    counter = registry.counter("events_total", "Events", ("kind",))
+    try:
+        counter.inc(outcome="x")
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+def test_histogram_buckets_are_cumulative():
+    """Each observation lands in its bucket and every larger one"""
+    registry = MetricsRegistry()
+    stage = registry.histogram("detection_stage_seconds", "Stage latency", ("stage",), buckets=(0.01, 0.1, 1.0))
+    for value in (0.005, 0.05, 0.05, 2.0):
+        stage.observe(value, stage="validation")
+
+    text = registry.render()
+    assert 'detection_stage_seconds_bucket{stage="validation",le="0.01"} 1' in text
+    assert 'detection_stage_seconds_bucket{stage="validation",le="0.1"} 3' in text
+    assert 'detection_stage_seconds_bucket{stage="validation",le="1.0"} 3' in text
+    assert 'detection_stage_seconds_bucket{stage="validation",le="+Inf"} 4' in text
+    assert 'detection_stage_seconds_count{stage="validation"} 4' in text
+    assert stage.count(stage="validation") == 4
+
+def test_callback_metrics_read_state_at_scrape_time():
+    """Callback metrics reflect current state and a failing one does not break the page"""
+    registry = MetricsRegistry()
+    queue = []
+    registry.callback("webhook_queue_depth", "Queue depth", lambda: len(queue))
+    registry.callback("rate_limiter_tokens", "Tokens", lambda: [({"operation": "send"}, 2.5)])
+    registry.callback("broken", "Broken", lambda: 1 / 0)
+
+    queue.extend([1, 2])
+    text = registry.render()
+    assert "webhook_queue_depth 2" in text
+    assert 'rate_limiter_tokens{operation="send"} 2.5' in text
+    assert "# broken collection failed" in text
+
+def test_label_values_escaped():
+    """Quotes and backslashes in label values are escaped"""
+    registry = MetricsRegistry()
+    registry.counter("events_total", "Events", ("name",)).inc(name='a"b\\c')
+    assert 'events_total{name="a\\"b\\\\c"} 1' in registry.render()
+
+def test_metrics_endpoint_scrape():
+    """GET /metrics serves the registry without Discord"""
+    registry = MetricsRegistry()
+    registry.counter("ask_requests_total", "Requests by outcome", ("outcome",)).inc(outcome="approved")
+
+    async def run():
+        server = TestServer(MetricsServer(registry).app())
+        await server.start_server()
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(server.make_url("/metrics")) as response:
+                    return response.status, response.headers["Content-Type"], await response.text()
+        finally:
+            await server.close()
+
+    status, content_type, text = asyncio.run(run())
+    assert status == 200
+    assert content_type.startswith("text/plain")
+    assert 'ask_requests_total{outcome="approved"} 1' in text
+
+def test_failed_bind_can_be_retried():
+    """A port already in use raises OSError and leaves the server stopped, so a later start() works"""
+    import socket
+    taken = socket.socket()
+    taken.bind(("127.0.0.1", 0))
+    taken.listen()
+    port = taken.getsockname()[1]
+    server = MetricsServer(MetricsRegistry())
+
+    async def run():
+        try:
+            await server.start("127.0.0.1", port)
+        except OSError:
+            pass
+        else:
+            raise AssertionError("expected OSError")
+        assert server.runner is None
+        taken.close()
+        try:
+            return await server.start("127.0.0.1", port)
+        finally:
+            await server.stop()
+
+    try:
+        assert asyncio.run(run()) is True
+    finally:
+        taken.close()
+
+def test_loop_monitor_measures_blocking():
+    """A blocking call on the loop shows up as lag"""
+    monitor = LoopMonitor(interval=0.01)
+
+    async def run():
+        monitor.start()
+        await asyncio.sleep(0.02)
+        import time
+        time.sleep(0.1)  # Block the loop on purpose
+        await asyncio.sleep(0.03)
+        monitor.task.cancel()
+
+    asyncio.run(run())
+    assert monitor.max_lag >= 0.05
+
+if __name__ == "__main__":
+    print("🧪 Testing metrics...")
+    test_counter_and_gauge_render()
+    test_same_name_returns_same_metric()
+    test_wrong_labels_rejected()
+    test_histogram_buckets_are_cumulative()
+    test_callback_metrics_read_state_at_scrape_time()
+    test_label_values_escaped()
+    test_metrics_endpoint_scrape()
+    test_failed_bind_can_be_retried()
+    test_loop_monitor_measures_blocking()
+    print("✅ All metrics tests passed")
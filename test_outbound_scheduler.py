@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test prioritized outbound Discord operation scheduling
+"""
+
+import sys
+import os
+import asyncio
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from outbound_scheduler import OutboundScheduler, PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW
+
+def test_high_priority_jumps_the_backlog():
+    """An approved question queued behind cosmetic work runs first"""
+    scheduler = OutboundScheduler(workers=1, low_backlog=50, low_max_age=60)
+    order = []
+    gate = asyncio.Event()
+
+    def job(name):
+        async def run():
+            if name == "blocker":
+                await gate.wait()
+            order.append(name)
+        return run
+
+    async def run():
+        blocker = asyncio.create_task(scheduler.run("blocker", job("blocker"), PRIORITY_NORMAL))
+        await asyncio.sleep(0)
+        for i in range(5):
+            scheduler.submit("delete_message", job(f"delete-{i}"), PRIORITY_LOW)
+        question = asyncio.create_task(scheduler.run("post_question", job("question"), PRIORITY_HIGH))
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(blocker, question)
+        await scheduler.join()
+
+    asyncio.run(run())
+    assert order[:2] == ["blocker", "question"]
+    assert order[2:] == [f"delete-{i}" for i in range(5)]
+
+def test_run_returns_result_and_raises_errors():
+    """Awaited jobs hand back the factory's result or exception"""
+    scheduler = OutboundScheduler(workers=2, low_backlog=5, low_max_age=60)
+
+    async def ok():
+        return "posted"
+
+    async def broken():
+        raise RuntimeError("send failed")
+
+    async def run():
+        assert await scheduler.run("post_question", ok, PRIORITY_HIGH) == "posted"
+        try:
+            await scheduler.run("post_question", broken, PRIORITY_HIGH)
+        except RuntimeError as e:
+            return str(e)
+
+    assert asyncio.run(run()) == "send failed"
+
+def test_low_priority_is_coalesced_and_dropped_under_pressure():
+    """Duplicate keys collapse into one job and a full low backlog drops new work"""
+    scheduler = OutboundScheduler(workers=1, low_backlog=3, low_max_age=60)
+    ran = []
+    gate = asyncio.Event()
+
+    async def blocker():
+        await gate.wait()
+
+    def job(name):
+        async def run():
+            ran.append(name)
+        return run
+
+    async def run():
+        blocked = asyncio.create_task(scheduler.run("blocker", blocker, PRIORITY_HIGH))
+        await asyncio.sleep(0)
+        scheduler.submit("send_confirmation", job("first"), key=("confirmation", 1))
+        scheduler.submit("send_confirmation", job("latest"), key=("confirmation", 1))
+        assert scheduler.submit("delete_message", job("a"))
+        assert scheduler.submit("delete_message", job("b"))
+        assert not scheduler.submit("delete_message", job("c"))
+        gate.set()
+        await blocked
+        await scheduler.join()
+
+    asyncio.run(run())
+    assert ran == ["latest", "a", "b"]
+    assert scheduler.stats["coalesced"] == 1
+    assert scheduler.stats["dropped"] == 1
+
+def test_stale_low_priority_work_is_skipped():
+    """Confirmations that waited past their max age are not sent"""
+    scheduler = OutboundScheduler(workers=1, low_backlog=5, low_max_age=0)
+    ran = []
+
+    async def confirmation():
+        ran.append(1)
+
+    async def run():
+        scheduler.submit("send_confirmation", confirmation)
+        await asyncio.sleep(0.01)
+        await scheduler.join()
+
+    asyncio.run(run())
+    assert ran == []
+    assert scheduler.stats["stale"] == 1
+
+if __name__ == "__main__":
+    print("🧪 Testing outbound scheduler...")
+    test_high_priority_jumps_the_backlog()
+    test_run_returns_result_and_raises_errors()
+    test_low_priority_is_coalesced_and_dropped_under_pressure()
+    test_stale_low_priority_work_is_skipped()
+    print("✅ All outbound scheduler tests passed")
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test the on-demand request profiler
+"""
+
+import sys
+import os
+import asyncio
+import pstats
+import tempfile
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from profiling import RequestProfiler
+
+def fuzzy_work():
+    return sum(i * i for i in range(20000))
+
+def executor_work():
+    return sorted(str(i) for i in range(20000))
+
+def test_profiles_next_n_requests_and_reports_once():
+    """Only the armed number of requests is profiled; the report comes with the last one"""
+    with tempfile.TemporaryDirectory() as tmp:
+        profiler = RequestProfiler(output_dir=tmp, top=10)
+        assert profiler.arm(2, report_to="channel")
+        assert not profiler.arm(5)  # Already running
+
+        first = profiler.start_request()
+        fuzzy_work()
+        assert profiler.finish_request(first) is None
+
+        second = profiler.start_request()
+        fuzzy_work()
+        path, summary, report_to = profiler.finish_request(second)
+
+        assert report_to == "channel"
+        assert os.path.exists(path)
+        assert "fuzzy_work" in summary
+        assert summary.startswith("2 requests")
+        assert not profiler.armed
+        assert profiler.start_request() is False
+
+def test_overlapping_requests_share_one_profile():
+    """Concurrent armed requests are covered by one profile that ends with the last of them"""
+    with tempfile.TemporaryDirectory() as tmp:
+        profiler = RequestProfiler(output_dir=tmp)
+        profiler.arm(2)
+
+        async def request():
+            profiled = profiler.start_request()
+            await asyncio.sleep(0.01)
+            fuzzy_work()
+            return profiler.finish_request(profiled)
+
+        async def run():
+            return await asyncio.gather(request(), request())
+
+        results = asyncio.run(run())
+        assert sum(result is not None for result in results) == 1
+
+def test_executor_work_is_merged():
+    """Work run through the executor wrapper appears in the stats"""
+    with tempfile.TemporaryDirectory() as tmp:
+        profiler = RequestProfiler(output_dir=tmp)
+        profiler.arm(1)
+
+        async def run():
+            profiled = profiler.start_request()
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, profiler.profile_call, executor_work)
+            return profiler.finish_request(profiled)
+
+        path, summary, _ = asyncio.run(run())
+        functions = {function for _, _, function in pstats.Stats(path).stats}
+        assert "executor_work" in functions
+
+def test_time_limit_stops_run_with_partial_report():
+    """A run still short of its requests at the time limit reports what it has; late requests are ignored"""
+    with tempfile.TemporaryDirectory() as tmp:
+        now = [0.0]
+        profiler = RequestProfiler(output_dir=tmp, max_seconds=60, clock=lambda: now[0])
+        run = profiler.arm(3, report_to="channel")
+
+        first = profiler.start_request()
+        fuzzy_work()
+        assert profiler.finish_request(first) is None
+        straggler = profiler.start_request()
+
+        now[0] = 61
+        assert profiler.start_request() is False  # No new requests past the limit
+        assert profiler.stop("time limit reached", run=run + 1) is None  # Not this run
+        path, summary, report_to = profiler.stop("time limit reached", run=run)
+
+        assert report_to == "channel"
+        assert os.path.exists(path)
+        assert summary.startswith("Stopped early (time limit reached) with 2 requests to go")
+        assert "1 requests" in summary
+        assert not profiler.armed
+        assert profiler.finish_request(straggler) is None
+
+        # A new run is unaffected by the stopped run's straggler
+        profiler.arm(1)
+        assert profiler.finish_request(straggler) is None
+        assert profiler.armed
+
+def test_stop_cancels_run():
+    """`!profile off` stops a run, even before any request was profiled"""
+    profiler = RequestProfiler(output_dir=None)
+    assert profiler.stop("cancelled") is None  # Nothing running
+    profiler.arm(5, report_to="channel")
+    path, summary, report_to = profiler.stop("cancelled")
+    assert path is None
+    assert "No requests were profiled" in summary
+    assert report_to == "channel"
+    assert not profiler.armed
+
+def test_unarmed_profile_call_just_runs():
+    """Without a run in progress the executor wrapper adds nothing"""
+    profiler = RequestProfiler(output_dir=None)
+    assert profiler.profile_call(len, [1, 2]) == 2
+    assert profiler.thread_profiles == []
+
+if __name__ == "__main__":
+    print("🧪 Testing request profiler...")
+    test_profiles_next_n_requests_and_reports_once()
+    test_overlapping_requests_share_one_profile()
+    test_executor_work_is_merged()
+    test_time_limit_stops_run_with_partial_report()
+    test_stop_cancels_run()
+    test_unarmed_profile_call_just_runs()
+    print("✅ All request profiler tests passed")
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test the non-blocking token-bucket rate limiter
+"""
+
+import sys
+import os
+import asyncio
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rate_limiter import AsyncRateLimiter, TokenBucket, RateLimitExceeded
+
+class FakeClock:
+    """Manual clock; sleeping advances it instead of waiting"""
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+def test_token_bucket_reservations_queue_in_order():
+    """An empty bucket hands out increasing waits instead of rejecting"""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1.0, capacity=2, clock=clock)
+    assert bucket.reserve(clock()) == 0
+    assert bucket.reserve(clock()) == 0
+    assert bucket.reserve(clock()) == 1.0
+    assert bucket.reserve(clock()) == 2.0
+    clock.now += 10
+    assert bucket.peek(clock()) == 0
+
+def test_burst_then_wait():
+    """Calls within the burst are immediate, later ones wait for refill"""
+    clock = FakeClock()
+    limiter = AsyncRateLimiter(clock=clock, sleep=clock.sleep)
+
+    async def run():
+        for _ in range(limiter.operation_burst):
+            await limiter.acquire("send_message")
+        assert clock.sleeps == []
+        await limiter.acquire("send_message")
+
+    asyncio.run(run())
+    assert len(clock.sleeps) == 1
+    assert abs(clock.sleeps[0] - 1 / limiter.operation_rate) < 1e-6
+    assert limiter.waits["send_message"] == 1
+
+def test_throttled_operation_does_not_stall_others():
+    """Exhausting one operation leaves other operations immediate"""
+    clock = FakeClock()
+    limiter = AsyncRateLimiter(clock=clock, sleep=clock.sleep)
+    limiter.enter_emergency_mode()
+
+    async def run():
+        for _ in range(limiter.operation_burst):
+            await limiter.acquire("history_backfill")
+        assert not limiter.can_proceed("history_backfill")
+        assert limiter.can_proceed("send_message")
+        await limiter.acquire("send_message")
+
+    asyncio.run(run())
+    assert clock.sleeps == []
+
+def test_waiting_does_not_block_event_loop():
+    """Other coroutines keep running while a caller waits for a token"""
+    limiter = AsyncRateLimiter()
+    limiter.operation_rate = 20.0  # 50ms per token
+    limiter.operation_burst = 1
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(1)
+            await asyncio.sleep(0.005)
+
+    async def run():
+        await limiter.acquire("bot_startup")
+        await asyncio.gather(limiter.acquire("bot_startup"), ticker())
+
+    asyncio.run(run())
+    assert len(ticks) == 5
+    assert limiter.calls["bot_startup"] == 2
+
+def test_wait_is_capped():
+    """A caller that would queue past max_wait fails fast and does not hold a token"""
+    clock = FakeClock()
+    sleeps = []
+
+    async def queued_sleep(seconds):
+        sleeps.append(seconds)  # Clock stands still, as for callers queued at the same moment
+
+    limiter = AsyncRateLimiter(clock=clock, sleep=queued_sleep, max_wait=150)
+    limiter.enter_emergency_mode()  # 30/hour: 120s per token
+
+    async def run():
+        for _ in range(limiter.operation_burst + 1):
+            await limiter.acquire("bot_startup")
+        tokens = limiter.buckets["bot_startup"].tokens
+        try:
+            await limiter.acquire("bot_startup")  # Would queue behind the previous caller: 240s
+        except RateLimitExceeded as e:
+            assert e.delay > 150
+        else:
+            raise AssertionError("expected RateLimitExceeded")
+        assert limiter.buckets["bot_startup"].tokens == tokens
+
+    asyncio.run(run())
+    assert sleeps == [120.0]
+    assert limiter.rejected["bot_startup"] == 1
+
+def test_cancelled_waiter_refunds_token():
+    """Cancelling a queued caller gives its token back to the next one"""
+    limiter = AsyncRateLimiter()
+    limiter.operation_rate = 1.0
+    limiter.operation_burst = 1
+
+    async def run():
+        await limiter.acquire("history_backfill")
+        waiter = asyncio.create_task(limiter.acquire("history_backfill"))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            pass
+        # Without the refund this caller would queue behind the cancelled one (~2s)
+        started = asyncio.get_running_loop().time()
+        await limiter.acquire("history_backfill")
+        return asyncio.get_running_loop().time() - started
+
+    assert asyncio.run(run()) < 1.5
+    assert limiter.calls["history_backfill"] == 2
+
+if __name__ == "__main__":
+    print("🧪 Testing async rate limiter...")
+    test_token_bucket_reservations_queue_in_order()
+    test_burst_then_wait()
+    test_throttled_operation_does_not_stall_others()
+    test_waiting_does_not_block_event_loop()
+    test_wait_is_capped()
+    test_cancelled_waiter_refunds_token()
+    print("✅ All async rate limiter tests passed")
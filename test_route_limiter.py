@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Test the Discord route-bucket limiter against a local fake API server
+"""
+
+import sys
+import os
+import time
+import asyncio
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from route_limiter import RouteBucketLimiter, route_key
+
+class FakeDiscordBucket:
+    """Enforces one fixed-window bucket the way Discord reports it"""
+    def __init__(self, bucket_hash, limit, window):
+        self.bucket_hash = bucket_hash
+        self.limit = limit
+        self.window = window
+        self.window_end = 0.0
+        self.used = 0
+
+    def hit(self):
+        now = time.monotonic()
+        if now >= self.window_end:
+            self.window_end = now + self.window
+            self.used = 0
+        reset_after = max(self.window_end - now, 0.0)
+        headers = {
+            "X-RateLimit-Bucket": self.bucket_hash,
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+        }
+        if self.used >= self.limit:
+            headers["X-RateLimit-Remaining"] = "0"
+            headers["Retry-After"] = f"{reset_after:.3f}"
+            return 429, headers
+        self.used += 1
+        headers["X-RateLimit-Remaining"] = str(self.limit - self.used)
+        return 200, headers
+
+def make_server(buckets, log):
+    """Fake API: one bucket per channel id for message sends"""
+    async def send_message(request):
+        status, headers = buckets[request.match_info["channel_id"]].hit()
+        log.append(status)
+        return web.json_response({}, status=status, headers=headers)
+
+    app = web.Application()
+    app.router.add_post("/api/v10/channels/{channel_id}/messages", send_message)
+    return TestServer(app)
+
+async def send_all(server, limiter, paths):
+    async with aiohttp.ClientSession(trace_configs=[limiter.trace_config()]) as session:
+        async def send(path):
+            async with session.post(server.make_url(path)) as response:
+                return response.status
+        return await asyncio.gather(*(send(path) for path in paths))
+
+def test_route_key_uses_template_and_major_parameter():
+    """Snowflakes collapse into the template; the channel id stays as the major parameter"""
+    assert route_key("delete", "/api/v10/channels/123/messages/456") == ("DELETE channels/{channels}/messages/{id}", "123")
+    assert route_key("PUT", "/api/v10/channels/1/messages/2/reactions/%E2%9C%85/@me") == ("PUT channels/{channels}/messages/{id}/reactions/{emoji}/@me", "1")
+    assert route_key("POST", "/api/v10/webhooks/9/tok3n") == ("POST webhooks/{webhooks}/{token}", "9/tok3n")
+    assert route_key("POST", "/api/v10/interactions/5/aW50ZXJhY3Rpb24/callback") == ("POST interactions/{id}/{token}/callback", "")
+
+def test_bursts_stay_under_learned_bucket_without_429():
+    """Concurrent sends are scheduled into the bucket's windows, never tripping a 429"""
+    log = []
+    buckets = {"1": FakeDiscordBucket("abc", limit=3, window=0.2)}
+    limiter = RouteBucketLimiter()
+
+    async def run():
+        server = make_server(buckets, log)
+        await server.start_server()
+        try:
+            return await send_all(server, limiter, ["/api/v10/channels/1/messages"] * 10)
+        finally:
+            await server.close()
+
+    statuses = asyncio.run(run())
+    assert statuses == [200] * 10
+    assert 429 not in log
+    assert limiter.bucket_hashes["POST channels/{channels}/messages"] == "abc"
+    assert limiter.stats["waits"] > 0
+
+def test_major_parameters_have_independent_budgets():
+    """A busy channel does not delay sends to another channel"""
+    log = []
+    buckets = {"1": FakeDiscordBucket("abc", limit=2, window=5.0), "2": FakeDiscordBucket("abc", limit=2, window=5.0)}
+    limiter = RouteBucketLimiter()
+
+    async def run():
+        server = make_server(buckets, log)
+        await server.start_server()
+        try:
+            await send_all(server, limiter, ["/api/v10/channels/1/messages"] * 2)
+            started = time.monotonic()
+            statuses = await send_all(server, limiter, ["/api/v10/channels/2/messages"] * 2)
+            return statuses, time.monotonic() - started
+        finally:
+            await server.close()
+
+    statuses, elapsed = asyncio.run(run())
+    assert statuses == [200, 200]
+    assert elapsed < 1.0
+    assert 429 not in log
+
+def test_replayed_global_429_pauses_every_route():
+    """A recorded global 429 blocks all routes until Retry-After passes"""
+    now = [100.0]
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = RouteBucketLimiter(clock=lambda: now[0], sleep=fake_sleep)
+    recorded = [
+        (200, {"X-RateLimit-Bucket": "abc", "X-RateLimit-Limit": "5", "X-RateLimit-Remaining": "4", "X-RateLimit-Reset-After": "1.0"}),
+        (429, {"X-RateLimit-Global": "true", "Retry-After": "2.5"}),
+    ]
+
+    async def run():
+        for status, headers in recorded:
+            await limiter.acquire("POST", "/api/v10/channels/1/messages")
+            limiter.update("POST", "/api/v10/channels/1/messages", status, headers)
+        await limiter.acquire("GET", "/api/v10/guilds/7/members/8")
+
+    asyncio.run(run())
+    assert sleeps == [2.5]
+    assert limiter.stats["global_rate_limited"] == 1
+
+def test_replayed_shared_bucket_429_waits_for_retry_after():
+    """A recorded per-resource 429 empties the bucket until Retry-After"""
+    now = [0.0]
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = RouteBucketLimiter(clock=lambda: now[0], sleep=fake_sleep)
+    path = "/api/v10/channels/1/messages/2/reactions/x/@me"
+
+    async def run():
+        await limiter.acquire("PUT", path)
+        limiter.update("PUT", path, 429, {"X-RateLimit-Bucket": "r", "X-RateLimit-Limit": "1", "X-RateLimit-Remaining": "0",
+                                           "X-RateLimit-Reset-After": "0.25", "X-RateLimit-Scope": "shared", "Retry-After": "0.75"})
+        await limiter.acquire("PUT", path)
+
+    asyncio.run(run())
+    assert sleeps == [0.75]
+    assert limiter.stats["rate_limited"] == 1
+
+def test_idle_buckets_are_pruned():
+    """Buckets whose window has ended with nothing in flight are dropped on the next sweep"""
+    now = [0.0]
+
+    async def fake_sleep(seconds):
+        now[0] += seconds
+
+    limiter = RouteBucketLimiter(clock=lambda: now[0], sleep=fake_sleep)
+    headers = {"X-RateLimit-Limit": "5", "X-RateLimit-Remaining": "4", "X-RateLimit-Reset-After": "1.0"}
+
+    async def run():
+        for channel in range(20):
+            path = f"/api/v10/channels/{channel}/messages"
+            await limiter.acquire("POST", path)
+            limiter.update("POST", path, 200, headers)
+        busy = "/api/v10/channels/99/messages"
+        await limiter.acquire("POST", busy)  # Still in flight at the sweep
+        now[0] += 120
+        await limiter.acquire("GET", "/api/v10/guilds/1/members/2")
+
+    asyncio.run(run())
+    assert set(limiter.buckets) == {("POST channels/{channels}/messages", "99"), ("GET guilds/{guilds}/members/{id}", "1")}
+
+def test_cancel_during_global_wait_releases_bucket_slot():
+    """A request cancelled while waiting on the global limit does not keep its bucket slot"""
+    limiter = RouteBucketLimiter(global_rate=1)
+    path = "/api/v10/channels/1/messages"
+
+    async def run():
+        limiter.global_bucket.tokens = 0  # Next request must wait on the global bucket
+        waiter = asyncio.create_task(limiter.acquire("POST", path))
+        await asyncio.sleep(0.01)
+        bucket = limiter._bucket(*route_key("POST", path))
+        assert bucket.in_flight == 1
+        waiter.cancel()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            pass
+        assert bucket.in_flight == 0
+
+        # The limit is still unknown; the next request must be able to discover it
+        limiter.global_bucket.tokens = 5
+        await asyncio.wait_for(limiter.acquire("POST", path), timeout=1.0)
+
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    print("🧪 Testing route-bucket limiter...")
+    test_route_key_uses_template_and_major_parameter()
+    test_bursts_stay_under_learned_bucket_without_429()
+    test_major_parameters_have_independent_budgets()
+    test_replayed_global_429_pauses_every_route()
+    test_replayed_shared_bucket_429_waits_for_retry_after()
+    test_idle_buckets_are_pruned()
+    test_cancel_during_global_wait_releases_bucket_slot()
+    print("✅ All route-bucket limiter tests passed")
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Test the message-id indexed pending selection store
+"""
+
+import sys
+import os
+import asyncio
+import tempfile
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from selection_store import SelectionStore
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def make_store(clock):
+    return SelectionStore(ttl=30, sweep_interval=1, clock=clock, path=None)
+
+def test_lookup_by_message_and_user():
+    """Selections are found by prompt message id and by user id"""
+    async def run():
+        store = make_store(FakeClock())
+        store.add(42, 555, {"players": ["a", "b"]})
+        return store
+
+    store = asyncio.run(run())
+    assert store.get(555)["players"] == ["a", "b"]
+    assert store.get(555)["user_id"] == 42
+    assert store.for_user(42) is store.get(555)
+    assert store.has_user(42)
+    assert store.get(556) is None and not store.has_user(7)
+
+def test_claim_is_exclusive():
+    """Only the first claim gets the selection"""
+    async def run():
+        store = make_store(FakeClock())
+        store.add(42, 555, {})
+        return store
+
+    store = asyncio.run(run())
+    assert store.claim(555) is not None
+    assert store.claim(555) is None
+    assert not store.has_user(42)
+    assert len(store) == 0
+
+def test_new_prompt_replaces_users_old_selection():
+    """A user only ever has one pending selection; the replaced one is cleaned up like a timeout"""
+    expired = []
+
+    async def on_expire(selection):
+        expired.append(selection["message_id"])
+
+    async def run():
+        store = make_store(FakeClock())
+        store.on_expire = on_expire
+        store.add(42, 555, {})
+        store.add(42, 777, {})
+        await asyncio.sleep(0)
+        return store
+
+    store = asyncio.run(run())
+    assert store.get(555) is None and 555 not in store
+    assert store.for_user(42)["message_id"] == 777
+    assert len(store) == 1
+    assert expired == [555]
+
+def test_sweep_expires_and_hands_off():
+    """Expired selections are removed by the sweeper and passed to on_expire exactly once"""
+    clock = FakeClock()
+    expired = []
+
+    async def on_expire(selection):
+        expired.append(selection["message_id"])
+
+    async def run():
+        store = make_store(clock)
+        store.on_expire = on_expire
+        store.add(42, 555, {})
+        store.add(43, 666, {}, ttl=60)
+        clock.now += 31
+        assert store.get(555) is None  # Expired entries are invisible before the sweep
+        first = await store.sweep()
+        second = await store.sweep()
+        return store, first, second
+
+    store, first, second = asyncio.run(run())
+    assert (first, second) == (1, 0)
+    assert expired == [555]
+    assert store.has_user(43) and not store.has_user(42)
+
+def test_claimed_selection_never_expires():
+    """A selection completed before its deadline is not handed to on_expire"""
+    clock = FakeClock()
+    expired = []
+
+    async def on_expire(selection):
+        expired.append(selection)
+
+    async def run():
+        store = make_store(clock)
+        store.on_expire = on_expire
+        store.add(42, 555, {})
+        store.claim(555)
+        clock.now += 31
+        return await store.sweep()
+
+    assert asyncio.run(run()) == 0
+    assert expired == []
+
+def test_snapshot_round_trip():
+    """Every change is saved, and a new store can reload the pending records"""
+    path = os.path.join(tempfile.mkdtemp(), "pending_selections.json")
+
+    async def run():
+        store = SelectionStore(ttl=30, sweep_interval=1, clock=FakeClock(), path=path)
+        store.add(42, 555, {"players": [{"name": "Bryan Abreu", "team": "Astros"}], "original_question": "Abreu?"})
+        store.add(43, 666, {"players": []})
+        store.claim(666)
+        assert not os.path.exists(path)  # Saves are debounced off the event loop
+        await store.flush()
+        return SelectionStore(path=path).load()
+
+    records = asyncio.run(run())
+    assert len(records) == 1
+    assert records[0]["message_id"] == 555 and records[0]["user_id"] == 42
+    assert records[0]["expires_at"] == 1030.0
+    assert records[0]["players"][0]["name"] == "Bryan Abreu"
+
+def test_changes_are_saved_in_one_debounced_write():
+    """A burst of adds and claims costs one snapshot write"""
+    path = os.path.join(tempfile.mkdtemp(), "pending_selections.json")
+    writes = []
+
+    async def run():
+        store = SelectionStore(ttl=30, sweep_interval=1, clock=FakeClock(), path=path, save_delay=0.02)
+        write = store.write
+        store.write = lambda records, version: writes.append(len(records)) or write(records, version)
+        for user_id in range(5):
+            store.add(user_id, 500 + user_id, {})
+        store.claim(500)
+        await asyncio.sleep(0.06)
+        return store
+
+    store = asyncio.run(run())
+    assert writes == [4]
+    assert not store.dirty
+    assert len(SelectionStore(path=path).load()) == 4
+
+if __name__ == "__main__":
+    print("🧪 Testing selection store...")
+    test_lookup_by_message_and_user()
+    test_claim_is_exclusive()
+    test_new_prompt_replaces_users_old_selection()
+    test_sweep_expires_and_hands_off()
+    test_claimed_selection_never_expires()
+    test_snapshot_round_trip()
+    test_changes_are_saved_in_one_debounced_write()
+    print("✅ All selection store tests passed")
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Test the select-menu disambiguation prompt
+"""
+
+import sys
+import os
+import asyncio
+import itertools
+import tempfile
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import selection_handlers
+from selection_handlers import PlayerSelectView
+from selection_store import SelectionStore
+
+# Pin the settings these tests rely on (other test modules may replace config with mocks)
+selection_handlers.REACTIONS = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "6️⃣", "7️⃣", "8️⃣"]
+selection_handlers.ALLOW_HELPER_REACTIONS = False
+selection_handlers.selection_store = SelectionStore(ttl=30, sweep_interval=1, path=None)
+
+message_ids = itertools.count(1000)
+
+class FakeUser:
+    def __init__(self, user_id):
+        self.id = user_id
+        self.display_name = f"user{user_id}"
+
+class FakeMessage:
+    def __init__(self, channel):
+        self.id = next(message_ids)
+        self.channel = channel
+
+    async def delete(self):
+        pass
+
+class FakeChannel:
+    def __init__(self):
+        self.id = 1
+        self.name = "ask-questions"
+        self.sent = []
+
+    async def send(self, content, **kwargs):
+        self.sent.append(content)
+        return FakeMessage(self)
+
+    def get_partial_message(self, message_id):
+        message = FakeMessage(self)
+        message.id = message_id
+        return message
+
+class FakeBot:
+    def __init__(self, channel):
+        self.channel = channel
+        self.views = []
+
+    def get_channel(self, channel_id):
+        return self.channel if channel_id == self.channel.id else None
+
+    def add_view(self, view, message_id=None):
+        self.views.append((view, message_id))
+
+class FakeResponse:
+    def __init__(self):
+        self.messages = []
+        self.deferred = False
+
+    async def send_message(self, content, ephemeral=False):
+        self.messages.append((content, ephemeral))
+
+    async def defer(self):
+        self.deferred = True
+
+class FakeInteraction:
+    def __init__(self, user, channel, message):
+        self.user = user
+        self.channel = channel
+        self.message = message
+        self.response = FakeResponse()
+
+PLAYERS = [
+    {"name": "Wilyer Abreu", "team": "Red Sox", "uuid": "a"},
+    {"name": "Bryan Abreu", "team": "Astros", "uuid": "b"},
+]
+
+def make_selection(channel, user_id, mentions=None):
+    prompt = FakeMessage(channel)
+    selection_handlers.selection_store.add(user_id, prompt.id, {
+        "message": prompt,
+        "players": PLAYERS,
+        "original_question": "How is Abreu doing?",
+        "original_user_message": FakeMessage(channel),
+        "type": "block_selection",
+        "mentions": mentions or [{"player": PLAYERS[1], "status": "pending"}],
+    })
+    return prompt
+
+def test_one_select_menu_with_every_candidate():
+    """The prompt carries a single select component instead of reactions"""
+    async def run():
+        view = PlayerSelectView(42, PLAYERS)
+        return view
+
+    view = asyncio.run(run())
+    assert len(view.children) == 1
+    assert [option.value for option in view.select.options] == ["0", "1"]
+    assert view.select.custom_id == "player_select:42"
+    assert view.timeout is None
+
+def test_only_original_user_may_select():
+    """Other users get an ephemeral refusal and the callback never runs"""
+    channel = FakeChannel()
+
+    async def run():
+        view = PlayerSelectView(42, PLAYERS)
+        prompt = make_selection(channel, 42)
+        intruder = FakeInteraction(FakeUser(7), channel, prompt)
+        allowed = await view.interaction_check(intruder)
+        owner = FakeInteraction(FakeUser(42), channel, prompt)
+        return allowed, intruder, await view.interaction_check(owner)
+
+    allowed, intruder, owner_allowed = asyncio.run(run())
+    assert not allowed
+    assert intruder.response.messages[0][1] is True
+    assert owner_allowed
+    selection_handlers.selection_store.clear()
+
+def test_selection_completes_and_claims_selection():
+    """Choosing an option defers the interaction and claims the selection, so it can no longer expire"""
+    channel = FakeChannel()
+
+    async def run():
+        view = PlayerSelectView(42, PLAYERS)
+        prompt = make_selection(channel, 42)
+        view.select._values = ["1"]
+        interaction = FakeInteraction(FakeUser(42), channel, prompt)
+        await view.on_select(interaction)
+        return interaction
+
+    interaction = asyncio.run(run())
+    assert interaction.response.deferred
+    assert not selection_handlers.selection_store.has_user(42)
+    assert len(selection_handlers.selection_store) == 0
+    assert channel.sent == ["This player has been asked about recently, please be patient and wait for an answer."]
+
+def test_stale_prompt_is_rejected():
+    """Selecting on a prompt that no longer has pending state answers ephemerally"""
+    channel = FakeChannel()
+
+    async def run():
+        view = PlayerSelectView(42, PLAYERS)
+        view.select._values = ["0"]
+        interaction = FakeInteraction(FakeUser(42), channel, FakeMessage(channel))
+        await view.on_select(interaction)
+        return interaction
+
+    interaction = asyncio.run(run())
+    assert interaction.response.messages and interaction.response.messages[0][1] is True
+    assert not interaction.response.deferred
+
+def test_restart_restores_live_prompts_and_cleans_expired():
+    """Pending prompts survive a restart; ones that expired while down are deleted"""
+    channel = FakeChannel()
+    path = os.path.join(tempfile.mkdtemp(), "pending_selections.json")
+    cleaned = []
+
+    async def run():
+        before = SelectionStore(ttl=30, sweep_interval=1, path=path)
+        selection_handlers.selection_store = before
+        live = make_selection(channel, 42)
+        before.add(43, 999, {"message": FakeMessage(channel), "players": PLAYERS, "original_question": "Abreu?",
+                             "original_user_message": FakeMessage(channel), "type": "disambiguation_selection"}, ttl=-1)
+        await before.flush()  # As AskBot.close() does at shutdown
+
+        after = SelectionStore(ttl=30, sweep_interval=1, path=path)
+        selection_handlers.selection_store = after
+        original_submit_delete = selection_handlers.submit_delete
+        selection_handlers.submit_delete = lambda message: cleaned.append(message.id)
+        bot = FakeBot(channel)
+        try:
+            counts = selection_handlers.restore_pending_selections(bot)
+            await after.flush()
+        finally:
+            selection_handlers.submit_delete = original_submit_delete
+        return live, after, bot, counts
+
+    try:
+        live, store, bot, counts = asyncio.run(run())
+        assert counts == (1, 1)
+        assert 999 in cleaned and 999 not in store
+        restored = store.get(live.id)
+        assert restored["user_id"] == 42 and restored["original_question"] == "How is Abreu doing?"
+        assert restored["message"].channel is channel
+        assert bot.views[0][1] == live.id and bot.views[0][0].user_id == 42
+        assert [record["message_id"] for record in store.load()] == [live.id]
+    finally:
+        selection_handlers.selection_store = SelectionStore(ttl=30, sweep_interval=1, path=None)
+
+if __name__ == "__main__":
+    print("🧪 Testing selection view...")
+    test_one_select_menu_with_every_candidate()
+    test_only_original_user_may_select()
+    test_selection_completes_and_claims_selection()
+    test_stale_prompt_is_rejected()
+    test_restart_restores_live_prompts_and_cleans_expired()
+    print("✅ All selection view tests passed")
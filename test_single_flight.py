@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test single-flight coalescing of concurrent recent mention lookups
+"""
+
+import sys
+import os
+import asyncio
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from single_flight import SingleFlight
+
+def test_concurrent_callers_share_one_lookup():
+    """Five simultaneous callers trigger a single lookup"""
+    flights = SingleFlight(cache_ttl=5)
+    calls = []
+
+    async def lookup():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "pending"
+
+    async def run():
+        return await asyncio.gather(*(flights.do(("guild", "uuid-1", 24), lookup) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert results == ["pending"] * 5
+    assert len(calls) == 1
+    assert flights.stats["coalesced"] == 4
+
+def test_cache_and_invalidation():
+    """Results are cached briefly and dropped when the bot posts"""
+    flights = SingleFlight(cache_ttl=5)
+    calls = []
+
+    async def lookup():
+        calls.append(1)
+        return len(calls)
+
+    async def run():
+        first = await flights.do("soto", lookup)
+        cached = await flights.do("soto", lookup)
+        flights.invalidate()
+        fresh = await flights.do("soto", lookup)
+        return first, cached, fresh
+
+    assert asyncio.run(run()) == (1, 1, 2)
+    assert flights.stats["cache_hits"] == 1
+
+def test_lookup_started_before_invalidation_is_not_cached():
+    """A lookup that races with a new bot post is returned but not cached"""
+    flights = SingleFlight(cache_ttl=5)
+    calls = []
+
+    async def slow_lookup():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return None
+
+    async def run():
+        task = asyncio.ensure_future(flights.do("judge", slow_lookup))
+        await asyncio.sleep(0.01)
+        flights.invalidate()
+        await task
+        await flights.do("judge", slow_lookup)
+
+    asyncio.run(run())
+    assert len(calls) == 2
+
+def test_errors_propagate_and_are_not_cached():
+    """A failed lookup raises for every waiter and the next call retries"""
+    flights = SingleFlight(cache_ttl=5)
+
+    async def broken():
+        raise RuntimeError("history failed")
+
+    async def run():
+        results = await asyncio.gather(flights.do("k", broken), flights.do("k", broken), return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert "k" not in flights.in_flight and "k" not in flights.cache
+
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    test_concurrent_callers_share_one_lookup()
+    test_cache_and_invalidation()
+    test_lookup_started_before_invalidation_is_not_cached()
+    test_errors_propagate_and_are_not_cached()
+    print("✅ Single flight tests passed")
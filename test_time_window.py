@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test the sliding time-bucket window used for recent mentions and rate tracking
+"""
+
+import sys
+import os
+import time
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from time_window import TimeBucketWindow
+
+def test_seen_within_any_window_size():
+    """One structure answers 1h, 24h and 48h questions without rebuilding"""
+    window = TimeBucketWindow(retention_hours=72)
+    now = time.time()
+    window.record("soto-uuid", now - 30 * 3600)
+    window.record("judge-uuid", now - 600)
+
+    assert window.seen_within("judge-uuid", 1, now=now)
+    assert not window.seen_within("soto-uuid", 24, now=now)
+    assert window.seen_within("soto-uuid", 48, now=now)
+    assert sorted(window.keys_within(48, now=now)) == ["judge-uuid", "soto-uuid"]
+    assert window.last_seen("missing") is None
+
+def test_latest_timestamp_wins():
+    """Recording an older event never moves the latest mention backwards"""
+    window = TimeBucketWindow(retention_hours=24)
+    now = time.time()
+    window.record("lindor", now - 60)
+    window.record("lindor", now - 7200)
+    assert window.last_seen("lindor") == now - 60
+
+def test_expire_drops_old_buckets():
+    """Expiry removes whole buckets and reports keys with nothing left"""
+    window = TimeBucketWindow(retention_hours=24)
+    now = time.time()
+    window.record("old", now - 20 * 3600)
+    window.record("both", now - 20 * 3600)
+    window.record("both", now - 60)
+
+    expired = window.expire(now=now + 10 * 3600)
+    assert expired == ["old"]
+    assert "old" not in window and "both" in window
+    assert window.count_within("both", 72, now=now) == 1
+
+def test_per_user_question_rate():
+    """The same structure counts questions per user"""
+    window = TimeBucketWindow(retention_hours=24)
+    now = time.time()
+    for _ in range(3):
+        window.record(1234, now - 60)
+    window.record(1234, now - 5 * 3600)
+    assert window.count_within(1234, 1, now=now) == 3
+    assert window.count_within(1234, 24, now=now) == 4
+    window.discard(1234)
+    assert window.count_within(1234, 24, now=now) == 0 and not window.buckets
+
+if __name__ == "__main__":
+    test_seen_within_any_window_size()
+    test_latest_timestamp_wins()
+    test_expire_drops_old_buckets()
+    test_per_user_question_rate()
+    print("✅ Time window tests passed")
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test the persistent timer scheduler used for delayed deletes and selection timeouts
+"""
+
+import sys
+import os
+import asyncio
+import tempfile
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from timer_scheduler import TimerScheduler
+
+def test_jobs_fire_in_due_order_from_one_driver():
+    """Jobs scheduled out of order fire by due time"""
+    scheduler = TimerScheduler(journal_path=None)
+    fired = []
+
+    async def handler(payload, context):
+        fired.append(payload["name"])
+
+    scheduler.register("cleanup", handler)
+
+    async def run():
+        scheduler.schedule("cleanup", 0.06, {"name": "late"})
+        scheduler.schedule("cleanup", 0.02, {"name": "early"})
+        scheduler.schedule("cleanup", 0.04, {"name": "middle"})
+        assert scheduler.counts() == {"cleanup": 3}
+        await asyncio.sleep(0.15)
+
+    asyncio.run(run())
+    assert fired == ["early", "middle", "late"]
+    assert len(scheduler) == 0
+
+def test_cancel_and_replace_by_key():
+    """Cancelled jobs never fire; rescheduling a key replaces the old job"""
+    scheduler = TimerScheduler(journal_path=None)
+    fired = []
+
+    async def handler(payload, context):
+        fired.append((payload["user_id"], context))
+
+    scheduler.register("selection_timeout", handler)
+
+    async def run():
+        scheduler.schedule("selection_timeout", 0.02, {"user_id": 1}, key="selection:1", context="ctx-1")
+        scheduler.schedule("selection_timeout", 0.02, {"user_id": 2}, key="selection:2")
+        scheduler.schedule("selection_timeout", 0.03, {"user_id": 2}, key="selection:2", context="ctx-2")
+        assert scheduler.cancel("selection:1")
+        assert not scheduler.cancel("selection:1")
+        assert scheduler.counts() == {"selection_timeout": 1}
+        await asyncio.sleep(0.1)
+
+    asyncio.run(run())
+    assert fired == [(2, "ctx-2")]
+
+def test_journal_restores_pending_jobs_after_restart():
+    """Jobs that had not fired are reloaded from the journal; cancelled and fired ones are not"""
+    with tempfile.TemporaryDirectory() as directory:
+        journal = os.path.join(directory, "scheduled_jobs.jsonl")
+        now = [1000.0]
+        before = TimerScheduler(journal_path=journal, clock=lambda: now[0])
+
+        async def noop(payload, context):
+            pass
+
+        before.register("delete_message", noop)
+
+        async def schedule_and_fire():
+            before.schedule("delete_message", 60, {"channel_id": 1, "message_id": 10}, key="delete:10")
+            before.schedule("delete_message", 5, {"channel_id": 1, "message_id": 11}, key="delete:11")
+            before.schedule("delete_message", 60, {"channel_id": 1, "message_id": 12}, key="delete:12")
+            before.cancel("delete:12")
+            before.schedule("delete_message", 0, {"channel_id": 1, "message_id": 13}, key="delete:13")
+            await asyncio.sleep(0.05)
+            assert not os.path.exists(journal)  # Buffered, nothing written on the loop yet
+            await before.flush()
+
+        asyncio.run(schedule_and_fire())
+
+        # "Restart": a fresh scheduler reads the journal after the original due times passed
+        now[0] = 1100.0
+        after = TimerScheduler(journal_path=journal, clock=lambda: now[0])
+        restored = []
+
+        async def handler(payload, context):
+            restored.append((payload["message_id"], context))
+
+        after.register("delete_message", handler)
+
+        async def restore():
+            assert after.restore() == 2
+            await asyncio.sleep(0.05)
+            await after.flush()
+
+        asyncio.run(restore())
+        assert sorted(restored) == [(10, None), (11, None)]
+        with open(journal) as f:
+            assert all('"op": "add"' in line for line in f.readlines()[:2])
+
+def test_journal_entries_are_batched():
+    """Schedule / cancel / done entries are written together after the flush interval"""
+    with tempfile.TemporaryDirectory() as directory:
+        journal = os.path.join(directory, "scheduled_jobs.jsonl")
+        scheduler = TimerScheduler(journal_path=journal, flush_interval=0.05)
+
+        async def noop(payload, context):
+            pass
+
+        scheduler.register("delete_message", noop)
+
+        async def run():
+            for i in range(5):
+                scheduler.schedule("delete_message", 0.01, {"message_id": i}, key=f"delete:{i}")
+            await asyncio.sleep(0.02)  # All five fire; ten entries buffered
+            assert len(scheduler.journal_buffer) == 10
+            await asyncio.sleep(0.05)
+            assert scheduler.journal_buffer == []
+            await scheduler.flush()
+
+        asyncio.run(run())
+        with open(journal) as f:
+            assert len(f.readlines()) == 10
+
+if __name__ == "__main__":
+    print("🧪 Testing timer scheduler...")
+    test_jobs_fire_in_due_order_from_one_driver()
+    test_cancel_and_replace_by_key()
+    test_journal_restores_pending_jobs_after_restart()
+    test_journal_entries_are_batched()
+    print("✅ All timer scheduler tests passed")
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test request tracing: context propagation, spans and rotating JSONL export
+"""
+
+import sys
+import os
+import json
+import asyncio
+import tempfile
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from tracing import Tracer, TraceExporter, current_request_id, set_attribute, run_in_executor
+
+def test_context_follows_awaits_and_tasks():
+    """Concurrent requests each see their own trace across awaits"""
+    tracer = Tracer(exporter=TraceExporter(path=None), enabled=False)
+    seen = {}
+
+    async def deep_module_call():
+        await asyncio.sleep(0)
+        return current_request_id()
+
+    async def handle(request_id, delay):
+        trace = tracer.begin("ask", request_id)
+        try:
+            await asyncio.sleep(delay)
+            seen[request_id] = await asyncio.create_task(deep_module_call())
+        finally:
+            tracer.end(trace)
+
+    async def run():
+        await asyncio.gather(handle("a", 0.02), handle("b", 0.01))
+        return current_request_id()
+
+    assert asyncio.run(run()) is None
+    assert seen == {"a": "a", "b": "b"}
+
+def test_context_follows_executor_hop():
+    """run_in_executor carries the trace into the worker thread"""
+    tracer = Tracer(exporter=TraceExporter(path=None), enabled=False)
+
+    def blocking_work():
+        with tracer.span("fuzzy_scan", candidates=3):
+            set_attribute("best", "Aaron Judge")
+        return current_request_id()
+
+    async def run():
+        trace = tracer.begin("ask", "req-exec")
+        request_id = await run_in_executor(blocking_work)
+        return tracer.end(trace), request_id
+
+    trace, request_id = asyncio.run(run())
+    assert request_id == "req-exec"
+    assert trace.spans[0].attributes == {"candidates": 3, "best": "Aaron Judge"}
+
+def test_spans_outside_trace_are_noops():
+    """Library code can open spans without a request in flight"""
+    tracer = Tracer(exporter=TraceExporter(path=None), enabled=False)
+    with tracer.span("orphan") as span:
+        set_attribute("ignored", True)
+    assert span is None
+
+def test_finished_trace_exported_as_jsonl():
+    """Each finished trace is queued, then written as one JSON line with its spans and attributes"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "traces.jsonl")
+        tracer = Tracer(exporter=TraceExporter(path=path), enabled=True)
+        trace = tracer.begin("ask", "req1", user_id=42)
+        with tracer.span("validation"):
+            set_attribute("result", "valid")
+        tracer.end(trace, outcome="approved")
+        assert not os.path.exists(path)  # Queued, not written on the request path
+        assert asyncio.run(tracer.exporter.flush()) == 1
+
+        with open(path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+
+    assert len(records) == 1
+    record = records[0]
+    assert record["trace_id"] == "req1"
+    assert record["attributes"] == {"user_id": 42, "outcome": "approved"}
+    assert record["spans"][0]["name"] == "validation"
+    assert record["spans"][0]["attributes"] == {"result": "valid"}
+
+def test_export_rotates_by_size():
+    """The trace file rotates into numbered backups, keeping at most `backups`"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "traces.jsonl")
+        exporter = TraceExporter(path=path, max_bytes=200, backups=2)
+        for i in range(20):
+            exporter.write([{"trace_id": f"req{i}", "padding": "x" * 50}])
+
+        files = sorted(os.listdir(tmp))
+        sizes = [os.path.getsize(os.path.join(tmp, name)) for name in files]
+
+    assert files == ["traces.jsonl", "traces.jsonl.1", "traces.jsonl.2"]
+    assert all(size <= 200 for size in sizes)
+    assert exporter.stats["rotations"] > 0 and exporter.stats["exported"] == 20
+
+def test_export_failure_does_not_raise():
+    """An unwritable trace path is counted, not raised into the request"""
+    exporter = TraceExporter(path="/nonexistent-dir/traces.jsonl")
+    exporter.export({"trace_id": "x"})
+    asyncio.run(exporter.flush())
+    assert exporter.stats["failed"] == 1
+
+def test_export_queue_bounded():
+    """When the writer falls behind, the oldest queued traces are dropped"""
+    exporter = TraceExporter(path=None, max_queue=3)
+    for i in range(5):
+        exporter.export({"trace_id": i})
+    assert [record["trace_id"] for record in exporter.queue] == [2, 3, 4]
+
+if __name__ == "__main__":
+    print("🧪 Testing request tracing...")
+    test_context_follows_awaits_and_tasks()
+    test_context_follows_executor_hop()
+    test_spans_outside_trace_are_noops()
+    test_finished_trace_exported_as_jsonl()
+    test_export_rotates_by_size()
+    test_export_failure_does_not_raise()
+    test_export_queue_bounded()
+    print("✅ All tracing tests passed")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test webhook packing, drop policy and 429 handling against a local fake webhook
+"""
+
+import sys
+import os
+import asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from http_session import SharedHTTPSession
+from webhook_dispatcher import WebhookDispatcher, embed_size
+
+DROP_ORDER = ["DEBUG", "INFO", "SUCCESS", "ANALYTICS", "WARNING", "ERROR"]
+
+def make_server(received, rate_limited=0):
+    """Fake webhook: answers the first `rate_limited` posts with a 429"""
+    state = {"limited": rate_limited}
+
+    async def webhook(request):
+        if state["limited"]:
+            state["limited"] -= 1
+            return web.json_response({"message": "You are being rate limited.", "retry_after": 0.05, "global": False}, status=429)
+        received.append((await request.json())["embeds"])
+        return web.Response(status=204)
+
+    app = web.Application()
+    app.router.add_post("/webhook", webhook)
+    return TestServer(app)
+
+async def deliver(dispatcher, server_factory, fill):
+    shared = SharedHTTPSession(pool_size=2, timeout=5, keepalive=30)
+    dispatcher.http = shared
+    server = server_factory()
+    await server.start_server()
+    try:
+        fill(str(server.make_url("/webhook")))
+        return await dispatcher.flush()
+    finally:
+        await shared.close()
+        await server.close()
+
+def test_packs_ten_embeds_and_6000_chars():
+    """Embeds go out 10 per message, and a message never exceeds 6000 characters"""
+    received = []
+    dispatcher = WebhookDispatcher(max_queue=100, drop_order=DROP_ORDER)
+
+    def fill(url):
+        for i in range(12):
+            dispatcher.enqueue(url, "INFO", {"title": f"line {i}", "description": "x" * 10})
+        for i in range(4):
+            dispatcher.enqueue(url, "INFO", lambda: {"title": "big", "description": "y" * 2500})
+
+    messages = asyncio.run(deliver(dispatcher, lambda: make_server(received), fill))
+    assert messages == len(received) == 3
+    assert [len(embeds) for embeds in received] == [10, 4, 2]
+    assert all(sum(embed_size(embed) for embed in embeds) <= 6000 for embeds in received)
+    assert dispatcher.stats["sent"] == 16 and len(dispatcher) == 0
+
+def test_429_is_retried_after_retry_after():
+    """Rate-limited messages are resent after retry_after instead of being lost"""
+    received = []
+    slept = []
+    dispatcher = WebhookDispatcher(max_queue=100, drop_order=DROP_ORDER)
+
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+
+    dispatcher.sleep = fake_sleep
+
+    def fill(url):
+        dispatcher.enqueue(url, "ERROR", {"title": "boom"})
+
+    messages = asyncio.run(deliver(dispatcher, lambda: make_server(received, rate_limited=2), fill))
+    assert messages == 1
+    assert received == [[{"title": "boom"}]]
+    assert slept == [0.05, 0.05]
+    assert dispatcher.stats["retried"] == 2 and dispatcher.stats["failed"] == 0
+
+def test_full_queue_drops_debug_first():
+    """When the queue is full, lower-priority levels make room for higher ones"""
+    dispatcher = WebhookDispatcher(max_queue=3, drop_order=DROP_ORDER)
+    url = "https://example.invalid/webhook"
+    dispatcher.enqueue(url, "INFO", {"title": "info"})
+    dispatcher.enqueue(url, "DEBUG", {"title": "debug"})
+    dispatcher.enqueue(url, "ERROR", {"title": "error 1"})
+
+    assert dispatcher.enqueue(url, "ERROR", {"title": "error 2"})      # Evicts DEBUG
+    assert dispatcher.enqueue(url, "WARNING", {"title": "warning"})    # Evicts INFO
+    assert not dispatcher.enqueue(url, "DEBUG", {"title": "debug 2"})  # Nothing ranks lower: dropped itself
+
+    assert [embed["title"] for _, embed in dispatcher.queues[url]] == ["error 1", "error 2", "warning"]
+    assert dispatcher.stats["dropped"] == 3
+
+if __name__ == "__main__":
+    print("🧪 Testing webhook dispatcher...")
+    test_packs_ten_embeds_and_6000_chars()
+    test_429_is_retried_after_retry_after()
+    test_full_queue_drops_debug_first()
+    print("✅ All webhook dispatcher tests passed")
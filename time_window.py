@@ -0,0 +1,83 @@
+import time
+
+# -------- SLIDING TIME-BUCKET WINDOW --------
+
+class TimeBucketWindow:
+    """
+    Sliding window of keyed events grouped into fixed time buckets (hourly by default).
+
+    - record(): O(1)
+    - seen_within() / last_seen(): O(1) via the per-key latest timestamp
+    - count_within(): O(buckets), for per-user rate tracking
+    - expire(): O(buckets) plus the keys that actually fall out
+
+    Events are retained for `retention_hours`, so queries can ask about any
+    window up to that size without rebuilding state when the window changes.
+    """
+    def __init__(self, retention_hours=72, bucket_seconds=3600):
+        self.retention_hours = retention_hours
+        self.bucket_seconds = bucket_seconds
+        self.buckets = {}   # bucket number: {key: event count}
+        self.latest = {}    # key: latest event timestamp
+
+    def __len__(self):
+        return len(self.latest)
+
+    def __contains__(self, key):
+        return key in self.latest
+
+    def _bucket_for(self, timestamp):
+        return int(timestamp // self.bucket_seconds)
+
+    def _cutoff(self, hours, now=None):
+        now = time.time() if now is None else now
+        return now - hours * 3600
+
+    def record(self, key, timestamp=None):
+        """Record an event for `key`; returns False if it is already outside retention"""
+        timestamp = time.time() if timestamp is None else timestamp
+        if timestamp < self._cutoff(self.retention_hours):
+            return False
+        counts = self.buckets.setdefault(self._bucket_for(timestamp), {})
+        counts[key] = counts.get(key, 0) + 1
+        if timestamp > self.latest.get(key, float("-inf")):
+            self.latest[key] = timestamp
+        return True
+
+    def discard(self, key):
+        """Forget every event for `key`"""
+        if self.latest.pop(key, None) is None:
+            return
+        for bucket in list(self.buckets):
+            counts = self.buckets[bucket]
+            if counts.pop(key, None) is not None and not counts:
+                del self.buckets[bucket]
+
+    def last_seen(self, key):
+        return self.latest.get(key)
+
+    def seen_within(self, key, hours, now=None):
+        """True if `key` had an event in the last `hours` hours"""
+        timestamp = self.latest.get(key)
+        return timestamp is not None and timestamp >= self._cutoff(hours, now)
+
+    def count_within(self, key, hours, now=None):
+        """Number of events for `key` in buckets overlapping the last `hours` hours"""
+        first_bucket = self._bucket_for(self._cutoff(hours, now))
+        return sum(counts.get(key, 0) for bucket, counts in self.buckets.items() if bucket >= first_bucket)
+
+    def keys_within(self, hours, now=None):
+        cutoff = self._cutoff(hours, now)
+        return [key for key, timestamp in self.latest.items() if timestamp >= cutoff]
+
+    def expire(self, now=None):
+        """Drop buckets entirely outside retention; returns keys with no remaining events"""
+        oldest_live_bucket = self._bucket_for(self._cutoff(self.retention_hours, now))
+        cutoff = oldest_live_bucket * self.bucket_seconds
+        expired_keys = []
+        for bucket in [bucket for bucket in self.buckets if bucket < oldest_live_bucket]:
+            for key in self.buckets.pop(bucket):
+                if key in self.latest and self.latest[key] < cutoff:
+                    del self.latest[key]
+                    expired_keys.append(key)
+        return expired_keys
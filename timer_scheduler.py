@@ -0,0 +1,272 @@
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from logging_system import log_error, log_info
+
+# -------- PERSISTENT TIMER SCHEDULER --------
+
+JOURNAL_FILE = "/persistence/scheduled_jobs.jsonl"
+JOURNAL_COMPACT_MIN = 200  # Journal lines before a compaction is considered
+JOURNAL_FLUSH_SECONDS = 1.0  # Journal entries are buffered and written this often
+
+class TimerJob:
+    __slots__ = ("key", "kind", "due", "payload", "context", "persist", "cancelled")
+
+    def __init__(self, key, kind, due, payload, context=None, persist=True):
+        self.key = key
+        self.kind = kind
+        self.due = due              # Wall-clock POSIX seconds, so jobs survive restarts
+        self.payload = payload      # JSON-serializable data passed to the handler
+        self.context = context      # In-memory only (e.g. a command context); None after a restart
+        self.persist = persist
+        self.cancelled = False
+
+class TimerScheduler:
+    """
+    One heap of delayed jobs driven by a single background task.
+
+    Replaces a sleeping asyncio task per delayed delete / cleanup / timeout.
+    Jobs are keyed (scheduling an existing key replaces it, cancel() removes it)
+    and recorded in an append-only JSONL journal, so restore() after a restart
+    brings back everything that had not fired yet. Handlers are registered per
+    job kind and called as `await handler(payload, context)`.
+
+    Journal entries are buffered and written every `flush_interval` seconds by
+    a single writer thread (so appends and compactions stay in order); a crash
+    can lose at most that much scheduling, never block the event loop.
+    """
+    def __init__(self, journal_path=JOURNAL_FILE, clock=time.time, flush_interval=JOURNAL_FLUSH_SECONDS):
+        self.journal_path = journal_path
+        self.clock = clock
+        self.flush_interval = flush_interval
+        self.heap = []                  # (due, sequence, TimerJob)
+        self.jobs = {}                  # key: TimerJob
+        self.handlers = {}              # kind: async handler(payload, context)
+        self.sequence = itertools.count()
+        self.journal_lines = 0
+        self.journal_buffer = []        # Entries waiting for the next flush
+        self.flush_handle = None        # Pending loop.call_later for that flush
+        self.flush_loop = None
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="timer-journal")
+        self.last_write = None          # Future of the most recently submitted write
+        self.restored = False
+        self.loop = None
+        self.driver = None
+        self.wakeup = None
+        self.stats = {"scheduled": 0, "cancelled": 0, "fired": 0, "failed": 0}
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def register(self, kind, handler):
+        self.handlers[kind] = handler
+
+    def counts(self):
+        """Scheduled jobs per kind"""
+        return dict(Counter(job.kind for job in self.jobs.values()))
+
+    def schedule(self, kind, delay, payload=None, key=None, context=None, persist=True):
+        """Run the `kind` handler after `delay` seconds; returns the job key"""
+        key = key or f"{kind}:{uuid.uuid4().hex}"
+        job = TimerJob(key, kind, self.clock() + delay, payload or {}, context, persist)
+        self._add(job)
+        if persist:
+            self._journal({"op": "add", "key": key, "kind": kind, "due": job.due, "payload": job.payload})
+        self.stats["scheduled"] += 1
+        return key
+
+    def cancel(self, key):
+        """Cancel a scheduled job; returns False if there was nothing to cancel"""
+        job = self.jobs.pop(key, None)
+        if job is None:
+            return False
+        job.cancelled = True  # Left in the heap and skipped when it surfaces
+        if job.persist:
+            self._journal({"op": "cancel", "key": key})
+        self.stats["cancelled"] += 1
+        return True
+
+    def _add(self, job):
+        existing = self.jobs.get(job.key)
+        if existing is not None:
+            existing.cancelled = True
+        self.jobs[job.key] = job
+        heapq.heappush(self.heap, (job.due, next(self.sequence), job))
+        self._ensure_driver()
+        if self.wakeup is not None and self.heap[0][2] is job:
+            self.wakeup.set()  # New earliest job: re-arm the driver
+
+    # -------- DRIVER --------
+
+    def _ensure_driver(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Restored before the loop starts; the first schedule() starts the driver
+        if self.loop is not loop:
+            self.loop = loop
+            self.wakeup = asyncio.Event()
+            self.driver = None
+        if self.driver is None or self.driver.done():
+            self.driver = loop.create_task(self._drive())
+
+    async def _drive(self):
+        while True:
+            while self.heap and self.heap[0][2].cancelled:
+                heapq.heappop(self.heap)
+
+            self.wakeup.clear()
+            if not self.heap:
+                await self.wakeup.wait()
+                continue
+
+            delay = self.heap[0][0] - self.clock()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, _, job = heapq.heappop(self.heap)
+            if self.jobs.get(job.key) is job:
+                del self.jobs[job.key]
+                self.loop.create_task(self._fire(job))
+
+    async def _fire(self, job):
+        handler = self.handlers.get(job.kind)
+        try:
+            if handler is None:
+                log_error(f"TIMERS: No handler registered for {job.kind}")
+                return
+            await handler(job.payload, job.context)
+            self.stats["fired"] += 1
+        except Exception as e:
+            self.stats["failed"] += 1
+            log_error(f"TIMERS: {job.kind} job {job.key} failed: {e}")
+        finally:
+            if job.persist:
+                self._journal({"op": "done", "key": job.key})
+
+    # -------- JOURNAL --------
+
+    def _journal(self, entry):
+        if not self.journal_path:
+            return
+        self.journal_buffer.append(entry)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush_journal()  # No loop to defer to
+            return
+        if self.flush_handle is None or self.flush_loop is not loop:
+            self.flush_loop = loop
+            self.flush_handle = loop.call_later(self.flush_interval, self.flush_journal)
+
+    def flush_journal(self):
+        """Hand buffered entries to the writer thread, compacting instead when the journal has grown"""
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        if not self.journal_buffer:
+            return
+        pending_lines = self.journal_lines + len(self.journal_buffer)
+        if pending_lines > JOURNAL_COMPACT_MIN and pending_lines > 4 * len(self.jobs):
+            self.compact()
+            return
+        lines = "".join(json.dumps(entry) + "\n" for entry in self.journal_buffer)
+        self.journal_lines += len(self.journal_buffer)
+        self.journal_buffer = []
+        self._submit(self._append, lines)
+
+    def compact(self):
+        """Rewrite the journal as one add line per pending persistent job (supersedes anything buffered)"""
+        live = [job for job in self.jobs.values() if job.persist]
+        lines = "".join(json.dumps({"op": "add", "key": job.key, "kind": job.kind, "due": job.due, "payload": job.payload}) + "\n"
+                        for job in live)
+        self.journal_buffer = []
+        self.journal_lines = len(live)
+        self._submit(self._replace, lines)
+
+    async def flush(self):
+        """Write everything buffered and wait for the writer (e.g. at shutdown)"""
+        self.flush_journal()
+        if self.last_write is not None:
+            await asyncio.wrap_future(self.last_write)
+
+    def _submit(self, write, lines):
+        future = self.writer.submit(write, lines)
+        future.add_done_callback(self._written)
+        self.last_write = future
+
+    def _written(self, future):
+        error = future.result()
+        if error:
+            # Runs on the writer thread; the loop (if any) does the logging
+            if self.loop is not None and not self.loop.is_closed():
+                self.loop.call_soon_threadsafe(log_error, error)
+            else:
+                print(f"❌ {error}")
+
+    def _append(self, lines):
+        """Blocking append; runs on the writer thread. Returns an error message or None"""
+        try:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError as e:
+            return f"TIMERS: Failed to write journal: {e}"
+        return None
+
+    def _replace(self, lines):
+        """Blocking rewrite via a temp file; runs on the writer thread. Returns an error message or None"""
+        temp_path = self.journal_path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(lines)
+            os.replace(temp_path, self.journal_path)
+        except OSError as e:
+            return f"TIMERS: Failed to compact journal: {e}"
+        return None
+
+    def restore(self):
+        """Reload jobs that had not fired before the last shutdown; overdue jobs fire right away"""
+        if self.restored or not self.journal_path:
+            return 0
+        self.restored = True
+        if not os.path.exists(self.journal_path):
+            return 0
+
+        pending = {}
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # Torn final line from a crash
+                    if entry.get("op") == "add":
+                        pending[entry["key"]] = entry
+                    else:
+                        pending.pop(entry.get("key"), None)
+        except OSError as e:
+            log_error(f"TIMERS: Failed to read journal: {e}")
+            return 0
+
+        restored = 0
+        for key, entry in pending.items():
+            if key in self.jobs:
+                continue  # Already rescheduled in this process
+            self._add(TimerJob(key, entry["kind"], entry["due"], entry.get("payload", {})))
+            restored += 1
+        self.compact()
+        log_info(f"TIMERS: Restored {restored} scheduled jobs {self.counts()}")
+        return restored
+
+# Global timer scheduler instance
+timers = TimerScheduler()
@@ -0,0 +1,241 @@
+import asyncio
+import contextvars
+import itertools
+import json
+import os
+import time
+from collections import deque
+from datetime import datetime
+from config import TRACING_ENABLED, TRACE_MAX_BYTES, TRACE_BACKUPS, TRACE_FLUSH_SECONDS, TRACE_QUEUE_SIZE
+from profiling import request_profiler
+
+# -------- REQUEST TRACING --------
+
+TRACE_FILE = "/persistence/traces.jsonl"
+
+# The request being served by the current task (copied into child tasks and executor hops)
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+class Span:
+    __slots__ = ("name", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name, span_id, parent_id, attributes):
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns = None
+        self.attributes = attributes
+        self.error = None
+
+    def duration_ms(self):
+        return ((self.end_ns or time.perf_counter_ns()) - self.start_ns) / 1e6
+
+class Trace:
+    """One request: its attributes and every span recorded while it was current"""
+    def __init__(self, name, trace_id, attributes):
+        self.name = name
+        self.trace_id = trace_id
+        self.attributes = attributes
+        self.spans = []
+        self.span_ids = itertools.count(1)
+        self.started_at = datetime.utcnow()
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns = None
+        self.token = None
+
+    @property
+    def finished(self):
+        return self.end_ns is not None
+
+    def duration_ms(self):
+        return ((self.end_ns or time.perf_counter_ns()) - self.start_ns) / 1e6
+
+    def summary(self):
+        """Top-level spans on one line"""
+        return " ".join(f"{span.name}={span.duration_ms():.1f}ms" for span in self.spans if span.parent_id is None) or "no spans"
+
+    def to_record(self):
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "start": self.started_at.isoformat(),
+            "duration_ms": round(self.duration_ms(), 3),
+            "attributes": self.attributes,
+            "spans": [{
+                "id": span.span_id,
+                "parent": span.parent_id,
+                "name": span.name,
+                "offset_ms": round((span.start_ns - self.start_ns) / 1e6, 3),
+                "duration_ms": round(span.duration_ms(), 3),
+                "attributes": span.attributes,
+                "error": span.error,
+            } for span in self.spans]
+        }
+
+class _SpanContext:
+    __slots__ = ("tracer", "name", "attributes", "span", "token")
+
+    def __init__(self, tracer, name, attributes):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self):
+        self.span, self.token = self.tracer.enter_span(self.name, self.attributes)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer.exit_span(self.span, self.token, exc)
+
+class TraceExporter:
+    """
+    Appends finished traces as JSON lines, rotating to path.1 ... path.N by size.
+
+    export() only queues the record; a background task serializes and writes
+    the queue in batches in an executor thread, so no request waits on disk.
+    """
+    def __init__(self, path=TRACE_FILE, max_bytes=TRACE_MAX_BYTES, backups=TRACE_BACKUPS,
+                 flush_interval=TRACE_FLUSH_SECONDS, max_queue=TRACE_QUEUE_SIZE):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.queue = deque(maxlen=max_queue)  # Oldest records dropped when the writer falls behind
+        self.size = None
+        self.warned = False
+        self.task = None
+        self.stats = {"queued": 0, "exported": 0, "rotations": 0, "failed": 0}
+
+    def __len__(self):
+        return len(self.queue)
+
+    def export(self, record):
+        """Queue a finished trace for the next batch write"""
+        self.queue.append(record)
+        self.stats["queued"] += 1
+
+    def start(self):
+        """Start the batch writer (once per event loop)"""
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self):
+        """Write everything queued so far in an executor thread; returns the number of records"""
+        if not self.queue:
+            return 0
+        records = list(self.queue)
+        self.queue.clear()
+        await asyncio.get_running_loop().run_in_executor(None, self.write, records)
+        return len(records)
+
+    def write(self, records):
+        """Serialize and append `records` (blocking; runs in the executor)"""
+        lines = "".join(json.dumps(record, separators=(",", ":"), default=str) + "\n" for record in records)
+        try:
+            if self.size is None:
+                self.size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+            if self.size and self.size + len(lines) > self.max_bytes:
+                self._rotate()
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+            self.size += len(lines)
+            self.stats["exported"] += len(records)
+        except OSError as e:
+            self.stats["failed"] += len(records)
+            if not self.warned:
+                print(f"⚠️ Trace export to {self.path} failed: {e}")
+                self.warned = True
+
+    def _rotate(self):
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self.size = 0
+        self.stats["rotations"] += 1
+
+class Tracer:
+    """
+    Request context in contextvars, so any module (matching, validation, recent
+    mentions) can add spans and attributes to the request it is serving without
+    a request id being passed around. Outside a trace every call is a cheap no-op.
+    """
+    def __init__(self, exporter=None, enabled=TRACING_ENABLED):
+        self.exporter = exporter if exporter is not None else TraceExporter()
+        self.enabled = enabled
+
+    def begin(self, name, trace_id, **attributes):
+        """Make a new trace current for this task; pair with end() in a finally"""
+        trace = Trace(name, trace_id, attributes)
+        trace.token = _current_trace.set(trace)
+        return trace
+
+    def end(self, trace, **attributes):
+        """Finish and export `trace`, restoring the previous context"""
+        trace.end_ns = time.perf_counter_ns()
+        trace.attributes.update(attributes)
+        try:
+            _current_trace.reset(trace.token)
+        except ValueError:
+            _current_trace.set(None)  # Ended from another context; just clear this one
+        _current_span.set(None)
+        if self.enabled:
+            self.exporter.export(trace.to_record())
+        return trace
+
+    def span(self, name, **attributes):
+        """Context manager recording a (nested) span in the current trace"""
+        return _SpanContext(self, name, attributes)
+
+    def enter_span(self, name, attributes=None):
+        """Start a span under the current one; returns (span, token), or (None, None) outside a trace"""
+        trace = _current_trace.get()
+        if trace is None or trace.finished:
+            return None, None
+        parent = _current_span.get()
+        span = Span(name, next(trace.span_ids), parent.span_id if parent is not None else None, attributes or {})
+        trace.spans.append(span)
+        return span, _current_span.set(span)
+
+    def exit_span(self, span, token, exc=None, end_ns=None):
+        if span is None:
+            return
+        _current_span.reset(token)
+        span.end_ns = end_ns or time.perf_counter_ns()
+        if exc is not None:
+            span.error = f"{type(exc).__name__}: {exc}"
+
+# Global tracer instance
+tracer = Tracer()
+
+def current_trace():
+    return _current_trace.get()
+
+def current_request_id():
+    trace = _current_trace.get()
+    return trace.trace_id if trace is not None else None
+
+def set_attribute(key, value):
+    """Attach an attribute to the current span (or the trace itself); no-op outside a trace"""
+    span = _current_span.get()
+    if span is not None:
+        span.attributes[key] = value
+        return
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.attributes[key] = value
+
+async def run_in_executor(func, *args, executor=None):
+    """loop.run_in_executor that keeps the request context (and its trace) in the worker thread"""
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(executor, context.run, request_profiler.profile_call, func, *args)
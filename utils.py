@@ -89,12 +89,12 @@ def expand_nicknames(text):
         return text
     
     text_lower = text.lower().strip()
-    log_debug(f"NICKNAME: Processing '{text_lower}'")
+    log_debug(lambda: f"NICKNAME: Processing '{text_lower}'")
     
     # Check for exact nickname matches
     if text_lower in player_nicknames:
         expanded = player_nicknames[text_lower]
-        log_info(f"NICKNAME EXPANSION: '{text}' → '{expanded}'")
+        log_debug(lambda: f"NICKNAME EXPANSION: '{text}' → '{expanded}'")
         return expanded
     
     # Check word-by-word
@@ -106,13 +106,13 @@ def expand_nicknames(text):
         if word in player_nicknames:
             expanded_words.append(player_nicknames[word])
             nickname_found = True
-            log_info(f"NICKNAME EXPANSION: '{word}' → '{player_nicknames[word]}'")
+            log_debug(lambda: f"NICKNAME EXPANSION: '{word}' → '{player_nicknames[word]}'")
         else:
             expanded_words.append(word)
     
     if nickname_found:
         result = ' '.join(expanded_words)
-        log_info(f"NICKNAME RESULT: '{text}' → '{result}'")
+        log_debug(lambda: f"NICKNAME RESULT: '{text}' → '{result}'")
         return result
     
     return text
@@ -0,0 +1,185 @@
+import asyncio
+from collections import deque
+from config import WEBHOOK_QUEUE_SIZE, WEBHOOK_DROP_ORDER
+from http_session import http_session
+
+# -------- WEBHOOK DISPATCHER --------
+
+MAX_EMBEDS_PER_MESSAGE = 10      # Discord's per-message embed limit
+MAX_EMBED_CHARS_PER_MESSAGE = 6000  # Discord's combined embed text limit per message
+SEND_INTERVAL = 10               # Seconds between drains when nothing wakes the sender
+WAKE_BATCH_SIZE = 5              # Queued embeds that wake the sender early
+MAX_RETRIES = 3                  # Attempts per message after 429s / server errors
+
+def embed_size(embed):
+    """Characters Discord counts against the 6000 limit"""
+    size = len(embed.get("title", "")) + len(embed.get("description", ""))
+    size += len(embed.get("footer", {}).get("text", "")) + len(embed.get("author", {}).get("name", ""))
+    for field in embed.get("fields", []):
+        size += len(field.get("name", "")) + len(field.get("value", ""))
+    return size
+
+class WebhookDispatcher:
+    """
+    The single path for webhook logs and analytics.
+
+    - one bounded queue shared by every webhook URL; when it is full the entry
+      ranked lowest in WEBHOOK_DROP_ORDER goes first (DEBUG before INFO before ...)
+    - one sender task packs each URL's queue into messages of up to 10 embeds
+      and 6000 characters
+    - 429s are retried after the reported retry_after; an exhausted bucket
+      (X-RateLimit-Remaining: 0) waits out its reset before the next message
+
+    Embeds may be queued as zero-argument callables; they are built when packed.
+    """
+    def __init__(self, max_queue=WEBHOOK_QUEUE_SIZE, drop_order=WEBHOOK_DROP_ORDER, http=http_session, sleep=asyncio.sleep):
+        self.max_queue = max_queue
+        self.drop_rank = {level: rank for rank, level in enumerate(drop_order)}
+        self.http = http
+        self.sleep = sleep
+        self.queues = {}  # url: deque of (level, embed)
+        self.queued = 0
+        self.wakeup = None
+        self.sender = None
+        self.stats = {"queued": 0, "sent": 0, "messages": 0, "dropped": 0, "retried": 0, "failed": 0}
+
+    def __len__(self):
+        return self.queued
+
+    def _rank(self, level):
+        return self.drop_rank.get(level, len(self.drop_rank))
+
+    def enqueue(self, url, level, embed):
+        """Queue one embed for `url`; returns False if it was the one dropped"""
+        if not url:
+            return False
+        if self.queued >= self.max_queue and not self._make_room(level):
+            self.stats["dropped"] += 1
+            return False
+
+        self.queues.setdefault(url, deque()).append((level, embed))
+        self.queued += 1
+        self.stats["queued"] += 1
+        if self.queued >= WAKE_BATCH_SIZE:
+            self._wake()
+        return True
+
+    def _make_room(self, level):
+        """Drop the oldest queued entry ranked lower than `level`; False if there is none"""
+        victim_rank = None
+        for queue in self.queues.values():
+            for queued_level, _ in queue:
+                rank = self._rank(queued_level)
+                if victim_rank is None or rank < victim_rank:
+                    victim_rank = rank
+        if victim_rank is None or victim_rank >= self._rank(level):
+            return False
+
+        for queue in self.queues.values():
+            for i, (queued_level, _) in enumerate(queue):
+                if self._rank(queued_level) == victim_rank:
+                    del queue[i]
+                    self.queued -= 1
+                    self.stats["dropped"] += 1
+                    return True
+        return False
+
+    def _wake(self):
+        if self.wakeup is None or self.sender is None:
+            return
+        try:
+            if asyncio.get_running_loop() is self.sender.get_loop():
+                self.wakeup.set()
+        except RuntimeError:
+            pass  # Queued outside the event loop thread; picked up on the next interval
+
+    # -------- SENDER --------
+
+    def start(self):
+        """Start the sender (once per event loop)"""
+        if self.sender is not None and not self.sender.done():
+            return
+        self.wakeup = asyncio.Event()
+        self.sender = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=SEND_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"❌ Webhook dispatcher error: {e}")
+
+    def _pack(self, queue):
+        """Take the next message's worth of embeds off the front of `queue`"""
+        embeds = []
+        chars = 0
+        while queue and len(embeds) < MAX_EMBEDS_PER_MESSAGE:
+            level, embed = queue[0]
+            if callable(embed):
+                embed = embed()
+                queue[0] = (level, embed)
+            size = embed_size(embed)
+            if embeds and chars + size > MAX_EMBED_CHARS_PER_MESSAGE:
+                break
+            queue.popleft()
+            self.queued -= 1
+            embeds.append(embed)
+            chars += size
+        return embeds
+
+    async def flush(self):
+        """Send everything queued so far; returns the number of messages posted"""
+        messages = 0
+        for url in list(self.queues):
+            queue = self.queues[url]
+            while queue:
+                embeds = self._pack(queue)
+                if await self._post(url, embeds):
+                    messages += 1
+            if not queue:
+                self.queues.pop(url, None)
+        return messages
+
+    async def _post(self, url, embeds):
+        for attempt in range(MAX_RETRIES + 1):
+            retry_after = None
+            try:
+                async with self.http.get().post(url, json={"embeds": embeds}) as response:
+                    if response.status in (200, 204):
+                        self.stats["sent"] += len(embeds)
+                        self.stats["messages"] += 1
+                        if response.headers.get("X-RateLimit-Remaining") == "0":
+                            await self.sleep(float(response.headers.get("X-RateLimit-Reset-After", 0)))
+                        return True
+                    if response.status == 429:
+                        retry_after = await self._retry_after(response)
+                    elif response.status >= 500:
+                        retry_after = 2 ** attempt
+                    else:
+                        print(f"❌ Webhook failed: {response.status}")
+                        break
+            except Exception as e:
+                print(f"❌ Webhook error: {e}")
+                retry_after = 2 ** attempt
+
+            if attempt < MAX_RETRIES:
+                self.stats["retried"] += 1
+                await self.sleep(retry_after)
+
+        self.stats["failed"] += len(embeds)
+        return False
+
+    async def _retry_after(self, response):
+        try:
+            body = await response.json(content_type=None)
+            return float(body.get("retry_after", 1))
+        except Exception:
+            return float(response.headers.get("Retry-After", 1))
+
+# Global dispatcher instance
+webhook_dispatcher = WebhookDispatcher()